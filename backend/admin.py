@@ -1,6 +1,6 @@
 # admin.py - FIXED VERSION
 
-from flask import Blueprint, render_template, request, redirect, url_for, session, flash, current_app, send_file, jsonify
+from flask import Blueprint, render_template, request, redirect, url_for, session, flash, current_app, send_file, jsonify, Response, stream_with_context
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
 from itsdangerous import URLSafeTimedSerializer
@@ -692,20 +692,15 @@ def refresh_post_analytics():
 @admin_login_required
 def blockchain_dashboard():
     """Blockchain integration statistics and monitoring"""
-    from blockchain.vote_verifier import get_vote_verifier
+    from blockchain.stats_cache import get_blockchain_stats_cache
     
     try:
-        verifier = get_vote_verifier()
-        stats = verifier.get_blockchain_stats()
-        
-        # Get recent blockchain votes
-        recent_votes = Vote.query.filter_by(
-            is_verified_on_chain=True
-        ).order_by(Vote.blockchain_timestamp.desc()).limit(10).all()
+        # Served from the background-refreshed cache (no count queries or RPC per page load)
+        stats = get_blockchain_stats_cache().get()
         
         return render_template('admin/blockchain_dashboard.html',
                              stats=stats,
-                             recent_votes=recent_votes)
+                             recent_votes=stats.get('recent_votes', []))
     except Exception as e:
         flash(f"❌ Blockchain dashboard error: {str(e)}", "danger")
         return redirect(url_for('admin_bp.admin_dashboard'))
@@ -744,6 +739,105 @@ def blockchain_integrity_check():
             'integrity_status': 'ERROR'
         })
 
+@admin_bp.route('/blockchain/integrity-check/stream')
+@admin_login_required
+def blockchain_integrity_check_stream():
+    """
+    Stream integrity check progress and tampered votes as NDJSON
+    The first event carries the run id; ?run=<id>&resume=1 continues that run's checkpoint
+    """
+    import json
+    import uuid
+    from blockchain.vote_verifier import get_vote_verifier
+    from blockchain.integrity_engine import IntegrityCheckEngine, integrity_checkpoint_path
+    
+    resume = request.args.get('resume') == '1'
+    run_id = request.args.get('run') if resume else None
+    run_id = run_id or uuid.uuid4().hex
+    
+    try:
+        checkpoint_path = integrity_checkpoint_path(run_id)
+    except ValueError as e:
+        return jsonify({'error': str(e), 'integrity_status': 'ERROR'}), 400
+    
+    engine = IntegrityCheckEngine(get_vote_verifier(), checkpoint_path=checkpoint_path)
+    
+    def generate():
+        yield json.dumps({'type': 'run', 'run_id': run_id}) + '\n'
+        for event in engine.iter_events(resume=resume):
+            yield json.dumps(event, default=str) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@admin_bp.route('/blockchain/hash-chain/scan')
+@admin_login_required
+def blockchain_hash_chain_scan():
+    """Scan the local vote hash chain for tampering (no RPC)"""
+    from blockchain.hash_chain import VoteHashChain
+    
+    try:
+        return jsonify(VoteHashChain().scan())
+    except Exception as e:
+        return jsonify({
+            'status': 'ERROR',
+            'error': str(e)
+        }), 500
+
+@admin_bp.route('/blockchain/circuit-breaker')
+@admin_login_required
+def blockchain_circuit_breaker():
+    """Solana RPC circuit breaker state and deferred outbox entries"""
+    from blockchain.solana_client import get_solana_client
+    from blockchain.outbox import get_outbox_submitter
+
+    client = get_solana_client()
+    submitter = get_outbox_submitter()
+
+    return jsonify({
+        'circuit_breaker': client.circuit_breaker.snapshot() if client.circuit_breaker is not None else None,
+        'outbox': submitter.get_stats() if submitter is not None else None
+    })
+
+@admin_bp.route('/blockchain/sweeper')
+@admin_login_required
+def blockchain_sweeper():
+    """Reconciliation sweeper backlog and drain rate"""
+    from blockchain.reconciler import get_reconciliation_sweeper
+
+    sweeper = get_reconciliation_sweeper()
+    if sweeper is None:
+        return jsonify({'running': False, 'error': 'Reconciliation sweeper not started'}), 503
+
+    metrics = sweeper.snapshot()
+    metrics['backlog'] = sweeper.get_backlog()
+    return jsonify(metrics)
+
+@admin_bp.route('/blockchain/priority-fees')
+@admin_login_required
+def blockchain_priority_fees():
+    """Priority fee estimator state (?samples=1 adds latency vs fee samples for tuning)"""
+    from blockchain.solana_client import get_solana_client
+
+    estimator = get_solana_client().get_priority_fee_estimator()
+    if estimator is None:
+        return jsonify({'enabled': False, 'error': 'USE_PRIORITY_FEES is off'}), 503
+
+    metrics = estimator.snapshot()
+    if request.args.get('samples') == '1':
+        metrics['samples'] = estimator.export_samples()
+    return jsonify(metrics)
+
+@admin_bp.route('/blockchain/reconcile')
+@admin_login_required
+def blockchain_reconcile():
+    """Merkle diff of database votes against the chain mirror (?confirm=0 skips RPC confirmation)"""
+    from blockchain.vote_verifier import get_vote_verifier
+    
+    verifier = get_vote_verifier()
+    result = verifier.reconcile_with_chain(confirm_on_chain=request.args.get('confirm') != '0')
+    
+    return jsonify(result), (200 if result['success'] else 500)
+
 @admin_bp.route('/blockchain/audit-report')
 @admin_login_required
 def blockchain_audit_report():
@@ -759,6 +853,47 @@ def blockchain_audit_report():
         flash(f"❌ Audit report error: {str(e)}", "danger")
         return redirect(url_for('admin_bp.blockchain_dashboard'))
 
+@admin_bp.route('/blockchain/audit-report/signatures')
+@admin_login_required
+def blockchain_audit_signatures():
+    """Stream verified votes' transaction signatures as NDJSON or CSV (?format=csv, ?after=<vote_id>&limit=N pages)"""
+    import csv
+    import json
+    from blockchain.vote_verifier import get_vote_verifier
+    
+    export_format = request.args.get('format', 'ndjson')
+    after_id = request.args.get('after', 0, type=int)
+    limit = request.args.get('limit', None, type=int)
+    
+    records = get_vote_verifier().iter_audit_signatures(after_id=after_id, limit=limit)
+    fields = ['vote_id', 'position', 'signature', 'slot', 'timestamp', 'merkle_root']
+    
+    if export_format == 'csv':
+        def generate():
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=fields)
+            writer.writeheader()
+            for record in records:
+                writer.writerow(record)
+                if buffer.tell() > 65536:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            yield buffer.getvalue()
+        mimetype = 'text/csv'
+    else:
+        def generate():
+            for record in records:
+                yield json.dumps(record) + '\n'
+        mimetype = 'application/x-ndjson'
+    
+    filename = f"blockchain_signatures.{'csv' if export_format == 'csv' else 'ndjson'}"
+    return Response(
+        stream_with_context(generate()),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
+
 # ------------------------------
 # AI Fraud Detection Dashboard
 # ------------------------------
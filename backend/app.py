@@ -1,5 +1,6 @@
 # app.py - UPDATED VERSION with Structured Survey + Blockchain Integration
 
+import os
 from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
 from flask_sqlalchemy import SQLAlchemy
 from flask_mail import Mail
@@ -13,7 +14,12 @@ from chatbot import chatbot_bp
 # from content_validator import validate_survey_content, content_validator  # ✅ OLD - No longer needed
 from models import PreSurveyNLP, SentimentAnalytics  # Keep for backwards compatibility with existing data
 from datetime import datetime
-from blockchain.vote_recorder import get_vote_recorder  # ✅ NEW: Blockchain integration
+from blockchain.encryption import get_encryption_service  # ✅ NEW: Blockchain integration
+from blockchain.outbox import enqueue_vote, start_outbox_submitter
+from blockchain.chain_indexer import start_chain_indexer
+from blockchain.hash_chain import start_vote_hash_chain
+from blockchain.stats_cache import start_blockchain_stats_cache
+from blockchain.reconciler import start_reconciliation_sweeper
 
 # ✅ NEW: Fraud Detection Integration
 from fraud_detection.behavior_analyzer import get_behavior_analyzer
@@ -695,14 +701,12 @@ def cast_vote():
                     # If fraud detection fails, allow vote to proceed
         
 
-        # ✅ BLOCKCHAIN INTEGRATION: Initialize vote recorder
+        # ✅ BLOCKCHAIN INTEGRATION: Encrypt votes locally, submission happens in the background
         try:
-            vote_recorder = get_vote_recorder()
-            blockchain_enabled = True
-            print("🔗 Blockchain vote recorder initialized")
+            encryption_service = get_encryption_service()
         except Exception as e:
-            blockchain_enabled = False
-            print(f"⚠️  Blockchain unavailable: {str(e)}")
+            encryption_service = None
+            print(f"⚠️  Vote encryption unavailable: {str(e)}")
 
         for position, candidate_id in votes.items():
             # STEP 1: Create vote record in local database
@@ -710,46 +714,25 @@ def cast_vote():
                 voter_id=voter_id,
                 candidate_id=candidate_id,
                 position=position,
-                created_at=datetime.utcnow()
+                created_at=datetime.utcnow(),
+                is_verified_on_chain=False
             )
+
+            if encryption_service:
+                payload = encryption_service.create_vote_payload(
+                    voter_id=voter_id,
+                    candidate_id=candidate_id,
+                    position=position,
+                    halka=voter.halka
+                )
+                vote.voter_id_hash = payload['voter_hash']
+                vote.encrypted_vote_data = payload['encrypted_vote']
+
             db.session.add(vote)
             db.session.flush()  # Get vote.id for reference
 
-            # STEP 2: Record vote on Solana blockchain
-            if blockchain_enabled:
-                try:
-                    print(f"\n🔐 Recording {position} vote on blockchain...")
-                    blockchain_result = vote_recorder.record_vote_on_chain(
-                        voter_id=voter_id,
-                        candidate_id=candidate_id,
-                        position=position,
-                        halka=voter.halka
-                    )
-
-                    if blockchain_result['success']:
-                        # Update vote with blockchain data
-                        vote.blockchain_tx_signature = blockchain_result['signature']
-                        vote.blockchain_slot = blockchain_result['slot']
-                        vote.blockchain_timestamp = blockchain_result['timestamp']
-                        vote.voter_id_hash = blockchain_result['voter_hash']
-                        vote.encrypted_vote_data = blockchain_result['encrypted_data']
-                        vote.verification_receipt = blockchain_result['receipt']
-                        vote.is_verified_on_chain = True
-                        print(f"✅ {position} vote recorded on blockchain: {blockchain_result['signature'][:16]}...")
-                    else:
-                        # Blockchain failed but vote saved locally
-                        vote.is_verified_on_chain = False
-                        print(f"⚠️  {position} blockchain recording failed: {blockchain_result.get('error')}")
-                        flash(f"⚠️ Vote recorded locally. Blockchain verification pending for {position}.", "warning")
-                
-                except Exception as e:
-                    # Blockchain error - vote still valid in local DB
-                    vote.is_verified_on_chain = False
-                    print(f"❌ Blockchain error for {position}: {str(e)}")
-                    flash(f"⚠️ Vote recorded locally. Blockchain temporarily unavailable for {position}.", "warning")
-            else:
-                # Blockchain disabled - local vote only
-                vote.is_verified_on_chain = False
+            # STEP 2: Queue vote for Solana blockchain (same DB transaction)
+            enqueue_vote(vote, voter.halka)
 
         db.session.commit()
         
@@ -766,14 +749,8 @@ def cast_vote():
                 db.session.commit()
                 print(f"✅ Vote allowed with Risk: {assessment['risk_score']:.1f}/100")
         
-        # Show success message with blockchain status
-        blockchain_count = Vote.query.filter_by(voter_id=voter_id, is_verified_on_chain=True).count()
-        if blockchain_count == len(votes):
-            flash(f"✅ All {len(votes)} votes recorded and verified on blockchain!", "success")
-        elif blockchain_count > 0:
-            flash(f"✅ {blockchain_count}/{len(votes)} votes verified on blockchain. Others recorded locally.", "info")
-        else:
-            flash(f"✅ All {len(votes)} votes recorded locally. Blockchain verification pending.", "info")
+        # Show success message (blockchain recording continues in the background)
+        flash(f"✅ All {len(votes)} votes recorded. Blockchain verification is in progress.", "success")
         
         session['step'] = 'voted'
         return redirect(url_for('post_survey'))
@@ -1003,4 +980,14 @@ def check_complaint_status(complaint_id):
 # Run the App
 # ---------------------------
 if __name__ == '__main__':
+    # Background workers that record queued votes on Solana, prove or resubmit
+    # unconfirmed ones, mirror them back, link committed votes into the local
+    # hash chain and keep dashboard stats warm. The debug reloader runs this
+    # module twice (watcher parent and serving child): start them in the child only
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_outbox_submitter(app)
+        start_reconciliation_sweeper(app)
+        start_chain_indexer(app)
+        start_vote_hash_chain(app)
+        start_blockchain_stats_cache(app)
     app.run(debug=True)
\ No newline at end of file
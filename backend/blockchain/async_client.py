@@ -0,0 +1,322 @@
+"""
+Async Solana Voting Client
+asyncio counterpart of SolanaVotingClient built on solana's AsyncClient
+
+Many transactions can be in flight on one event loop without tying up a
+thread each: blockhashes are fetched once per BLOCKHASH_REFRESH_INTERVAL
+and shared, and every pending signature is confirmed by one poller task
+that batches get_signature_statuses (256 per call). Like the synchronous
+confirmation tracker, it confirms at the receipt tier, keeps following
+receipted signatures until finalized and records each tier's latency.
+
+Wallets, the fee-payer pool and the circuit breaker are shared with the
+synchronous client, so both paths see the same balances and RPC health.
+Only the primary RPC endpoint is used.
+"""
+
+import asyncio
+import time
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.commitment import Confirmed
+from solana.rpc.core import RPCException
+from solana.rpc.types import TxOpts
+from solders.signature import Signature  # type: ignore
+from .circuit_breaker import CircuitOpenError
+from .confirmation_tracker import COMMITMENT_LEVELS, TierLatency
+from .config import (
+    config,
+    BLOCKHASH_REFRESH_INTERVAL,
+    CONFIRMATION_POLL_INTERVAL,
+    CONFIRMATION_BATCH_SIZE,
+    CONFIRMATION_TIMEOUT,
+    PROMOTE_TO_FINALIZED,
+    FINALIZATION_TIMEOUT,
+)
+
+
+class AsyncSolanaVotingClient:
+    """
+    Async RPC access for the vote recording pipeline (use from one event loop)
+    """
+
+    def __init__(self, solana_client, commitment=None,
+                 poll_interval=CONFIRMATION_POLL_INTERVAL, batch_size=CONFIRMATION_BATCH_SIZE,
+                 blockhash_max_age=BLOCKHASH_REFRESH_INTERVAL,
+                 promote_to_finalized=PROMOTE_TO_FINALIZED, finalization_timeout=FINALIZATION_TIMEOUT):
+        """
+        Initialize async client
+
+        Args:
+            solana_client: SolanaVotingClient whose wallets, fee payers and breaker are shared
+            commitment: 'processed', 'confirmed' or 'finalized'
+                        (None = the receipt tier in BlockchainConfig)
+            poll_interval: Seconds between signature status polls
+            batch_size: Signatures per get_signature_statuses call (RPC max 256)
+            blockhash_max_age: Seconds a fetched blockhash is reused
+            promote_to_finalized: Keep polling receipted signatures until finalized
+            finalization_timeout: Seconds a receipted signature is followed
+        """
+        self.sync_client = solana_client
+        self.rpc_url = solana_client.rpc_url
+        self.client = AsyncClient(self.rpc_url, commitment=Confirmed)
+        self.circuit_breaker = solana_client.circuit_breaker
+
+        self.default_commitment = commitment
+        self.poll_interval = poll_interval
+        self.batch_size = min(batch_size, 256)
+        self.blockhash_max_age = blockhash_max_age
+        self.promote_to_finalized = promote_to_finalized
+        self.finalization_timeout = finalization_timeout
+
+        self._blockhash = None
+        self._fetched_at = 0
+        self._blockhash_lock = None
+
+        self._pending = {}  # (signature, tier) -> (Signature, deadline, Future, started)
+        self._poller = None
+
+        self.rpc_calls = 0
+        self.confirmed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.finalized = 0
+        self.promotions_failed = 0
+        self.latency = TierLatency()
+
+    @property
+    def commitment(self):
+        """Tier used when confirm_transaction() is not given one"""
+        return self.default_commitment or config.get_commitment_tier()
+
+    def get_fee_payer_pool(self):
+        return self.sync_client.get_fee_payer_pool()
+
+    def get_priority_fee_estimator(self):
+        return self.sync_client.get_priority_fee_estimator()
+
+    def get_nonce_pool(self):
+        return self.sync_client.get_nonce_pool()
+
+    def is_circuit_open(self):
+        return self.sync_client.is_circuit_open()
+
+    async def _call(self, method, *args, **kwargs):
+        """Await one RPC method through the shared circuit breaker"""
+        breaker = self.circuit_breaker
+        probe = breaker.before_call() if breaker is not None else False
+
+        start = time.time()
+        try:
+            result = await getattr(self.client, method)(*args, **kwargs)
+        except RPCException:
+            if breaker is not None:
+                breaker.record_success(time.time() - start, probe)
+            raise
+        except Exception as e:
+            if breaker is not None:
+                breaker.record_failure(e, probe)
+            raise
+
+        self.rpc_calls += 1
+        if breaker is not None:
+            breaker.record_success(time.time() - start, probe)
+        return result
+
+    async def get_latest_blockhash(self):
+        """
+        Recent blockhash, fetched at most once per blockhash_max_age for all callers
+
+        Returns:
+            tuple: (blockhash, last_valid_block_height)
+        """
+        if self._blockhash_lock is None:
+            self._blockhash_lock = asyncio.Lock()
+
+        async with self._blockhash_lock:
+            if self._blockhash is None or time.time() - self._fetched_at >= self.blockhash_max_age:
+                response = await self._call('get_latest_blockhash')
+                self._blockhash = (response.value.blockhash, response.value.last_valid_block_height)
+                self._fetched_at = time.time()
+            return self._blockhash
+
+    def invalidate_blockhash(self):
+        """Drop the cached blockhash (e.g. after a BlockhashNotFound error)"""
+        self._blockhash = None
+
+    async def send_transaction(self, transaction):
+        """
+        Send a signed transaction
+
+        Returns:
+            str: Transaction signature
+        """
+        response = await self._call(
+            'send_raw_transaction',
+            bytes(transaction),
+            opts=TxOpts(skip_preflight=False, preflight_commitment=Confirmed)
+        )
+        return str(response.value)
+
+    async def confirm_transaction(self, signature, timeout=CONFIRMATION_TIMEOUT, commitment=None):
+        """
+        Wait until a signature reaches a commitment tier
+
+        Args:
+            signature: Transaction signature string
+            timeout: Seconds to wait
+            commitment: Tier to wait for (defaults to the client tier)
+
+        Returns:
+            dict: {'confirmed': bool, 'signature': str, 'slot': int, 'error': str,
+                   'timeout': bool, 'commitment': str}
+        """
+        key = (signature, commitment or self.commitment)
+        entry = self._pending.get(key)
+        if entry is None or entry[2] is None:
+            future = asyncio.get_running_loop().create_future()
+            entry = (Signature.from_string(signature), time.time() + timeout, future, time.time())
+            self._pending[key] = entry
+
+        # One poller task serves every pending signature
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.ensure_future(self._poll_loop())
+
+        return await asyncio.shield(entry[2])
+
+    async def _poll_loop(self):
+        """Poll all pending signatures in batches until none are left"""
+        while self._pending:
+            try:
+                await self.poll_once()
+            except Exception as e:
+                print(f"⚠️  Async confirmation poll error: {str(e)}")
+
+            if self._pending:
+                await asyncio.sleep(self.poll_interval)
+
+    async def poll_once(self):
+        """
+        Poll every pending signature once
+
+        Returns:
+            int: Number of signatures resolved
+        """
+        entries = list(self._pending.items())
+        resolved = 0
+
+        for i in range(0, len(entries), self.batch_size):
+            batch = entries[i:i + self.batch_size]
+            try:
+                response = await self._call('get_signature_statuses', [entry[0] for _, entry in batch])
+            except CircuitOpenError as e:
+                # RPC is down: report the batch as unconfirmed now instead of at its deadline
+                for key, _ in batch:
+                    resolved += self._resolve(key, False, None, str(e), True)
+                continue
+            except Exception as e:
+                print(f"⚠️  Async confirmation check error: {str(e)}")
+                continue
+
+            for (key, entry), status in zip(batch, response.value):
+                if status is None:
+                    continue
+                if status.err:
+                    resolved += self._resolve(key, False, status.slot, str(status.err), False)
+                elif status.confirmation_status is not None and \
+                        int(status.confirmation_status) >= COMMITMENT_LEVELS[key[1]]:
+                    self.latency.record(key[1], time.time() - entry[3])
+                    resolved += self._resolve(key, True, status.slot, None, False)
+
+        # Expire signatures that are still unresolved
+        now = time.time()
+        for key, (_, deadline, future, _) in entries:
+            if (future is None or not future.done()) and now >= deadline:
+                resolved += self._resolve(key, False, None, 'Transaction confirmation timeout', True)
+
+        return resolved
+
+    def _resolve(self, key, confirmed, slot, error, timeout):
+        entry = self._pending.pop(key, None)
+        if entry is None:
+            return 0
+
+        signature, tier = key
+        sig_obj, _, future, started = entry
+
+        if future is None:
+            # Promotion follow-up of a receipted signature
+            if confirmed:
+                self.finalized += 1
+            elif not timeout:
+                self.promotions_failed += 1
+            return 1
+
+        if future.done():
+            return 0
+
+        if confirmed:
+            self.confirmed += 1
+            if tier == 'finalized':
+                self.finalized += 1
+            elif self.promote_to_finalized:
+                self._pending.setdefault(
+                    (signature, 'finalized'),
+                    (sig_obj, time.time() + self.finalization_timeout, None, started)
+                )
+        elif timeout:
+            self.timed_out += 1
+        else:
+            self.failed += 1
+
+        future.set_result({
+            'confirmed': confirmed,
+            'signature': signature,
+            'slot': slot,
+            'error': error,
+            'timeout': timeout,
+            'commitment': tier
+        })
+        return 1
+
+    async def transaction_exists(self, signature):
+        """
+        One get_transaction lookup (used after a confirmation timeout)
+
+        Returns:
+            int: Slot of the transaction, or None if not found
+        """
+        try:
+            response = await self._call(
+                'get_transaction',
+                Signature.from_string(signature),
+                encoding="json",
+                max_supported_transaction_version=0
+            )
+        except Exception:
+            return None
+        return response.value.slot if response.value is not None else None
+
+    def snapshot(self):
+        """
+        Get async client statistics for monitoring
+
+        Returns:
+            dict: In-flight signatures and counters
+        """
+        return {
+            'commitment': self.commitment,
+            'in_flight': len(self._pending),
+            'rpc_calls': self.rpc_calls,
+            'confirmed': self.confirmed,
+            'failed': self.failed,
+            'timed_out': self.timed_out,
+            'finalized': self.finalized,
+            'promotions_failed': self.promotions_failed,
+            'latency': self.latency.snapshot()
+        }
+
+    async def close(self):
+        """Close the HTTP session"""
+        if self._poller is not None:
+            self._poller.cancel()
+        await self.client.close()
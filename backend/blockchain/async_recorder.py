@@ -0,0 +1,454 @@
+"""
+Async Vote Recording Pipeline
+Records ballots on Solana from one asyncio event loop (USE_ASYNC_RECORDING)
+
+AsyncVoteRecorder is the coroutine counterpart of VoteRecorder: sign,
+send and confirm run as one coroutine per ballot, so hundreds of
+transactions can be in flight without a thread each. A semaphore bounds
+how many are in flight at once.
+
+AsyncRecordingPipeline is the synchronous facade. It runs the event loop
+in a background thread and is a drop-in VoteRecorder for the outbox and
+Flask code:
+
+    submit_ballot(...)           -> concurrent.futures.Future (hand-off)
+    record_ballot_on_chain(...)  -> result dict (blocks until confirmed)
+
+Backpressure: at most max_queued ballots may be submitted but unfinished.
+A caller that cannot get a slot within submit_timeout gets a 'deferred'
+result instead of queueing without bound, and the outbox retries later.
+Merkle anchors and chain head anchors are single transactions and go
+through the synchronous VoteRecorder.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import ExitStack
+from datetime import datetime
+from .async_client import AsyncSolanaVotingClient
+from .circuit_breaker import CircuitOpenError
+from .memo_codec import encode_ballot_memo
+from .vote_recorder import (
+    VoteRecorder,
+    MAX_BALLOT_MEMO_BYTES,
+    build_memo_transaction,
+    reserve_nonce,
+    transaction_fee,
+    ballot_receipts,
+    unproven_result,
+)
+from .config import ASYNC_MAX_IN_FLIGHT, ASYNC_MAX_QUEUED, ASYNC_SUBMIT_TIMEOUT, CONFIRMATION_TIMEOUT
+
+
+class AsyncVoteRecorder:
+    """
+    Records ballots with memo transactions on an asyncio event loop
+    """
+
+    def __init__(self, async_client, encryption_service, max_in_flight=ASYNC_MAX_IN_FLIGHT):
+        """
+        Initialize async recorder (inside the event loop)
+
+        Args:
+            async_client: AsyncSolanaVotingClient instance
+            encryption_service: VoteEncryption instance
+            max_in_flight: Transactions signed, sent or confirming at once
+        """
+        self.client = async_client
+        self.encryption = encryption_service
+        self.max_in_flight = max_in_flight
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+
+    async def record_ballot_on_chain(self, voter_hash, ballot, halka, metadata=None):
+        """
+        Record all of a voter's encrypted votes in one memo transaction
+
+        Returns:
+            dict: Same structure as VoteRecorder.record_ballot_on_chain
+        """
+        try:
+            if metadata is None:
+                from .config import ELECTION_ID
+                metadata = {'election_id': ELECTION_ID}
+
+            memo_str = encode_ballot_memo(metadata['election_id'], voter_hash, halka, ballot)
+
+            if len(memo_str.encode('utf-8')) > MAX_BALLOT_MEMO_BYTES:
+                return {
+                    'success': False,
+                    'error': f'Ballot memo too large ({len(memo_str)} bytes)'
+                }
+
+            async with self._semaphore:
+                result = await self._send_memo_transaction(memo_str)
+
+            if not result['success'] and result.get('signature') is None:
+                return {
+                    'success': False,
+                    'deferred': result.get('deferred', False),
+                    'error': result.get('error', 'Unknown error')
+                }
+
+            return {
+                'success': result['success'],
+                'deferred': result.get('deferred', False),
+                'signature': result['signature'],
+                'slot': result['slot'],
+                'timestamp': result['timestamp'],
+                'proven': result['proven'],
+                'commitment': result['commitment'],
+                'last_valid_block_height': result['last_valid_block_height'],
+                'nonce_account': result['nonce_account'],
+                'durable_nonce': result['durable_nonce'],
+                'nonce_slot': result['nonce_slot'],
+                'voter_hash': voter_hash,
+                'votes': ballot_receipts(self.encryption, result['signature'], voter_hash, ballot),
+                'error': result.get('error')
+            }
+
+        except Exception as e:
+            print(f"   ❌ Async ballot recording failed: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+
+    def _reserve(self, reservations, lamports, memo_text):
+        """
+        Reserve a fee payer and a durable nonce (run in an executor: building the
+        pools and a payer's first balance check are blocking RPC calls)
+
+        Args:
+            reservations: ExitStack that releases both when the transaction is done
+            lamports: Fee the payer must afford
+            memo_text: Memo the transaction will carry
+
+        Returns:
+            tuple: (FeePayer or None, NonceAccount or None)
+        """
+        payer = reservations.enter_context(self.client.get_fee_payer_pool().acquire(lamports=lamports))
+        nonce_account = reservations.enter_context(reserve_nonce(self.client, payer, memo_text))
+        return payer, nonce_account
+
+    async def _send_memo_transaction(self, memo_text):
+        """
+        Sign, send and confirm one memo transaction
+
+        Returns:
+            dict: Same structure as VoteRecorder._send_memo_transaction
+        """
+        if self.client.is_circuit_open():
+            return {
+                'success': False,
+                'deferred': True,
+                'error': 'Solana RPC circuit open, vote deferred'
+            }
+
+        fee_estimator = None
+        priority_fee = None
+        sent = False
+
+        try:
+            loop = asyncio.get_running_loop()
+            fee_estimator = self.client.get_priority_fee_estimator()
+            if fee_estimator is not None:
+                # quote() may sample fees over HTTP if the sampler fell behind
+                priority_fee = await loop.run_in_executor(None, fee_estimator.quote)
+
+            with ExitStack() as reservations:
+                payer, nonce_account = await loop.run_in_executor(
+                    None, self._reserve, reservations, transaction_fee(priority_fee), memo_text
+                )
+                if payer is None:
+                    if fee_estimator is not None:
+                        fee_estimator.refund(priority_fee)
+                    return {
+                        'success': False,
+                        'error': 'Insufficient SOL balance for transaction'
+                    }
+
+                if nonce_account is not None:
+                    recent_blockhash, last_valid_block_height = nonce_account.nonce, None
+                else:
+                    recent_blockhash, last_valid_block_height = await self.client.get_latest_blockhash()
+                transaction = build_memo_transaction(payer, memo_text, recent_blockhash, priority_fee, nonce_account)
+
+                sent_at = time.time()
+                if nonce_account is not None:
+                    self.client.get_nonce_pool().mark_sent(nonce_account)
+                signature = await self.client.send_transaction(transaction)
+                sent = True
+                payer.ledger.debit(lamports=transaction_fee(priority_fee))
+
+                commitment = self.client.commitment
+                status = await self.client.confirm_transaction(
+                    signature, timeout=CONFIRMATION_TIMEOUT, commitment=commitment
+                )
+                slot = status['slot']
+
+                if not status['confirmed'] and status['timeout'] and not self.client.is_circuit_open():
+                    # Last look before giving up (the status may have been pruned)
+                    slot = await self.client.transaction_exists(signature)
+
+                if fee_estimator is not None:
+                    fee_estimator.record(priority_fee, time.time() - sent_at, status['confirmed'] or slot is not None)
+
+                if status['confirmed'] or slot is not None:
+                    return {
+                        'success': True,
+                        'proven': True,
+                        'commitment': commitment,
+                        'signature': signature,
+                        'slot': slot,
+                        'timestamp': datetime.utcnow(),
+                        'last_valid_block_height': last_valid_block_height,
+                        'nonce_account': str(nonce_account.pubkey) if nonce_account is not None else None,
+                        'durable_nonce': str(recent_blockhash) if nonce_account is not None else None,
+                        'nonce_slot': nonce_account.nonce_slot if nonce_account is not None else None
+                    }
+
+                if status['timeout']:
+                    # Sent but not seen (devnet delay or RPC circuit open): unproven,
+                    # settled later by the reconciliation sweeper
+                    return {
+                        'success': True,
+                        'proven': False,
+                        'commitment': None,
+                        'signature': signature,
+                        'slot': None,
+                        'timestamp': None,
+                        'last_valid_block_height': last_valid_block_height,
+                        'nonce_account': str(nonce_account.pubkey) if nonce_account is not None else None,
+                        'durable_nonce': str(recent_blockhash) if nonce_account is not None else None,
+                        'nonce_slot': nonce_account.nonce_slot if nonce_account is not None else None
+                    }
+
+                return {
+                    'success': False,
+                    'error': status['error'] or 'Transaction failed on-chain'
+                }
+
+        except CircuitOpenError as e:
+            if sent:
+                # Already sent: keep the signature (unproven) rather than send it twice
+                result = unproven_result(signature, last_valid_block_height, nonce_account, recent_blockhash, str(e))
+                result['deferred'] = True
+                return result
+            if fee_estimator is not None:
+                fee_estimator.refund(priority_fee)
+            return {
+                'success': False,
+                'deferred': True,
+                'error': str(e)
+            }
+        except Exception as e:
+            if sent:
+                # Already sent: keep the signature (unproven) rather than send it twice
+                return unproven_result(
+                    signature, last_valid_block_height, nonce_account, recent_blockhash, f'Transaction failed: {str(e)}'
+                )
+            if fee_estimator is not None:
+                fee_estimator.refund(priority_fee)
+            if 'BlockhashNotFound' in str(e):
+                self.client.invalidate_blockhash()
+            return {
+                'success': False,
+                'error': f'Transaction failed: {str(e)}'
+            }
+
+
+class AsyncRecordingPipeline:
+    """
+    Synchronous facade over AsyncVoteRecorder running on a background event loop
+    """
+
+    def __init__(self, solana_client, encryption_service, max_in_flight=ASYNC_MAX_IN_FLIGHT,
+                 max_queued=ASYNC_MAX_QUEUED, submit_timeout=ASYNC_SUBMIT_TIMEOUT):
+        """
+        Initialize pipeline
+
+        Args:
+            solana_client: SolanaVotingClient instance (shared wallets, fee payers, breaker)
+            encryption_service: VoteEncryption instance
+            max_in_flight: Transactions in flight on the event loop at once
+            max_queued: Submitted but unfinished ballots before callers are pushed back
+            submit_timeout: Seconds a caller waits for a queue slot
+        """
+        self.client = solana_client
+        self.encryption = encryption_service
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.submit_timeout = submit_timeout
+
+        # Merkle and chain head anchors stay on the synchronous recorder
+        self.sync_recorder = VoteRecorder(solana_client, encryption_service)
+
+        self._slots = threading.BoundedSemaphore(max_queued)
+        self._loop = None
+        self._thread = None
+        self._async_client = None
+        self._recorder = None
+        self._start_lock = threading.Lock()
+
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def start(self):
+        """Start the event loop thread"""
+        with self._start_lock:
+            if self._thread is not None:
+                return
+
+            ready = threading.Event()
+            self._loop = asyncio.new_event_loop()
+
+            def run():
+                asyncio.set_event_loop(self._loop)
+                self._async_client = AsyncSolanaVotingClient(self.client)
+                self._recorder = AsyncVoteRecorder(self._async_client, self.encryption, self.max_in_flight)
+                ready.set()
+                self._loop.run_forever()
+
+            self._thread = threading.Thread(target=run, name="async-vote-recorder", daemon=True)
+            self._thread.start()
+            ready.wait()
+
+        print(f"⚡ Async vote recording pipeline started ({self.max_in_flight} in flight, "
+              f"{self.max_queued} queued)")
+
+    def stop(self, timeout=5):
+        """Close the RPC session and stop the event loop"""
+        with self._start_lock:
+            if self._thread is None:
+                return
+            asyncio.run_coroutine_threadsafe(self._async_client.close(), self._loop).result(timeout)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit_ballot(self, voter_hash, ballot, halka, metadata=None):
+        """
+        Hand a ballot to the event loop without waiting for it
+
+        Returns:
+            Future: Resolves to the record_ballot_on_chain result dict
+        """
+        if self._thread is None:
+            self.start()
+
+        if not self._slots.acquire(timeout=self.submit_timeout):
+            self.rejected += 1
+            future = Future()
+            future.set_result({
+                'success': False,
+                'deferred': True,
+                'error': f'Async recording pipeline full ({self.max_queued} ballots queued)'
+            })
+            return future
+
+        self.submitted += 1
+        future = asyncio.run_coroutine_threadsafe(
+            self._recorder.record_ballot_on_chain(voter_hash, ballot, halka, metadata),
+            self._loop
+        )
+        future.add_done_callback(self._release_slot)
+        return future
+
+    def _release_slot(self, future):
+        self.completed += 1
+        self._slots.release()
+
+    def record_ballot_on_chain(self, voter_hash, ballot, halka, metadata=None):
+        """
+        Record a ballot and wait for the result (VoteRecorder compatible)
+
+        Returns:
+            dict: Same structure as VoteRecorder.record_ballot_on_chain
+        """
+        return self.submit_ballot(voter_hash, ballot, halka, metadata).result()
+
+    def record_encrypted_vote_on_chain(self, voter_hash, encrypted_vote, position, halka, metadata=None):
+        """Record one encrypted vote as a single-position ballot"""
+        result = self.record_ballot_on_chain(voter_hash, {position: encrypted_vote}, halka, metadata)
+        if not result['success']:
+            return result
+
+        vote = result['votes'][position]
+        return {
+            'success': True,
+            'signature': result['signature'],
+            'slot': result['slot'],
+            'timestamp': result['timestamp'],
+            'proven': result['proven'],
+            'commitment': result['commitment'],
+            'last_valid_block_height': result['last_valid_block_height'],
+            'nonce_account': result['nonce_account'],
+            'durable_nonce': result['durable_nonce'],
+            'nonce_slot': result['nonce_slot'],
+            'voter_hash': voter_hash,
+            'encrypted_data': vote['encrypted_data'],
+            'receipt': vote['receipt'],
+            'error': None
+        }
+
+    def anchor_merkle_batch(self, votes, metadata=None):
+        return self.sync_recorder.anchor_merkle_batch(votes, metadata)
+
+    def anchor_chain_head(self, head_hash, length, last_vote_id):
+        return self.sync_recorder.anchor_chain_head(head_hash, length, last_vote_id)
+
+    def verify_vote_on_chain(self, transaction_signature):
+        return self.sync_recorder.verify_vote_on_chain(transaction_signature)
+
+    def snapshot(self):
+        """
+        Get pipeline statistics for monitoring
+
+        Returns:
+            dict: Queue usage and async client counters
+        """
+        return {
+            'running': self._thread is not None,
+            'max_in_flight': self.max_in_flight,
+            'max_queued': self.max_queued,
+            'queued': self.submitted - self.completed,
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'rejected': self.rejected,
+            'client': self._async_client.snapshot() if self._async_client is not None else None
+        }
+
+
+# Shared pipeline instance
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+def get_async_recording_pipeline():
+    """
+    Get the shared async recording pipeline bound to the shared Solana client
+    and encryption service, starting its event loop on first use
+
+    Returns:
+        AsyncRecordingPipeline: Pipeline instance
+    """
+    from .solana_client import get_solana_client
+    from .encryption import get_encryption_service
+
+    global _pipeline
+
+    solana_client = get_solana_client()
+    encryption_service = get_encryption_service()
+
+    with _pipeline_lock:
+        pipeline = _pipeline
+        if pipeline is None or pipeline.client is not solana_client or pipeline.encryption is not encryption_service:
+            if pipeline is not None:
+                pipeline.stop()
+            pipeline = AsyncRecordingPipeline(solana_client, encryption_service)
+            pipeline.start()
+            _pipeline = pipeline
+
+    return pipeline
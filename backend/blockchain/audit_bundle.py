@@ -0,0 +1,601 @@
+"""
+Audit Bundle Module
+Self-contained export of the election record that observers verify
+offline, without admin access, database or RPC
+
+A bundle is a gzip-compressed tar stream:
+
+    votes-00000.ndjson ...  vote records + the raw transactions they reference
+    anchors.ndjson          Merkle anchors with their anchoring transactions
+    checkpoints.ndjson      vote hash chain checkpoints (+ anchor transactions)
+    manifest.json           format, election, signer set, SHA-256 of every part
+
+Parts are independent, so the offline verifier checks them on all cores:
+transaction signatures (ed25519), fee payer in the signer set, memo
+contents against each vote, Merkle inclusion proofs, receipts and the
+hash chain (stitched across parts).
+"""
+
+import base64
+import hashlib
+import io
+import json
+import os
+import tarfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from solders.transaction import VersionedTransaction  # type: ignore
+from .config import AUDIT_BUNDLE_PART_SIZE, AUDIT_BUNDLE_FETCH_WORKERS, ELECTION_ID
+from .encryption import format_vote_receipt
+from .memo_codec import decode_memo
+from .merkle import verify_proof, vote_leaf_data
+
+BUNDLE_FORMAT = "votonomy-audit-bundle"
+BUNDLE_VERSION = 1
+MEMO_PROGRAM_ID = 'MemoSq4gqABAXKb96qnH8TysNcWxMyWCqXgDLGmfcHr'
+GENESIS_HASH = '0' * 64  # Same genesis as hash_chain (kept local so verification needs no database)
+MAX_REPORTED_FAILURES = 100
+
+
+def _ndjson(records):
+    return b''.join(json.dumps(record, separators=(',', ':'), default=str).encode('utf-8') + b'\n'
+                    for record in records)
+
+
+def _add_member(tar, name, data):
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    info.mtime = int(time.time())
+    tar.addfile(info, io.BytesIO(data))
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+class AuditBundleExporter:
+    """
+    Streams the vote table and referenced transactions into a bundle
+    """
+
+    def __init__(self, solana_client, part_size=AUDIT_BUNDLE_PART_SIZE,
+                 fetch_workers=AUDIT_BUNDLE_FETCH_WORKERS, include_candidates=False):
+        """
+        Initialize exporter
+
+        Args:
+            solana_client: SolanaVotingClient (transactions are read through its cache)
+            part_size: Votes per bundle part
+            fetch_workers: Concurrent transaction lookups (shares the integrity rate limit)
+            include_candidates: Export candidate_id so the hash chain can be
+                                recomputed (links voter hashes to choices, only
+                                for trusted auditors)
+        """
+        self.client = solana_client
+        self.part_size = part_size
+        self.fetch_workers = fetch_workers
+        self.include_candidates = include_candidates
+
+    def _fetch_transaction(self, signature):
+        """Raw transaction bytes and status of one signature"""
+        from solders.signature import Signature  # type: ignore
+        from .integrity_engine import get_rate_limiter
+
+        get_rate_limiter().acquire()
+        response = self.client._get_transaction_cached(
+            Signature.from_string(signature),
+            "base64",
+            max_supported_transaction_version=0
+        )
+        if not response.value:
+            return None
+
+        tx_value = response.value
+        meta = tx_value.transaction.meta
+        return {
+            'kind': 'tx',
+            'signature': signature,
+            'slot': tx_value.slot,
+            'block_time': tx_value.block_time,
+            'err': str(meta.err) if meta is not None and meta.err is not None else None,
+            'tx': base64.b64encode(bytes(tx_value.transaction.transaction)).decode()
+        }
+
+    def _fetch_transactions(self, signatures):
+        signatures = sorted(set(sig for sig in signatures if sig))
+        if not signatures:
+            return []
+
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as pool:
+            results = list(pool.map(self._safe_fetch, signatures))
+        return [record for record in results if record is not None]
+
+    def _safe_fetch(self, signature):
+        try:
+            return self._fetch_transaction(signature)
+        except Exception as e:
+            print(f"⚠️  Could not fetch transaction {signature[:16]}...: {str(e)}")
+            return None
+
+    def export(self, fileobj, on_progress=None):
+        """
+        Write a bundle (requires app context)
+
+        Args:
+            fileobj: Binary file object (written sequentially, may be a pipe)
+            on_progress: Optional callback(votes_exported)
+
+        Returns:
+            dict: The manifest
+        """
+        from models import Vote, MerkleAnchor, VoteChainCheckpoint, db
+
+        started = time.time()
+        manifest = {
+            'format': BUNDLE_FORMAT,
+            'version': BUNDLE_VERSION,
+            'election_id': ELECTION_ID,
+            'created_at': datetime.utcnow().isoformat(),
+            'memo_program': MEMO_PROGRAM_ID,
+            'signers': [str(pubkey) for pubkey in self.client.get_signer_pubkeys()],
+            'include_candidates': self.include_candidates,
+            'parts': [],
+            'files': {}
+        }
+
+        with tarfile.open(fileobj=fileobj, mode='w|gz') as tar:
+            # Votes, keyset-paginated by id
+            cursor = 0
+            chain_prev = GENESIS_HASH
+            total_votes = 0
+            total_transactions = 0
+
+            while True:
+                votes = Vote.query.filter(Vote.id > cursor).order_by(Vote.id).limit(self.part_size).all()
+                if not votes:
+                    break
+                cursor = votes[-1].id
+
+                records = [self._vote_record(vote) for vote in votes]
+                transactions = self._fetch_transactions(
+                    vote.blockchain_tx_signature for vote in votes
+                    if vote.is_verified_on_chain and not vote.merkle_anchor_id
+                )
+
+                name = f"votes-{len(manifest['parts']):05d}.ndjson"
+                header = {
+                    'kind': 'part',
+                    'index': len(manifest['parts']),
+                    'chain_prev': chain_prev
+                }
+                data = _ndjson([header] + records + transactions)
+                _add_member(tar, name, data)
+
+                manifest['parts'].append({
+                    'name': name,
+                    'sha256': hashlib.sha256(data).hexdigest(),
+                    'votes': len(records),
+                    'transactions': len(transactions),
+                    'first_vote_id': votes[0].id,
+                    'last_vote_id': votes[-1].id
+                })
+
+                for vote in votes:
+                    if vote.chain_hash:
+                        chain_prev = vote.chain_hash
+
+                # Only the current part stays in memory
+                db.session.expunge_all()
+
+                total_votes += len(records)
+                total_transactions += len(transactions)
+                if on_progress is not None:
+                    on_progress(total_votes)
+
+            # Merkle anchors and their anchoring transactions
+            anchors = MerkleAnchor.query.order_by(MerkleAnchor.id).all()
+            anchor_records = [{
+                'kind': 'anchor',
+                'id': anchor.id,
+                'merkle_root': anchor.merkle_root,
+                'leaf_count': anchor.leaf_count,
+                'signature': anchor.tx_signature,
+                'slot': anchor.slot
+            } for anchor in anchors]
+            anchor_transactions = self._fetch_transactions(anchor.tx_signature for anchor in anchors)
+            self._write_file(tar, manifest, 'anchors.ndjson', anchor_records + anchor_transactions)
+
+            # Hash chain checkpoints
+            checkpoints = VoteChainCheckpoint.query.order_by(VoteChainCheckpoint.id).all()
+            checkpoint_records = [{
+                'kind': 'chain_checkpoint',
+                'id': checkpoint.id,
+                'last_vote_id': checkpoint.last_vote_id,
+                'head_hash': checkpoint.head_hash,
+                'length': checkpoint.length,
+                'signature': checkpoint.anchor_signature,
+                'slot': checkpoint.anchor_slot
+            } for checkpoint in checkpoints]
+            checkpoint_transactions = self._fetch_transactions(
+                checkpoint.anchor_signature for checkpoint in checkpoints
+            )
+            self._write_file(tar, manifest, 'checkpoints.ndjson', checkpoint_records + checkpoint_transactions)
+
+            manifest['totals'] = {
+                'votes': total_votes,
+                'transactions': total_transactions + len(anchor_transactions) + len(checkpoint_transactions),
+                'merkle_anchors': len(anchors),
+                'chain_checkpoints': len(checkpoints)
+            }
+            manifest['export_seconds'] = round(time.time() - started, 2)
+
+            _add_member(tar, 'manifest.json', json.dumps(manifest, indent=2).encode('utf-8'))
+
+        return manifest
+
+    def _write_file(self, tar, manifest, name, records):
+        data = _ndjson(records)
+        _add_member(tar, name, data)
+        manifest['files'][name] = hashlib.sha256(data).hexdigest()
+
+    def _vote_record(self, vote):
+        record = {
+            'kind': 'vote',
+            'id': vote.id,
+            'position': vote.position,
+            'voter_hash': vote.voter_id_hash,
+            'encrypted_vote': vote.encrypted_vote_data,
+            'on_chain': bool(vote.is_verified_on_chain),
+            'signature': vote.blockchain_tx_signature,
+            'slot': vote.blockchain_slot,
+            'receipt': vote.verification_receipt,
+            'merkle_anchor_id': vote.merkle_anchor_id,
+            'merkle_leaf_index': vote.merkle_leaf_index,
+            'merkle_proof': json.loads(vote.merkle_proof) if vote.merkle_proof else None,
+            'chain_hash': vote.chain_hash
+        }
+        if self.include_candidates:
+            record['candidate_id'] = vote.candidate_id
+        return record
+
+
+# ---------------------------------------------------------------------------
+# Offline verification
+# ---------------------------------------------------------------------------
+
+def verify_transaction_record(record, signers):
+    """
+    Check a raw transaction offline and return its memo
+
+    Args:
+        record: 'tx' record from a bundle
+        signers: Set of allowed fee-payer pubkey strings
+
+    Returns:
+        tuple: (memo dict or None, error string or None)
+    """
+    try:
+        transaction = VersionedTransaction.from_bytes(base64.b64decode(record['tx']))
+    except Exception as e:
+        return None, f"Unreadable transaction bytes: {str(e)}"
+
+    if str(transaction.signatures[0]) != record['signature']:
+        return None, "Transaction bytes do not match the signature"
+    if not all(transaction.verify_with_results()):
+        return None, "Invalid transaction signature"
+    if record.get('err'):
+        return None, f"Transaction failed on chain: {record['err']}"
+
+    account_keys = transaction.message.account_keys
+    if str(account_keys[0]) not in signers:
+        return None, f"Fee payer {str(account_keys[0])[:8]}... is not an election signer"
+
+    for instruction in transaction.message.instructions:
+        if str(account_keys[instruction.program_id_index]) == MEMO_PROGRAM_ID:
+            memo_data = decode_memo(bytes(instruction.data).decode('utf-8', errors='replace'))
+            if memo_data is not None:
+                return memo_data, None
+
+    return None, "No election memo in transaction"
+
+
+def _chain_hash(prev_hash, record):
+    data = json.dumps(
+        [prev_hash, record['id'], record['candidate_id'], record['position'],
+         record['voter_hash'], record['encrypted_vote']],
+        separators=(',', ':')
+    )
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+# Per-process state of verification workers
+_worker_state = {}
+
+
+def _init_worker(signers, anchors, checkpoint_vote_ids):
+    _worker_state['signers'] = set(signers)
+    _worker_state['anchors'] = anchors
+    _worker_state['checkpoint_vote_ids'] = set(checkpoint_vote_ids)
+
+
+def _verify_part(data):
+    """
+    Verify one votes part (runs in a worker process)
+
+    Returns:
+        dict: Counters, failures, chain endpoints and checkpoint hashes
+    """
+    signers = _worker_state['signers']
+    anchors = _worker_state['anchors']
+    checkpoint_vote_ids = _worker_state['checkpoint_vote_ids']
+
+    header = None
+    votes = []
+    memos = {}
+    tx_errors = {}
+
+    for line in data.splitlines():
+        record = json.loads(line)
+        kind = record.get('kind')
+        if kind == 'vote':
+            votes.append(record)
+        elif kind == 'tx':
+            memo_data, error = verify_transaction_record(record, signers)
+            if error:
+                tx_errors[record['signature']] = error
+            else:
+                memos[record['signature']] = memo_data
+        elif kind == 'part':
+            header = record
+
+    result = {
+        'index': header['index'] if header else None,
+        'chain_prev': header['chain_prev'] if header else None,
+        'chain_last': None,
+        'votes': len(votes),
+        'on_chain': 0,
+        'verified': 0,
+        'transactions_verified': len(memos),
+        'failures': [],
+        'failure_count': 0,
+        'chain_pending': 0,
+        'checkpoint_hashes': {}
+    }
+
+    def fail(vote, issue):
+        result['failure_count'] += 1
+        if len(result['failures']) < MAX_REPORTED_FAILURES:
+            result['failures'].append({'vote_id': vote['id'], 'issue': issue})
+
+    chain_hash = result['chain_prev']
+
+    for vote in votes:
+        # Hash chain (recomputed when candidate ids were exported)
+        if vote.get('chain_hash') is None:
+            result['chain_pending'] += 1
+        else:
+            # Each row is checked against the stored hash before it, so every edited row is reported
+            if 'candidate_id' in vote and _chain_hash(chain_hash, vote) != vote['chain_hash']:
+                fail(vote, "Hash chain mismatch")
+            chain_hash = vote['chain_hash']
+            if vote['id'] in checkpoint_vote_ids:
+                result['checkpoint_hashes'][vote['id']] = vote['chain_hash']
+
+        if not vote['on_chain']:
+            continue
+        result['on_chain'] += 1
+
+        issue = _check_vote(vote, memos, tx_errors, anchors)
+        if issue:
+            fail(vote, issue)
+        else:
+            result['verified'] += 1
+
+    result['chain_last'] = chain_hash
+    return result
+
+
+def _check_vote(vote, memos, tx_errors, anchors):
+    """Problem with one on-chain vote, or None if it verifies"""
+    signature = vote.get('signature')
+    if not signature:
+        return "No transaction signature"
+
+    if vote.get('merkle_anchor_id'):
+        anchor = anchors.get(vote['merkle_anchor_id'])
+        if anchor is None:
+            return "Merkle anchor missing from bundle"
+        if anchor['error']:
+            return f"Merkle anchor not verified: {anchor['error']}"
+        if not verify_proof(vote_leaf_data(vote['voter_hash'], vote['position'], vote['encrypted_vote']),
+                            vote.get('merkle_proof') or [], anchor['merkle_root']):
+            return "Merkle inclusion proof does not match the anchored root"
+        expected_receipt = format_vote_receipt(signature, vote['voter_hash'], vote['position'],
+                                               anchor['merkle_root'], vote.get('merkle_leaf_index'))
+    else:
+        if signature in tx_errors:
+            return tx_errors[signature]
+        memo_data = memos.get(signature)
+        if memo_data is None:
+            return "Transaction missing from bundle"
+
+        if memo_data.get('type') == 'BALLOT':
+            on_chain = memo_data.get('votes', {}).get(vote['position'])
+        else:
+            on_chain = memo_data.get('encrypted_vote') if memo_data.get('position') == vote['position'] else None
+
+        if on_chain is None:
+            return "Position not recorded in transaction memo"
+        if on_chain != vote['encrypted_vote']:
+            return "Encrypted vote differs from the on-chain memo"
+        if memo_data.get('voter_hash') != vote['voter_hash']:
+            return "Voter hash differs from the on-chain memo"
+        expected_receipt = format_vote_receipt(signature, vote['voter_hash'], vote['position'])
+
+    # Single-vote receipts carry no position suffix
+    if vote.get('receipt') and vote['receipt'] not in (
+            expected_receipt, format_vote_receipt(signature, vote['voter_hash'])):
+        return "Receipt does not match the vote"
+    return None
+
+
+def _load_anchor_file(data, signers):
+    """Verify anchor transactions; returns {anchor_id: {'merkle_root', 'error'}}"""
+    records = [json.loads(line) for line in data.splitlines()]
+    memos = {}
+    for record in records:
+        if record.get('kind') == 'tx':
+            memos[record['signature']] = verify_transaction_record(record, signers)
+
+    anchors = {}
+    for record in records:
+        if record.get('kind') != 'anchor':
+            continue
+        memo_data, error = memos.get(record['signature'], (None, "Anchor transaction missing from bundle"))
+        if error is None and (memo_data.get('type') != 'MERKLE_ROOT' or memo_data.get('root') != record['merkle_root']):
+            error = "Anchored root differs from the on-chain memo"
+        anchors[record['id']] = {'merkle_root': record['merkle_root'], 'error': error}
+    return anchors
+
+
+def _load_checkpoint_file(data, signers):
+    """Checkpoints with the result of verifying their anchoring transactions"""
+    records = [json.loads(line) for line in data.splitlines()]
+    memos = {}
+    for record in records:
+        if record.get('kind') == 'tx':
+            memos[record['signature']] = verify_transaction_record(record, signers)
+
+    checkpoints = []
+    for record in records:
+        if record.get('kind') != 'chain_checkpoint':
+            continue
+        record['anchor_error'] = None
+        if record.get('signature'):
+            memo_data, error = memos.get(record['signature'], (None, "Checkpoint transaction missing from bundle"))
+            if error is None and (memo_data.get('type') != 'CHAIN_HEAD' or memo_data.get('head') != record['head_hash']
+                                  or memo_data.get('last_vote_id') != record['last_vote_id']):
+                error = "Anchored chain head differs from the checkpoint"
+            record['anchor_error'] = error
+        checkpoints.append(record)
+    return checkpoints
+
+
+def verify_audit_bundle(path, workers=None, on_progress=None):
+    """
+    Verify a bundle offline on multiple cores
+
+    Args:
+        path: Bundle file path
+        workers: Worker processes (defaults to the CPU count)
+        on_progress: Optional callback(parts_done, parts_total)
+
+    Returns:
+        dict: Verification report
+    """
+    started = time.time()
+    workers = workers or os.cpu_count() or 1
+
+    # First pass: manifest, anchors and checkpoints (small) plus member hashes
+    manifest = None
+    small_files = {}
+    digests = {}
+    with tarfile.open(path, mode='r|gz') as tar:
+        for member in tar:
+            data = tar.extractfile(member).read()
+            digests[member.name] = hashlib.sha256(data).hexdigest()
+            if member.name == 'manifest.json':
+                manifest = json.loads(data)
+            elif member.name in ('anchors.ndjson', 'checkpoints.ndjson'):
+                small_files[member.name] = data
+
+    if manifest is None or manifest.get('format') != BUNDLE_FORMAT:
+        return {'status': 'FAILED', 'error': 'Not an audit bundle (manifest missing)'}
+    if manifest.get('version') != BUNDLE_VERSION:
+        return {'status': 'FAILED', 'error': f"Unsupported bundle version {manifest.get('version')}"}
+
+    integrity_errors = []
+    expected = {part['name']: part['sha256'] for part in manifest['parts']}
+    expected.update(manifest.get('files', {}))
+    for name, digest in expected.items():
+        if digests.get(name) != digest:
+            integrity_errors.append(f"{name}: {'missing' if name not in digests else 'SHA-256 mismatch'}")
+
+    signers = set(manifest['signers'])
+    anchors = _load_anchor_file(small_files.get('anchors.ndjson', b''), signers)
+    checkpoints = _load_checkpoint_file(small_files.get('checkpoints.ndjson', b''), signers)
+
+    # Second pass: votes parts in parallel
+    part_results = []
+    parts_total = len(manifest['parts'])
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(list(signers), anchors, [c['last_vote_id'] for c in checkpoints])
+    ) as pool:
+        futures = []
+        with tarfile.open(path, mode='r|gz') as tar:
+            for member in tar:
+                if member.name in expected and member.name.startswith('votes-'):
+                    futures.append(pool.submit(_verify_part, tar.extractfile(member).read()))
+
+        for future in futures:
+            part_results.append(future.result())
+            if on_progress is not None:
+                on_progress(len(part_results), parts_total)
+
+    part_results.sort(key=lambda result: result['index'])
+
+    failures = []
+    failure_count = 0
+    for result in part_results:
+        failure_count += result['failure_count']
+        failures.extend(result['failures'][:MAX_REPORTED_FAILURES - len(failures)])
+
+    # Hash chain: parts must join up, and every checkpoint must match its row
+    chain_errors = []
+    for previous, current in zip(part_results, part_results[1:]):
+        if current['chain_prev'] != previous['chain_last']:
+            chain_errors.append(f"Part {current['index']} does not continue the chain of part {previous['index']}")
+
+    checkpoint_hashes = {}
+    for result in part_results:
+        checkpoint_hashes.update(result['checkpoint_hashes'])
+
+    checkpoints_verified = 0
+    for checkpoint in checkpoints:
+        stored = checkpoint_hashes.get(checkpoint['last_vote_id'])
+        if stored is None:
+            chain_errors.append(f"Checkpoint #{checkpoint['id']}: vote {checkpoint['last_vote_id']} missing")
+        elif stored != checkpoint['head_hash']:
+            chain_errors.append(f"Checkpoint #{checkpoint['id']}: chain rewritten since checkpoint")
+        elif checkpoint['anchor_error']:
+            chain_errors.append(f"Checkpoint #{checkpoint['id']}: {checkpoint['anchor_error']}")
+        else:
+            checkpoints_verified += 1
+
+    anchor_errors = [f"Anchor #{anchor_id}: {anchor['error']}" for anchor_id, anchor in anchors.items() if anchor['error']]
+
+    ok = not (integrity_errors or failure_count or chain_errors or anchor_errors)
+    return {
+        'status': 'VERIFIED' if ok else 'FAILED',
+        'election_id': manifest['election_id'],
+        'created_at': manifest['created_at'],
+        'signers': manifest['signers'],
+        'votes': sum(result['votes'] for result in part_results),
+        'on_chain_votes': sum(result['on_chain'] for result in part_results),
+        'verified_votes': sum(result['verified'] for result in part_results),
+        'transactions_verified': sum(result['transactions_verified'] for result in part_results),
+        'merkle_anchors': len(anchors),
+        'chain_checkpoints_verified': checkpoints_verified,
+        'chain_recomputed': manifest.get('include_candidates', False),
+        'chain_pending': sum(result['chain_pending'] for result in part_results),
+        'failure_count': failure_count,
+        'failures': failures,
+        'integrity_errors': integrity_errors,
+        'anchor_errors': anchor_errors,
+        'chain_errors': chain_errors,
+        'workers': workers,
+        'elapsed': round(time.time() - started, 2)
+    }
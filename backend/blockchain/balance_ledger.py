@@ -0,0 +1,216 @@
+"""
+Fee-Payer Balance Ledger
+Tracks the fee payer's lamport balance locally so vote submission never
+waits on get_balance or an airdrop
+
+Each submitted transaction debits its known fee from the local estimate.
+A background timer reconciles the estimate with the chain, and crossing
+the low watermark triggers a refill (devnet airdrop) or an alert in a
+separate thread.
+"""
+
+import threading
+import time
+from .config import (
+    LAMPORTS_PER_SIGNATURE,
+    MIN_FEE_BALANCE_SOL,
+    LOW_BALANCE_WATERMARK_SOL,
+    BALANCE_RECONCILE_INTERVAL,
+    AUTO_REFILL_AMOUNT_SOL,
+)
+
+LAMPORTS_PER_SOL = 1_000_000_000
+
+
+class FeePayerLedger:
+    """
+    Local lamport balance estimate for one fee-payer wallet
+    """
+
+    def __init__(self, solana_client, keypair=None, min_balance_sol=MIN_FEE_BALANCE_SOL,
+                 low_watermark_sol=LOW_BALANCE_WATERMARK_SOL,
+                 reconcile_interval=BALANCE_RECONCILE_INTERVAL,
+                 refill_amount_sol=AUTO_REFILL_AMOUNT_SOL, on_low_balance=None):
+        """
+        Initialize ledger
+
+        Args:
+            solana_client: SolanaVotingClient instance
+            keypair: Fee-payer keypair (defaults to the client's admin keypair)
+            min_balance_sol: Below this, new transactions are refused
+            low_watermark_sol: Below this, a refill or alert is triggered
+            reconcile_interval: Seconds between balance reconciliations
+            refill_amount_sol: Airdrop amount on devnet (0 disables refills)
+            on_low_balance: Optional callback(pubkey, lamports) for alerts
+        """
+        self.client = solana_client
+        self.keypair = keypair or solana_client.admin_keypair
+        self.min_lamports = int(min_balance_sol * LAMPORTS_PER_SOL)
+        self.low_watermark_lamports = int(low_watermark_sol * LAMPORTS_PER_SOL)
+        self.reconcile_interval = reconcile_interval
+        self.refill_amount_sol = refill_amount_sol
+        self.on_low_balance = on_low_balance
+
+        self.lamports = None  # Unknown until first reconciliation
+        self.last_reconciled = None
+        self.debited_since_reconcile = 0
+        self.transactions_debited = 0
+
+        self._lock = threading.Lock()
+        self._refill_in_progress = False
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def pubkey(self):
+        return self.keypair.pubkey()
+
+    def start(self):
+        """Start background reconciliation timer"""
+        if self._thread is not None:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._reconcile_loop,
+            name=f"balance-ledger-{str(self.pubkey)[:8]}",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop background reconciliation"""
+        self._stop_event.set()
+        self._thread = None
+
+    def _reconcile_loop(self):
+        while not self._stop_event.is_set():
+            self.reconcile()
+            self._stop_event.wait(self.reconcile_interval)
+
+    def reconcile(self):
+        """
+        Replace the local estimate with the on-chain balance
+
+        Returns:
+            bool: True if the balance is above the minimum
+        """
+        try:
+            response = self.client.client.get_balance(self.pubkey)
+            lamports = response.value
+        except Exception as e:
+            print(f"⚠️  Balance reconciliation failed: {str(e)}")
+            return self.lamports is not None and self.lamports >= self.min_lamports
+
+        with self._lock:
+            if self.lamports is not None:
+                drift = lamports - self.lamports
+                if abs(drift) > LAMPORTS_PER_SIGNATURE * 10:
+                    print(f"ℹ️  Fee-payer balance drift: {drift} lamports since last reconcile")
+            self.lamports = lamports
+            self.last_reconciled = time.time()
+            self.debited_since_reconcile = 0
+
+        self._check_watermark()
+        return lamports >= self.min_lamports
+
+    def can_afford(self, signatures=1, lamports=None):
+        """
+        Check if the fee payer can pay for a transaction (no RPC after the first call)
+
+        Args:
+            signatures: Number of signatures in the transaction
+            lamports: Exact fee (e.g. including a priority fee), defaults to
+                      signatures * LAMPORTS_PER_SIGNATURE
+
+        Returns:
+            bool: True if the estimated balance covers the fee and the minimum
+        """
+        if self.lamports is None:
+            # First use before the background timer ran
+            self.reconcile()
+            if self.lamports is None:
+                return False
+
+        fee = lamports if lamports is not None else signatures * LAMPORTS_PER_SIGNATURE
+        return self.lamports - fee >= self.min_lamports
+
+    def debit(self, lamports=None, signatures=1):
+        """
+        Record a submitted transaction's fee locally
+
+        Args:
+            lamports: Exact fee, defaults to signatures * LAMPORTS_PER_SIGNATURE
+            signatures: Number of signatures in the transaction
+        """
+        if lamports is None:
+            lamports = signatures * LAMPORTS_PER_SIGNATURE
+
+        with self._lock:
+            if self.lamports is not None:
+                self.lamports -= lamports
+            self.debited_since_reconcile += lamports
+            self.transactions_debited += 1
+
+        self._check_watermark()
+
+    def _check_watermark(self):
+        """Start an asynchronous refill/alert if below the low watermark"""
+        with self._lock:
+            if self.lamports is None or self.lamports >= self.low_watermark_lamports:
+                return
+            if self._refill_in_progress:
+                return
+            self._refill_in_progress = True
+            lamports = self.lamports
+
+        threading.Thread(
+            target=self._refill,
+            args=(lamports,),
+            name="balance-refill",
+            daemon=True
+        ).start()
+
+    def _refill(self, lamports):
+        """Refill (devnet airdrop) or alert, off the vote submission path"""
+        try:
+            print(f"⚠️  Low fee-payer balance: {lamports / LAMPORTS_PER_SOL:.4f} SOL ({self.pubkey})")
+
+            if self.on_low_balance is not None:
+                self.on_low_balance(self.pubkey, lamports)
+
+            from .config import config
+            if self.refill_amount_sol and config.is_devnet():
+                response = self.client.client.request_airdrop(
+                    self.pubkey,
+                    int(self.refill_amount_sol * LAMPORTS_PER_SOL)
+                )
+                print(f"🪂 Airdrop requested for fee payer: {response.value}")
+                # Give the airdrop time to land, then pick up the new balance
+                self._stop_event.wait(5)
+                self.reconcile()
+            else:
+                print(f"   Top up the fee-payer wallet manually: {self.pubkey}")
+        except Exception as e:
+            print(f"❌ Fee-payer refill failed: {str(e)}")
+        finally:
+            with self._lock:
+                self._refill_in_progress = False
+
+    def snapshot(self):
+        """
+        Get ledger state for monitoring
+
+        Returns:
+            dict: Balance estimate and counters
+        """
+        with self._lock:
+            return {
+                'pubkey': str(self.pubkey),
+                'estimated_lamports': self.lamports,
+                'estimated_sol': self.lamports / LAMPORTS_PER_SOL if self.lamports is not None else None,
+                'last_reconciled': self.last_reconciled,
+                'debited_since_reconcile': self.debited_since_reconcile,
+                'transactions_debited': self.transactions_debited,
+                'refill_in_progress': self._refill_in_progress
+            }
@@ -0,0 +1,135 @@
+"""
+Blockhash Cache
+Shares one recent blockhash between all vote submitters
+
+A blockhash stays valid for ~150 blocks (60-90 seconds), so a background
+thread refreshes it every few seconds and transactions are built from the
+cached value instead of calling get_latest_blockhash each time.
+"""
+
+import threading
+import time
+from .config import BLOCKHASH_REFRESH_INTERVAL, BLOCKHASH_MAX_AGE
+
+
+class BlockhashProvider:
+    """
+    Cached (blockhash, last_valid_block_height) with background refresh
+    """
+
+    def __init__(self, solana_client, refresh_interval=BLOCKHASH_REFRESH_INTERVAL,
+                 max_age=BLOCKHASH_MAX_AGE):
+        """
+        Initialize provider
+
+        Args:
+            solana_client: SolanaVotingClient instance
+            refresh_interval: Seconds between background refreshes
+            max_age: Cached blockhash older than this is fetched synchronously
+        """
+        self.client = solana_client
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+
+        self._blockhash = None
+        self._last_valid_block_height = None
+        self._fetched_at = None
+
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.errors = 0
+
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start background refresh thread"""
+        if self._thread is not None:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._refresh_loop,
+            name="blockhash-refresh",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop background refresh"""
+        self._stop_event.set()
+        self._thread = None
+
+    def _refresh_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"⚠️  Blockhash refresh failed: {str(e)}")
+            self._stop_event.wait(self.refresh_interval)
+
+    def refresh(self):
+        """
+        Fetch latest blockhash from RPC and cache it
+
+        Returns:
+            tuple: (blockhash, last_valid_block_height)
+        """
+        with self._fetch_lock:
+            try:
+                response = self.client.client.get_latest_blockhash()
+            except Exception:
+                with self._lock:
+                    self.errors += 1
+                raise
+
+            with self._lock:
+                self._blockhash = response.value.blockhash
+                self._last_valid_block_height = response.value.last_valid_block_height
+                self._fetched_at = time.time()
+                self.refreshes += 1
+                return self._blockhash, self._last_valid_block_height
+
+    def get(self):
+        """
+        Get a recent blockhash, from cache when fresh enough
+
+        Returns:
+            tuple: (blockhash, last_valid_block_height)
+        """
+        with self._lock:
+            if self._blockhash is not None and time.time() - self._fetched_at < self.max_age:
+                self.hits += 1
+                return self._blockhash, self._last_valid_block_height
+            self.misses += 1
+
+        return self.refresh()
+
+    def invalidate(self):
+        """Drop the cached blockhash (e.g. after a BlockhashNotFound error)"""
+        with self._lock:
+            self._blockhash = None
+            self._fetched_at = None
+
+    def snapshot(self):
+        """
+        Get cache statistics for monitoring
+
+        Returns:
+            dict: Hit/miss counters and age of the cached blockhash
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'blockhash': str(self._blockhash) if self._blockhash else None,
+                'last_valid_block_height': self._last_valid_block_height,
+                'age_seconds': round(time.time() - self._fetched_at, 2) if self._fetched_at else None,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total * 100, 2) if total else 0,
+                'refreshes': self.refreshes,
+                'errors': self.errors
+            }
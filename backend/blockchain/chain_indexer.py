@@ -0,0 +1,425 @@
+"""
+Chain Indexer
+Mirrors election memos from the fee payers' transaction histories into
+the local chain_memo table
+
+For every key of the fee-payer pool the indexer pages through
+get_signatures_for_address (newest first, down to the last signature it
+fully indexed), decodes the VOTE, BALLOT and MERKLE_ROOT memos carried in
+each signature entry, and stores them keyed by signature, voter_hash,
+halka and position. A signer's history also lists third-party
+transactions that merely reference it, so a memo is only mirrored once
+the transaction's fee payer is confirmed to be in the signer set. After
+downtime it simply catches up from its checkpoint. The verifier reads this mirror before falling back to
+per-signature RPC calls.
+"""
+
+import re
+import threading
+from solders.signature import Signature  # type: ignore
+from models import ChainMemo, ChainIndexerState, db
+from .memo_codec import decode_memo
+from .config import INDEXER_PAGE_SIZE, INDEXER_POLL_INTERVAL, USE_CHAIN_MIRROR
+
+MEMO_PROGRAM_ID = 'MemoSq4gqABAXKb96qnH8TysNcWxMyWCqXgDLGmfcHr'
+
+# RPC signature entries carry memos as "[<byte length>] <memo text>"
+MEMO_FIELD_PATTERN = re.compile(r'^\[(\d+)\] (.*)$', re.DOTALL)
+
+
+def parse_memo_field(memo_field):
+    """
+    Decode the memo field of a get_signatures_for_address entry
+
+    Args:
+        memo_field: "[len] text" string or None
+
+    Returns:
+        dict: Parsed memo JSON, or None if absent/not an election memo
+    """
+    if not memo_field:
+        return None
+
+    match = MEMO_FIELD_PATTERN.match(memo_field)
+    memo_text = match.group(2) if match else memo_field
+
+    return decode_memo(memo_text)
+
+
+def memo_to_rows(memo_data, signature, slot=None, block_time=None):
+    """
+    Convert a decoded memo into ChainMemo rows
+
+    Args:
+        memo_data: Parsed memo dict
+        signature: Transaction signature string
+        slot: Slot of the transaction
+        block_time: Block time (unix seconds)
+
+    Returns:
+        list: ChainMemo instances (empty for unknown memo types)
+    """
+    common = {
+        'signature': signature,
+        'slot': slot,
+        'block_time': block_time,
+        'memo_type': memo_data.get('type'),
+        'election_id': memo_data.get('election_id'),
+        'memo_version': memo_data.get('version'),
+        'memo_timestamp': memo_data.get('timestamp')
+    }
+
+    memo_type = memo_data.get('type')
+
+    if memo_type == 'VOTE':
+        return [ChainMemo(
+            voter_hash=memo_data.get('voter_hash'),
+            halka=memo_data.get('halka'),
+            position=memo_data.get('position'),
+            encrypted_vote=memo_data.get('encrypted_vote'),
+            **common
+        )]
+
+    if memo_type == 'BALLOT':
+        return [
+            ChainMemo(
+                voter_hash=memo_data.get('voter_hash'),
+                halka=memo_data.get('halka'),
+                position=position,
+                encrypted_vote=encrypted_vote,
+                **common
+            )
+            for position, encrypted_vote in memo_data.get('votes', {}).items()
+        ]
+
+    if memo_type == 'MERKLE_ROOT':
+        return [ChainMemo(
+            merkle_root=memo_data.get('root'),
+            leaf_count=memo_data.get('leaves'),
+            **common
+        )]
+
+    return []
+
+
+def rows_to_memo(rows):
+    """
+    Rebuild the original memo dict from mirrored rows of one signature
+
+    Args:
+        rows: ChainMemo rows sharing a signature
+
+    Returns:
+        dict: Memo data in the on-chain format, or None
+    """
+    if not rows:
+        return None
+
+    first = rows[0]
+    memo_data = {
+        'type': first.memo_type,
+        'election_id': first.election_id,
+        'version': first.memo_version,
+        'timestamp': first.memo_timestamp
+    }
+
+    if first.memo_type == 'BALLOT':
+        memo_data.update({
+            'voter_hash': first.voter_hash,
+            'halka': first.halka,
+            'votes': {row.position: row.encrypted_vote for row in rows}
+        })
+    elif first.memo_type == 'MERKLE_ROOT':
+        memo_data.update({
+            'root': first.merkle_root,
+            'leaves': first.leaf_count
+        })
+    else:
+        memo_data.update({
+            'voter_hash': first.voter_hash,
+            'halka': first.halka,
+            'position': first.position,
+            'encrypted_vote': first.encrypted_vote
+        })
+
+    return memo_data
+
+
+def get_mirrored_memo(signature):
+    """
+    Memo of a transaction from the local mirror (requires app context)
+
+    Args:
+        signature: Transaction signature string
+
+    Returns:
+        dict: Memo data, or None if the mirror is disabled or has no entry
+    """
+    if not USE_CHAIN_MIRROR or not signature:
+        return None
+
+    rows = ChainMemo.query.filter_by(signature=str(signature)).all()
+    return rows_to_memo(rows)
+
+
+def get_mirrored_signatures(signatures):
+    """
+    Which of the given signatures are in the local mirror (requires app context)
+
+    Args:
+        signatures: Iterable of signature strings
+
+    Returns:
+        set: Mirrored signatures (empty if the mirror is disabled)
+    """
+    if not USE_CHAIN_MIRROR:
+        return set()
+    return _indexed_signatures(signatures)
+
+
+def _indexed_signatures(signatures):
+    signatures = [str(sig) for sig in signatures if sig]
+
+    indexed = set()
+    for i in range(0, len(signatures), 500):
+        chunk = signatures[i:i + 500]
+        indexed.update(
+            row.signature for row in
+            db.session.query(ChainMemo.signature).filter(ChainMemo.signature.in_(chunk)).distinct()
+        )
+    return indexed
+
+
+class ChainIndexer:
+    """
+    Background process that keeps chain_memo in sync with the blockchain
+    """
+
+    def __init__(self, app, solana_client=None, page_size=INDEXER_PAGE_SIZE,
+                 poll_interval=INDEXER_POLL_INTERVAL):
+        """
+        Initialize indexer
+
+        Args:
+            app: Flask app (for database access from the indexer thread)
+            solana_client: SolanaVotingClient (defaults to the shared client)
+            page_size: Signatures per history page (RPC max 1000)
+            poll_interval: Seconds between catch-up runs
+        """
+        self.app = app
+        self._client = solana_client
+        self.page_size = min(page_size, 1000)
+        self.poll_interval = poll_interval
+
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            from .solana_client import get_solana_client
+            self._client = get_solana_client()
+        return self._client
+
+    def get_addresses(self):
+        """
+        Addresses whose history holds election memos
+
+        Returns:
+            list: Pubkeys of fee-paying signers
+        """
+        return self.client.get_signer_pubkeys()
+
+    def start(self):
+        """Start background indexing thread"""
+        if self._thread is not None:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run_loop, name="chain-indexer", daemon=True)
+        self._thread.start()
+        print(f"🗂️  Chain indexer started (every {self.poll_interval}s)")
+
+    def stop(self):
+        """Stop background indexing"""
+        self._stop_event.set()
+        self._thread = None
+
+    def _run_loop(self):
+        while not self._stop_event.is_set():
+            with self.app.app_context():
+                try:
+                    self.catch_up()
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"⚠️  Chain indexer error: {str(e)}")
+                finally:
+                    db.session.remove()
+            self._stop_event.wait(self.poll_interval)
+
+    def catch_up(self):
+        """
+        Index all signatures newer than each address's checkpoint
+
+        Returns:
+            int: Number of memo rows added
+        """
+        addresses = self.get_addresses()
+        signers = {str(address) for address in addresses}
+
+        added = 0
+        for address in addresses:
+            added += self._catch_up_address(address, signers)
+        return added
+
+    def rebuild(self):
+        """Drop the mirror and all checkpoints so the next catch-up re-reads every history"""
+        ChainMemo.query.delete()
+        ChainIndexerState.query.delete()
+        db.session.commit()
+
+    def _catch_up_address(self, address, signers):
+        state = ChainIndexerState.query.filter_by(address=str(address)).first()
+        if state is None:
+            state = ChainIndexerState(address=str(address), signatures_indexed=0)
+            db.session.add(state)
+            db.session.commit()
+
+        until = Signature.from_string(state.last_signature) if state.last_signature else None
+        before = None
+        newest = None
+        added = 0
+        seen = 0
+
+        # History is returned newest first; the checkpoint only moves once the gap is closed
+        while True:
+            response = self.client.client.get_signatures_for_address(
+                address,
+                before=before,
+                until=until,
+                limit=self.page_size
+            )
+            entries = response.value
+            if not entries:
+                break
+
+            if newest is None:
+                newest = entries[0]
+
+            added += self._index_page(entries, signers)
+            seen += len(entries)
+            before = entries[-1].signature
+
+            if len(entries) < self.page_size:
+                break
+
+        if newest is not None:
+            state.last_signature = str(newest.signature)
+            state.last_slot = newest.slot
+            state.signatures_indexed = (state.signatures_indexed or 0) + seen
+            db.session.commit()
+
+            if added:
+                print(f"🗂️  Indexed {added} memo rows from {seen} new signatures ({str(address)[:8]}...)")
+
+        return added
+
+    def _index_page(self, entries, signers):
+        """
+        Decode and store one page of signature entries
+
+        Args:
+            entries: Signature entries of one history page
+            signers: Pubkey strings allowed to author election memos
+
+        Returns:
+            int: Memo rows added
+        """
+        signatures = [str(entry.signature) for entry in entries]
+        already_indexed = _indexed_signatures(signatures)
+
+        added = 0
+        for entry in entries:
+            signature = str(entry.signature)
+            if entry.err is not None or signature in already_indexed or not entry.memo:
+                continue
+
+            # Anyone can send a memo transaction that references a signer: only
+            # memos paid for by the signer set are election memos
+            tx_data = self.client.get_transaction_data(signature)
+            if not tx_data:
+                raise RuntimeError(f"Transaction {signature[:16]}... not readable, retrying next run")
+            if tx_data.get('fee_payer') not in signers:
+                continue
+
+            memo_data = parse_memo_field(entry.memo)
+            if memo_data is None:
+                # Memo field unparseable (e.g. truncated): read the transaction itself
+                memo_data = self._memo_from_transaction(tx_data)
+            if memo_data is None:
+                continue
+
+            for row in memo_to_rows(memo_data, signature, entry.slot, entry.block_time):
+                db.session.add(row)
+                added += 1
+
+        db.session.commit()
+        return added
+
+    def _memo_from_transaction(self, tx_data):
+        for instruction in tx_data['transaction']['message'].get('instructions', []):
+            if instruction.get('programId') == MEMO_PROGRAM_ID and instruction.get('data'):
+                memo_data = parse_memo_field(instruction['data'])
+                if memo_data is not None:
+                    return memo_data
+        return None
+
+    def get_stats(self):
+        """
+        Get indexer statistics (requires app context)
+
+        Returns:
+            dict: Checkpoints per address and mirror size
+        """
+        return {
+            'addresses': [
+                {
+                    'address': state.address,
+                    'last_signature': state.last_signature,
+                    'last_slot': state.last_slot,
+                    'signatures_indexed': state.signatures_indexed,
+                    'updated_at': state.updated_at
+                }
+                for state in ChainIndexerState.query.all()
+            ],
+            'memo_rows': ChainMemo.query.count(),
+            'running': self._thread is not None
+        }
+
+
+# Global indexer instance
+_chain_indexer = None
+
+def start_chain_indexer(app, **kwargs):
+    """
+    Start the background chain indexer (once per process)
+    
+    Args:
+        app: Flask application
+        **kwargs: Passed to ChainIndexer
+    
+    Returns:
+        ChainIndexer: Running indexer
+    """
+    global _chain_indexer
+    
+    if _chain_indexer is None:
+        _chain_indexer = ChainIndexer(app, **kwargs)
+        _chain_indexer.start()
+    
+    return _chain_indexer
+
+
+def get_chain_indexer():
+    """Get the running chain indexer, or None if not started"""
+    return _chain_indexer
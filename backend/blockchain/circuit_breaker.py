@@ -0,0 +1,251 @@
+"""
+RPC Circuit Breaker
+Fails Solana RPC calls fast while the network is down or too slow
+
+    CLOSED     calls pass through; consecutive failures or consecutive
+               calls slower than the latency SLO trip the breaker
+    OPEN       calls raise CircuitOpenError immediately; submitters defer
+               their votes instead of waiting out RPC timeouts
+    HALF_OPEN  after the open period a few probe calls are let through;
+               enough successes close the breaker, any failure reopens it
+               for twice as long (up to CIRCUIT_MAX_OPEN_SECONDS)
+
+JSON-RPC error responses (RPCException) mean the node answered, so they
+count as successes, the same way the endpoint pool treats them.
+"""
+
+import threading
+import time
+from solana.rpc.api import Client
+from solana.rpc.core import RPCException
+from .config import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_LATENCY_SLO,
+    CIRCUIT_SLOW_CALL_THRESHOLD,
+    CIRCUIT_OPEN_SECONDS,
+    CIRCUIT_MAX_OPEN_SECONDS,
+    CIRCUIT_HALF_OPEN_PROBES,
+)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of an RPC call while the circuit is open"""
+
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
+        super().__init__(f"Solana RPC circuit open (retry in {retry_after:.0f}s)")
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure / latency-SLO circuit breaker with half-open probes
+    """
+
+    def __init__(self, failure_threshold=CIRCUIT_FAILURE_THRESHOLD, latency_slo=CIRCUIT_LATENCY_SLO,
+                 slow_call_threshold=CIRCUIT_SLOW_CALL_THRESHOLD, open_seconds=CIRCUIT_OPEN_SECONDS,
+                 max_open_seconds=CIRCUIT_MAX_OPEN_SECONDS, half_open_probes=CIRCUIT_HALF_OPEN_PROBES):
+        """
+        Initialize breaker
+
+        Args:
+            failure_threshold: Consecutive failed calls that open the circuit
+            latency_slo: Seconds; calls slower than this count as slow
+            slow_call_threshold: Consecutive slow calls that open the circuit
+            open_seconds: First open period (doubles on every failed probe)
+            max_open_seconds: Longest open period
+            half_open_probes: Successful probe calls needed to close the circuit
+        """
+        self.failure_threshold = failure_threshold
+        self.latency_slo = latency_slo
+        self.slow_call_threshold = slow_call_threshold
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.half_open_probes = half_open_probes
+
+        self.state = CLOSED
+        self.opened_at = None
+        self.open_until = 0
+        self.open_count = 0  # Consecutive openings without a successful recovery
+        self.last_trip_reason = None
+
+        self.consecutive_failures = 0
+        self.consecutive_slow = 0
+        self.probes_in_flight = 0
+        self.probe_successes = 0
+
+        self.calls = 0
+        self.failures = 0
+        self.slow_calls = 0
+        self.short_circuited = 0
+        self.trips = 0
+
+        self._lock = threading.Lock()
+
+    def is_open(self):
+        """True while calls are being short-circuited (half-open counts as closed)"""
+        with self._lock:
+            return self.state == OPEN and time.time() < self.open_until
+
+    def retry_after(self):
+        """Seconds until the next probe is allowed (0 when not open)"""
+        with self._lock:
+            if self.state != OPEN:
+                return 0
+            return max(0.0, self.open_until - time.time())
+
+    def before_call(self):
+        """
+        Admit a call or short-circuit it
+
+        Returns:
+            bool: True if the call is a half-open probe
+
+        Raises:
+            CircuitOpenError: Circuit is open, or all probe slots are taken
+        """
+        with self._lock:
+            if self.state == OPEN:
+                now = time.time()
+                if now < self.open_until:
+                    self.short_circuited += 1
+                    raise CircuitOpenError(self.open_until - now)
+                self.state = HALF_OPEN
+                self.probe_successes = 0
+                self.probes_in_flight = 0
+                print("🔌 Solana RPC circuit half-open, probing")
+
+            if self.state == HALF_OPEN:
+                if self.probes_in_flight >= self.half_open_probes:
+                    self.short_circuited += 1
+                    raise CircuitOpenError(0)
+                self.probes_in_flight += 1
+                return True
+
+            return False
+
+    def record_success(self, latency, probe=False):
+        """Record a call that got an answer, slow answers count toward tripping"""
+        with self._lock:
+            self.calls += 1
+            if probe:
+                self.probes_in_flight = max(0, self.probes_in_flight - 1)
+
+            if latency > self.latency_slo:
+                self.slow_calls += 1
+                self.consecutive_slow += 1
+                if probe or self.consecutive_slow >= self.slow_call_threshold:
+                    self._trip(f"{self.consecutive_slow} calls over {self.latency_slo}s latency SLO")
+                return
+
+            self.consecutive_failures = 0
+            self.consecutive_slow = 0
+
+            if probe and self.state == HALF_OPEN:
+                self.probe_successes += 1
+                if self.probe_successes >= self.half_open_probes:
+                    self.state = CLOSED
+                    self.open_count = 0
+                    print("✅ Solana RPC circuit closed")
+
+    def record_failure(self, error=None, probe=False):
+        """Record a call that failed at the transport level"""
+        with self._lock:
+            self.calls += 1
+            self.failures += 1
+            self.consecutive_failures += 1
+            if probe:
+                self.probes_in_flight = max(0, self.probes_in_flight - 1)
+
+            if probe or self.consecutive_failures >= self.failure_threshold:
+                self._trip(f"{self.consecutive_failures} consecutive failures ({type(error).__name__}: {error})")
+
+    def _trip(self, reason):
+        """Open the circuit (lock held)"""
+        if self.state == OPEN:
+            return
+
+        duration = min(self.open_seconds * (2 ** self.open_count), self.max_open_seconds)
+        self.state = OPEN
+        self.opened_at = time.time()
+        self.open_until = self.opened_at + duration
+        self.open_count += 1
+        self.trips += 1
+        self.last_trip_reason = reason
+        self.consecutive_failures = 0
+        self.consecutive_slow = 0
+        print(f"🚨 Solana RPC circuit open for {duration}s: {reason}")
+
+    def call(self, func, *args, **kwargs):
+        """
+        Run an RPC call through the breaker
+
+        Returns:
+            Call result
+
+        Raises:
+            CircuitOpenError: Call was short-circuited
+        """
+        probe = self.before_call()
+        start = time.time()
+        try:
+            result = func(*args, **kwargs)
+        except RPCException:
+            self.record_success(time.time() - start, probe)
+            raise
+        except Exception as e:
+            self.record_failure(e, probe)
+            raise
+
+        self.record_success(time.time() - start, probe)
+        return result
+
+    def snapshot(self):
+        """
+        Get breaker state for monitoring
+
+        Returns:
+            dict: State, open period and counters
+        """
+        with self._lock:
+            state = self.state
+            if state == OPEN and time.time() >= self.open_until:
+                state = HALF_OPEN  # Next call will probe
+            return {
+                'state': state,
+                'retry_after': round(max(0.0, self.open_until - time.time()), 1) if state == OPEN else 0,
+                'last_trip_reason': self.last_trip_reason,
+                'consecutive_failures': self.consecutive_failures,
+                'consecutive_slow': self.consecutive_slow,
+                'latency_slo': self.latency_slo,
+                'calls': self.calls,
+                'failures': self.failures,
+                'slow_calls': self.slow_calls,
+                'short_circuited': self.short_circuited,
+                'trips': self.trips
+            }
+
+
+class CircuitBreakerClient:
+    """
+    Wraps a solana Client (or RpcEndpointPool) so every RPC method goes
+    through the breaker; other attributes (e.g. the pool's snapshot) pass through
+    """
+
+    def __init__(self, client, breaker):
+        self.inner = client
+        self.breaker = breaker
+
+    def __getattr__(self, name):
+        attr = getattr(self.inner, name)
+        if name.startswith('_') or not callable(attr) or not hasattr(Client, name):
+            return attr
+
+        def call(*args, **kwargs):
+            return self.breaker.call(attr, *args, **kwargs)
+
+        call.__name__ = name
+        return call
@@ -16,6 +16,14 @@ BACKUP_RPC_ENDPOINTS = [
     "https://rpc.ankr.com/solana_devnet",
 ]
 
+# RPC endpoint pool (routes calls across RPC_ENDPOINT and the backups)
+RPC_LATENCY_WINDOW = 100  # Recent requests kept per endpoint for percentiles/error rate
+RPC_HEDGE_DELAY = 0.5  # seconds before a slow read is also sent to a second endpoint
+RPC_FAILURE_THRESHOLD = 3  # Consecutive failures before an endpoint is quarantined
+RPC_QUARANTINE_BASE = 10  # seconds, doubled on each repeated quarantine
+RPC_QUARANTINE_MAX = 300  # seconds
+RPC_POOL_MAX_WORKERS = 16  # Threads used for hedged reads
+
 # Paths
 BASE_DIR = Path(__file__).resolve().parent.parent
 WALLETS_DIR = BASE_DIR / "wallets"
@@ -36,9 +44,139 @@ CONFIRMATION_TIMEOUT = 30  # seconds (reduced for faster feedback)
 MAX_RETRY_ATTEMPTS = 2
 TRANSACTION_FEE_PAYER = "admin"  # Who pays transaction fees
 
+# Commitment tiers: a vote's receipt is issued once its transaction reaches the
+# receipt tier, then it is promoted to finalized in the background.
+# Loaded once into BlockchainConfig.commitment_tier (fast_mode.py can override it)
+COMMITMENT_TIERS = ("processed", "confirmed", "finalized")
+CONFIRMATION_COMMITMENT = "confirmed"  # Default receipt tier
+PROMOTE_TO_FINALIZED = True  # Follow receipted transactions until finalized
+FINALIZATION_TIMEOUT = 60  # seconds a receipted transaction is followed for finalization
+COMMITMENT_LATENCY_SAMPLES = 500  # Recent confirmation latencies kept per tier
+FAST_MODE_CONFIG = BASE_DIR / "blockchain_fast_mode.txt"  # Receipt tier override (fast_mode.py)
+
+# Batched confirmation tracker (one poller for all in-flight signatures)
+CONFIRMATION_POLL_INTERVAL = 1.0  # seconds between get_signature_statuses polls
+CONFIRMATION_BATCH_SIZE = 256  # Signatures per get_signature_statuses call (RPC max)
+
+# Fee-payer balance ledger (local balance estimate, reconciled in the background)
+LAMPORTS_PER_SIGNATURE = 5000  # Base fee per transaction signature
+MIN_FEE_BALANCE_SOL = 0.01  # Refuse to submit below this estimated balance
+LOW_BALANCE_WATERMARK_SOL = 0.1  # Refill (devnet airdrop) or alert below this
+BALANCE_RECONCILE_INTERVAL = 30  # seconds between get_balance reconciliations
+AUTO_REFILL_AMOUNT_SOL = 2  # Devnet airdrop amount (0 = alert only)
+
+# Fee-payer pool (transactions are spread over several paying keypairs)
+FEE_PAYER_COUNT = 1  # Total signers including the admin wallet (1 = admin only, raise to pool payers)
+FEE_PAYER_WALLETS_DIR = WALLETS_DIR / "fee_payers"
+FEE_PAYER_ASSIGNMENT = "least_loaded"  # least_loaded / round_robin
+
+# RPC circuit breaker (fail fast and defer votes while Solana is down or too slow)
+CIRCUIT_BREAKER_ENABLED = True
+CIRCUIT_FAILURE_THRESHOLD = 5  # Consecutive failed RPC calls that open the circuit
+CIRCUIT_LATENCY_SLO = 5.0  # seconds, slower RPC calls count as slow
+CIRCUIT_SLOW_CALL_THRESHOLD = 5  # Consecutive slow calls that open the circuit
+CIRCUIT_OPEN_SECONDS = 15  # First open period, doubled after each failed probe
+CIRCUIT_MAX_OPEN_SECONDS = 120  # Longest open period
+CIRCUIT_HALF_OPEN_PROBES = 2  # Successful probe calls needed to close the circuit
+
+# Blockhash cache (shared by all submitters, refreshed in the background)
+BLOCKHASH_REFRESH_INTERVAL = 5  # seconds between background refreshes
+BLOCKHASH_MAX_AGE = 30  # seconds, older cached blockhashes are fetched synchronously
+
+# Admin dashboard statistics cache (DB and network fields refresh separately)
+STATS_DB_REFRESH_INTERVAL = 5  # seconds between vote table aggregate queries
+STATS_NETWORK_REFRESH_INTERVAL = 15  # seconds between get_slot / get_balance calls
+STATS_DB_MAX_AGE = 30  # seconds, older cached DB stats are recomputed synchronously
+STATS_NETWORK_MAX_AGE = 120  # seconds, older cached network stats are fetched synchronously
+
+# Shared client health checks (get_version / get_balance) run at most this often
+HEALTH_CHECK_INTERVAL = 60  # seconds
+
 # Performance optimization
 SKIP_FULL_CONFIRMATION = False  # Set True for faster devnet (assumes transaction succeeds)
-USE_ASYNC_RECORDING = False  # Experimental: parallel blockchain recording
+USE_ASYNC_RECORDING = False  # Record ballots on an asyncio event loop (see async_recorder.py)
+
+# Async recording pipeline (USE_ASYNC_RECORDING)
+ASYNC_MAX_IN_FLIGHT = 256  # Transactions signing, sending or confirming at once
+ASYNC_MAX_QUEUED = 1024  # Submitted but unfinished ballots before callers are pushed back
+ASYNC_SUBMIT_TIMEOUT = 5  # seconds a caller waits for a queue slot before the ballot is deferred
+
+# Adaptive priority fees (compute-unit price from recent prioritization fees, see priority_fees.py)
+USE_PRIORITY_FEES = False  # Add compute-budget instructions to vote transactions
+PRIORITY_FEE_SAMPLE_INTERVAL = 10  # seconds between getRecentPrioritizationFees samples
+PRIORITY_FEE_WINDOW = 600  # Per-slot fee samples kept for the rolling percentile
+PRIORITY_FEE_PERCENTILE = 50  # Starting fee percentile
+PRIORITY_FEE_MIN_PERCENTILE = 25  # The feedback loop never prices below this percentile
+PRIORITY_FEE_LATENCY_TARGET = 5.0  # seconds, send-to-receipt latency target...
+PRIORITY_FEE_LATENCY_PERCENTILE = 90  # ...for this percentile of transactions
+PRIORITY_FEE_COMPUTE_UNIT_LIMIT = 100_000  # Compute units requested (a 1000-byte memo needs far fewer)
+PRIORITY_FEE_MAX_MICRO_LAMPORTS = 1_000_000  # Upper bound for the compute-unit price
+PRIORITY_FEE_ELECTION_BUDGET_SOL = 0.5  # Priority fees allowed per election
+PRIORITY_FEE_SPEND_PATH = WALLETS_DIR / "priority_fee_spend.json"  # Spend per election
+
+# Durable nonce pool (vote transactions signed against pre-fetched nonces, see nonce_pool.py)
+USE_DURABLE_NONCES = False  # Missing nonce accounts are created with rent from the admin wallet
+NONCE_ACCOUNT_COUNT = 64  # Nonce accounts, spread over the fee payers as authorities
+NONCE_WALLETS_DIR = WALLETS_DIR / "nonce_accounts"
+NONCE_REFRESH_INTERVAL = 1.0  # seconds between reads of used nonce accounts
+NONCE_RECYCLE_AFTER = 60  # seconds before an unchanged used nonce is advanced (voids its transaction)
+
+# Transaction cache (confirmed transactions never change once finalized)
+TX_CACHE_ENABLED = True
+TX_CACHE_PATH = BASE_DIR / "instance" / "tx_cache.db"
+TX_CACHE_TTL = 30  # seconds a confirmed but not yet finalized transaction stays cached
+FINALIZED_SLOT_REFRESH_INTERVAL = 5  # seconds between finalized-slot lookups
+
+# Integrity check engine (concurrent, rate-limited audit of blockchain votes)
+INTEGRITY_WORKERS = 16  # Concurrent transaction lookups
+INTEGRITY_RPC_RATE = 40  # Global requests per second across all workers
+INTEGRITY_PAGE_SIZE = 500  # Votes loaded per database page
+INTEGRITY_CHECKPOINT_DIR = BASE_DIR / "integrity_checkpoints"  # One checkpoint per election and run
+
+# Merkle diff between the vote table and the chain mirror
+MERKLE_DIFF_PREFIX_DEPTH = 3  # Hex digits of voter_hash used as tree levels (16^3 buckets per halka/position)
+
+# Offline audit bundles (export_audit_bundle.py / verify_audit_bundle.py)
+AUDIT_BUNDLE_PART_SIZE = 5000  # Votes per bundle part (parts are verified in parallel)
+AUDIT_BUNDLE_FETCH_WORKERS = 8  # Concurrent transaction lookups during export
+
+# Local vote hash chain (RPC-free tamper detection over the vote table)
+HASH_CHAIN_LINK_INTERVAL = 2  # seconds between linking newly committed votes
+HASH_CHAIN_CHECKPOINT_INTERVAL = 300  # seconds between chain head checkpoints
+HASH_CHAIN_ANCHOR_CHECKPOINTS = False  # Also write each checkpoint head to Solana
+HASH_CHAIN_BATCH_SIZE = 1000  # Rows per linking commit / scan fetch
+
+# Chain indexer (local mirror of election memos read from signature history)
+USE_CHAIN_MIRROR = True  # Verifier answers from the mirror before falling back to RPC
+INDEXER_PAGE_SIZE = 1000  # Signatures per get_signatures_for_address call (RPC max)
+INDEXER_POLL_INTERVAL = 10  # seconds between catch-up runs
+
+# Incremental chain-sourced tally
+TALLY_BATCH_SIZE = 200  # Votes fetched/decrypted per tally commit
+
+# Vote outbox (votes are queued in the DB and submitted by background workers)
+OUTBOX_WORKERS = 2  # Number of background submitter threads
+OUTBOX_POLL_INTERVAL = 1.0  # seconds between polls when the outbox is empty
+OUTBOX_BATCH_SIZE = 20  # Ballots (voters) claimed per poll
+OUTBOX_MAX_ATTEMPTS = 10  # Give up (status 'failed') after this many attempts
+OUTBOX_RETRY_BACKOFF = 5  # seconds, doubled after every failed attempt
+OUTBOX_MAX_BACKOFF = 300  # seconds, upper bound for retry delay
+OUTBOX_LEASE_SECONDS = 180  # 'processing' entries older than this are reclaimed (worker crash)
+
+# Reconciliation sweeper (unproven, failed and local-only votes, see reconciler.py)
+SWEEPER_INTERVAL = 15  # seconds between sweeps
+SWEEPER_BATCH_SIZE = 500  # Votes / outbox entries per database round trip
+SWEEPER_FAILED_RETRY_AFTER = 300  # seconds before a 'failed' outbox entry gets new attempts
+SWEEPER_MAX_REVIVALS = 5  # 'failed' entries stay failed after this many revivals
+SWEEPER_RECEIPT_MISSING_SWEEPS = 3  # Sweeps a confirmed receipt must be missing before it is resubmitted
+SWEEPER_RATE_WINDOW = 600  # seconds of history behind the drain rate metrics
+
+# Anchoring mode
+#   "ballot" - one memo transaction per voter with the encrypted votes
+#   "merkle" - batch votes into a Merkle tree and anchor only the root on-chain
+ANCHORING_MODE = "ballot"
+MERKLE_BATCH_SIZE = 256  # Anchor as soon as this many votes are queued
+MERKLE_BATCH_WINDOW = 10  # seconds, anchor a partial batch once its oldest vote waited this long
 
 # Election configuration
 ELECTION_ID = "2025-GENERAL-ELECTION"
@@ -59,6 +197,34 @@ class BlockchainConfig:
         self.admin_wallet_path = str(ADMIN_WALLET_PATH)
         self.encryption_key_path = str(ENCRYPTION_KEY_PATH)
         self.election_id = ELECTION_ID
+        self.commitment_tier = self._load_commitment_tier()
+    
+    def _load_commitment_tier(self):
+        """
+        Receipt commitment tier, read once at startup
+        The fast_mode.py override file holds a tier name ("ENABLED" = processed)
+        """
+        if not FAST_MODE_CONFIG.exists():
+            return CONFIRMATION_COMMITMENT
+        
+        try:
+            value = FAST_MODE_CONFIG.read_text().split()[0].strip().lower()
+        except (OSError, IndexError):
+            return CONFIRMATION_COMMITMENT
+        
+        if value == "enabled":
+            return "processed"
+        return value if value in COMMITMENT_TIERS else CONFIRMATION_COMMITMENT
+    
+    def get_commitment_tier(self):
+        """Get the commitment tier at which vote receipts are issued"""
+        return self.commitment_tier
+    
+    def set_commitment_tier(self, tier):
+        """Change the receipt tier for this process (new trackers and recorders)"""
+        if tier not in COMMITMENT_TIERS:
+            raise ValueError(f"Unknown commitment tier: {tier}")
+        self.commitment_tier = tier
         
     def get_rpc_endpoint(self):
         """Get primary RPC endpoint"""
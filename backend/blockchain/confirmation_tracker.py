@@ -0,0 +1,362 @@
+"""
+Confirmation Tracker
+Confirms in-flight transaction signatures in batches on one timer
+
+Instead of each submitter polling get_signature_statuses for its own
+signature, signatures are registered here and polled together (up to
+256 per RPC call). Each registration returns a Future that resolves once
+the signature reaches the requested commitment tier (the receipt tier in
+BlockchainConfig by default), fails, or times out.
+
+Once a receipt is issued below finalized, the signature stays on the
+poller until it is finalized (PROMOTE_TO_FINALIZED), so the latency of
+every tier is measured. The reconciliation sweeper persists the promotion.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from solders.signature import Signature  # type: ignore
+from solders.transaction_status import TransactionConfirmationStatus  # type: ignore
+from .circuit_breaker import CircuitOpenError
+from .config import (
+    config,
+    CONFIRMATION_TIMEOUT,
+    CONFIRMATION_POLL_INTERVAL,
+    CONFIRMATION_BATCH_SIZE,
+    PROMOTE_TO_FINALIZED,
+    FINALIZATION_TIMEOUT,
+    COMMITMENT_LATENCY_SAMPLES,
+)
+
+# Ordered commitment ranks (processed < confirmed < finalized)
+COMMITMENT_LEVELS = {
+    'processed': int(TransactionConfirmationStatus.Processed),
+    'confirmed': int(TransactionConfirmationStatus.Confirmed),
+    'finalized': int(TransactionConfirmationStatus.Finalized),
+}
+
+
+class TierLatency:
+    """
+    Recent send-to-commitment latencies per tier
+    """
+
+    def __init__(self, samples=COMMITMENT_LATENCY_SAMPLES):
+        self._samples = {tier: deque(maxlen=samples) for tier in COMMITMENT_LEVELS}
+        self._lock = threading.Lock()
+
+    def record(self, tier, seconds):
+        with self._lock:
+            self._samples[tier].append(seconds)
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: tier -> {'samples', 'avg', 'p50', 'p95', 'max'} (seconds)
+        """
+        with self._lock:
+            samples = {tier: sorted(values) for tier, values in self._samples.items()}
+
+        result = {}
+        for tier, values in samples.items():
+            if not values:
+                result[tier] = {'samples': 0, 'avg': None, 'p50': None, 'p95': None, 'max': None}
+                continue
+            result[tier] = {
+                'samples': len(values),
+                'avg': round(sum(values) / len(values), 3),
+                'p50': round(values[int(0.5 * (len(values) - 1))], 3),
+                'p95': round(values[int(0.95 * (len(values) - 1))], 3),
+                'max': round(values[-1], 3)
+            }
+        return result
+
+
+class _PendingSignature:
+    """In-flight signature waiting for one commitment tier"""
+
+    def __init__(self, signature, sig_obj, tier, deadline, callback, started=None, promotion=False):
+        self.signature = signature
+        self.sig_obj = sig_obj
+        self.tier = tier
+        self.commitment = COMMITMENT_LEVELS[tier]
+        self.deadline = deadline
+        self.callback = callback
+        self.started = started or time.time()
+        self.promotion = promotion  # Follow-up after the receipt, nobody waits on it
+        self.future = Future()
+        self.resolved = False  # Set under the tracker lock by the first _resolve()
+
+
+class ConfirmationTracker:
+    """
+    Batched signature confirmation with one background poller
+    """
+
+    def __init__(self, solana_client, commitment=None,
+                 poll_interval=CONFIRMATION_POLL_INTERVAL,
+                 batch_size=CONFIRMATION_BATCH_SIZE, timeout=CONFIRMATION_TIMEOUT,
+                 promote_to_finalized=PROMOTE_TO_FINALIZED, finalization_timeout=FINALIZATION_TIMEOUT):
+        """
+        Initialize tracker
+
+        Args:
+            solana_client: SolanaVotingClient instance
+            commitment: Default tier, 'processed', 'confirmed' or 'finalized'
+                        (None = the receipt tier in BlockchainConfig)
+            poll_interval: Seconds between status polls
+            batch_size: Signatures per get_signature_statuses call (RPC max 256)
+            timeout: Default seconds before a signature is reported as timed out
+            promote_to_finalized: Keep polling receipted signatures until finalized
+            finalization_timeout: Seconds a receipted signature is followed
+        """
+        self.client = solana_client
+        self.default_commitment = commitment
+        self.poll_interval = poll_interval
+        self.batch_size = min(batch_size, 256)
+        self.timeout = timeout
+        self.promote_to_finalized = promote_to_finalized
+        self.finalization_timeout = finalization_timeout
+
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        self.rpc_calls = 0
+        self.confirmed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.finalized = 0
+        self.promotions_failed = 0
+        self.latency = TierLatency()
+
+    @property
+    def commitment(self):
+        """Tier used when track() is not given one"""
+        return self.default_commitment or config.get_commitment_tier()
+
+    def start(self):
+        """Start background poller"""
+        if self._thread is not None:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._poll_loop,
+            name="confirmation-tracker",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop background poller"""
+        self._stop_event.set()
+        self._wakeup.set()
+        self._thread = None
+
+    def track(self, signature, timeout=None, callback=None, commitment=None):
+        """
+        Register a signature for confirmation
+
+        Args:
+            signature: Transaction signature (string or Signature object)
+            timeout: Seconds to wait (defaults to tracker timeout)
+            callback: Optional callback(result) called when resolved
+            commitment: Tier to wait for (defaults to the tracker tier)
+
+        Returns:
+            Future: Resolves to {'confirmed': bool, 'signature': str, 'slot': int,
+                    'error': str, 'timeout': bool, 'commitment': str}
+        """
+        sig_obj = signature if isinstance(signature, Signature) else Signature.from_string(signature)
+        signature = str(sig_obj)
+        tier = commitment or self.commitment
+        deadline = time.time() + (timeout if timeout is not None else self.timeout)
+
+        with self._lock:
+            entry = self._pending.get((signature, tier))
+            if entry is None:
+                entry = _PendingSignature(signature, sig_obj, tier, deadline, callback)
+                self._pending[(signature, tier)] = entry
+            else:
+                entry.deadline = max(entry.deadline, deadline)
+                if callback is not None:
+                    entry.future.add_done_callback(lambda f: callback(f.result()))
+
+        self._wakeup.set()
+        return entry.future
+
+    def wait(self, signature, timeout=None, commitment=None):
+        """
+        Track a signature and block until it resolves
+
+        Args:
+            signature: Transaction signature
+            timeout: Seconds to wait
+            commitment: Tier to wait for (defaults to the tracker tier)
+
+        Returns:
+            dict: Result as resolved by the tracker
+        """
+        return self.track(signature, timeout=timeout, commitment=commitment).result()
+
+    def _poll_loop(self):
+        while not self._stop_event.is_set():
+            # Sleep until there is something to poll
+            self._wakeup.wait()
+            if self._stop_event.is_set():
+                break
+
+            try:
+                self.poll_once()
+            except Exception as e:
+                print(f"⚠️  Confirmation poll error: {str(e)}")
+
+            with self._lock:
+                if not self._pending:
+                    self._wakeup.clear()
+
+            self._stop_event.wait(self.poll_interval)
+
+    def poll_once(self):
+        """
+        Poll all in-flight signatures once, in batches
+
+        Returns:
+            int: Number of signatures resolved
+        """
+        with self._lock:
+            entries = list(self._pending.values())
+
+        resolved = 0
+        for i in range(0, len(entries), self.batch_size):
+            batch = entries[i:i + self.batch_size]
+            try:
+                response = self.client.client.get_signature_statuses(
+                    [entry.sig_obj for entry in batch]
+                )
+                self.rpc_calls += 1
+            except CircuitOpenError as e:
+                # RPC is down: report the batch as unconfirmed now instead of at its deadline
+                for entry in batch:
+                    self._resolve(entry, {
+                        'confirmed': False,
+                        'signature': entry.signature,
+                        'slot': None,
+                        'error': str(e),
+                        'timeout': True,
+                        'commitment': entry.tier
+                    })
+                    resolved += 1
+                continue
+            except Exception as e:
+                print(f"⚠️  Confirmation check error: {str(e)}")
+                continue
+
+            for entry, status in zip(batch, response.value):
+                if status is None:
+                    continue
+                if status.err:
+                    self._resolve(entry, {
+                        'confirmed': False,
+                        'signature': entry.signature,
+                        'slot': status.slot,
+                        'error': str(status.err),
+                        'timeout': False,
+                        'commitment': entry.tier
+                    })
+                    resolved += 1
+                elif status.confirmation_status is not None and int(status.confirmation_status) >= entry.commitment:
+                    self.latency.record(entry.tier, time.time() - entry.started)
+                    self._resolve(entry, {
+                        'confirmed': True,
+                        'signature': entry.signature,
+                        'slot': status.slot,
+                        'error': None,
+                        'timeout': False,
+                        'commitment': entry.tier
+                    })
+                    resolved += 1
+
+        # Expire signatures that are still unresolved
+        now = time.time()
+        for entry in entries:
+            if not entry.future.done() and now >= entry.deadline:
+                self._resolve(entry, {
+                    'confirmed': False,
+                    'signature': entry.signature,
+                    'slot': None,
+                    'error': 'Transaction confirmation timeout',
+                    'timeout': True,
+                    'commitment': entry.tier
+                })
+                resolved += 1
+
+        return resolved
+
+    def _resolve(self, entry, result):
+        with self._lock:
+            # A timeout sweep and a status batch can both resolve an entry: first one wins
+            if entry.resolved or entry.future.done():
+                return
+            entry.resolved = True
+
+            if self._pending.get((entry.signature, entry.tier)) is entry:
+                del self._pending[(entry.signature, entry.tier)]
+
+            if entry.promotion:
+                if result['confirmed']:
+                    self.finalized += 1
+                elif not result['timeout']:
+                    self.promotions_failed += 1
+            elif result['timeout']:
+                self.timed_out += 1
+            elif not result['confirmed']:
+                self.failed += 1
+            else:
+                self.confirmed += 1
+                if entry.tier == 'finalized':
+                    self.finalized += 1
+            if result['confirmed'] and not entry.promotion and entry.tier != 'finalized' and self.promote_to_finalized:
+                # Receipt issued: keep following the signature until it is finalized
+                key = (entry.signature, 'finalized')
+                if key not in self._pending:
+                    self._pending[key] = _PendingSignature(
+                        entry.signature, entry.sig_obj, 'finalized',
+                        time.time() + self.finalization_timeout, None,
+                        started=entry.started, promotion=True
+                    )
+
+        entry.future.set_result(result)
+
+        if entry.callback is not None:
+            try:
+                entry.callback(result)
+            except Exception as e:
+                print(f"⚠️  Confirmation callback error: {str(e)}")
+
+    def snapshot(self):
+        """
+        Get tracker statistics for monitoring
+
+        Returns:
+            dict: In-flight count and counters
+        """
+        with self._lock:
+            in_flight = len(self._pending)
+
+        return {
+            'commitment': self.commitment,
+            'in_flight': in_flight,
+            'rpc_calls': self.rpc_calls,
+            'confirmed': self.confirmed,
+            'failed': self.failed,
+            'timed_out': self.timed_out,
+            'finalized': self.finalized,
+            'promotions_failed': self.promotions_failed,
+            'latency': self.latency.snapshot()
+        }
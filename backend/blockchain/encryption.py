@@ -3,22 +3,99 @@ Vote Encryption Module
 Handles AES-256 encryption and voter ID hashing for blockchain storage
 """
 
+import calendar
 import hashlib
 import json
+import os
 import secrets
 from datetime import datetime
+import msgspec
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.backends import default_backend
 import base64
 
+# Compact ciphertext format: "v2." + base64(nonce || AES-256-GCM ciphertext+tag)
+# Anything else is a legacy base64-wrapped Fernet token
+CIPHERTEXT_V2_PREFIX = "v2."
+GCM_NONCE_BYTES = 12
+
+# Raw ciphertext bytes (as stored in compact memos) start with a format byte
+CIPHERTEXT_FORMAT_FERNET = 1
+CIPHERTEXT_FORMAT_V2 = 2
+
+# Fields of a standard vote, packed positionally in v2 plaintext
+VOTE_FIELDS = ("candidate_id", "position", "halka", "timestamp")
+
+_msgpack_encoder = msgspec.msgpack.Encoder()
+_msgpack_decoder = msgspec.msgpack.Decoder()
+
+
+def ciphertext_to_bytes(encrypted_data):
+    """
+    Convert a stored ciphertext string to its raw bytes (with format byte)
+    
+    Args:
+        encrypted_data: Ciphertext string as returned by encrypt_vote_data
+    
+    Returns:
+        bytes: Format byte followed by the raw ciphertext
+    """
+    if encrypted_data.startswith(CIPHERTEXT_V2_PREFIX):
+        raw = base64.b64decode(encrypted_data[len(CIPHERTEXT_V2_PREFIX):])
+        return bytes([CIPHERTEXT_FORMAT_V2]) + raw
+    
+    token = base64.b64decode(encrypted_data)
+    return bytes([CIPHERTEXT_FORMAT_FERNET]) + base64.urlsafe_b64decode(token)
+
+
+def ciphertext_from_bytes(data):
+    """
+    Inverse of ciphertext_to_bytes
+    
+    Args:
+        data: Format byte followed by the raw ciphertext
+    
+    Returns:
+        str: Ciphertext string exactly as stored locally
+    """
+    fmt, raw = data[0], data[1:]
+    
+    if fmt == CIPHERTEXT_FORMAT_V2:
+        return CIPHERTEXT_V2_PREFIX + base64.b64encode(raw).decode()
+    if fmt == CIPHERTEXT_FORMAT_FERNET:
+        return base64.b64encode(base64.urlsafe_b64encode(raw)).decode()
+    
+    raise ValueError(f"Unknown ciphertext format {fmt}")
+
+
+def format_vote_receipt(transaction_signature, voter_id_hash, position=None,
+                        merkle_root=None, leaf_index=None):
+    """
+    Receipt code of a vote (needs no key, so receipts can be re-derived offline)
+    See VoteEncryption.generate_vote_receipt for the format
+    
+    Returns:
+        str: Receipt code
+    """
+    sig_prefix = transaction_signature[:8] if len(transaction_signature) >= 8 else transaction_signature
+    hash_prefix = voter_id_hash[:8]
+    
+    if merkle_root is not None:
+        return f"RECEIPT-{sig_prefix}-{hash_prefix}-{position}-M{merkle_root[:8]}.{leaf_index}"
+    if position:
+        return f"RECEIPT-{sig_prefix}-{hash_prefix}-{position}"
+    return f"RECEIPT-{sig_prefix}-{hash_prefix}"
+
 
 class VoteEncryption:
     """
     Handles encryption and hashing for vote data before blockchain storage
     - Voter IDs are hashed (SHA-256) for anonymity
-    - Vote data is encrypted (AES-256-GCM via Fernet)
+    - Vote data is encrypted (AES-256-GCM over msgpack, legacy Fernet tokens still decrypt)
     - Receipts are generated for verification
     """
     
@@ -36,6 +113,15 @@ class VoteEncryption:
         
         self.cipher = Fernet(encryption_key)
         self.encryption_key = encryption_key
+        
+        # AES-256-GCM key derived from the same Fernet key file
+        self.aead = AESGCM(HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=None,
+            info=b"votonomy-vote-aesgcm-v2",
+            backend=default_backend()
+        ).derive(base64.urlsafe_b64decode(encryption_key)))
     
     def hash_voter_id(self, voter_id):
         """
@@ -69,29 +155,49 @@ class VoteEncryption:
                 }
         
         Returns:
-            str: Base64-encoded encrypted data
+            str: "v2." + base64(nonce || AES-GCM ciphertext)
         """
-        # Convert dict to JSON string
-        json_data = json.dumps(vote_data, ensure_ascii=False)
+        # Standard votes are packed positionally (no key names), timestamp as epoch seconds
+        if set(vote_data) == set(VOTE_FIELDS) and isinstance(vote_data["timestamp"], str):
+            timestamp = datetime.fromisoformat(vote_data["timestamp"])
+            plaintext = [
+                vote_data["candidate_id"],
+                vote_data["position"],
+                vote_data["halka"],
+                calendar.timegm(timestamp.utctimetuple())
+            ]
+        else:
+            plaintext = vote_data
         
-        # Encrypt using Fernet (AES-256-GCM)
-        encrypted_bytes = self.cipher.encrypt(json_data.encode())
+        nonce = os.urandom(GCM_NONCE_BYTES)
+        ciphertext = self.aead.encrypt(nonce, _msgpack_encoder.encode(plaintext), None)
         
-        # Return as base64 string for storage
-        return base64.b64encode(encrypted_bytes).decode()
+        return CIPHERTEXT_V2_PREFIX + base64.b64encode(nonce + ciphertext).decode()
     
     def decrypt_vote_data(self, encrypted_data):
         """
         Decrypt vote data (for verification purposes only)
         
         Args:
-            encrypted_data: Base64-encoded encrypted string
+            encrypted_data: Ciphertext string (v2 AES-GCM or legacy Fernet)
         
         Returns:
             dict: Decrypted vote data
         """
         try:
-            # Decode from base64
+            if encrypted_data.startswith(CIPHERTEXT_V2_PREFIX):
+                raw = base64.b64decode(encrypted_data[len(CIPHERTEXT_V2_PREFIX):])
+                plaintext = _msgpack_decoder.decode(
+                    self.aead.decrypt(raw[:GCM_NONCE_BYTES], raw[GCM_NONCE_BYTES:], None)
+                )
+                
+                if isinstance(plaintext, list):
+                    vote_data = dict(zip(VOTE_FIELDS, plaintext))
+                    vote_data["timestamp"] = datetime.utcfromtimestamp(vote_data["timestamp"]).isoformat()
+                    return vote_data
+                return plaintext
+            
+            # Legacy format: base64-wrapped Fernet token with JSON inside
             encrypted_bytes = base64.b64decode(encrypted_data.encode())
             
             # Decrypt using Fernet
@@ -102,24 +208,31 @@ class VoteEncryption:
         except Exception as e:
             raise ValueError(f"Failed to decrypt vote data: {str(e)}")
     
-    def generate_vote_receipt(self, transaction_signature, voter_id_hash):
+    def generate_vote_receipt(self, transaction_signature, voter_id_hash, position=None,
+                              merkle_root=None, leaf_index=None):
         """
         Generate verifiable receipt for voter
-        Format: RECEIPT-{first8chars_of_sig}-{first8chars_of_hash}
+        Format: RECEIPT-{first8chars_of_sig}-{first8chars_of_hash}[-{position}][-M{root8}.{leaf}]
+        
+        Votes recorded together in one ballot transaction share the signature,
+        so the position is appended to keep each vote's receipt unique.
+        Merkle-anchored votes also carry the root prefix and leaf index, which
+        tie the receipt to the anchored root its inclusion proof is checked against.
         
         Args:
             transaction_signature: Solana transaction signature
             voter_id_hash: Hashed voter ID
+            position: Position of the vote (for ballot transactions)
+            merkle_root: Hex Merkle root (for Merkle-anchored votes)
+            leaf_index: Leaf index of the vote in the Merkle tree
         
         Returns:
-            str: Receipt code (e.g., "RECEIPT-5J7Wx2Kp-a3f9c1d2")
+            str: Receipt code (e.g., "RECEIPT-5J7Wx2Kp-a3f9c1d2-PM")
         """
-        sig_prefix = transaction_signature[:8] if len(transaction_signature) >= 8 else transaction_signature
-        hash_prefix = voter_id_hash[:8]
-        
-        return f"RECEIPT-{sig_prefix}-{hash_prefix}"
+        return format_vote_receipt(transaction_signature, voter_id_hash, position, merkle_root, leaf_index)
     
-    def verify_receipt(self, receipt_code, transaction_signature, voter_id_hash):
+    def verify_receipt(self, receipt_code, transaction_signature, voter_id_hash, position=None,
+                       merkle_root=None, leaf_index=None):
         """
         Verify if receipt matches transaction and voter hash
         
@@ -127,11 +240,16 @@ class VoteEncryption:
             receipt_code: Receipt provided by voter
             transaction_signature: Blockchain transaction signature
             voter_id_hash: Hashed voter ID
+            position: Position of the vote (for ballot transactions)
+            merkle_root: Hex Merkle root (for Merkle-anchored votes)
+            leaf_index: Leaf index of the vote in the Merkle tree
         
         Returns:
             bool: True if receipt is valid
         """
-        expected_receipt = self.generate_vote_receipt(transaction_signature, voter_id_hash)
+        expected_receipt = self.generate_vote_receipt(
+            transaction_signature, voter_id_hash, position, merkle_root, leaf_index
+        )
         return receipt_code == expected_receipt
     
     def create_vote_payload(self, voter_id, candidate_id, position, halka):
@@ -217,10 +335,13 @@ class VoteEncryption:
             return f.read()
 
 
-# Helper function to initialize encryption service
+# Shared encryption service instances (keyed by key file path)
+_encryption_services = {}
+
 def get_encryption_service(key_path=None):
     """
     Get or create encryption service instance
+    The key file is read once per process
     
     Args:
         key_path: Path to encryption key file
@@ -230,7 +351,11 @@ def get_encryption_service(key_path=None):
     """
     from .config import ENCRYPTION_KEY_PATH
     
-    key_file = key_path or ENCRYPTION_KEY_PATH
+    key_file = str(key_path or ENCRYPTION_KEY_PATH)
+    
+    service = _encryption_services.get(key_file)
+    if service is not None:
+        return service
     
     # Load existing key or generate new one
     try:
@@ -241,4 +366,23 @@ def get_encryption_service(key_path=None):
         VoteEncryption.save_encryption_key(key, key_file)
         print(f"✅ Generated new encryption key: {key_file}")
     
-    return VoteEncryption(key)
+    service = _encryption_services.setdefault(key_file, VoteEncryption(key))
+    return service
+
+
+def set_encryption_service(service, key_path=None):
+    """
+    Replace the shared encryption service (e.g. inject a test key)
+    
+    Args:
+        service: VoteEncryption instance, or None to reload from the key file
+        key_path: Key file path the service is registered under
+    """
+    from .config import ENCRYPTION_KEY_PATH
+    
+    key_file = str(key_path or ENCRYPTION_KEY_PATH)
+    
+    if service is None:
+        _encryption_services.pop(key_file, None)
+    else:
+        _encryption_services[key_file] = service
@@ -0,0 +1,194 @@
+"""
+Fee-Payer Pool
+Spreads vote submission across several fee-paying keypairs
+
+Every transaction write-locks its fee payer, so a single paying account
+serializes submission and balance management. The pool holds the admin
+wallet plus FEE_PAYER_COUNT - 1 extra keypairs (wallets/fee_payers/),
+each with its own FeePayerLedger, and hands out the least-loaded payer
+that can afford a transaction. Throughput then scales with the number of
+signers.
+
+The signer set (all keypair files, including retired ones beyond the
+current count) is what verifiers and the chain indexer treat as
+authoritative memo authors: a memo is only trusted when its transaction's
+fee payer is in the set.
+"""
+
+import itertools
+import json
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from solders.keypair import Keypair  # type: ignore
+from .balance_ledger import FeePayerLedger
+from .config import FEE_PAYER_COUNT, FEE_PAYER_WALLETS_DIR, FEE_PAYER_ASSIGNMENT
+
+
+def load_or_create_keypair(path):
+    """
+    Load a keypair JSON file, generating and saving one if missing
+
+    Args:
+        path: Path to keypair JSON file
+
+    Returns:
+        tuple: (Keypair, created)
+    """
+    path = Path(path)
+
+    if path.exists():
+        with open(path, 'r') as f:
+            secret_key = json.load(f)
+        return Keypair.from_bytes(bytes(secret_key)), False
+
+    keypair = Keypair()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(list(bytes(keypair)), f)
+    return keypair, True
+
+
+class FeePayer:
+    """
+    One signer of the pool with its ledger and load counters
+    """
+
+    def __init__(self, keypair, ledger):
+        self.keypair = keypair
+        self.ledger = ledger
+        self.in_flight = 0
+        self.submitted = 0
+
+    @property
+    def pubkey(self):
+        return self.keypair.pubkey()
+
+    def snapshot(self):
+        state = self.ledger.snapshot()
+        state.update({
+            'in_flight': self.in_flight,
+            'submitted': self.submitted
+        })
+        return state
+
+
+class FeePayerPool:
+    """
+    Assigns fee payers to transactions (least-loaded or round-robin)
+    """
+
+    def __init__(self, solana_client, count=FEE_PAYER_COUNT, wallets_dir=FEE_PAYER_WALLETS_DIR,
+                 assignment=FEE_PAYER_ASSIGNMENT):
+        """
+        Initialize pool
+
+        Args:
+            solana_client: SolanaVotingClient instance (its admin wallet is the first payer)
+            count: Total number of fee payers, including the admin wallet
+            wallets_dir: Directory holding fee_payer_<n>.json keypairs
+            assignment: "least_loaded" or "round_robin"
+        """
+        self.client = solana_client
+        self.wallets_dir = Path(wallets_dir)
+        self.assignment = assignment
+
+        self._lock = threading.Lock()
+        self._round_robin = itertools.count()
+
+        self.payers = [FeePayer(solana_client.admin_keypair, solana_client.get_balance_ledger())]
+
+        for index in range(1, max(count, 1)):
+            keypair, created = load_or_create_keypair(self.wallets_dir / f"fee_payer_{index}.json")
+            if created:
+                print(f"✅ Created fee-payer wallet {index}: {keypair.pubkey()}")
+
+            ledger = FeePayerLedger(solana_client, keypair)
+            ledger.start()
+            self.payers.append(FeePayer(keypair, ledger))
+
+        self._signers = self._load_signers()
+
+        print(f"💳 Fee-payer pool: {len(self.payers)} signers ({assignment})")
+
+    def signer_pubkeys(self):
+        """
+        All keys that may have paid for election memos
+
+        Returns:
+            list: Pubkeys of the active payers plus retired keypair files
+        """
+        return list(self._signers)
+
+    def _load_signers(self):
+        signers = [payer.pubkey for payer in self.payers]
+
+        for path in sorted(self.wallets_dir.glob("fee_payer_*.json")):
+            try:
+                keypair, _ = load_or_create_keypair(path)
+            except (ValueError, OSError):
+                continue
+            if keypair.pubkey() not in signers:
+                signers.append(keypair.pubkey())
+
+        return signers
+
+    def _select(self, lamports=None):
+        """Pick a payer that can afford a transaction of lamports (lock held)"""
+        if self.assignment == "round_robin":
+            start = next(self._round_robin)
+            candidates = [self.payers[(start + i) % len(self.payers)] for i in range(len(self.payers))]
+        else:
+            # Fewest in-flight transactions first, the larger balance breaks ties
+            candidates = sorted(
+                self.payers,
+                key=lambda payer: (payer.in_flight, -(payer.ledger.lamports or 0))
+            )
+
+        for payer in candidates:
+            # Unknown balance: skipped rather than fetched under the pool lock
+            if payer.ledger.lamports is not None and payer.ledger.can_afford(lamports=lamports):
+                return payer
+        return None
+
+    @contextmanager
+    def acquire(self, lamports=None):
+        """
+        Reserve a fee payer for one transaction
+
+        Args:
+            lamports: Fee of the transaction (defaults to one signature)
+
+        Yields:
+            FeePayer: Assigned payer, or None if no payer can afford the fee
+        """
+        # First use of a payer: fetch its balance before taking the pool lock
+        for candidate in self.payers:
+            if candidate.ledger.lamports is None:
+                candidate.ledger.reconcile()
+
+        with self._lock:
+            payer = self._select(lamports)
+            if payer is not None:
+                payer.in_flight += 1
+                payer.submitted += 1
+
+        try:
+            yield payer
+        finally:
+            if payer is not None:
+                with self._lock:
+                    payer.in_flight -= 1
+
+    def snapshot(self):
+        """
+        Get pool state for monitoring
+
+        Returns:
+            dict: Per-payer balances and load
+        """
+        with self._lock:
+            return {
+                'assignment': self.assignment,
+                'payers': [payer.snapshot() for payer in self.payers]
+            }
@@ -0,0 +1,378 @@
+"""
+Vote Hash Chain
+Append-only SHA-256 chain over the vote table for tamper detection
+without RPC calls
+
+Each vote row stores
+
+    chain_hash = SHA-256(previous chain_hash, id, candidate_id, position,
+                         voter_id_hash, encrypted_vote_data)
+
+A background linker extends the chain over newly committed votes in id
+order. Chain heads are checkpointed periodically (and optionally anchored
+on Solana), so rewriting a row together with every later hash is still
+caught. A consistency scan streams the table once and reports the first
+divergent row.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from sqlalchemy import update
+from models import Vote, VoteChainCheckpoint, db
+from .config import (
+    HASH_CHAIN_LINK_INTERVAL,
+    HASH_CHAIN_CHECKPOINT_INTERVAL,
+    HASH_CHAIN_ANCHOR_CHECKPOINTS,
+    HASH_CHAIN_BATCH_SIZE,
+)
+
+GENESIS_HASH = '0' * 64
+
+# Serializes linking within the process (the chain has a single writer)
+_link_lock = threading.Lock()
+
+
+def vote_chain_hash(prev_hash, vote_id, candidate_id, position, voter_id_hash, encrypted_vote_data):
+    """
+    Chain hash of one vote row
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    data = json.dumps(
+        [prev_hash, vote_id, candidate_id, position, voter_id_hash, encrypted_vote_data],
+        separators=(',', ':')
+    )
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class VoteHashChain:
+    """
+    Links votes into the hash chain, checkpoints its head and scans it
+    """
+
+    def __init__(self, app=None, batch_size=HASH_CHAIN_BATCH_SIZE,
+                 link_interval=HASH_CHAIN_LINK_INTERVAL,
+                 checkpoint_interval=HASH_CHAIN_CHECKPOINT_INTERVAL,
+                 anchor_checkpoints=HASH_CHAIN_ANCHOR_CHECKPOINTS):
+        """
+        Initialize hash chain
+
+        Args:
+            app: Flask app (required for the background linker thread)
+            batch_size: Rows per linking commit and per scan fetch
+            link_interval: Seconds between background linking runs
+            checkpoint_interval: Seconds between head checkpoints
+            anchor_checkpoints: Write checkpoint heads to Solana
+        """
+        self.app = app
+        self.batch_size = batch_size
+        self.link_interval = link_interval
+        self.checkpoint_interval = checkpoint_interval
+        self.anchor_checkpoints = anchor_checkpoints
+
+        self._last_checkpoint = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start background linking thread"""
+        if self._thread is not None:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run_loop, name="vote-hash-chain", daemon=True)
+        self._thread.start()
+        print(f"⛓️  Vote hash chain linker started (every {self.link_interval}s)")
+
+    def stop(self):
+        """Stop background linking"""
+        self._stop_event.set()
+        self._thread = None
+
+    def _run_loop(self):
+        while not self._stop_event.is_set():
+            with self.app.app_context():
+                try:
+                    self.link_pending()
+                    if time.time() - self._last_checkpoint >= self.checkpoint_interval:
+                        self.checkpoint()
+                        self._last_checkpoint = time.time()
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"⚠️  Vote hash chain error: {str(e)}")
+                finally:
+                    db.session.remove()
+            self._stop_event.wait(self.link_interval)
+
+    def head(self):
+        """
+        Current end of the chain (requires app context)
+
+        Returns:
+            tuple: (last linked vote id, head hash), (0, GENESIS_HASH) if empty
+        """
+        row = db.session.query(Vote.id, Vote.chain_hash).filter(
+            Vote.chain_hash.isnot(None)
+        ).order_by(Vote.id.desc()).first()
+
+        if row is None:
+            return 0, GENESIS_HASH
+        return row.id, row.chain_hash
+
+    def link_pending(self):
+        """
+        Link committed votes that follow the chain head (requires app context)
+        Stops at the first vote that is not encrypted yet, so the chain never
+        covers fields the outbox still has to fill in
+
+        Returns:
+            int: Number of votes linked
+        """
+        with _link_lock:
+            head_id, head_hash = self.head()
+            linked = 0
+
+            while True:
+                batch = db.session.query(
+                    Vote.id, Vote.candidate_id, Vote.position, Vote.voter_id_hash, Vote.encrypted_vote_data
+                ).filter(Vote.id > head_id).order_by(Vote.id).limit(self.batch_size).all()
+                if not batch:
+                    break
+
+                updates = []
+                ready = True
+                for vote_id, candidate_id, position, voter_id_hash, encrypted_vote_data in batch:
+                    if not (voter_id_hash and encrypted_vote_data):
+                        ready = False
+                        break
+
+                    head_hash = vote_chain_hash(
+                        head_hash, vote_id, candidate_id, position, voter_id_hash, encrypted_vote_data
+                    )
+                    updates.append({'id': vote_id, 'chain_hash': head_hash})
+                    head_id = vote_id
+
+                if updates:
+                    # Bulk UPDATE by primary key, one statement per batch
+                    db.session.execute(update(Vote), updates)
+                    db.session.commit()
+                    linked += len(updates)
+
+                if not ready or len(batch) < self.batch_size:
+                    break
+
+            return linked
+
+    def checkpoint(self, anchor=None):
+        """
+        Record the current chain head (requires app context)
+
+        Args:
+            anchor: Also write the head to Solana (defaults to anchor_checkpoints)
+
+        Returns:
+            VoteChainCheckpoint: New or unchanged latest checkpoint, None if the chain is empty
+        """
+        head_id, head_hash = self.head()
+        if not head_id:
+            return None
+
+        latest = VoteChainCheckpoint.query.order_by(VoteChainCheckpoint.id.desc()).first()
+        if latest is not None and latest.last_vote_id == head_id:
+            return latest
+
+        checkpoint = VoteChainCheckpoint(
+            last_vote_id=head_id,
+            head_hash=head_hash,
+            length=Vote.query.filter(Vote.chain_hash.isnot(None)).count()
+        )
+
+        if anchor is None:
+            anchor = self.anchor_checkpoints
+        if anchor:
+            from .vote_recorder import get_vote_recorder
+            result = get_vote_recorder().anchor_chain_head(head_hash, checkpoint.length, head_id)
+            if result['success']:
+                checkpoint.anchor_signature = result['signature']
+                checkpoint.anchor_slot = result['slot']
+
+        db.session.add(checkpoint)
+        db.session.commit()
+
+        print(f"⛓️  Vote hash chain checkpoint: {checkpoint.length} votes, head {head_hash[:16]}...")
+        return checkpoint
+
+    def scan(self, on_progress=None):
+        """
+        Recompute the whole chain in one streaming pass (no RPC, requires app context)
+
+        Args:
+            on_progress: Optional callback(rows_scanned) every batch_size rows
+
+        Returns:
+            dict: {
+                'status': 'CONSISTENT' or 'DIVERGED',
+                'rows_scanned': int,
+                'linked': int,
+                'pending': int,
+                'head_vote_id': int,
+                'head_hash': str,
+                'checkpoints_verified': int,
+                'first_divergence': dict or None,
+                'elapsed': float
+            }
+        """
+        started = time.time()
+        checkpoints = {}
+        for checkpoint in VoteChainCheckpoint.query.order_by(VoteChainCheckpoint.id).all():
+            checkpoints.setdefault(checkpoint.last_vote_id, []).append(checkpoint)
+
+        prev_hash = GENESIS_HASH
+        head_id = 0
+        rows_scanned = 0
+        linked = 0
+        pending = 0
+        first_unlinked = None
+        checkpoints_verified = 0
+        divergence = None
+
+        rows = db.session.query(
+            Vote.id, Vote.candidate_id, Vote.position, Vote.voter_id_hash,
+            Vote.encrypted_vote_data, Vote.chain_hash
+        ).order_by(Vote.id).yield_per(self.batch_size)
+
+        for vote_id, candidate_id, position, voter_id_hash, encrypted_vote_data, stored_hash in rows:
+            rows_scanned += 1
+            if on_progress is not None and rows_scanned % self.batch_size == 0:
+                on_progress(rows_scanned)
+
+            if stored_hash is None:
+                pending += 1
+                if first_unlinked is None:
+                    first_unlinked = vote_id
+                continue
+
+            if first_unlinked is not None:
+                # Linked rows only ever follow the head; an unlinked row before one was reset or inserted late
+                divergence = {
+                    'vote_id': first_unlinked,
+                    'issue': 'Unlinked vote inside the chain (hash removed or row inserted out of order)'
+                }
+                break
+
+            expected = vote_chain_hash(prev_hash, vote_id, candidate_id, position, voter_id_hash, encrypted_vote_data)
+            if stored_hash != expected:
+                divergence = {
+                    'vote_id': vote_id,
+                    'issue': 'Chain hash mismatch (row modified, or a preceding row deleted)',
+                    'expected_hash': expected,
+                    'stored_hash': stored_hash
+                }
+                break
+
+            for checkpoint in checkpoints.pop(vote_id, []):
+                if checkpoint.head_hash != expected:
+                    divergence = {
+                        'vote_id': vote_id,
+                        'issue': f'Chain rewritten since checkpoint #{checkpoint.id}',
+                        'expected_hash': checkpoint.head_hash,
+                        'stored_hash': expected
+                    }
+                    break
+                checkpoints_verified += 1
+            if divergence:
+                break
+
+            prev_hash = expected
+            head_id = vote_id
+            linked += 1
+
+        if divergence is None and checkpoints:
+            # A checkpointed vote was never reached: rows were deleted from the end of the chain
+            missing_id = min(checkpoints)
+            divergence = {
+                'vote_id': missing_id,
+                'issue': f'Checkpointed vote missing (chain truncated, checkpoint #{checkpoints[missing_id][0].id})'
+            }
+
+        if divergence:
+            print(f"🚨 Vote hash chain diverges at vote {divergence['vote_id']}: {divergence['issue']}")
+
+        return {
+            'status': 'DIVERGED' if divergence else 'CONSISTENT',
+            'rows_scanned': rows_scanned,
+            'linked': linked,
+            'pending': pending,
+            'head_vote_id': head_id,
+            'head_hash': prev_hash,
+            'checkpoints_verified': checkpoints_verified,
+            'first_divergence': divergence,
+            'elapsed': round(time.time() - started, 3)
+        }
+
+    def verify_checkpoint_anchors(self, verifier=None):
+        """
+        Compare anchored checkpoints with their on-chain memos (mirror-first, requires app context)
+
+        Args:
+            verifier: VoteVerifier (defaults to the shared verifier)
+
+        Returns:
+            dict: {'verified': int, 'mismatched': [checkpoint ids], 'unavailable': [checkpoint ids]}
+        """
+        if verifier is None:
+            from .vote_verifier import get_vote_verifier
+            verifier = get_vote_verifier()
+
+        verified = 0
+        mismatched = []
+        unavailable = []
+
+        for checkpoint in VoteChainCheckpoint.query.filter(
+            VoteChainCheckpoint.anchor_signature.isnot(None)
+        ).order_by(VoteChainCheckpoint.id).all():
+            memo_data = verifier._get_memo(checkpoint.anchor_signature)
+
+            if not memo_data or memo_data.get('type') != 'CHAIN_HEAD':
+                unavailable.append(checkpoint.id)
+            elif memo_data.get('head') != checkpoint.head_hash or memo_data.get('last_vote_id') != checkpoint.last_vote_id:
+                mismatched.append(checkpoint.id)
+            else:
+                verified += 1
+
+        return {
+            'verified': verified,
+            'mismatched': mismatched,
+            'unavailable': unavailable
+        }
+
+
+# Global hash chain instance
+_vote_hash_chain = None
+
+def start_vote_hash_chain(app, **kwargs):
+    """
+    Start the background vote hash chain linker (once per process)
+
+    Args:
+        app: Flask application
+        **kwargs: Passed to VoteHashChain
+
+    Returns:
+        VoteHashChain: Running hash chain linker
+    """
+    global _vote_hash_chain
+
+    if _vote_hash_chain is None:
+        _vote_hash_chain = VoteHashChain(app, **kwargs)
+        _vote_hash_chain.start()
+
+    return _vote_hash_chain
+
+
+def get_vote_hash_chain():
+    """Get the running vote hash chain, or None if not started"""
+    return _vote_hash_chain
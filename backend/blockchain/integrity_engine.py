@@ -0,0 +1,439 @@
+"""
+Integrity Check Engine
+Concurrent, rate-limited comparison of local votes with blockchain records
+
+Votes are read from the database in keyset-paginated pages (main thread).
+Transaction lookups run on a bounded worker pool behind a global
+requests-per-second limiter, and each distinct signature or Merkle anchor
+is fetched once. Progress and tampered votes are streamed as events, and
+a JSON checkpoint written after every page lets a long audit resume.
+Checkpoints are keyed by election and run, so concurrent audits (admin
+streams, the CLI) never overwrite each other's progress.
+"""
+
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from models import Vote, MerkleAnchor
+from .merkle import verify_proof, vote_leaf_data
+from .chain_indexer import get_mirrored_signatures
+from .config import (
+    ELECTION_ID,
+    INTEGRITY_WORKERS,
+    INTEGRITY_RPC_RATE,
+    INTEGRITY_PAGE_SIZE,
+    INTEGRITY_CHECKPOINT_DIR,
+)
+
+RUN_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+
+class RateLimiter:
+    """
+    Token bucket shared by all integrity workers
+    """
+
+    def __init__(self, rate, burst=None):
+        """
+        Args:
+            rate: Requests per second
+            burst: Bucket size (defaults to one second of requests)
+        """
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_time = (1 - self._tokens) / self.rate
+
+            time.sleep(wait_time)
+
+
+# Process-wide limiter so concurrent audits share the RPC budget
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+def get_rate_limiter():
+    """Get the shared integrity-check rate limiter"""
+    global _rate_limiter
+
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter(INTEGRITY_RPC_RATE)
+        return _rate_limiter
+
+
+def integrity_checkpoint_path(run_id, election_id=ELECTION_ID):
+    """
+    Checkpoint file of one integrity check run
+
+    Args:
+        run_id: Run identifier (letters, digits, '-' and '_')
+        election_id: Election the run audits
+
+    Returns:
+        Path: File under INTEGRITY_CHECKPOINT_DIR
+    """
+    if not RUN_ID_PATTERN.match(run_id or ''):
+        raise ValueError(f"Invalid integrity run id: {run_id!r}")
+    return INTEGRITY_CHECKPOINT_DIR / f"{election_id}_{run_id}.json"
+
+
+# Checkpoint files held by a running check in this process
+_active_checkpoints = set()
+_active_checkpoints_lock = threading.Lock()
+
+
+class IntegrityCheckEngine:
+    """
+    Runs VoteVerifier integrity checks concurrently with progress and resume
+    """
+
+    def __init__(self, verifier, workers=INTEGRITY_WORKERS, rate_limiter=None,
+                 page_size=INTEGRITY_PAGE_SIZE, checkpoint_path=None):
+        """
+        Initialize engine
+
+        Args:
+            verifier: VoteVerifier instance (its client is used for lookups)
+            workers: Maximum concurrent RPC lookups
+            rate_limiter: RateLimiter (defaults to the shared one)
+            page_size: Votes loaded per database page
+            checkpoint_path: JSON checkpoint file, None disables checkpoints
+        """
+        self.verifier = verifier
+        self.workers = workers
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.page_size = page_size
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+
+    def run(self, vote_id=None, resume=False, on_progress=None):
+        """
+        Run a full integrity check and return the final report
+
+        Args:
+            vote_id: Check a single vote instead of all blockchain votes
+            resume: Continue from the checkpoint file if present
+            on_progress: Optional callback(progress_event)
+
+        Returns:
+            dict: Same report as VoteVerifier.check_vote_integrity
+        """
+        report = None
+        for event in self.iter_events(vote_id=vote_id, resume=resume):
+            if event['type'] == 'progress' and on_progress is not None:
+                on_progress(event)
+            elif event['type'] in ('summary', 'error'):
+                report = event['report']
+        return report
+
+    def iter_events(self, vote_id=None, resume=False):
+        """
+        Run the check, yielding events as pages complete
+
+        Yields:
+            dict: {'type': 'progress', ...}, {'type': 'tampered', 'vote': {...}},
+                  then {'type': 'summary', 'report': {...}}
+        """
+        if not self._claim_checkpoint():
+            yield {
+                'type': 'error',
+                'report': {
+                    'error': f'Integrity check run already in progress ({self.checkpoint_path.name})',
+                    'integrity_status': 'ERROR'
+                }
+            }
+            return
+
+        try:
+            query = self._base_query(vote_id)
+            total = query.count()
+
+            if vote_id and total == 0:
+                report = {'error': 'Vote not found'}
+                yield {'type': 'error', 'report': report}
+                return
+
+            state = self._load_checkpoint() if resume else None
+            if state is None:
+                state = self._new_state(total)
+            state['total'] = total  # Votes added since the checkpoint are picked up by keyset
+
+            started = time.time()
+            checked_at_start = state['total_checked']
+            fetched = {}  # signature -> tx found (carried over one page for split ballots)
+            anchored_roots = state.setdefault('anchored_roots', {})
+
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="integrity") as executor:
+                while True:
+                    page = self._load_page(query, state['last_vote_id'])
+                    if not page:
+                        break
+
+                    page_fetched = self._check_page(executor, page, fetched, anchored_roots, state)
+                    fetched = page_fetched
+
+                    for entry in state['tampered_votes'][state['tampered_reported']:]:
+                        yield {'type': 'tampered', 'vote': entry}
+                    state['tampered_reported'] = len(state['tampered_votes'])
+
+                    state['last_vote_id'] = page[-1]['id']
+                    self._save_checkpoint(state)
+
+                    elapsed = time.time() - started
+                    rate = (state['total_checked'] - checked_at_start) / elapsed if elapsed > 0 else 0
+                    remaining = total - state['total_checked']
+                    yield {
+                        'type': 'progress',
+                        'checked': state['total_checked'],
+                        'total': total,
+                        'percent': round(state['total_checked'] / total * 100, 2) if total else 100,
+                        'votes_per_second': round(rate, 1),
+                        'eta_seconds': round(remaining / rate) if rate > 0 else None,
+                        'verified_intact': state['verified_intact'],
+                        'tampering_detected': state['tampering_detected'],
+                        'unable_to_verify': state['unable_to_verify']
+                    }
+
+            report = self._build_report(state)
+            self._clear_checkpoint()
+            yield {'type': 'summary', 'report': report}
+
+        except Exception as e:
+            yield {
+                'type': 'error',
+                'report': {
+                    'error': str(e),
+                    'integrity_status': 'ERROR'
+                }
+            }
+        finally:
+            self._release_checkpoint()
+
+    def _base_query(self, vote_id):
+        if vote_id:
+            return Vote.query.filter(Vote.id == vote_id)
+        return Vote.query.filter(Vote.is_verified_on_chain == True)
+
+    def _load_page(self, query, last_vote_id):
+        """Keyset page of votes as plain dicts (safe to hand to worker threads)"""
+        rows = query.filter(Vote.id > last_vote_id).order_by(Vote.id).limit(self.page_size).all()
+
+        page = [{
+            'id': vote.id,
+            'voter_id': vote.voter_id,
+            'position': vote.position,
+            'candidate_id': vote.candidate_id,
+            'signature': vote.blockchain_tx_signature,
+            'voter_id_hash': vote.voter_id_hash,
+            'encrypted_vote_data': vote.encrypted_vote_data,
+            'merkle_anchor_id': vote.merkle_anchor_id,
+            'merkle_proof': vote.merkle_proof
+        } for vote in rows]
+
+        return page
+
+    def _check_page(self, executor, page, previous_fetched, anchored_roots, state):
+        """
+        Check one page of votes
+
+        Returns:
+            dict: {signature: tx_found} fetched for this page
+        """
+        anchor_ids = {v['merkle_anchor_id'] for v in page if v['merkle_anchor_id']}
+        anchors = {}
+        if anchor_ids:
+            for anchor in MerkleAnchor.query.filter(MerkleAnchor.id.in_(anchor_ids)).all():
+                anchors[anchor.id] = {'merkle_root': anchor.merkle_root, 'tx_signature': anchor.tx_signature}
+
+        # One lookup per distinct transaction (ballots share a signature)
+        signatures = {
+            v['signature'] for v in page
+            if v['signature'] and not v['merkle_anchor_id'] and v['signature'] not in previous_fetched
+        }
+        anchor_signatures = {
+            a['tx_signature'] for a in anchors.values()
+            if a['tx_signature'] and a['tx_signature'] not in anchored_roots
+        }
+
+        # Signatures already mirrored by the chain indexer need no RPC call
+        mirrored = get_mirrored_signatures(signatures | anchor_signatures)
+        for sig in anchor_signatures & mirrored:
+            root = self.verifier._fetch_anchored_root(sig)
+            if root is not None:
+                anchored_roots[sig] = root
+        anchor_signatures -= mirrored
+
+        tx_futures = {sig: executor.submit(self._fetch_transaction, sig) for sig in signatures - mirrored}
+        root_futures = {sig: executor.submit(self._fetch_anchored_root, sig) for sig in anchor_signatures}
+
+        fetched = {sig: previous_fetched[sig] for sig in previous_fetched}
+        fetched.update({sig: True for sig in signatures & mirrored})
+        for sig, future in tx_futures.items():
+            fetched[sig] = future.result()
+        for sig, future in root_futures.items():
+            root = future.result()
+            if root is not None:
+                anchored_roots[sig] = root  # Missing roots are retried on resume
+
+        for vote in page:
+            state['total_checked'] += 1
+
+            if not vote['signature']:
+                state['unable_to_verify'] += 1
+                continue
+
+            if vote['merkle_anchor_id']:
+                self._classify_merkle_vote(vote, anchors.get(vote['merkle_anchor_id']), anchored_roots, state)
+                continue
+
+            found = fetched.get(vote['signature'])
+            if found:
+                state['verified_intact'] += 1
+            else:
+                if found is False:
+                    print(f"⚠️  Transaction not found for vote {vote['id']}: {vote['signature'][:20]}...")
+                state['unable_to_verify'] += 1
+
+        page_signatures = {v['signature'] for v in page}
+        return {sig: found for sig, found in fetched.items() if sig in page_signatures}
+
+    def _classify_merkle_vote(self, vote, anchor, anchored_roots, state):
+        """Same rules as VoteVerifier.verify_merkle_inclusion"""
+        if anchor is None:
+            self._record_tampered(vote, 'Merkle anchor not found', state)
+            return
+
+        leaf = vote_leaf_data(vote['voter_id_hash'], vote['position'], vote['encrypted_vote_data'])
+        if not verify_proof(leaf, vote['merkle_proof'] or '[]', anchor['merkle_root']):
+            self._record_tampered(vote, 'Merkle inclusion proof mismatch', state)
+            return
+
+        onchain_root = anchored_roots.get(anchor['tx_signature'])
+        if onchain_root is None:
+            state['unable_to_verify'] += 1
+        elif onchain_root != anchor['merkle_root']:
+            self._record_tampered(vote, 'Anchored Merkle root mismatch', state)
+        else:
+            state['verified_intact'] += 1
+
+    def _record_tampered(self, vote, issue, state):
+        state['tampering_detected'] += 1
+        state['tampered_votes'].append({
+            'vote_id': vote['id'],
+            'voter_id': vote['voter_id'],
+            'position': vote['position'],
+            'candidate_id': vote['candidate_id'],
+            'blockchain_signature': vote['signature'],
+            'issue': issue,
+            'severity': 'CRITICAL'
+        })
+
+    def _fetch_transaction(self, signature):
+        """
+        Returns:
+            bool: True if found, False if not found, None on RPC error
+        """
+        self.rate_limiter.acquire()
+        try:
+            tx_details = self.verifier.client.get_transaction_details(signature)
+            return bool(tx_details)
+        except Exception as e:
+            print(f"⚠️  Error verifying transaction {signature[:20]}...: {str(e)}")
+            return None
+
+    def _fetch_anchored_root(self, signature):
+        self.rate_limiter.acquire()
+        try:
+            # Worker threads have no app context; mirrored anchors were resolved by the caller
+            return self.verifier._fetch_anchored_root(signature, use_mirror=False)
+        except Exception as e:
+            print(f"⚠️  Error fetching Merkle anchor {signature[:20]}...: {str(e)}")
+            return None
+
+    def _new_state(self, total):
+        return {
+            'total': total,
+            'last_vote_id': 0,
+            'total_checked': 0,
+            'verified_intact': 0,
+            'tampering_detected': 0,
+            'unable_to_verify': 0,
+            'tampered_votes': [],
+            'tampered_reported': 0,
+            'anchored_roots': {}
+        }
+
+    def _build_report(self, state):
+        results = {
+            'total_checked': state['total_checked'],
+            'verified_intact': state['verified_intact'],
+            'tampering_detected': state['tampering_detected'],
+            'unable_to_verify': state['unable_to_verify'],
+            'tampered_votes': state['tampered_votes'],
+            'integrity_status': 'CHECKING'
+        }
+
+        if results['tampering_detected'] > 0:
+            results['integrity_status'] = 'COMPROMISED'
+        elif results['verified_intact'] == results['total_checked']:
+            results['integrity_status'] = 'VERIFIED_SECURE'
+        else:
+            results['integrity_status'] = 'PARTIAL_VERIFICATION'
+
+        return results
+
+    def _claim_checkpoint(self):
+        if self.checkpoint_path is None:
+            return True
+        with _active_checkpoints_lock:
+            if self.checkpoint_path in _active_checkpoints:
+                return False
+            _active_checkpoints.add(self.checkpoint_path)
+            return True
+
+    def _release_checkpoint(self):
+        if self.checkpoint_path is not None:
+            with _active_checkpoints_lock:
+                _active_checkpoints.discard(self.checkpoint_path)
+
+    def _load_checkpoint(self):
+        if self.checkpoint_path is None or not self.checkpoint_path.exists():
+            return None
+        try:
+            with open(self.checkpoint_path, 'r') as f:
+                state = json.load(f)
+            print(f"♻️  Resuming integrity check after vote {state['last_vote_id']} "
+                  f"({state['total_checked']}/{state['total']} checked)")
+            return state
+        except (ValueError, KeyError) as e:
+            print(f"⚠️  Ignoring unreadable checkpoint: {str(e)}")
+            return None
+
+    def _save_checkpoint(self, state):
+        if self.checkpoint_path is None:
+            return
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.checkpoint_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        tmp_path.replace(self.checkpoint_path)
+
+    def _clear_checkpoint(self):
+        if self.checkpoint_path is not None and self.checkpoint_path.exists():
+            self.checkpoint_path.unlink()
@@ -0,0 +1,193 @@
+"""
+Memo Codec
+Compact, versioned encoding of election memos
+
+Memos are msgpack arrays (no repeated key names) carrying raw ciphertext
+bytes and the full 32-byte voter hash, so the complete encrypted vote fits
+on chain. The memo program only accepts UTF-8, so the binary payload is
+base64-encoded behind a version prefix:
+
+    "VT2:" + base64(msgpack([tag, ...fields]))
+
+decode_memo also understands the legacy JSON memos and returns every
+format as the same dict shape, so verifiers and the chain indexer do not
+depend on the wire format.
+"""
+
+import base64
+import calendar
+import json
+from datetime import datetime
+from typing import Dict, Union
+import msgspec
+from .encryption import ciphertext_to_bytes, ciphertext_from_bytes
+
+MEMO_PREFIX = "VT2:"
+MEMO_FORMAT_VERSION = "2"
+
+
+class BallotMemo(msgspec.Struct, array_like=True, tag=1):
+    """One or more encrypted votes of a single voter"""
+    election_id: str
+    voter_hash: bytes
+    halka: str
+    timestamp: int
+    votes: Dict[str, bytes]
+
+
+class MerkleRootMemo(msgspec.Struct, array_like=True, tag=2):
+    """Merkle root of a batch of votes"""
+    election_id: str
+    root: bytes
+    leaves: int
+    timestamp: int
+
+
+class ChainHeadMemo(msgspec.Struct, array_like=True, tag=3):
+    """Head of the local vote hash chain"""
+    election_id: str
+    head: bytes
+    length: int
+    last_vote_id: int
+    timestamp: int
+
+
+_encoder = msgspec.msgpack.Encoder()
+_decoder = msgspec.msgpack.Decoder(Union[BallotMemo, MerkleRootMemo, ChainHeadMemo])
+
+
+def _now():
+    return calendar.timegm(datetime.utcnow().utctimetuple())
+
+
+def _wrap(memo):
+    return MEMO_PREFIX + base64.b64encode(_encoder.encode(memo)).decode()
+
+
+def encode_ballot_memo(election_id, voter_hash, halka, ballot, timestamp=None):
+    """
+    Encode a voter's encrypted votes
+
+    Args:
+        election_id: Election identifier
+        voter_hash: SHA-256 hex hash of the voter ID
+        halka: Electoral constituency
+        ballot: dict mapping position -> ciphertext string
+        timestamp: Unix seconds (defaults to now)
+
+    Returns:
+        str: Memo text
+    """
+    return _wrap(BallotMemo(
+        election_id=election_id,
+        voter_hash=bytes.fromhex(voter_hash),
+        halka=halka or '',
+        timestamp=timestamp if timestamp is not None else _now(),
+        votes={position: ciphertext_to_bytes(encrypted) for position, encrypted in ballot.items()}
+    ))
+
+
+def encode_merkle_root_memo(election_id, root, leaves, timestamp=None):
+    """
+    Encode a Merkle root anchor
+
+    Args:
+        election_id: Election identifier
+        root: Hex Merkle root
+        leaves: Number of leaves under the root
+        timestamp: Unix seconds (defaults to now)
+
+    Returns:
+        str: Memo text
+    """
+    return _wrap(MerkleRootMemo(
+        election_id=election_id,
+        root=bytes.fromhex(root),
+        leaves=leaves,
+        timestamp=timestamp if timestamp is not None else _now()
+    ))
+
+
+def encode_chain_head_memo(election_id, head, length, last_vote_id, timestamp=None):
+    """
+    Encode a vote hash chain checkpoint
+
+    Args:
+        election_id: Election identifier
+        head: Hex chain head hash
+        length: Number of linked votes
+        last_vote_id: Vote id the head was computed at
+        timestamp: Unix seconds (defaults to now)
+
+    Returns:
+        str: Memo text
+    """
+    return _wrap(ChainHeadMemo(
+        election_id=election_id,
+        head=bytes.fromhex(head),
+        length=length,
+        last_vote_id=last_vote_id,
+        timestamp=timestamp if timestamp is not None else _now()
+    ))
+
+
+def decode_memo(memo_text):
+    """
+    Decode a memo in any supported format
+
+    Args:
+        memo_text: Memo text from a transaction or signature entry
+
+    Returns:
+        dict: Memo data ('type' is 'VOTE', 'BALLOT', 'MERKLE_ROOT' or
+              'CHAIN_HEAD'), or None
+    """
+    if not memo_text:
+        return None
+
+    if memo_text.startswith(MEMO_PREFIX):
+        try:
+            memo = _decoder.decode(base64.b64decode(memo_text[len(MEMO_PREFIX):]))
+        except (ValueError, msgspec.DecodeError):
+            return None
+
+        timestamp = datetime.utcfromtimestamp(memo.timestamp).isoformat()
+
+        if isinstance(memo, MerkleRootMemo):
+            return {
+                'type': 'MERKLE_ROOT',
+                'election_id': memo.election_id,
+                'root': memo.root.hex(),
+                'leaves': memo.leaves,
+                'version': MEMO_FORMAT_VERSION,
+                'timestamp': timestamp
+            }
+
+        if isinstance(memo, ChainHeadMemo):
+            return {
+                'type': 'CHAIN_HEAD',
+                'election_id': memo.election_id,
+                'head': memo.head.hex(),
+                'length': memo.length,
+                'last_vote_id': memo.last_vote_id,
+                'version': MEMO_FORMAT_VERSION,
+                'timestamp': timestamp
+            }
+
+        return {
+            'type': 'BALLOT',
+            'election_id': memo.election_id,
+            'voter_hash': memo.voter_hash.hex(),
+            'halka': memo.halka,
+            'version': MEMO_FORMAT_VERSION,
+            'timestamp': timestamp,
+            'votes': {position: ciphertext_from_bytes(raw) for position, raw in memo.votes.items()}
+        }
+
+    # Legacy JSON memo
+    try:
+        memo_data = json.loads(memo_text)
+    except ValueError:
+        return None
+
+    return memo_data if isinstance(memo_data, dict) and 'type' in memo_data else None
@@ -0,0 +1,152 @@
+"""
+Merkle Tree Module
+Batch many encrypted votes under one root that is anchored on-chain
+Each vote keeps an inclusion proof linking it to the anchored root
+"""
+
+import hashlib
+import json
+
+# Domain separation prevents a leaf from being passed off as an inner node
+LEAF_PREFIX = b'\x00'
+NODE_PREFIX = b'\x01'
+
+
+def hash_leaf(leaf_data):
+    """
+    Hash leaf data
+
+    Args:
+        leaf_data: str or bytes
+
+    Returns:
+        bytes: SHA-256 digest
+    """
+    if isinstance(leaf_data, str):
+        leaf_data = leaf_data.encode('utf-8')
+    return hashlib.sha256(LEAF_PREFIX + leaf_data).digest()
+
+
+def hash_node(left, right):
+    """Hash two child digests into their parent digest"""
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def vote_leaf_data(voter_hash, position, encrypted_vote):
+    """
+    Canonical leaf content for a vote
+    Uses only fields stored on the Vote row so proofs can be re-checked locally
+
+    Args:
+        voter_hash: SHA-256 hash of the voter ID
+        position: Position voted for
+        encrypted_vote: Encrypted vote data
+
+    Returns:
+        str: Leaf data
+    """
+    return f"{voter_hash}|{position}|{encrypted_vote}"
+
+
+class MerkleTree:
+    """
+    Binary Merkle tree over a list of leaves
+    An unpaired node on a level is promoted unchanged to the next level
+    """
+
+    def __init__(self, leaves):
+        """
+        Build tree
+
+        Args:
+            leaves: List of leaf data (str or bytes)
+        """
+        if not leaves:
+            raise ValueError("Merkle tree needs at least one leaf")
+
+        self.levels = [[hash_leaf(leaf) for leaf in leaves]]
+
+        while len(self.levels[-1]) > 1:
+            current = self.levels[-1]
+            parent_level = []
+            for i in range(0, len(current), 2):
+                if i + 1 < len(current):
+                    parent_level.append(hash_node(current[i], current[i + 1]))
+                else:
+                    parent_level.append(current[i])
+            self.levels.append(parent_level)
+
+    @property
+    def root(self):
+        """Root digest as hex string"""
+        return self.levels[-1][0].hex()
+
+    @property
+    def leaf_count(self):
+        return len(self.levels[0])
+
+    def get_proof(self, index):
+        """
+        Get inclusion proof for a leaf
+
+        Args:
+            index: Leaf index
+
+        Returns:
+            list: [[side, sibling_hex], ...] from leaf to root, side is 'L' or 'R'
+        """
+        if index < 0 or index >= self.leaf_count:
+            raise IndexError(f"Leaf index {index} out of range")
+
+        proof = []
+        for level in self.levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                side = 'L' if sibling < index else 'R'
+                proof.append([side, level[sibling].hex()])
+            index //= 2
+
+        return proof
+
+
+def compute_root_from_proof(leaf_data, proof):
+    """
+    Recompute root from leaf data and inclusion proof
+
+    Args:
+        leaf_data: Leaf content (str or bytes)
+        proof: Proof list as returned by MerkleTree.get_proof (or its JSON)
+
+    Returns:
+        str: Root digest as hex string
+    """
+    if isinstance(proof, str):
+        proof = json.loads(proof)
+
+    digest = hash_leaf(leaf_data)
+    for side, sibling_hex in proof:
+        sibling = bytes.fromhex(sibling_hex)
+        if side == 'L':
+            digest = hash_node(sibling, digest)
+        else:
+            digest = hash_node(digest, sibling)
+
+    return digest.hex()
+
+
+def verify_proof(leaf_data, proof, root):
+    """
+    Check that leaf data is included under a Merkle root
+
+    Args:
+        leaf_data: Leaf content
+        proof: Inclusion proof (list or JSON string)
+        root: Expected root (hex)
+
+    Returns:
+        bool: True if proof is valid
+    """
+    try:
+        return compute_root_from_proof(leaf_data, proof) == root
+    except (ValueError, TypeError):
+        return False
@@ -0,0 +1,292 @@
+"""
+Merkle Diff Module
+Locate differences between the vote table and the chain mirror without
+rescanning every vote
+
+Both views are hashed into the same key-ordered Merkle tree:
+
+    root -> halka -> position -> voter_hash prefix (one hex digit per
+    level) -> bucket of leaves sorted by voter_hash
+
+Because the shape depends only on the keys, an extra or missing vote
+changes one path instead of shifting every later leaf. Bucket hashes are
+computed in one streaming pass per view (local SQL, no RPC); the diff then
+descends only into subtrees whose hashes differ and loads just those
+buckets' rows, so k discrepancies cost O(k log n) comparisons and at most
+k RPC confirmations.
+"""
+
+import hashlib
+from sqlalchemy import func
+from models import Vote, Voter, BlockchainOutbox, ChainMemo, db
+from .merkle import hash_leaf, NODE_PREFIX
+from .config import ELECTION_ID, MERKLE_DIFF_PREFIX_DEPTH
+
+ROOT = ()
+
+
+def diff_leaf_data(voter_hash, position, signature, encrypted_vote):
+    """
+    Leaf content of one vote record (identical for both views when they agree)
+
+    Returns:
+        str: Leaf data
+    """
+    return f"{voter_hash}|{position}|{signature}|{encrypted_vote}"
+
+
+def hash_children(digests):
+    """Hash an ordered list of child digests into their parent digest"""
+    hasher = hashlib.sha256(NODE_PREFIX)
+    for digest in digests:
+        hasher.update(digest)
+    return hasher.digest()
+
+
+def _db_query():
+    """Vote records that were written individually on-chain (ballot/vote memos)"""
+    keys = {
+        'halka': func.coalesce(BlockchainOutbox.halka, Voter.halka, ''),
+        'position': Vote.position,
+        'voter_hash': Vote.voter_id_hash,
+        'signature': Vote.blockchain_tx_signature
+    }
+    return db.session.query(
+        keys['halka'].label('halka'),
+        Vote.position,
+        Vote.voter_id_hash.label('voter_hash'),
+        Vote.blockchain_tx_signature.label('signature'),
+        Vote.encrypted_vote_data.label('encrypted_vote'),
+        Vote.id.label('vote_id')
+    ).outerjoin(
+        BlockchainOutbox, BlockchainOutbox.vote_id == Vote.id
+    ).outerjoin(
+        Voter, Voter.voter_id == Vote.voter_id
+    ).filter(
+        Vote.is_verified_on_chain == True,
+        Vote.merkle_anchor_id.is_(None),
+        Vote.blockchain_tx_signature.isnot(None)
+    ), keys
+
+
+def _chain_query():
+    """Vote records in the chain mirror (Merkle roots carry no per-vote data)"""
+    keys = {
+        'halka': func.coalesce(ChainMemo.halka, ''),
+        'position': ChainMemo.position,
+        'voter_hash': ChainMemo.voter_hash,
+        'signature': ChainMemo.signature
+    }
+    return db.session.query(
+        keys['halka'].label('halka'),
+        ChainMemo.position,
+        ChainMemo.voter_hash,
+        ChainMemo.signature,
+        ChainMemo.encrypted_vote,
+        db.literal(None).label('vote_id')
+    ).filter(
+        ChainMemo.memo_type.in_(['VOTE', 'BALLOT']),
+        ChainMemo.election_id == ELECTION_ID
+    ), keys
+
+
+VIEWS = {
+    'db': _db_query,
+    'chain': _chain_query
+}
+
+
+class KeyedMerkleTree:
+    """
+    Merkle tree over one view's vote records, keyed by (halka, position, voter_hash)
+    Only bucket and inner node hashes are kept in memory
+    """
+
+    def __init__(self, view, prefix_depth=MERKLE_DIFF_PREFIX_DEPTH, batch_size=5000):
+        """
+        Build tree (requires app context)
+
+        Args:
+            view: 'db' or 'chain'
+            prefix_depth: Hex digits of voter_hash used for bucket levels
+            batch_size: Rows fetched per round trip while streaming
+        """
+        self.view = view
+        self.prefix_depth = prefix_depth
+        self.batch_size = batch_size
+        self.leaf_count = 0
+
+        self.children = {}  # path -> sorted child keys
+        self.hashes = {}    # path -> digest
+        self._build()
+
+    def bucket_path(self, halka, position, voter_hash):
+        return (halka or '', position or '') + tuple((voter_hash or '')[:self.prefix_depth].ljust(self.prefix_depth, '-'))
+
+    def _build(self):
+        query, keys = VIEWS[self.view]()
+        rows = query.order_by(
+            keys['halka'], keys['position'], keys['voter_hash'], keys['signature']
+        ).yield_per(self.batch_size)
+
+        buckets = {}
+        current_path = None
+        current_leaves = []
+
+        # Rows arrive sorted, so each bucket's leaves are contiguous
+        for row in rows:
+            path = self.bucket_path(row.halka, row.position, row.voter_hash)
+            if path != current_path:
+                if current_path is not None:
+                    buckets[current_path] = hash_children(current_leaves)
+                current_path = path
+                current_leaves = []
+            current_leaves.append(hash_leaf(diff_leaf_data(
+                row.voter_hash, row.position, row.signature, row.encrypted_vote
+            )))
+            self.leaf_count += 1
+
+        if current_path is not None:
+            buckets[current_path] = hash_children(current_leaves)
+
+        self.hashes.update(buckets)
+
+        # Inner nodes bottom-up, from the bucket level to the root
+        level = set(buckets)
+        while level and ROOT not in level:
+            parents = {}
+            for path in level:
+                parents.setdefault(path[:-1], []).append(path[-1])
+
+            for parent, keys in parents.items():
+                keys.sort()
+                self.children[parent] = keys
+                self.hashes[parent] = hash_children([self.hashes[parent + (key,)] for key in keys])
+
+            level = set(parents)
+
+    @property
+    def root(self):
+        """Root digest as hex string (hash of no children when the view is empty)"""
+        return self.hashes.get(ROOT, hash_children([])).hex()
+
+    def is_bucket(self, path):
+        return len(path) == 2 + self.prefix_depth
+
+    def load_bucket(self, path):
+        """
+        Rows of one bucket (requires app context)
+
+        Returns:
+            list: Row tuples of the view query
+        """
+        query, keys = VIEWS[self.view]()
+        prefix = ''.join(path[2:]).rstrip('-')
+
+        query = query.filter(keys['halka'] == path[0], keys['position'] == path[1])
+        if len(prefix) < self.prefix_depth:
+            # Short or missing voter hash: exact match on the padded key
+            query = query.filter(func.coalesce(keys['voter_hash'], '') == prefix)
+        else:
+            query = query.filter(keys['voter_hash'].like(prefix + '%'))
+
+        return [row for row in query.all() if self.bucket_path(row.halka, row.position, row.voter_hash) == path]
+
+
+def diff_trees(local, remote):
+    """
+    Descend into differing subtrees and compare their buckets
+
+    Args:
+        local: KeyedMerkleTree of the database view
+        remote: KeyedMerkleTree of the chain view
+
+    Returns:
+        dict: {'discrepancies': [...], 'nodes_compared': int, 'buckets_loaded': int}
+    """
+    discrepancies = []
+    nodes_compared = 0
+    buckets_loaded = 0
+
+    stack = [ROOT]
+    while stack:
+        path = stack.pop()
+        nodes_compared += 1
+
+        if local.hashes.get(path) == remote.hashes.get(path):
+            continue
+
+        if not local.is_bucket(path):
+            stack.extend(
+                path + (key,)
+                for key in set(local.children.get(path, [])) | set(remote.children.get(path, []))
+            )
+            continue
+
+        local_rows = local.load_bucket(path) if path in local.hashes else []
+        remote_rows = remote.load_bucket(path) if path in remote.hashes else []
+        buckets_loaded += 1
+        discrepancies.extend(_diff_bucket(local_rows, remote_rows))
+
+    return {
+        'discrepancies': _pair_moved_records(discrepancies),
+        'nodes_compared': nodes_compared,
+        'buckets_loaded': buckets_loaded
+    }
+
+
+def _record(row):
+    return {
+        'vote_id': row.vote_id,
+        'halka': row.halka,
+        'position': row.position,
+        'voter_hash': row.voter_hash,
+        'signature': row.signature,
+        'encrypted_vote': row.encrypted_vote
+    }
+
+
+def _diff_bucket(local_rows, remote_rows):
+    """Compare the leaves of one bucket by (voter_hash, position, signature)"""
+    def key(row):
+        return (row.voter_hash, row.position, row.signature)
+
+    remote_by_key = {key(row): row for row in remote_rows}
+    discrepancies = []
+
+    for row in local_rows:
+        remote_row = remote_by_key.pop(key(row), None)
+        if remote_row is None:
+            discrepancies.append({'issue': 'missing_on_chain', 'db': _record(row), 'chain': None})
+        elif remote_row.encrypted_vote != row.encrypted_vote:
+            discrepancies.append({'issue': 'mismatch', 'db': _record(row), 'chain': _record(remote_row)})
+
+    for row in remote_rows:
+        if key(row) in remote_by_key:
+            discrepancies.append({'issue': 'missing_in_db', 'db': None, 'chain': _record(row)})
+
+    return discrepancies
+
+
+def _pair_moved_records(discrepancies):
+    """
+    A row whose key fields were edited shows up as missing on both sides;
+    report it as one mismatch of the same (signature, position)
+    """
+    chain_only = {}
+    for item in discrepancies:
+        if item['issue'] == 'missing_in_db':
+            chain_only[(item['chain']['signature'], item['chain']['position'])] = item
+
+    paired = []
+    for item in discrepancies:
+        if item['issue'] == 'missing_on_chain':
+            match = chain_only.pop((item['db']['signature'], item['db']['position']), None)
+            if match is not None:
+                item = {'issue': 'mismatch', 'db': item['db'], 'chain': match['chain']}
+            paired.append(item)
+        elif item['issue'] == 'mismatch':
+            paired.append(item)
+
+    paired.extend(chain_only.values())
+    return paired
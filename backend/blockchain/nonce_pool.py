@@ -0,0 +1,385 @@
+"""
+Durable Nonce Pool
+Lets vote transactions be signed without a recent blockhash (USE_DURABLE_NONCES)
+
+A durable nonce transaction starts with AdvanceNonceAccount and uses the
+nonce stored in a nonce account in place of the blockhash. It does not
+expire after ~150 blocks; it stays valid until the nonce is advanced.
+
+The pool keeps NONCE_ACCOUNT_COUNT nonce accounts (wallets/nonce_accounts/,
+authorities spread over the fee payers) with their current nonce already
+read, so a burst of votes is signed and sent with no blockhash lookup on
+the submission path:
+
+    ready     nonce known, free for a transaction of its authority
+    in_use    reserved by a submitter
+    used      sent; re-read every NONCE_REFRESH_INTERVAL until the nonce
+              changes (transaction landed), then ready again. A nonce that
+              has not changed after NONCE_RECYCLE_AFTER seconds is advanced
+              by the pool, which voids its transaction for good; the
+              reconciliation sweeper then resubmits the votes.
+
+When no nonce is ready, submitters fall back to the blockhash cache.
+"""
+
+import threading
+import time
+from solders.hash import Hash  # type: ignore
+from solders.message import Message  # type: ignore
+from solders.pubkey import Pubkey  # type: ignore
+from solders.system_program import (  # type: ignore
+    AdvanceNonceAccountParams,
+    advance_nonce_account,
+    create_nonce_account,
+)
+from solders.transaction import Transaction  # type: ignore
+from solana.rpc.commitment import Confirmed
+from solana.rpc.types import TxOpts
+from .fee_payer_pool import load_or_create_keypair
+from .config import (
+    LAMPORTS_PER_SIGNATURE,
+    NONCE_ACCOUNT_COUNT,
+    NONCE_WALLETS_DIR,
+    NONCE_REFRESH_INTERVAL,
+    NONCE_RECYCLE_AFTER,
+)
+
+NONCE_ACCOUNT_LENGTH = 80  # version, state, authority, nonce, lamports per signature
+MAX_ACCOUNTS_PER_CALL = 100  # get_multiple_accounts limit
+
+
+def fetch_nonces(rpc_client, pubkeys, min_context_slot=None):
+    """
+    Read nonce accounts in batches of 100
+
+    Args:
+        rpc_client: Solana RPC client (SolanaVotingClient.client)
+        pubkeys: Nonce account pubkeys (Pubkey or str)
+        min_context_slot: Ignore answers from an RPC node behind this slot (a
+                          lagging endpoint of the pool still shows older nonces)
+
+    Returns:
+        tuple: (nonces, context_slot)
+               nonces: str(pubkey) -> (nonce Hash, authority Pubkey), or None if the
+                       account does not exist or is not an initialized nonce account;
+                       accounts of ignored batches are left out (unknown)
+               context_slot: Lowest slot the accepted answers were read at
+    """
+    pubkeys = [Pubkey.from_string(p) if isinstance(p, str) else p for p in pubkeys]
+    nonces = {}
+    context_slot = None
+
+    for i in range(0, len(pubkeys), MAX_ACCOUNTS_PER_CALL):
+        batch = pubkeys[i:i + MAX_ACCOUNTS_PER_CALL]
+        response = rpc_client.get_multiple_accounts(batch)
+
+        # solana-py has no minContextSlot option: compare the answer's slot instead
+        slot = response.context.slot
+        if min_context_slot is not None and slot < min_context_slot:
+            continue
+        context_slot = slot if context_slot is None else min(context_slot, slot)
+
+        for pubkey, account in zip(batch, response.value):
+            data = bytes(account.data) if account is not None else b''
+            if len(data) < NONCE_ACCOUNT_LENGTH or int.from_bytes(data[4:8], 'little') != 1:
+                nonces[str(pubkey)] = None
+            else:
+                nonces[str(pubkey)] = (Hash(data[40:72]), Pubkey(data[8:40]))
+
+    return nonces, context_slot
+
+
+class NonceAccount:
+    """
+    One nonce account with its current nonce and authority (a fee payer)
+    """
+
+    def __init__(self, keypair):
+        self.keypair = keypair
+        self.authority = None  # FeePayer
+        self.nonce = None
+        self.nonce_slot = None  # Slot the nonce was read at
+        self.state = 'unknown'  # unknown / missing / orphaned / ready / in_use / used
+        self.used_nonce = None
+        self.changed_at = time.time()
+        self.uses = 0
+        self.recycled = 0
+        self.advance_instruction = None
+
+    @property
+    def pubkey(self):
+        return self.keypair.pubkey()
+
+    def set_authority(self, payer):
+        """Bind the account to its authority and prepare its AdvanceNonceAccount instruction"""
+        self.authority = payer
+        self.advance_instruction = advance_nonce_account(AdvanceNonceAccountParams(
+            nonce_pubkey=self.pubkey,
+            authorized_pubkey=payer.pubkey
+        ))
+
+    def snapshot(self):
+        return {
+            'pubkey': str(self.pubkey),
+            'authority': str(self.authority.pubkey) if self.authority is not None else None,
+            'state': self.state,
+            'nonce': str(self.nonce) if self.nonce is not None else None,
+            'uses': self.uses,
+            'recycled': self.recycled
+        }
+
+
+class DurableNoncePool:
+    """
+    Hands out nonce accounts with a known nonce and recycles them once used
+    """
+
+    def __init__(self, solana_client, count=NONCE_ACCOUNT_COUNT, wallets_dir=NONCE_WALLETS_DIR,
+                 refresh_interval=NONCE_REFRESH_INTERVAL, recycle_after=NONCE_RECYCLE_AFTER):
+        """
+        Initialize pool
+
+        Args:
+            solana_client: SolanaVotingClient instance (RPC, admin wallet and fee payers)
+            count: Number of nonce accounts
+            wallets_dir: Directory holding nonce_<n>.json keypairs
+            refresh_interval: Seconds between reads of used nonce accounts
+            recycle_after: Seconds before an unchanged used nonce is advanced by the pool
+        """
+        self.client = solana_client
+        self.refresh_interval = refresh_interval
+        self.recycle_after = recycle_after
+
+        self.accounts = []
+        for index in range(count):
+            keypair, created = load_or_create_keypair(wallets_dir / f"nonce_{index}.json")
+            if created:
+                print(f"✅ Created nonce account keypair {index}: {keypair.pubkey()}")
+            self.accounts.append(NonceAccount(keypair))
+
+        self.hits = 0
+        self.misses = 0
+        self.created = 0
+        self.errors = 0
+
+        self._lock = threading.Lock()
+        self._payer_keys = set()  # Fee payers the accounts were last bound against
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        print(f"🔑 Durable nonce pool: {count} accounts")
+
+    def start(self):
+        """Start background nonce refresh"""
+        if self._thread is not None:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._refresh_loop, name="nonce-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop background refresh"""
+        self._stop_event.set()
+        self._thread = None
+
+    def _refresh_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                self.errors += 1
+                print(f"⚠️  Nonce refresh failed: {str(e)}")
+            self._stop_event.wait(self.refresh_interval)
+
+    def acquire(self, payer):
+        """
+        Reserve a ready nonce account authorized by payer (no RPC)
+
+        Args:
+            payer: FeePayer that signs and pays the transaction
+
+        Returns:
+            NonceAccount: Reserved account, or None to use a recent blockhash instead
+        """
+        with self._lock:
+            for account in self.accounts:
+                if account.state == 'ready' and account.authority is payer:
+                    account.state = 'in_use'
+                    self.hits += 1
+                    return account
+            self.misses += 1
+            return None
+
+    def mark_sent(self, account):
+        """
+        Record that a transaction using the account's nonce is being sent
+        The account is watched from now on and reused once its nonce changes.
+
+        Args:
+            account: NonceAccount from acquire()
+        """
+        with self._lock:
+            account.state = 'used'
+            account.used_nonce = account.nonce
+            account.changed_at = time.time()
+            account.uses += 1
+
+    def release(self, account):
+        """
+        Return a nonce account that was not used for a transaction
+
+        Args:
+            account: NonceAccount from acquire()
+        """
+        with self._lock:
+            if account.state == 'in_use':
+                account.state = 'ready'
+
+    def refresh(self):
+        """
+        Read the accounts whose nonce is not known, make changed nonces ready,
+        recycle stuck ones and create missing accounts
+
+        Returns:
+            int: Accounts made ready
+        """
+        payers = {payer.pubkey: payer for payer in self.client.get_fee_payer_pool().payers}
+
+        with self._lock:
+            if set(payers) != self._payer_keys:
+                # Fee payers changed: orphaned accounts may have their authority back
+                self._payer_keys = set(payers)
+                for account in self.accounts:
+                    if account.state == 'orphaned':
+                        account.state = 'unknown'
+
+            # Orphaned accounts are not polled until the fee payers change
+            stale = [account for account in self.accounts
+                     if account.state not in ('ready', 'in_use', 'orphaned')]
+        if not stale:
+            return 0
+
+        # Never step back to a nonce older than one already seen
+        seen_slots = [account.nonce_slot for account in stale if account.nonce_slot is not None]
+        nonces, context_slot = fetch_nonces(
+            self.client.client,
+            [account.pubkey for account in stale],
+            min_context_slot=max(seen_slots) if seen_slots else None
+        )
+        now = time.time()
+        made_ready = 0
+
+        for account in stale:
+            if str(account.pubkey) not in nonces:
+                continue  # Read from a lagging RPC node, try again next time
+            current = nonces[str(account.pubkey)]
+
+            if current is None:
+                with self._lock:
+                    create = account.state != 'missing' or now - account.changed_at >= self.recycle_after
+                    if create:
+                        account.state = 'missing'
+                        account.changed_at = now
+                if create:
+                    self._create(account, self.accounts.index(account))
+                continue
+
+            nonce, authority = current
+            payer = payers.get(authority)
+
+            with self._lock:
+                if payer is None:
+                    # Authority is not a current fee payer (pool shrank): cannot sign for it
+                    account.state = 'orphaned'
+                    continue
+                if account.authority is not payer:
+                    account.set_authority(payer)
+
+                if account.state == 'used' and nonce == account.used_nonce:
+                    stuck = now - account.changed_at >= self.recycle_after
+                else:
+                    account.nonce = nonce
+                    account.nonce_slot = context_slot
+                    account.used_nonce = None
+                    account.state = 'ready'
+                    made_ready += 1
+                    stuck = False
+
+            if stuck:
+                self._recycle(account)
+
+        return made_ready
+
+    def _create(self, account, index):
+        """Create and initialize a missing nonce account (rent paid by the admin wallet)"""
+        payers = self.client.get_fee_payer_pool().payers
+        authority = payers[index % len(payers)]
+        admin = payers[0]
+
+        try:
+            rent = self.client.client.get_minimum_balance_for_rent_exemption(NONCE_ACCOUNT_LENGTH).value
+            if not admin.ledger.can_afford(signatures=2) or admin.ledger.lamports < rent:
+                return
+
+            recent_blockhash, _ = self.client.get_blockhash_provider().get()
+            instructions = create_nonce_account(admin.pubkey, account.pubkey, authority.pubkey, rent)
+            message = Message.new_with_blockhash(list(instructions), admin.pubkey, recent_blockhash)
+            transaction = Transaction([admin.keypair, account.keypair], message, recent_blockhash)
+
+            self.client.client.send_raw_transaction(
+                bytes(transaction),
+                opts=TxOpts(skip_preflight=False, preflight_commitment=Confirmed)
+            )
+            admin.ledger.debit(lamports=rent + 2 * LAMPORTS_PER_SIGNATURE, signatures=2)
+            self.created += 1
+            print(f"🔑 Creating nonce account {str(account.pubkey)[:16]}... (authority {str(authority.pubkey)[:8]})")
+        except Exception as e:
+            self.errors += 1
+            print(f"⚠️  Nonce account creation failed: {str(e)}")
+
+    def _recycle(self, account):
+        """
+        Advance a nonce whose transaction never landed, so that transaction
+        can no longer land and the account can be reused
+        """
+        payer = account.authority
+
+        try:
+            message = Message.new_with_blockhash([account.advance_instruction], payer.pubkey, account.used_nonce)
+            transaction = Transaction([payer.keypair], message, account.used_nonce)
+
+            self.client.client.send_raw_transaction(
+                bytes(transaction),
+                opts=TxOpts(skip_preflight=False, preflight_commitment=Confirmed)
+            )
+            payer.ledger.debit()
+            account.recycled += 1
+        except Exception as e:
+            self.errors += 1
+            print(f"⚠️  Nonce recycle failed for {str(account.pubkey)[:16]}...: {str(e)}")
+
+        account.changed_at = time.time()
+
+    def snapshot(self):
+        """
+        Get pool state for monitoring
+
+        Returns:
+            dict: Accounts per state and acquire hit rate
+        """
+        with self._lock:
+            states = {}
+            for account in self.accounts:
+                states[account.state] = states.get(account.state, 0) + 1
+            total = self.hits + self.misses
+            return {
+                'accounts': len(self.accounts),
+                'states': states,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total * 100, 2) if total else 0,
+                'created': self.created,
+                'recycled': sum(account.recycled for account in self.accounts),
+                'errors': self.errors
+            }
@@ -0,0 +1,578 @@
+"""
+Vote Outbox Module
+Background submission of votes to Solana blockchain
+
+cast_vote writes each Vote and its BlockchainOutbox entry in the same
+database transaction and returns immediately. Submitter threads drain
+the outbox, record each voter's ballot on-chain in one transaction (or,
+in "merkle" anchoring mode, anchor whole batches under one Merkle root)
+and fill in the blockchain fields.
+Entries left in 'processing' by a crashed worker are reclaimed once
+their lease expires. While the RPC circuit breaker is open, nothing is
+claimed and votes caught mid-submission are parked as 'deferred' without
+using up an attempt. Votes sent without an observed confirmation are left
+'unproven' for the reconciliation sweeper (reconciler.py).
+"""
+
+import json
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import and_, or_
+from models import db, Vote, BlockchainOutbox, MerkleAnchor
+from .config import (
+    ANCHORING_MODE,
+    MERKLE_BATCH_SIZE,
+    MERKLE_BATCH_WINDOW,
+    OUTBOX_WORKERS,
+    OUTBOX_POLL_INTERVAL,
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_RETRY_BACKOFF,
+    OUTBOX_MAX_BACKOFF,
+    OUTBOX_LEASE_SECONDS,
+)
+
+
+def enqueue_vote(vote, halka):
+    """
+    Add outbox entry for a vote (caller commits the session)
+
+    Args:
+        vote: Vote instance (flushed, so vote.id is set)
+        halka: Electoral constituency of the voter
+
+    Returns:
+        BlockchainOutbox: New outbox entry
+    """
+    entry = BlockchainOutbox(
+        vote_id=vote.id,
+        voter_id=vote.voter_id,
+        position=vote.position,
+        halka=halka,
+        status='pending',
+        next_attempt_at=datetime.utcnow()
+    )
+    db.session.add(entry)
+    return entry
+
+
+class VoteOutboxSubmitter:
+    """
+    Pool of background threads that drain the blockchain outbox
+    Each thread runs inside its own Flask app context
+    """
+
+    def __init__(self, app, recorder_factory=None, workers=OUTBOX_WORKERS,
+                 poll_interval=OUTBOX_POLL_INTERVAL, batch_size=OUTBOX_BATCH_SIZE,
+                 anchoring_mode=ANCHORING_MODE, merkle_batch_size=MERKLE_BATCH_SIZE,
+                 merkle_batch_window=MERKLE_BATCH_WINDOW):
+        """
+        Initialize outbox submitter
+
+        Args:
+            app: Flask application (for database access)
+            recorder_factory: Callable returning a VoteRecorder (defaults to get_vote_recorder)
+            workers: Number of submitter threads
+            poll_interval: Seconds to sleep when the outbox is empty
+            batch_size: Ballots claimed per poll
+            anchoring_mode: "ballot" or "merkle"
+            merkle_batch_size: Votes per Merkle anchor (merkle mode)
+            merkle_batch_window: Max seconds a vote waits for a full batch (merkle mode)
+        """
+        self.app = app
+        self.recorder_factory = recorder_factory
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.anchoring_mode = anchoring_mode
+        self.merkle_batch_size = merkle_batch_size
+        self.merkle_batch_window = merkle_batch_window
+
+        self._threads = []
+        self._stop_event = threading.Event()
+        self._recorder = None
+        self._recorder_lock = threading.Lock()
+
+    def start(self):
+        """Start background submitter threads"""
+        if self._threads:
+            return
+
+        self._stop_event.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._worker_loop,
+                name=f"vote-outbox-{i}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+        print(f"📤 Vote outbox submitter started ({self.workers} workers)")
+
+    def stop(self, timeout=5):
+        """Stop submitter threads (entries in flight are reclaimed later)"""
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _worker_loop(self):
+        """Poll the outbox until stopped"""
+        with self.app.app_context():
+            while not self._stop_event.is_set():
+                try:
+                    processed = self.drain_once()
+                except Exception as e:
+                    print(f"⚠️  Outbox worker error: {str(e)}")
+                    db.session.rollback()
+                    processed = 0
+                finally:
+                    db.session.remove()
+
+                if not processed:
+                    self._stop_event.wait(self.poll_interval)
+
+    def _get_recorder(self):
+        """Lazily create the vote recorder shared by all workers"""
+        with self._recorder_lock:
+            if self._recorder is None:
+                if self.recorder_factory is not None:
+                    self._recorder = self.recorder_factory()
+                else:
+                    from .vote_recorder import get_vote_recorder
+                    self._recorder = get_vote_recorder()
+            return self._recorder
+
+    def drain_once(self):
+        """
+        Claim and submit one batch of ballots from the outbox
+
+        Returns:
+            int: Number of outbox entries processed
+        """
+        if self._circuit_open():
+            # Solana unreachable: leave entries queued until the breaker half-opens
+            return 0
+
+        if self.anchoring_mode == 'merkle':
+            entries = self._claim_merkle_batch()
+            if entries:
+                self._submit_merkle_batch(entries)
+            return len(entries)
+
+        recorder = self._pipeline_recorder()
+        if recorder is not None:
+            # Async pipeline: every claimed ballot is in flight at once
+            ballots = self._claim_batch(limit=max(self.batch_size, recorder.max_in_flight))
+            self._submit_ballots_pipelined(recorder, ballots)
+            return sum(len(entries) for entries in ballots)
+
+        ballots = self._claim_batch()
+
+        for entries in ballots:
+            self._submit_ballot(entries)
+
+        return sum(len(entries) for entries in ballots)
+
+    def _pipeline_recorder(self):
+        """The recorder if it is the async pipeline facade (USE_ASYNC_RECORDING), else None"""
+        try:
+            recorder = self._get_recorder()
+        except Exception:
+            return None
+        return recorder if hasattr(recorder, 'submit_ballot') else None
+
+    def _circuit_open(self):
+        """True while the recorder's Solana client short-circuits RPC calls"""
+        try:
+            return self._get_recorder().client.is_circuit_open()
+        except Exception:
+            return False
+
+    def _claimable_filter(self, now):
+        """Entries that are due, or whose worker lease has expired"""
+        lease_expiry = now - timedelta(seconds=OUTBOX_LEASE_SECONDS)
+        return or_(
+            and_(
+                BlockchainOutbox.status.in_(['pending', 'deferred']),
+                BlockchainOutbox.next_attempt_at <= now
+            ),
+            and_(
+                BlockchainOutbox.status == 'processing',
+                BlockchainOutbox.locked_at < lease_expiry
+            )
+        )
+
+    def _claim_batch(self, limit=None):
+        """
+        Atomically claim due ballots for this worker
+        All due entries of a voter are claimed together so the ballot goes
+        out as one transaction. A conditional UPDATE ensures only one worker
+        (or process) wins each ballot.
+
+        Args:
+            limit: Maximum ballots to claim (defaults to batch_size)
+
+        Returns:
+            list: One list of claimed BlockchainOutbox entries per voter
+        """
+        now = datetime.utcnow()
+
+        candidate_voters = [
+            row.voter_id for row in db.session.query(
+                BlockchainOutbox.voter_id
+            ).filter(
+                self._claimable_filter(now)
+            ).group_by(BlockchainOutbox.voter_id).order_by(
+                db.func.min(BlockchainOutbox.id)
+            ).limit(limit or self.batch_size).all()
+        ]
+
+        claimed_voters = []
+        for voter_id in candidate_voters:
+            updated = BlockchainOutbox.query.filter(
+                BlockchainOutbox.voter_id == voter_id,
+                self._claimable_filter(now)
+            ).update({
+                'status': 'processing',
+                'locked_at': now,
+                'attempts': BlockchainOutbox.attempts + 1
+            }, synchronize_session=False)
+
+            if updated:
+                claimed_voters.append(voter_id)
+
+        db.session.commit()
+
+        ballots = []
+        for voter_id in claimed_voters:
+            entries = BlockchainOutbox.query.filter_by(
+                voter_id=voter_id,
+                status='processing',
+                locked_at=now
+            ).order_by(BlockchainOutbox.id).all()
+            if entries:
+                ballots.append(entries)
+
+        return ballots
+
+    def _claim_merkle_batch(self):
+        """
+        Claim a batch of due entries for one Merkle anchor
+        Waits until either merkle_batch_size entries are due or the oldest
+        one has waited merkle_batch_window seconds
+
+        Returns:
+            list: Claimed BlockchainOutbox entries
+        """
+        now = datetime.utcnow()
+
+        due_count, oldest = db.session.query(
+            db.func.count(BlockchainOutbox.id),
+            db.func.min(BlockchainOutbox.created_at)
+        ).filter(self._claimable_filter(now)).one()
+
+        if not due_count:
+            return []
+
+        if due_count < self.merkle_batch_size and oldest is not None:
+            if (now - oldest).total_seconds() < self.merkle_batch_window:
+                return []
+
+        candidate_ids = [
+            row.id for row in db.session.query(BlockchainOutbox.id).filter(
+                self._claimable_filter(now)
+            ).order_by(BlockchainOutbox.id).limit(self.merkle_batch_size).all()
+        ]
+
+        BlockchainOutbox.query.filter(
+            BlockchainOutbox.id.in_(candidate_ids),
+            self._claimable_filter(now)
+        ).update({
+            'status': 'processing',
+            'locked_at': now,
+            'attempts': BlockchainOutbox.attempts + 1
+        }, synchronize_session=False)
+
+        db.session.commit()
+
+        return BlockchainOutbox.query.filter(
+            BlockchainOutbox.id.in_(candidate_ids),
+            BlockchainOutbox.status == 'processing',
+            BlockchainOutbox.locked_at == now
+        ).order_by(BlockchainOutbox.id).all()
+
+    def _load_pending_votes(self, entries):
+        """
+        Pair claimed entries with their votes, settling entries that need no submission
+
+        Returns:
+            list: (entry, vote) tuples still to be recorded on-chain
+        """
+        pending = []
+        for entry in entries:
+            vote = db.session.get(Vote, entry.vote_id)
+
+            if vote is None:
+                entry.status = 'failed'
+                entry.last_error = 'Vote no longer exists'
+            elif vote.is_verified_on_chain:
+                # Already recorded (e.g. worker crashed after saving the vote)
+                entry.status = 'done'
+            else:
+                pending.append((entry, vote))
+
+        return pending
+
+    def _ensure_encrypted(self, recorder, pending):
+        """Encrypt votes that were queued while encryption was unavailable"""
+        for entry, vote in pending:
+            if not (vote.encrypted_vote_data and vote.voter_id_hash):
+                payload = recorder.encryption.create_vote_payload(
+                    voter_id=vote.voter_id,
+                    candidate_id=vote.candidate_id,
+                    position=vote.position,
+                    halka=entry.halka
+                )
+                vote.voter_id_hash = payload['voter_hash']
+                vote.encrypted_vote_data = payload['encrypted_vote']
+
+    def _ballot_args(self, recorder, pending):
+        """record_ballot_on_chain arguments for one voter's pending votes"""
+        self._ensure_encrypted(recorder, pending)
+        return {
+            'voter_hash': pending[0][1].voter_id_hash,
+            'ballot': {vote.position: vote.encrypted_vote_data for entry, vote in pending},
+            'halka': pending[0][0].halka
+        }
+
+    def _recorder_error(self, error):
+        """Failure result when the recorder could not be used (RPC down, wallet missing...)"""
+        with self._recorder_lock:
+            self._recorder = None
+        return {'success': False, 'error': str(error)}
+
+    def _submit_ballot(self, entries):
+        """Record one voter's claimed votes on-chain in a single transaction"""
+        pending = self._load_pending_votes(entries)
+
+        if not pending:
+            db.session.commit()
+            return
+
+        try:
+            recorder = self._get_recorder()
+            result = recorder.record_ballot_on_chain(**self._ballot_args(recorder, pending))
+        except Exception as e:
+            result = self._recorder_error(e)
+
+        self._finish_ballot(pending, result)
+
+    def _submit_ballots_pipelined(self, recorder, ballots):
+        """Hand every claimed ballot to the async pipeline, then apply results as they finish"""
+        submitted = []
+        for entries in ballots:
+            pending = self._load_pending_votes(entries)
+            if not pending:
+                continue
+
+            try:
+                submitted.append((pending, recorder.submit_ballot(**self._ballot_args(recorder, pending))))
+            except Exception as e:
+                self._finish_ballot(pending, self._recorder_error(e))
+
+        db.session.commit()
+
+        for pending, future in submitted:
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'success': False, 'error': str(e)}
+            self._finish_ballot(pending, result)
+
+    def _finish_ballot(self, pending, result):
+        """Store a ballot's on-chain result, or schedule its retry"""
+        # A deferred result that carries a signature was sent before the circuit
+        # opened: it is kept as unproven, since sending it again could record it twice
+        if result['success'] or result.get('signature'):
+            for entry, vote in pending:
+                vote_result = result['votes'][vote.position]
+                vote.blockchain_tx_signature = result['signature']
+                vote.blockchain_slot = result['slot']
+                vote.blockchain_timestamp = result['timestamp']
+                vote.voter_id_hash = result['voter_hash']
+                vote.encrypted_vote_data = vote_result['encrypted_data']
+                vote.verification_receipt = vote_result['receipt']
+                self._settle(entry, vote, result)
+
+            print(f"✅ Outbox: ballot of {len(pending)} votes recorded on blockchain"
+                  f"{'' if result.get('proven', True) else ' (unproven)'}")
+        elif result.get('deferred'):
+            self._defer([entry for entry, vote in pending], result.get('error'))
+        else:
+            for entry, vote in pending:
+                self._schedule_retry(entry, result.get('error', 'Unknown error'))
+
+        db.session.commit()
+
+    def _submit_merkle_batch(self, entries):
+        """Anchor claimed votes under one Merkle root and store each inclusion proof"""
+        pending = self._load_pending_votes(entries)
+
+        if not pending:
+            db.session.commit()
+            return
+
+        try:
+            recorder = self._get_recorder()
+            self._ensure_encrypted(recorder, pending)
+
+            result = recorder.anchor_merkle_batch([
+                {
+                    'voter_hash': vote.voter_id_hash,
+                    'position': vote.position,
+                    'encrypted_vote': vote.encrypted_vote_data
+                }
+                for entry, vote in pending
+            ])
+        except Exception as e:
+            with self._recorder_lock:
+                self._recorder = None
+            result = {'success': False, 'error': str(e)}
+
+        if result['success'] or result.get('signature'):
+            # Same leaves re-anchored after a crash produce the same root
+            anchor = MerkleAnchor.query.filter_by(merkle_root=result['merkle_root']).first()
+            if anchor is None:
+                anchor = MerkleAnchor(merkle_root=result['merkle_root'])
+                db.session.add(anchor)
+
+            anchor.leaf_count = len(result['leaves'])
+            anchor.tx_signature = result['signature']
+            anchor.slot = result['slot']
+            anchor.anchored_at = result['timestamp']
+            db.session.flush()
+
+            for (entry, vote), leaf in zip(pending, result['leaves']):
+                vote.blockchain_tx_signature = result['signature']
+                vote.blockchain_slot = result['slot']
+                vote.blockchain_timestamp = result['timestamp']
+                vote.verification_receipt = leaf['receipt']
+                vote.merkle_anchor_id = anchor.id
+                vote.merkle_leaf_index = leaf['leaf_index']
+                vote.merkle_proof = json.dumps(leaf['proof'])
+                self._settle(entry, vote, result)
+
+            print(f"✅ Outbox: {len(pending)} votes anchored under Merkle root {result['merkle_root'][:16]}...")
+        elif result.get('deferred'):
+            self._defer([entry for entry, vote in pending], result.get('error'))
+        else:
+            for entry, vote in pending:
+                self._schedule_retry(entry, result.get('error', 'Unknown error'))
+
+        db.session.commit()
+
+    def _settle(self, entry, vote, result):
+        """
+        Mark a sent vote as done at its receipt tier, or as unproven when its
+        confirmation was not observed (the reconciliation sweeper proves or
+        resubmits it later, and promotes receipts to finalized)
+        """
+        proven = result['success'] and result.get('proven', True)
+        vote.is_verified_on_chain = proven
+        vote.blockchain_commitment = result.get('commitment')
+
+        entry.status = 'done' if proven else 'unproven'
+        entry.tx_signature = result['signature']
+        entry.last_valid_block_height = result.get('last_valid_block_height')
+        entry.nonce_account = result.get('nonce_account')
+        entry.durable_nonce = result.get('durable_nonce')
+        entry.nonce_slot = result.get('nonce_slot')
+        entry.locked_at = None
+        entry.last_error = None
+
+    def _defer(self, entries, error):
+        """
+        Park entries while the RPC circuit is open, without using up an attempt
+        They become claimable again once the breaker lets probe calls through.
+        Only for results without a signature: sent ones are settled as unproven.
+        """
+        try:
+            breaker = self._get_recorder().client.circuit_breaker
+            delay = max(1, breaker.retry_after()) if breaker is not None else OUTBOX_RETRY_BACKOFF
+        except Exception:
+            delay = OUTBOX_RETRY_BACKOFF
+
+        for entry in entries:
+            entry.status = 'deferred'
+            entry.attempts = max(0, (entry.attempts or 0) - 1)
+            entry.last_error = error
+            entry.locked_at = None
+            entry.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+
+        print(f"🔌 Outbox: {len(entries)} votes deferred for {delay:.0f}s ({error})")
+
+    def _schedule_retry(self, entry, error):
+        """Back off exponentially, or give up after OUTBOX_MAX_ATTEMPTS"""
+        entry.last_error = error
+        entry.locked_at = None
+
+        if entry.attempts >= OUTBOX_MAX_ATTEMPTS:
+            entry.status = 'failed'
+            print(f"❌ Outbox: vote {entry.vote_id} failed after {entry.attempts} attempts: {error}")
+            return
+
+        delay = min(OUTBOX_RETRY_BACKOFF * (2 ** (entry.attempts - 1)), OUTBOX_MAX_BACKOFF)
+        entry.status = 'pending'
+        entry.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+        print(f"⚠️  Outbox: vote {entry.vote_id} retry in {delay}s ({error})")
+
+    def get_stats(self):
+        """
+        Get outbox queue statistics
+
+        Returns:
+            dict: Entry counts per status
+        """
+        counts = dict(
+            db.session.query(
+                BlockchainOutbox.status,
+                db.func.count(BlockchainOutbox.id)
+            ).group_by(BlockchainOutbox.status).all()
+        )
+
+        return {
+            'pending': counts.get('pending', 0),
+            'deferred': counts.get('deferred', 0),
+            'processing': counts.get('processing', 0),
+            'unproven': counts.get('unproven', 0),
+            'done': counts.get('done', 0),
+            'failed': counts.get('failed', 0),
+            'workers': len(self._threads)
+        }
+
+
+# Global submitter instance
+_outbox_submitter = None
+
+def start_outbox_submitter(app, **kwargs):
+    """
+    Start the process-wide outbox submitter
+
+    Args:
+        app: Flask application
+
+    Returns:
+        VoteOutboxSubmitter: Running submitter
+    """
+    global _outbox_submitter
+    if _outbox_submitter is None:
+        _outbox_submitter = VoteOutboxSubmitter(app, **kwargs)
+        _outbox_submitter.start()
+    return _outbox_submitter
+
+
+def get_outbox_submitter():
+    """Get global outbox submitter (None if not started)"""
+    return _outbox_submitter
@@ -0,0 +1,407 @@
+"""
+Priority Fee Estimator
+Adds a compute-unit price to vote transactions so they land quickly under
+congestion (USE_PRIORITY_FEES)
+
+Recent prioritization fees (getRecentPrioritizationFees, the last ~150
+slots) are sampled every PRIORITY_FEE_SAMPLE_INTERVAL seconds into a
+rolling window, and transactions are priced at a percentile of that
+window. The percentile adapts to the measured confirmation latency:
+
+    p-th percentile latency > target     fee percentile steps up
+    p-th percentile latency < target/2   fee percentile steps down
+
+Every fee is charged against a per-election budget
+(PRIORITY_FEE_ELECTION_BUDGET_SOL). Each reservation is a locked
+read-modify-write of the spend file, so the budget holds across restarts
+and across processes sharing the file (web app and run_outbox_worker.py).
+Once the budget is spent, transactions go out without a priority fee. Latency vs
+fee samples are kept for tuning (snapshot / export_samples).
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import httpx
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+from .config import (
+    config,
+    PRIORITY_FEE_SAMPLE_INTERVAL,
+    PRIORITY_FEE_WINDOW,
+    PRIORITY_FEE_PERCENTILE,
+    PRIORITY_FEE_MIN_PERCENTILE,
+    PRIORITY_FEE_LATENCY_TARGET,
+    PRIORITY_FEE_LATENCY_PERCENTILE,
+    PRIORITY_FEE_COMPUTE_UNIT_LIMIT,
+    PRIORITY_FEE_MAX_MICRO_LAMPORTS,
+    PRIORITY_FEE_ELECTION_BUDGET_SOL,
+    PRIORITY_FEE_SPEND_PATH,
+)
+
+LAMPORTS_PER_SOL = 1_000_000_000
+MICRO_LAMPORTS_PER_LAMPORT = 1_000_000
+
+PERCENTILE_STEP_UP = 10
+PERCENTILE_STEP_DOWN = 5
+MIN_LATENCY_SAMPLES = 20  # Outcomes needed before the percentile adapts
+
+
+def _percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, math.ceil(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+@contextmanager
+def _file_lock(path):
+    """Exclusive lock on path across processes (blocks until acquired)"""
+    with open(path, 'a+') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class PriorityFeeEstimator:
+    """
+    Rolling-percentile compute-unit price with a latency feedback loop and
+    a per-election spending cap
+    """
+
+    def __init__(self, solana_client, election_id=None, sample_interval=PRIORITY_FEE_SAMPLE_INTERVAL,
+                 window=PRIORITY_FEE_WINDOW, percentile=PRIORITY_FEE_PERCENTILE,
+                 min_percentile=PRIORITY_FEE_MIN_PERCENTILE, latency_target=PRIORITY_FEE_LATENCY_TARGET,
+                 latency_percentile=PRIORITY_FEE_LATENCY_PERCENTILE,
+                 compute_unit_limit=PRIORITY_FEE_COMPUTE_UNIT_LIMIT,
+                 max_micro_lamports=PRIORITY_FEE_MAX_MICRO_LAMPORTS,
+                 budget_sol=PRIORITY_FEE_ELECTION_BUDGET_SOL, spend_path=PRIORITY_FEE_SPEND_PATH):
+        """
+        Initialize estimator
+
+        Args:
+            solana_client: SolanaVotingClient instance (RPC URL and circuit breaker)
+            election_id: Election the budget belongs to (defaults to the configured election)
+            sample_interval: Seconds between prioritization fee samples
+            window: Fee samples (one per slot) kept for the percentile
+            percentile: Starting fee percentile
+            min_percentile: Lowest fee percentile the feedback loop steps down to
+            latency_target: Seconds; target for the latency percentile
+            latency_percentile: Latency percentile held under the target
+            compute_unit_limit: Compute units requested per transaction
+            max_micro_lamports: Upper bound for the compute-unit price
+            budget_sol: Priority fees allowed per election
+            spend_path: JSON file with the spend per election
+        """
+        self.client = solana_client
+        self.election_id = election_id or config.election_id
+        self.sample_interval = sample_interval
+        self.percentile = percentile
+        self.min_percentile = min_percentile
+        self.latency_target = latency_target
+        self.latency_percentile = latency_percentile
+        self.compute_unit_limit = compute_unit_limit
+        self.max_micro_lamports = max_micro_lamports
+        self.budget_lamports = int(budget_sol * LAMPORTS_PER_SOL)
+        self.spend_path = spend_path
+
+        self._fees = deque(maxlen=window)  # (slot, micro-lamports per compute unit)
+        self._seen_slots = set()
+        self._outcomes = deque(maxlen=max(MIN_LATENCY_SAMPLES * 10, 200))  # (price, latency, confirmed)
+        self._sampled_at = None
+
+        self.spent_lamports = self._load_spent()
+        self.quotes = 0
+        self.capped = 0
+        self.refunds = 0
+        self.sample_errors = 0
+
+        self._lock = threading.Lock()
+        self._sample_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start background fee sampling"""
+        if self._thread is not None:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._sample_loop, name="priority-fee-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop background sampling"""
+        self._stop_event.set()
+        self._thread = None
+
+    def _sample_loop(self):
+        while not self._stop_event.is_set():
+            self.sample()
+            self._stop_event.wait(self.sample_interval)
+
+    def _load_spent(self):
+        """Lamports already spent on priority fees in this election"""
+        try:
+            with open(self.spend_path) as f:
+                return int(json.load(f).get(self.election_id, 0))
+        except (OSError, ValueError):
+            return 0
+
+    def _add_spent(self, lamports, limit=None):
+        """
+        Add to the election spend in the spend file (locked read-modify-write,
+        atomic replace), so every process charges the same counter
+
+        Args:
+            lamports: Lamports to add (negative to give back)
+            limit: Refuse the change if the spend would go over this
+
+        Returns:
+            bool: True if the spend was changed
+        """
+        with _file_lock(f"{self.spend_path}.lock"):
+            try:
+                with open(self.spend_path) as f:
+                    spend = json.load(f)
+            except FileNotFoundError:
+                spend = {}  # A damaged file raises: never restart the budget from zero
+
+            spent = int(spend.get(self.election_id, 0))
+            if limit is not None and spent + lamports > limit:
+                self.spent_lamports = spent
+                return False
+            spend[self.election_id] = max(0, spent + lamports)
+
+            tmp_path = f"{self.spend_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(spend, f)
+            os.replace(tmp_path, self.spend_path)
+            self.spent_lamports = spend[self.election_id]
+            return True
+
+    def _fetch_recent_fees(self):
+        """
+        getRecentPrioritizationFees over JSON-RPC (not wrapped by solana-py)
+
+        Returns:
+            list: [{'slot': int, 'prioritizationFee': int}, ...]
+        """
+        def post():
+            response = httpx.post(self.client.rpc_url, json={
+                'jsonrpc': '2.0',
+                'id': 1,
+                'method': 'getRecentPrioritizationFees',
+                'params': [[]]
+            }, timeout=10)
+            response.raise_for_status()
+            return response.json()
+
+        breaker = self.client.circuit_breaker
+        body = breaker.call(post) if breaker is not None else post()
+        if 'error' in body:
+            raise RuntimeError(body['error'].get('message', 'getRecentPrioritizationFees failed'))
+        return body.get('result') or []
+
+    def sample(self):
+        """
+        Add the latest per-slot prioritization fees to the window and adapt
+        the fee percentile to the measured latency
+        """
+        with self._sample_lock:
+            try:
+                fees = self._fetch_recent_fees()
+            except Exception as e:
+                self.sample_errors += 1
+                self._sampled_at = time.time()  # Do not retry on every vote while RPC fails
+                print(f"⚠️  Priority fee sampling failed: {str(e)}")
+                return
+
+            with self._lock:
+                for fee in sorted(fees, key=lambda f: f['slot']):
+                    if fee['slot'] not in self._seen_slots:
+                        if len(self._fees) == self._fees.maxlen:
+                            self._seen_slots.discard(self._fees[0][0])
+                        self._fees.append((fee['slot'], fee['prioritizationFee']))
+                        self._seen_slots.add(fee['slot'])
+                self._sampled_at = time.time()
+                self._adapt()
+
+    def _adapt(self):
+        """Step the fee percentile toward the latency target (lock held)"""
+        if len(self._outcomes) < MIN_LATENCY_SAMPLES:
+            return
+
+        latency = _percentile(sorted(o[1] for o in self._outcomes), self.latency_percentile)
+        if latency > self.latency_target and self.percentile < 100:
+            self.percentile = min(100, self.percentile + PERCENTILE_STEP_UP)
+            print(f"💸 p{self.latency_percentile} confirmation {latency:.1f}s over target, "
+                  f"priority fee at p{self.percentile}")
+        elif latency < self.latency_target / 2 and self.percentile > self.min_percentile:
+            self.percentile = max(self.min_percentile, self.percentile - PERCENTILE_STEP_DOWN)
+
+    def current_price(self):
+        """
+        Compute-unit price at the current fee percentile
+
+        Returns:
+            int: micro-lamports per compute unit
+        """
+        # Normally kept fresh by the sampler thread
+        if self._sampled_at is None or time.time() - self._sampled_at >= 3 * self.sample_interval:
+            self.sample()
+
+        with self._lock:
+            price = _percentile(sorted(fee for _, fee in self._fees), self.percentile) or 0
+        return min(int(price), self.max_micro_lamports)
+
+    def quote(self):
+        """
+        Priority fee for the next transaction, reserved from the election budget
+        (give it back with refund() if the transaction is not sent)
+
+        Returns:
+            dict: {'compute_unit_price': int, 'compute_unit_limit': int, 'lamports': int},
+                  or None to send without a priority fee (no congestion or budget spent)
+        """
+        price = self.current_price()
+        if price <= 0:
+            return None
+
+        lamports = math.ceil(price * self.compute_unit_limit / MICRO_LAMPORTS_PER_LAMPORT)
+
+        # Check and reserve in one step (threads here, other processes through the
+        # spend file lock) so concurrent submitters cannot overspend
+        with self._lock:
+            try:
+                reserved = self._add_spent(lamports, limit=self.budget_lamports)
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Could not reserve priority fee: {str(e)}")
+                return None
+
+            if reserved:
+                self.quotes += 1
+                capped = 0
+            else:
+                self.capped += 1
+                capped = self.capped
+
+        if capped:
+            if capped == 1:
+                print(f"💸 Priority fee budget for {self.election_id} spent, sending without priority fees")
+            return None
+
+        return {
+            'compute_unit_price': price,
+            'compute_unit_limit': self.compute_unit_limit,
+            'lamports': lamports
+        }
+
+    def refund(self, quote):
+        """
+        Give back a quote whose transaction was never sent
+
+        Args:
+            quote: Quote from quote() (None is ignored)
+        """
+        if quote is None:
+            return
+        with self._lock:
+            try:
+                self._add_spent(-quote['lamports'])
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Could not refund priority fee: {str(e)}")
+                return
+            self.refunds += 1
+
+    def record(self, quote, latency, confirmed):
+        """
+        Record how long a transaction took to reach its receipt tier
+
+        Args:
+            quote: Quote it was sent with (None = no priority fee)
+            latency: Seconds from send to confirmation (or until giving up)
+            confirmed: False if the confirmation was not observed
+        """
+        with self._lock:
+            self._outcomes.append((quote['compute_unit_price'] if quote else 0, latency, confirmed))
+
+    def export_samples(self):
+        """
+        Latency vs fee samples for tuning
+
+        Returns:
+            list: {'compute_unit_price', 'latency', 'confirmed'} per transaction
+        """
+        with self._lock:
+            return [
+                {'compute_unit_price': price, 'latency': round(latency, 3), 'confirmed': confirmed}
+                for price, latency, confirmed in self._outcomes
+            ]
+
+    def snapshot(self):
+        """
+        Get estimator state for monitoring
+
+        Returns:
+            dict: Current price, percentile, budget use and latency per fee level
+        """
+        with self._lock:
+            fees = sorted(fee for _, fee in self._fees)
+            outcomes = list(self._outcomes)
+            percentile = self.percentile
+            spent = self.spent_lamports
+
+        by_price = {}
+        for price, latency, confirmed in outcomes:
+            by_price.setdefault(price, []).append(latency)
+
+        return {
+            'election_id': self.election_id,
+            'fee_percentile': percentile,
+            'compute_unit_price': min(int(_percentile(fees, percentile) or 0), self.max_micro_lamports),
+            'compute_unit_limit': self.compute_unit_limit,
+            'window': {
+                'slots': len(fees),
+                'p50': _percentile(fees, 50),
+                'p75': _percentile(fees, 75),
+                'p90': _percentile(fees, 90),
+                'max': fees[-1] if fees else None
+            },
+            'latency_target': self.latency_target,
+            'latency_percentile': self.latency_percentile,
+            'latency': _percentile(sorted(o[1] for o in outcomes), self.latency_percentile),
+            'latency_by_price': {
+                price: {
+                    'samples': len(latencies),
+                    'p50': round(_percentile(sorted(latencies), 50), 3),
+                    'p90': round(_percentile(sorted(latencies), 90), 3)
+                }
+                for price, latencies in sorted(by_price.items())
+            },
+            'budget_sol': self.budget_lamports / LAMPORTS_PER_SOL,
+            'spent_sol': spent / LAMPORTS_PER_SOL,
+            'quotes': self.quotes,
+            'capped': self.capped,
+            'refunds': self.refunds,
+            'sample_errors': self.sample_errors
+        }
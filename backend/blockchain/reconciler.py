@@ -0,0 +1,634 @@
+"""
+Vote Reconciliation Sweeper
+Settles votes whose on-chain state is unknown or that were never recorded
+
+Each sweep works in batches of SWEEPER_BATCH_SIZE:
+
+    local-only  votes not on-chain and without an outbox entry (recorded
+                before the outbox existed, or by a path that crashed) are
+                queued in the outbox
+    failed      outbox entries that gave up are revived after
+                SWEEPER_FAILED_RETRY_AFTER seconds, at most
+                SWEEPER_MAX_REVIVALS times (then they stay failed)
+    unproven    votes sent without an observed confirmation are looked up
+                with batched get_signature_statuses calls (256 per call):
+                  confirmed  -> is_verified_on_chain, blockchain_slot and
+                                blockchain_timestamp from the status
+                  failed     -> queued again in the outbox
+                  not found  -> queued again only once the block height has
+                                passed the transaction's last valid block
+                                height (durable nonce transactions: once the
+                                nonce account has moved past its nonce), so
+                                the old transaction can no longer land and
+                                resubmitting never records a vote twice
+    receipts    votes receipted below finalized (processed / confirmed tier)
+                are promoted once their transaction is finalized, or queued
+                again if it was dropped with its fork. A processed receipt is
+                queued again once expired; a confirmed one only after it was
+                missing for SWEEPER_RECEIPT_MISSING_SWEEPS sweeps and
+                get_transaction at finalized does not know it either (a
+                lagging RPC node must not cause a second recording)
+
+Backlog sizes and drain rates are kept for the admin dashboard. The RPC
+step is skipped while the circuit breaker is open.
+"""
+
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from solders.signature import Signature  # type: ignore
+from solana.rpc.commitment import Finalized
+from models import db, Vote, Voter, BlockchainOutbox, MerkleAnchor
+from .confirmation_tracker import COMMITMENT_LEVELS
+from .nonce_pool import fetch_nonces
+from .outbox import enqueue_vote
+from .config import (
+    config,
+    CONFIRMATION_BATCH_SIZE,
+    PROMOTE_TO_FINALIZED,
+    SWEEPER_INTERVAL,
+    SWEEPER_BATCH_SIZE,
+    SWEEPER_FAILED_RETRY_AFTER,
+    SWEEPER_MAX_REVIVALS,
+    SWEEPER_RECEIPT_MISSING_SWEEPS,
+    SWEEPER_RATE_WINDOW,
+)
+
+
+class VoteReconciliationSweeper:
+    """
+    Background thread that reconciles unproven, failed and local-only votes
+    """
+
+    def __init__(self, app, solana_client=None, batch_size=SWEEPER_BATCH_SIZE, interval=SWEEPER_INTERVAL,
+                 failed_retry_after=SWEEPER_FAILED_RETRY_AFTER, max_revivals=SWEEPER_MAX_REVIVALS,
+                 rate_window=SWEEPER_RATE_WINDOW,
+                 commitment=None, promote_to_finalized=PROMOTE_TO_FINALIZED,
+                 receipt_missing_sweeps=SWEEPER_RECEIPT_MISSING_SWEEPS):
+        """
+        Initialize sweeper
+
+        Args:
+            app: Flask application (for database access)
+            solana_client: SolanaVotingClient (defaults to the shared client, resolved lazily)
+            batch_size: Votes or outbox entries handled per database round trip
+            interval: Seconds between sweeps
+            failed_retry_after: Seconds before a 'failed' outbox entry is retried
+            max_revivals: Revivals before a 'failed' outbox entry is left failed
+            rate_window: Seconds of history used for the drain rates
+            commitment: Tier that proves an unproven transaction
+                        (None = the receipt tier in BlockchainConfig)
+            promote_to_finalized: Promote receipts below finalized in the background
+            receipt_missing_sweeps: Sweeps a confirmed receipt must be missing before it is resubmitted
+        """
+        self.app = app
+        self._client = solana_client
+        self.batch_size = batch_size
+        self.interval = interval
+        self.failed_retry_after = failed_retry_after
+        self.max_revivals = max_revivals
+        self.rate_window = rate_window
+        self.default_commitment = commitment
+        self.promote_to_finalized = promote_to_finalized
+        self.receipt_missing_sweeps = receipt_missing_sweeps
+        self._missing_receipts = {}  # signature -> consecutive sweeps without a status
+        self.status_batch_size = min(CONFIRMATION_BATCH_SIZE, 256)
+
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+        self.sweeps = 0
+        self.last_sweep = None
+        self.last_error = None
+        self.totals = {'enqueued': 0, 'revived': 0, 'confirmed': 0, 'promoted': 0, 'resubmitted': 0}
+        self.backlog = {}
+        self._samples = deque()  # (time, backlog size, votes settled so far)
+
+    @property
+    def commitment(self):
+        return self.default_commitment or config.get_commitment_tier()
+
+    @property
+    def client(self):
+        if self._client is not None:
+            return self._client
+        from .solana_client import get_solana_client
+        return get_solana_client()
+
+    def start(self):
+        """Start background sweep thread"""
+        if self._thread is not None:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._sweep_loop, name="vote-reconciler", daemon=True)
+        self._thread.start()
+        print(f"🧹 Vote reconciliation sweeper started (every {self.interval}s)")
+
+    def stop(self):
+        """Stop background sweeps"""
+        self._stop_event.set()
+        self._thread = None
+
+    def _sweep_loop(self):
+        while not self._stop_event.is_set():
+            with self.app.app_context():
+                try:
+                    self.sweep_once()
+                except Exception as e:
+                    db.session.rollback()
+                    self.last_error = str(e)
+                    print(f"⚠️  Vote reconciliation sweep failed: {str(e)}")
+                finally:
+                    db.session.remove()
+            self._stop_event.wait(self.interval)
+
+    def sweep_once(self):
+        """
+        Run one reconciliation pass (requires app context)
+
+        Returns:
+            dict: Votes enqueued, revived, confirmed, promoted and resubmitted in this pass
+        """
+        result = {
+            'enqueued': self._enqueue_local_only(),
+            'revived': self._revive_failed(),
+            'confirmed': 0,
+            'promoted': 0,
+            'resubmitted': 0,
+            'skipped': None
+        }
+
+        if self._circuit_open():
+            result['skipped'] = 'Solana RPC circuit open'
+        else:
+            result['confirmed'], result['resubmitted'] = self._reconcile_unproven()
+            if self.promote_to_finalized:
+                promoted, resubmitted = self._promote_receipts()
+                result['promoted'] = promoted
+                result['resubmitted'] += resubmitted
+
+        with self._lock:
+            self.sweeps += 1
+            self.last_sweep = datetime.utcnow()
+            self.last_error = None
+            for key in self.totals:
+                self.totals[key] += result[key]
+
+        self._record_backlog()
+
+        if any(result[key] for key in self.totals):
+            print(f"🧹 Reconciler: {result['confirmed']} confirmed, {result['promoted']} finalized, "
+                  f"{result['resubmitted']} resubmitted, {result['revived']} revived, {result['enqueued']} enqueued")
+        return result
+
+    def _circuit_open(self):
+        try:
+            return self.client.is_circuit_open()
+        except Exception:
+            return False
+
+    def _local_only_query(self, *columns):
+        """Votes not on-chain that have no outbox entry"""
+        return db.session.query(*columns).select_from(Vote).outerjoin(
+            BlockchainOutbox, BlockchainOutbox.vote_id == Vote.id
+        ).filter(
+            BlockchainOutbox.id.is_(None),
+            Vote.is_verified_on_chain.isnot(True)
+        )
+
+    def _enqueue_local_only(self):
+        """
+        Queue local-only votes in the outbox
+
+        Returns:
+            int: Votes enqueued
+        """
+        enqueued = 0
+        while True:
+            rows = self._local_only_query(Vote, Voter.halka).outerjoin(
+                Voter, Voter.voter_id == Vote.voter_id
+            ).order_by(Vote.id).limit(self.batch_size).all()
+
+            if not rows:
+                return enqueued
+
+            for vote, halka in rows:
+                enqueue_vote(vote, halka)
+            db.session.commit()
+            enqueued += len(rows)
+
+    def _revive_failed(self):
+        """
+        Give 'failed' outbox entries a fresh set of attempts, up to max_revivals
+        times (an entry that fails for good, e.g. a memo that is too large,
+        is not retried forever)
+
+        Returns:
+            int: Entries revived
+        """
+        now = datetime.utcnow()
+        revived = BlockchainOutbox.query.filter(
+            BlockchainOutbox.status == 'failed',
+            BlockchainOutbox.updated_at < now - timedelta(seconds=self.failed_retry_after),
+            db.func.coalesce(BlockchainOutbox.revivals, 0) < self.max_revivals,
+            BlockchainOutbox.vote_id.in_(db.session.query(Vote.id))
+        ).update({
+            'status': 'pending',
+            'attempts': 0,
+            'revivals': db.func.coalesce(BlockchainOutbox.revivals, 0) + 1,
+            'locked_at': None,
+            'next_attempt_at': now,
+            'updated_at': now
+        }, synchronize_session=False)
+        db.session.commit()
+        return revived
+
+    def _reconcile_unproven(self):
+        """
+        Look up unproven transactions and settle them
+
+        Returns:
+            tuple: (votes confirmed, votes resubmitted)
+        """
+        return self._walk_signatures(
+            BlockchainOutbox.query.filter(BlockchainOutbox.status == 'unproven'),
+            self._settle_unproven
+        )
+
+    def _promote_receipts(self):
+        """
+        Promote votes receipted below finalized once their transaction is finalized
+
+        Returns:
+            tuple: (votes promoted, votes resubmitted)
+        """
+        return self._walk_signatures(
+            BlockchainOutbox.query.join(Vote, Vote.id == BlockchainOutbox.vote_id).filter(
+                BlockchainOutbox.status == 'done',
+                BlockchainOutbox.tx_signature.isnot(None),
+                Vote.blockchain_commitment.in_(['processed', 'confirmed'])
+            ),
+            self._settle_receipt
+        )
+
+    def _walk_signatures(self, query, settle):
+        """
+        Walk outbox entries in keyset pages by id, look up their transactions in
+        batches and let settle() decide per transaction
+
+        Args:
+            query: BlockchainOutbox query selecting the entries
+            settle: Callable(signature, entries, status, expired, context) -> (settled, resubmitted)
+
+        Returns:
+            tuple: (votes settled, votes resubmitted)
+        """
+        settled = 0
+        resubmitted = 0
+        context = {'block_height': None, 'height_slot': None, 'block_times': {}}
+        last_id = 0
+
+        while not self._stop_event.is_set():
+            entries = query.filter(
+                BlockchainOutbox.id > last_id
+            ).order_by(BlockchainOutbox.id).limit(self.batch_size).all()
+
+            if not entries:
+                break
+            last_id = entries[-1].id
+
+            by_signature = {}
+            for entry in entries:
+                by_signature.setdefault(entry.tx_signature, []).append(entry)
+
+            # Nothing was sent for these: queue them again
+            for entry in by_signature.pop(None, []):
+                resubmitted += self._resubmit(None, [entry], 'No transaction signature recorded')
+
+            if context['block_height'] is None:
+                # Block height together with the slot it was read at, so statuses from a
+                # node behind it are not mistaken for dropped transactions
+                epoch_info = self.client.client.get_epoch_info().value
+                context['block_height'] = epoch_info.block_height
+                context['height_slot'] = epoch_info.absolute_slot
+
+            # Read before the statuses: a nonce that moved on because its transaction
+            # landed shows that transaction in the statuses fetched afterwards. Both
+            # reads must come from nodes at or past the slot the nonce was read at
+            nonce_entries = [group[0] for group in by_signature.values() if group[0].nonce_account]
+            nonces, nonce_slot = {}, None
+            if nonce_entries:
+                nonces, nonce_slot = fetch_nonces(
+                    self.client.client,
+                    list({entry.nonce_account for entry in nonce_entries}),
+                    min_context_slot=max(entry.nonce_slot or 0 for entry in nonce_entries)
+                )
+
+            statuses, status_slot = self._get_statuses(list(by_signature))
+            if nonce_slot is not None and (status_slot is None or status_slot < nonce_slot):
+                nonces = {}  # Statuses from a node behind the nonce read: unknown this sweep
+            block_height = context['block_height']
+            if status_slot is None or status_slot < context['height_slot']:
+                block_height = None  # Statuses from a node behind the block height: unknown this sweep
+
+            for signature, group in by_signature.items():
+                status = statuses.get(signature)
+
+                if status is not None and status.err:
+                    resubmitted += self._resubmit(signature, group, f'Transaction failed on-chain: {status.err}')
+                    continue
+
+                expired = status is None and self._expired(group[0], block_height, nonces)
+                done, again = settle(signature, group, status, expired, context)
+                settled += done
+                resubmitted += again
+
+            db.session.commit()
+
+        return settled, resubmitted
+
+    def _expired(self, entry, block_height, nonces):
+        """Whether an entry's transaction can no longer land"""
+        if entry.nonce_account:
+            # Durable nonce transaction: valid until its nonce account moves on. A missing
+            # account or an answer from a lagging node is unknown, not expired
+            current = nonces.get(entry.nonce_account)
+            return current is not None and str(current[0]) != entry.durable_nonce
+
+        # Blockhash transaction: valid until the block height passes its last valid
+        # height. No block height (statuses read behind it) is unknown, not expired
+        if block_height is None:
+            return False
+        last_valid = entry.last_valid_block_height
+        return last_valid is None or block_height > last_valid
+
+    def _settle_unproven(self, signature, entries, status, expired, context):
+        """Confirm an unproven transaction, or resubmit it once it can no longer land"""
+        if expired:
+            return 0, self._resubmit(signature, entries, 'Blockhash or nonce expired before confirmation')
+        if status is not None and self._tier_of(status) is not None:
+            return self._confirm(signature, entries, status, context['block_times']), 0
+        return 0, 0
+
+    def _settle_receipt(self, signature, entries, status, expired, context):
+        """Mark a receipted transaction finalized, or resubmit it if it was dropped (fork)"""
+        if status is not None:
+            self._missing_receipts.pop(signature, None)
+            if self._tier_of(status) == 'finalized':
+                for entry in entries:
+                    if entry.vote is not None:
+                        entry.vote.blockchain_commitment = 'finalized'
+                        entry.vote.blockchain_slot = status.slot
+                return len(entries), 0
+            return 0, 0
+
+        if not expired:
+            return 0, 0
+
+        vote = entries[0].vote
+        if vote is None or vote.blockchain_commitment != 'processed':
+            # Confirmed receipts are rarely dropped: a missing status is more likely a
+            # lagging RPC node, so it has to stay missing and be unknown at finalized
+            misses = self._missing_receipts.get(signature, 0) + 1
+            self._missing_receipts[signature] = misses
+            if misses < self.receipt_missing_sweeps or self._finalized_transaction_exists(signature):
+                return 0, 0
+            self._missing_receipts.pop(signature, None)
+
+        return 0, self._resubmit(signature, entries, 'Receipted transaction dropped before finalization')
+
+    def _finalized_transaction_exists(self, signature):
+        """get_transaction at finalized (True when the lookup fails: never resubmit on doubt)"""
+        try:
+            response = self.client.client.get_transaction(
+                Signature.from_string(signature),
+                encoding="json",
+                commitment=Finalized,
+                max_supported_transaction_version=0
+            )
+        except Exception:
+            return True
+        return response.value is not None
+
+    def _tier_of(self, status):
+        """Highest tier a status has reached, if at least the receipt tier"""
+        if status.confirmation_status is None:
+            return None
+        rank = int(status.confirmation_status)
+        if rank < COMMITMENT_LEVELS[self.commitment]:
+            return None
+        return next(tier for tier, level in COMMITMENT_LEVELS.items() if level == rank)
+
+    def _get_statuses(self, signatures):
+        """
+        Batched get_signature_statuses with transaction history search
+
+        Returns:
+            tuple: (statuses, context_slot)
+                   statuses: signature -> TransactionStatus (missing when not found)
+                   context_slot: Lowest slot the answers were read at
+        """
+        statuses = {}
+        context_slot = None
+        for i in range(0, len(signatures), self.status_batch_size):
+            batch = signatures[i:i + self.status_batch_size]
+            response = self.client.client.get_signature_statuses(
+                [Signature.from_string(signature) for signature in batch],
+                search_transaction_history=True
+            )
+            slot = response.context.slot
+            context_slot = slot if context_slot is None else min(context_slot, slot)
+            for signature, status in zip(batch, response.value):
+                if status is not None:
+                    statuses[signature] = status
+        return statuses, context_slot
+
+    def _block_time(self, slot, block_times):
+        """On-chain time of a slot (cached per sweep), or now if the RPC has none"""
+        if slot not in block_times:
+            try:
+                block_time = self.client.client.get_block_time(slot).value
+            except Exception:
+                block_time = None
+            block_times[slot] = datetime.utcfromtimestamp(block_time) if block_time else datetime.utcnow()
+        return block_times[slot]
+
+    def _confirm(self, signature, entries, status, block_times):
+        """Mark the votes of a confirmed transaction as verified on-chain"""
+        slot = status.slot
+        timestamp = self._block_time(slot, block_times)
+
+        for entry in entries:
+            vote = entry.vote
+            if vote is not None:
+                vote.blockchain_tx_signature = signature
+                vote.blockchain_slot = slot
+                vote.blockchain_timestamp = timestamp
+                vote.blockchain_commitment = self._tier_of(status)
+                vote.is_verified_on_chain = True
+
+            entry.status = 'done'
+            entry.last_error = None
+
+        MerkleAnchor.query.filter_by(tx_signature=signature).update({
+            'slot': slot,
+            'anchored_at': timestamp
+        }, synchronize_session=False)
+
+        return len(entries)
+
+    def _resubmit(self, signature, entries, reason):
+        """
+        Queue the votes of a transaction that can no longer land
+        Their receipts and Merkle proofs referenced the dead transaction, so
+        they are cleared and rebuilt by the outbox on the next submission.
+        """
+        now = datetime.utcnow()
+
+        for entry in entries:
+            vote = entry.vote
+            if vote is not None:
+                vote.blockchain_tx_signature = None
+                vote.blockchain_slot = None
+                vote.blockchain_timestamp = None
+                vote.verification_receipt = None
+                vote.blockchain_commitment = None
+                vote.merkle_anchor_id = None
+                vote.merkle_leaf_index = None
+                vote.merkle_proof = None
+                vote.is_verified_on_chain = False
+
+            entry.status = 'pending'
+            entry.attempts = 0
+            entry.locked_at = None
+            entry.next_attempt_at = now
+            entry.tx_signature = None
+            entry.last_valid_block_height = None
+            entry.nonce_account = None
+            entry.durable_nonce = None
+            entry.nonce_slot = None
+            entry.last_error = reason
+
+        if signature is not None:
+            # A re-anchored batch with the same leaves reuses the anchor row (same root)
+            MerkleAnchor.query.filter_by(tx_signature=signature).update({
+                'tx_signature': None,
+                'slot': None,
+                'anchored_at': None
+            }, synchronize_session=False)
+            print(f"🔁 Reconciler: resubmitting {len(entries)} votes of {signature[:16]}... ({reason})")
+
+        return len(entries)
+
+    def get_backlog(self):
+        """
+        Count votes waiting for reconciliation or submission (requires app context)
+
+        Returns:
+            dict: Backlog size per state
+        """
+        counts = dict(
+            db.session.query(
+                BlockchainOutbox.status,
+                db.func.count(BlockchainOutbox.id)
+            ).filter(
+                BlockchainOutbox.status.in_(['pending', 'deferred', 'processing', 'unproven', 'failed'])
+            ).group_by(BlockchainOutbox.status).all()
+        )
+
+        backlog = {
+            status: counts.get(status, 0)
+            for status in ('unproven', 'failed', 'deferred', 'pending', 'processing')
+        }
+        backlog['local_only'] = self._local_only_query(Vote.id).count()
+        backlog['total'] = sum(backlog.values())
+
+        # On-chain with a receipt, not yet finalized (not part of the total)
+        backlog['awaiting_finalization'] = Vote.query.filter(
+            Vote.is_verified_on_chain.is_(True),
+            Vote.blockchain_commitment.in_(['processed', 'confirmed'])
+        ).count()
+        return backlog
+
+    def _record_backlog(self):
+        """Store the current backlog and a sample for the drain rates"""
+        backlog = self.get_backlog()
+        now = time.time()
+
+        with self._lock:
+            self.backlog = backlog
+            self._samples.append((now, backlog['total'], self.totals['confirmed'] + self.totals['resubmitted']))
+            while len(self._samples) > 2 and now - self._samples[0][0] > self.rate_window:
+                self._samples.popleft()
+
+    def _drain_rates(self):
+        """Per-minute rates over the sample window (lock held)"""
+        if len(self._samples) < 2:
+            return None, None
+
+        start_time, start_backlog, start_settled = self._samples[0]
+        end_time, end_backlog, end_settled = self._samples[-1]
+        minutes = (end_time - start_time) / 60
+        if minutes <= 0:
+            return None, None
+
+        # Net drain: how fast the backlog shrinks (negative while it grows)
+        return (
+            round((start_backlog - end_backlog) / minutes, 2),
+            round((end_settled - start_settled) / minutes, 2)
+        )
+
+    def snapshot(self):
+        """
+        Get sweeper metrics for monitoring
+
+        Returns:
+            dict: Backlog, drain rates and totals
+        """
+        with self._lock:
+            drain_rate, settle_rate = self._drain_rates()
+            total = self.backlog.get('total', 0)
+            return {
+                'running': self._thread is not None,
+                'interval': self.interval,
+                'sweeps': self.sweeps,
+                'last_sweep': self.last_sweep.isoformat() if self.last_sweep else None,
+                'last_error': self.last_error,
+                'backlog': dict(self.backlog),
+                'drain_rate_per_minute': drain_rate,
+                'settled_per_minute': settle_rate,
+                'estimated_minutes_to_drain': round(total / drain_rate, 1) if drain_rate and drain_rate > 0 else None,
+                'totals': dict(self.totals)
+            }
+
+
+# Global sweeper instance
+_sweeper = None
+_sweeper_lock = threading.Lock()
+
+def start_reconciliation_sweeper(app, **kwargs):
+    """
+    Start the background reconciliation sweeper (once per process)
+
+    Args:
+        app: Flask application
+        **kwargs: Passed to VoteReconciliationSweeper
+
+    Returns:
+        VoteReconciliationSweeper: Running sweeper
+    """
+    global _sweeper
+
+    with _sweeper_lock:
+        if _sweeper is None:
+            _sweeper = VoteReconciliationSweeper(app, **kwargs)
+        _sweeper.start()
+        return _sweeper
+
+
+def get_reconciliation_sweeper():
+    """Get global reconciliation sweeper (None if not started)"""
+    return _sweeper
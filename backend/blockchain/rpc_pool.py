@@ -0,0 +1,305 @@
+"""
+RPC Endpoint Pool
+Routes Solana RPC calls across RPC_ENDPOINT and BACKUP_RPC_ENDPOINTS
+
+Each endpoint keeps a window of recent latencies and outcomes. Calls go
+to the healthiest endpoint (lowest p90 latency, penalised by error rate),
+slow reads are hedged to a second endpoint, and endpoints that fail
+repeatedly are quarantined with exponential backoff.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from solana.rpc.api import Client
+from solana.rpc.commitment import Confirmed
+from solana.rpc.core import RPCException
+from .config import (
+    RPC_LATENCY_WINDOW,
+    RPC_HEDGE_DELAY,
+    RPC_FAILURE_THRESHOLD,
+    RPC_QUARANTINE_BASE,
+    RPC_QUARANTINE_MAX,
+    RPC_POOL_MAX_WORKERS,
+)
+
+# Read-only calls that are safe to send to two endpoints at once
+HEDGED_METHODS = {
+    'get_transaction',
+    'get_signature_statuses',
+    'get_signatures_for_address',
+    'get_latest_blockhash',
+    'get_balance',
+    'get_slot',
+    'get_version',
+    'get_account_info',
+    'get_block_height',
+    'get_epoch_info',
+}
+
+
+class RpcEndpoint:
+    """
+    One RPC endpoint with its latency and error statistics
+    """
+
+    def __init__(self, url, commitment=Confirmed, window=RPC_LATENCY_WINDOW):
+        self.url = url
+        self.client = Client(url, commitment=commitment)
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)  # True = success, False = failure
+
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.quarantined_until = 0
+        self.quarantine_count = 0
+
+    def percentile(self, pct):
+        """
+        Latency percentile over the recent window
+
+        Args:
+            pct: Percentile (0-100)
+
+        Returns:
+            float: Seconds, or None without samples
+        """
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+        return ordered[index]
+
+    @property
+    def error_rate(self):
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def is_available(self, now=None):
+        return (now or time.time()) >= self.quarantined_until
+
+    def score(self):
+        """Lower is healthier"""
+        p90 = self.percentile(90)
+        if p90 is None:
+            p90 = 0.0  # Untried endpoints get a chance
+        return p90 * (1 + 10 * self.error_rate) + self.error_rate
+
+    def snapshot(self):
+        p50 = self.percentile(50)
+        p90 = self.percentile(90)
+        p99 = self.percentile(99)
+        return {
+            'url': self.url,
+            'available': self.is_available(),
+            'quarantined_for': max(0, round(self.quarantined_until - time.time(), 1)),
+            'requests': self.requests,
+            'failures': self.failures,
+            'error_rate': round(self.error_rate * 100, 2),
+            'p50_ms': round(p50 * 1000, 1) if p50 is not None else None,
+            'p90_ms': round(p90 * 1000, 1) if p90 is not None else None,
+            'p99_ms': round(p99 * 1000, 1) if p99 is not None else None,
+        }
+
+
+class RpcEndpointPool:
+    """
+    Drop-in replacement for solana.rpc.api.Client backed by several endpoints
+
+    Any Client method can be called on the pool; the call is routed to the
+    healthiest endpoint and fails over to the next one on transport errors.
+    JSON-RPC error responses (RPCException) mean the endpoint is up, so they
+    are raised to the caller without failover.
+    """
+
+    def __init__(self, urls, commitment=Confirmed, hedge_delay=RPC_HEDGE_DELAY,
+                 failure_threshold=RPC_FAILURE_THRESHOLD,
+                 quarantine_base=RPC_QUARANTINE_BASE, quarantine_max=RPC_QUARANTINE_MAX,
+                 max_workers=RPC_POOL_MAX_WORKERS):
+        """
+        Initialize pool
+
+        Args:
+            urls: RPC endpoint URLs (duplicates are ignored), primary first
+            commitment: Default commitment for every endpoint client
+            hedge_delay: Seconds before a slow read is also sent to a second endpoint
+            failure_threshold: Consecutive failures before an endpoint is quarantined
+            quarantine_base: First quarantine duration in seconds (doubles each time)
+            quarantine_max: Maximum quarantine duration in seconds
+            max_workers: Threads available for hedged reads
+        """
+        unique_urls = list(dict.fromkeys(urls))
+        if not unique_urls:
+            raise ValueError("RPC endpoint pool needs at least one endpoint")
+
+        self.endpoints = [RpcEndpoint(url, commitment) for url in unique_urls]
+        self.hedge_delay = hedge_delay
+        self.failure_threshold = failure_threshold
+        self.quarantine_base = quarantine_base
+        self.quarantine_max = quarantine_max
+
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+        self.failovers = 0
+
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rpc-hedge")
+
+    @property
+    def primary(self):
+        return self.endpoints[0]
+
+    def __getattr__(self, name):
+        # Only reached for names the pool itself does not define
+        if name.startswith('_') or not callable(getattr(self.primary.client, name, None)):
+            raise AttributeError(name)
+
+        def call(*args, **kwargs):
+            return self.call(name, *args, **kwargs)
+
+        call.__name__ = name
+        return call
+
+    def ranked_endpoints(self):
+        """
+        Endpoints ordered from healthiest to least healthy
+
+        Returns:
+            list: Available endpoints by score, then quarantined ones by expiry
+        """
+        now = time.time()
+        with self._lock:
+            available = [e for e in self.endpoints if e.is_available(now)]
+            quarantined = [e for e in self.endpoints if not e.is_available(now)]
+            available.sort(key=lambda e: e.score())
+            quarantined.sort(key=lambda e: e.quarantined_until)
+        return available + quarantined
+
+    def call(self, method, *args, **kwargs):
+        """
+        Call an RPC method on the best endpoint
+
+        Args:
+            method: solana Client method name
+            *args, **kwargs: Method arguments
+
+        Returns:
+            Method response
+        """
+        endpoints = self.ranked_endpoints()
+
+        if method in HEDGED_METHODS and len(endpoints) > 1 and endpoints[1].is_available():
+            return self._hedged_call(endpoints, method, args, kwargs)
+
+        last_error = None
+        for index, endpoint in enumerate(endpoints):
+            if index > 0:
+                self.failovers += 1
+            try:
+                return self._call_endpoint(endpoint, method, args, kwargs)
+            except RPCException:
+                raise
+            except Exception as e:
+                last_error = e
+
+        raise last_error
+
+    def _call_endpoint(self, endpoint, method, args, kwargs):
+        start = time.time()
+        try:
+            result = getattr(endpoint.client, method)(*args, **kwargs)
+        except RPCException:
+            # Endpoint answered, the request itself was rejected
+            self._record(endpoint, time.time() - start, True)
+            raise
+        except Exception:
+            self._record(endpoint, time.time() - start, False)
+            raise
+
+        self._record(endpoint, time.time() - start, True)
+        return result
+
+    def _hedged_call(self, endpoints, method, args, kwargs):
+        """Send a read to the best endpoint, and to the next one if it is slow or fails"""
+        remaining = list(endpoints)
+        futures = {}
+
+        def launch():
+            endpoint = remaining.pop(0)
+            futures[self._executor.submit(self._call_endpoint, endpoint, method, args, kwargs)] = endpoint
+
+        launch()
+        hedged = False
+        last_error = None
+
+        while futures:
+            timeout = self.hedge_delay if remaining and not hedged else None
+            done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            if not done:
+                # Slow read: race it against the next endpoint
+                hedged = True
+                self.hedged_requests += 1
+                launch()
+                continue
+
+            for future in done:
+                endpoint = futures.pop(future)
+                try:
+                    result = future.result()
+                except RPCException:
+                    raise
+                except Exception as e:
+                    last_error = e
+                    if remaining and not futures:
+                        self.failovers += 1
+                        launch()
+                    continue
+
+                if hedged and endpoint is not endpoints[0]:
+                    self.hedge_wins += 1
+                return result
+
+        raise last_error
+
+    def _record(self, endpoint, latency, success):
+        with self._lock:
+            endpoint.requests += 1
+            endpoint.outcomes.append(success)
+
+            if success:
+                endpoint.latencies.append(latency)
+                endpoint.consecutive_failures = 0
+                endpoint.quarantine_count = 0
+                return
+
+            endpoint.failures += 1
+            endpoint.consecutive_failures += 1
+
+            if endpoint.consecutive_failures >= self.failure_threshold:
+                duration = min(
+                    self.quarantine_base * (2 ** endpoint.quarantine_count),
+                    self.quarantine_max
+                )
+                endpoint.quarantined_until = time.time() + duration
+                endpoint.quarantine_count += 1
+                endpoint.consecutive_failures = 0
+                print(f"⚠️  RPC endpoint quarantined for {duration}s: {endpoint.url}")
+
+    def snapshot(self):
+        """
+        Get pool statistics for monitoring
+
+        Returns:
+            dict: Per-endpoint latency/error stats and hedging counters
+        """
+        with self._lock:
+            return {
+                'endpoints': [endpoint.snapshot() for endpoint in self.endpoints],
+                'hedged_requests': self.hedged_requests,
+                'hedge_wins': self.hedge_wins,
+                'failovers': self.failovers
+            }
@@ -3,17 +3,18 @@ Solana Voting Client
 Handles connection to Solana devnet and wallet operations
 """
 
-import json
+import threading
 import time
-from pathlib import Path
 from solana.rpc.api import Client
-from solders.keypair import Keypair  # type: ignore
 from solders.transaction import Transaction  # type: ignore
 from solders.system_program import TransferParams, transfer  # type: ignore
 from solders.pubkey import Pubkey  # type: ignore
 from solders.signature import Signature  # type: ignore
 from solders.system_program import ID as SYS_PROGRAM_ID  # type: ignore
-from solana.rpc.commitment import Confirmed
+from solana.rpc.commitment import Confirmed, Finalized
+from solders.rpc.responses import GetTransactionResp  # type: ignore
+
+MEMO_PROGRAM_ID = 'MemoSq4gqABAXKb96qnH8TysNcWxMyWCqXgDLGmfcHr'
 
 
 class SolanaVotingClient:
@@ -22,19 +23,60 @@ class SolanaVotingClient:
     Handles RPC connection, wallet management, and transaction building
     """
     
-    def __init__(self, rpc_url, admin_keypair_path=None):
+    def __init__(self, rpc_url, admin_keypair_path=None, backup_urls=None):
         """
         Initialize Solana client
         
         Args:
             rpc_url: Solana RPC endpoint (e.g., "https://api.devnet.solana.com")
             admin_keypair_path: Path to admin wallet keypair JSON
+            backup_urls: Optional backup RPC endpoints, calls are then routed
+                         through a health-scored endpoint pool
         """
         self.rpc_url = rpc_url
-        self.client = Client(rpc_url, commitment=Confirmed)
+        
+        endpoints = list(dict.fromkeys([rpc_url] + list(backup_urls or [])))
+        if len(endpoints) > 1:
+            from .rpc_pool import RpcEndpointPool
+            self.client = RpcEndpointPool(endpoints, commitment=Confirmed)
+        else:
+            self.client = Client(rpc_url, commitment=Confirmed)  # Reused httpx session keeps connections alive
+        
+        # Circuit breaker: RPC calls fail fast while Solana is down or too slow
+        from .config import CIRCUIT_BREAKER_ENABLED
+        self.circuit_breaker = None
+        if CIRCUIT_BREAKER_ENABLED:
+            from .circuit_breaker import CircuitBreaker, CircuitBreakerClient
+            self.circuit_breaker = CircuitBreaker()
+            self.client = CircuitBreakerClient(self.client, self.circuit_breaker)
         self.admin_keypair = None
         self.admin_keypair_path = admin_keypair_path
         
+        # Lazy health check state (see health_check)
+        self._health_lock = threading.Lock()
+        self._last_health_check = None
+        self._healthy = False
+        
+        # Fee-payer balance ledger, blockhash cache and confirmation tracker (created on first use)
+        self._balance_ledger = None
+        self._ledger_lock = threading.Lock()
+        self._fee_payer_pool = None
+        self._fee_payer_lock = threading.Lock()
+        self._blockhash_provider = None
+        self._blockhash_lock = threading.Lock()
+        self._confirmation_tracker = None
+        self._tracker_lock = threading.Lock()
+        self._priority_fees = None
+        self._priority_fees_lock = threading.Lock()
+        self._nonce_pool = None
+        self._nonce_pool_lock = threading.Lock()
+        
+        # Persistent transaction cache and last known finalized slot
+        self._tx_cache = None
+        self._tx_cache_lock = threading.Lock()
+        self._finalized_slot = 0
+        self._finalized_slot_checked = 0
+        
         # Load or generate admin keypair
         if admin_keypair_path:
             self._load_or_create_keypair(admin_keypair_path)
@@ -46,23 +88,13 @@ class SolanaVotingClient:
         Args:
             keypair_path: Path to keypair JSON file
         """
-        path = Path(keypair_path)
+        from .fee_payer_pool import load_or_create_keypair
+        
+        self.admin_keypair, created = load_or_create_keypair(keypair_path)
         
-        if path.exists():
-            # Load existing keypair
-            with open(path, 'r') as f:
-                secret_key = json.load(f)
-            self.admin_keypair = Keypair.from_bytes(bytes(secret_key))
+        if not created:
             print(f"✅ Loaded admin wallet: {self.admin_keypair.pubkey()}")
         else:
-            # Generate new keypair
-            self.admin_keypair = Keypair()
-            
-            # Save to file
-            path.parent.mkdir(parents=True, exist_ok=True)
-            with open(path, 'w') as f:
-                json.dump(list(bytes(self.admin_keypair)), f)
-            
             print(f"✅ Created new admin wallet: {self.admin_keypair.pubkey()}")
             print(f"⚠️  Keypair saved to: {keypair_path}")
             print(f"⚠️  Request devnet SOL: solana airdrop 2 {self.admin_keypair.pubkey()} --url devnet")
@@ -83,6 +115,147 @@ class SolanaVotingClient:
             print(f"❌ Failed to connect to Solana: {str(e)}")
             return False
     
+    def is_circuit_open(self):
+        """
+        Check whether RPC calls are currently short-circuited
+        
+        Returns:
+            bool: True while the circuit breaker is open
+        """
+        return self.circuit_breaker is not None and self.circuit_breaker.is_open()
+    
+    def health_check(self, max_age=None):
+        """
+        Check connection and reconcile the balance ledger, reusing a recent result
+        Only one thread runs the RPC checks; others get the last result
+        instead of waiting
+        
+        Args:
+            max_age: Seconds a previous result stays valid (default HEALTH_CHECK_INTERVAL)
+        
+        Returns:
+            bool: True if connected with sufficient balance
+        """
+        from .config import HEALTH_CHECK_INTERVAL
+        
+        if max_age is None:
+            max_age = HEALTH_CHECK_INTERVAL
+        
+        now = time.time()
+        if self._last_health_check is not None and now - self._last_health_check < max_age:
+            return self._healthy
+        
+        if not self._health_lock.acquire(blocking=False):
+            # Another thread is already checking
+            return self._healthy
+        
+        try:
+            self._healthy = self.check_connection() and self.get_balance_ledger().reconcile()
+            self._last_health_check = time.time()
+            return self._healthy
+        finally:
+            self._health_lock.release()
+    
+    def get_balance_ledger(self):
+        """
+        Get the fee-payer balance ledger, starting its reconciliation timer
+        
+        Returns:
+            FeePayerLedger: Ledger for the admin wallet
+        """
+        with self._ledger_lock:
+            if self._balance_ledger is None:
+                from .balance_ledger import FeePayerLedger
+                self._balance_ledger = FeePayerLedger(self)
+                self._balance_ledger.start()
+            return self._balance_ledger
+    
+    def get_fee_payer_pool(self):
+        """
+        Get the fee-payer pool (admin wallet plus extra paying keypairs)
+        
+        Returns:
+            FeePayerPool: Pool used to assign a fee payer to each transaction
+        """
+        with self._fee_payer_lock:
+            if self._fee_payer_pool is None:
+                from .fee_payer_pool import FeePayerPool
+                self._fee_payer_pool = FeePayerPool(self)
+            return self._fee_payer_pool
+    
+    def get_signer_pubkeys(self):
+        """
+        Get every key allowed to pay for election memos
+        
+        Returns:
+            list: Signer pubkeys (admin wallet first)
+        """
+        return self.get_fee_payer_pool().signer_pubkeys()
+    
+    def get_blockhash_provider(self):
+        """
+        Get the shared blockhash cache, starting its refresh thread
+        
+        Returns:
+            BlockhashProvider: Cached blockhash provider
+        """
+        with self._blockhash_lock:
+            if self._blockhash_provider is None:
+                from .blockhash_cache import BlockhashProvider
+                self._blockhash_provider = BlockhashProvider(self)
+                self._blockhash_provider.start()
+            return self._blockhash_provider
+    
+    def get_confirmation_tracker(self):
+        """
+        Get the shared confirmation tracker, starting its poller
+        
+        Returns:
+            ConfirmationTracker: Batched signature confirmation tracker
+        """
+        with self._tracker_lock:
+            if self._confirmation_tracker is None:
+                from .confirmation_tracker import ConfirmationTracker
+                self._confirmation_tracker = ConfirmationTracker(self)
+                self._confirmation_tracker.start()
+            return self._confirmation_tracker
+    
+    def get_priority_fee_estimator(self):
+        """
+        Get the shared priority fee estimator, starting its sampler
+        
+        Returns:
+            PriorityFeeEstimator: Estimator, or None when USE_PRIORITY_FEES is off
+        """
+        from .config import USE_PRIORITY_FEES
+        if not USE_PRIORITY_FEES:
+            return None
+        
+        with self._priority_fees_lock:
+            if self._priority_fees is None:
+                from .priority_fees import PriorityFeeEstimator
+                self._priority_fees = PriorityFeeEstimator(self)
+                self._priority_fees.start()
+            return self._priority_fees
+    
+    def get_nonce_pool(self):
+        """
+        Get the shared durable nonce pool, starting its refresh thread
+        
+        Returns:
+            DurableNoncePool: Pool, or None when USE_DURABLE_NONCES is off
+        """
+        from .config import USE_DURABLE_NONCES
+        if not USE_DURABLE_NONCES:
+            return None
+        
+        with self._nonce_pool_lock:
+            if self._nonce_pool is None:
+                from .nonce_pool import DurableNoncePool
+                self._nonce_pool = DurableNoncePool(self)
+                self._nonce_pool.start()
+            return self._nonce_pool
+    
     def get_balance(self, pubkey=None):
         """
         Get SOL balance of wallet
@@ -147,19 +320,19 @@ class SolanaVotingClient:
             print(f"   Try manual airdrop: solana airdrop 2 {self.admin_keypair.pubkey()} --url devnet")
             return None
     
-    def confirm_transaction(self, signature, timeout=30):
+    def confirm_transaction(self, signature, timeout=30, commitment=None):
         """
         Wait for transaction confirmation with optimized devnet handling
         
         Args:
             signature: Transaction signature (string or Signature object)
             timeout: Maximum seconds to wait (reduced for faster feedback)
+            commitment: Tier to wait for (defaults to the receipt tier in BlockchainConfig)
         
         Returns:
-            bool: True if confirmed, False if timeout
+            bool: True if confirmed, False if the transaction failed,
+                  None if it was not seen in time (unproven, see reconciler.py)
         """
-        start_time = time.time()
-        
         # Convert string to Signature if needed
         if isinstance(signature, str):
             try:
@@ -172,23 +345,15 @@ class SolanaVotingClient:
         else:
             sig_obj = signature
         
-        while time.time() - start_time < timeout:
-            try:
-                response = self.client.get_signature_statuses([sig_obj])
-                status = response.value[0]
-                
-                if status is not None:
-                    if status.confirmation_status == Confirmed:
-                        print(f"✅ Transaction confirmed: {signature}")
-                        return True
-                    elif status.err:
-                        print(f"❌ Transaction failed: {status.err}")
-                        return False
-                
-                time.sleep(2)  # Reduced polling frequency saves time
-            except Exception as e:
-                print(f"⚠️  Confirmation check error: {str(e)}")
-                time.sleep(2)
+        # Polled together with all other in-flight signatures
+        result = self.get_confirmation_tracker().wait(sig_obj, timeout=timeout, commitment=commitment)
+        
+        if result['confirmed']:
+            print(f"✅ Transaction {result['commitment']}: {signature}")
+            return True
+        elif not result['timeout']:
+            print(f"❌ Transaction failed: {result['error']}")
+            return False
         
         print(f"⏱️  Transaction timeout after {timeout}s (devnet delay)")
         print(f"   ℹ️  Quick-checking if transaction exists...")
@@ -200,10 +365,13 @@ class SolanaVotingClient:
         """
         Alternative confirmation method using get_transaction
         Faster fallback for devnet delays
+        
+        Returns:
+            bool: True if the transaction was found, None if not (unproven)
         """
         start_time = time.time()
         
-        while time.time() - start_time < timeout:
+        while time.time() - start_time < timeout and not self.is_circuit_open():
             try:
                 tx = self.get_transaction_details(signature)
                 if tx is not None:
@@ -213,11 +381,11 @@ class SolanaVotingClient:
             except:
                 time.sleep(3)
         
-        # Devnet is unreliable - if transaction was sent successfully, assume it's pending
-        print(f"   ⚠️  Devnet confirmation slow. Transaction likely processing.")
+        # Not seen yet: no proof either way (devnet delay, or RPC circuit open).
+        # The reconciliation sweeper settles it later.
+        print(f"   ⚠️  Confirmation not observed yet, recorded as unproven.")
         print(f"   🔗 Verify: https://explorer.solana.com/tx/{signature}?cluster=devnet")
-        # Return True - transaction was broadcast successfully
-        return True
+        return None
     
     def get_latest_blockhash(self):
         """
@@ -247,6 +415,72 @@ class SolanaVotingClient:
             print(f"❌ Failed to get slot: {str(e)}")
             return 0
     
+    def get_transaction_cache(self):
+        """
+        Get the persistent transaction cache
+        
+        Returns:
+            TransactionCache: Cache, or None if disabled
+        """
+        from .config import TX_CACHE_ENABLED
+        
+        if not TX_CACHE_ENABLED:
+            return None
+        
+        with self._tx_cache_lock:
+            if self._tx_cache is None:
+                from .tx_cache import TransactionCache
+                self._tx_cache = TransactionCache()
+            return self._tx_cache
+    
+    def _is_finalized_slot(self, slot):
+        """
+        Check if a slot is at or below the latest finalized slot
+        The finalized slot is looked up at most every FINALIZED_SLOT_REFRESH_INTERVAL seconds
+        """
+        from .config import FINALIZED_SLOT_REFRESH_INTERVAL
+        
+        if slot <= self._finalized_slot:
+            return True
+        
+        if time.time() - self._finalized_slot_checked >= FINALIZED_SLOT_REFRESH_INTERVAL:
+            try:
+                self._finalized_slot = self.client.get_slot(commitment=Finalized).value
+                self._finalized_slot_checked = time.time()
+            except Exception as e:
+                print(f"⚠️  Could not get finalized slot: {str(e)}")
+        
+        return slot <= self._finalized_slot
+    
+    def _get_transaction_cached(self, sig_obj, encoding, **kwargs):
+        """
+        get_transaction that reads through the persistent transaction cache
+        
+        Args:
+            sig_obj: Signature object
+            encoding: RPC encoding ("json" or "jsonParsed")
+            **kwargs: Extra get_transaction arguments
+        
+        Returns:
+            GetTransactionResp: RPC response (cached or fresh)
+        """
+        cache = self.get_transaction_cache()
+        signature = str(sig_obj)
+        
+        if cache is not None:
+            cached = cache.get(signature, encoding)
+            if cached is not None:
+                return GetTransactionResp.from_json(cached)
+        
+        response = self.client.get_transaction(sig_obj, encoding=encoding, **kwargs)
+        
+        # Only found transactions are cached, a missing one may still land
+        if cache is not None and response.value:
+            slot = response.value.slot
+            cache.put(signature, encoding, slot, response.to_json(), self._is_finalized_slot(slot))
+        
+        return response
+    
     def get_transaction_details(self, signature):
         """
         Fetch transaction details from blockchain
@@ -264,9 +498,9 @@ class SolanaVotingClient:
             else:
                 sig_obj = signature
             
-            response = self.client.get_transaction(
+            response = self._get_transaction_cached(
                 sig_obj,
-                encoding="json",
+                "json",
                 commitment=Confirmed
             )
             
@@ -303,9 +537,9 @@ class SolanaVotingClient:
                 sig_obj = signature
             
             # Get transaction with JSON encoding
-            response = self.client.get_transaction(
+            response = self._get_transaction_cached(
                 sig_obj,
-                encoding="jsonParsed",
+                "jsonParsed",
                 max_supported_transaction_version=0
             )
             
@@ -319,6 +553,7 @@ class SolanaVotingClient:
                 'signature': str(signature),
                 'slot': tx_value.slot,
                 'blockTime': tx_value.block_time,
+                'fee_payer': self._get_fee_payer(tx_value),
                 'transaction': {
                     'message': {
                         'instructions': self._parse_instructions(tx_value)
@@ -330,6 +565,25 @@ class SolanaVotingClient:
             print(f"❌ Error fetching transaction data: {str(e)}")
             return None
     
+    def _get_fee_payer(self, tx_value):
+        """
+        First account key of the transaction (the fee payer)
+        
+        Args:
+            tx_value: Transaction value from RPC
+        
+        Returns:
+            str: Fee payer pubkey, or None if unavailable
+        """
+        try:
+            account_keys = tx_value.transaction.transaction.message.account_keys
+            if not account_keys:
+                return None
+            # jsonParsed returns ParsedAccount entries, json returns plain pubkeys
+            return str(getattr(account_keys[0], 'pubkey', account_keys[0]))
+        except AttributeError:
+            return None
+    
     def _parse_instructions(self, tx_value):
         """
         Parse transaction instructions to extract memo data
@@ -353,10 +607,20 @@ class SolanaVotingClient:
                     # Get instructions
                     if hasattr(message, 'instructions'):
                         for inst in message.instructions:
-                            # Check if it's a memo instruction
-                            if hasattr(inst, 'data'):
+                            # Other programs (e.g. the ComputeBudget instructions placed
+                            # before the memo when priority fees are on) are not memos
+                            if str(getattr(inst, 'program_id', '')) != MEMO_PROGRAM_ID:
+                                continue
+                            
+                            # jsonParsed encoding decodes memo instructions into plain text
+                            if isinstance(getattr(inst, 'parsed', None), str):
                                 instructions.append({
-                                    'programId': 'MemoSq4gqABAXKb96qnH8TysNcWxMyWCqXgDLGmfcHr',
+                                    'programId': MEMO_PROGRAM_ID,
+                                    'data': inst.parsed
+                                })
+                            elif hasattr(inst, 'data'):
+                                instructions.append({
+                                    'programId': MEMO_PROGRAM_ID,
                                     'data': inst.data
                                 })
             
@@ -398,33 +662,63 @@ class SolanaVotingClient:
             balance = self.get_balance()
             
             return {
-                "connected": True,
+                "connected": not self.is_circuit_open(),
                 "network": self.rpc_url,
                 "current_slot": slot,
                 "admin_balance": balance,
-                "admin_pubkey": str(self.admin_keypair.pubkey()) if self.admin_keypair else None
+                "admin_pubkey": str(self.admin_keypair.pubkey()) if self.admin_keypair else None,
+                "rpc_pool": self.client.snapshot() if hasattr(self.client, 'snapshot') else None,
+                "fee_payers": self._fee_payer_pool.snapshot() if self._fee_payer_pool is not None else None,
+                "confirmation": self._confirmation_tracker.snapshot() if self._confirmation_tracker is not None else None,
+                "priority_fees": self._priority_fees.snapshot() if self._priority_fees is not None else None,
+                "nonce_pool": self._nonce_pool.snapshot() if self._nonce_pool is not None else None,
+                "circuit_breaker": self.circuit_breaker.snapshot() if self.circuit_breaker is not None else None
             }
         except Exception as e:
             return {
                 "connected": False,
-                "error": str(e)
+                "error": str(e),
+                "circuit_breaker": self.circuit_breaker.snapshot() if self.circuit_breaker is not None else None
             }
 
 
-# Helper function to get client instance
+# Process-wide shared client instance
+_solana_client = None
+_solana_client_lock = threading.Lock()
+
 def get_solana_client():
     """
-    Get Solana client instance with configuration from config.py
+    Get shared Solana client with configuration from config.py
+    The keypair is loaded once per process and health checks run lazily
     
     Returns:
         SolanaVotingClient: Client instance
     """
-    from .config import RPC_ENDPOINT, ADMIN_WALLET_PATH
-    
-    client = SolanaVotingClient(RPC_ENDPOINT, ADMIN_WALLET_PATH)
+    global _solana_client
     
-    # Check connection on initialization
-    if client.check_connection():
-        client.ensure_sufficient_balance()
+    with _solana_client_lock:
+        if _solana_client is None:
+            from .config import config, ADMIN_WALLET_PATH
+            _solana_client = SolanaVotingClient(
+                config.get_rpc_endpoint(),
+                ADMIN_WALLET_PATH,
+                backup_urls=config.get_backup_endpoints()
+            )
+        client = _solana_client
     
+    client.health_check()
     return client
+
+
+def set_solana_client(client):
+    """
+    Replace the shared Solana client (e.g. inject a stub in tests)
+    Shared recorder/verifier instances pick up the new client on next use
+    
+    Args:
+        client: SolanaVotingClient instance, or None to rebuild from config
+    """
+    global _solana_client
+    
+    with _solana_client_lock:
+        _solana_client = client
@@ -0,0 +1,272 @@
+"""
+Blockchain Stats Cache
+Keeps the admin dashboard statistics warm so page loads never run the
+vote table aggregates or the get_slot / get_balance RPC calls
+
+The statistics are split in two sections with their own schedules:
+
+    db       vote counts, verification rate, latest votes (local SQL)
+    network  connection state, current slot, admin balance (RPC)
+
+A background thread refreshes each section when its interval elapses.
+Readers get the cached values; only a section that is missing or older
+than its max age is computed synchronously, once, while concurrent
+readers wait for that single computation instead of repeating it.
+"""
+
+import threading
+import time
+from models import db
+from .config import (
+    STATS_DB_REFRESH_INTERVAL,
+    STATS_NETWORK_REFRESH_INTERVAL,
+    STATS_DB_MAX_AGE,
+    STATS_NETWORK_MAX_AGE,
+)
+
+
+class _CachedSection:
+    """
+    One independently refreshed group of statistics
+    """
+
+    def __init__(self, name, compute, refresh_interval, max_age):
+        self.name = name
+        self.compute = compute
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+
+        self.value = None
+        self.fetched_at = None
+
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.errors = 0
+
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+
+    def age(self):
+        return time.time() - self.fetched_at if self.fetched_at else None
+
+    def is_due(self):
+        return self.fetched_at is None or self.age() >= self.refresh_interval
+
+    def refresh(self):
+        """
+        Recompute and cache the section
+
+        Returns:
+            dict: Fresh section value
+        """
+        with self._fetch_lock:
+            return self._compute()
+
+    def _compute(self):
+        """Run compute and store the result (fetch lock held)"""
+        try:
+            value = self.compute()
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+
+        with self._lock:
+            self.value = value
+            self.fetched_at = time.time()
+            self.refreshes += 1
+            return value
+
+    def get(self):
+        """
+        Get the cached value, recomputing it only when missing or too old
+
+        Returns:
+            dict: Section value
+        """
+        with self._lock:
+            if self.value is not None and self.age() < self.max_age:
+                self.hits += 1
+                return self.value
+            self.misses += 1
+            fetched_at = self.fetched_at
+
+        with self._fetch_lock:
+            # Another reader may have refreshed while we waited for the lock
+            with self._lock:
+                if self.value is not None and self.fetched_at != fetched_at:
+                    return self.value
+            return self._compute()
+
+    def snapshot(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'age_seconds': round(self.age(), 2) if self.fetched_at else None,
+                'refresh_interval': self.refresh_interval,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total * 100, 2) if total else 0,
+                'refreshes': self.refreshes,
+                'errors': self.errors
+            }
+
+
+class BlockchainStatsCache:
+    """
+    TTL cache for VoteVerifier dashboard statistics with background refresh
+    """
+
+    def __init__(self, app=None, verifier=None,
+                 db_refresh_interval=STATS_DB_REFRESH_INTERVAL,
+                 network_refresh_interval=STATS_NETWORK_REFRESH_INTERVAL,
+                 db_max_age=STATS_DB_MAX_AGE,
+                 network_max_age=STATS_NETWORK_MAX_AGE):
+        """
+        Initialize cache
+
+        Args:
+            app: Flask app (required for the background refresh thread)
+            verifier: VoteVerifier (defaults to the shared verifier, resolved lazily)
+            db_refresh_interval: Seconds between vote table refreshes
+            network_refresh_interval: Seconds between RPC refreshes
+            db_max_age: Cached DB stats older than this are recomputed on read
+            network_max_age: Cached network stats older than this are fetched on read
+        """
+        self.app = app
+        self._verifier = verifier
+
+        self.sections = {
+            'db': _CachedSection(
+                'db',
+                lambda: self.verifier.get_blockchain_db_stats(),
+                db_refresh_interval, db_max_age
+            ),
+            'network': _CachedSection(
+                'network',
+                lambda: self.verifier.get_blockchain_network_stats(),
+                network_refresh_interval, network_max_age
+            )
+        }
+
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def verifier(self):
+        if self._verifier is not None:
+            return self._verifier
+        from .vote_verifier import get_vote_verifier
+        return get_vote_verifier()
+
+    def start(self):
+        """Start background refresh thread"""
+        if self._thread is not None:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._refresh_loop, name="blockchain-stats-cache", daemon=True)
+        self._thread.start()
+        print(f"📊 Blockchain stats cache started (DB every {self.sections['db'].refresh_interval}s, "
+              f"network every {self.sections['network'].refresh_interval}s)")
+
+    def stop(self):
+        """Stop background refresh"""
+        self._stop_event.set()
+        self._thread = None
+
+    def _refresh_loop(self):
+        wait = min(section.refresh_interval for section in self.sections.values())
+
+        while not self._stop_event.is_set():
+            for section in self.sections.values():
+                if not section.is_due():
+                    continue
+                with self.app.app_context():
+                    try:
+                        section.refresh()
+                    except Exception as e:
+                        db.session.rollback()
+                        print(f"⚠️  Blockchain stats refresh failed ({section.name}): {str(e)}")
+                    finally:
+                        db.session.remove()
+            self._stop_event.wait(wait)
+
+    def get(self):
+        """
+        Get dashboard statistics in the get_blockchain_stats format (requires
+        app context when a section has to be recomputed)
+
+        Returns:
+            dict: Blockchain statistics plus a 'cache' snapshot
+        """
+        try:
+            stats = dict(self.sections['db'].get())
+            stats['network'] = self.sections['network'].get()
+        except Exception as e:
+            return {
+                'error': str(e),
+                'total_votes': 0,
+                'blockchain_verified': 0
+            }
+
+        stats['cache'] = self.snapshot()
+        return stats
+
+    def invalidate(self, section=None):
+        """Force a refresh of one section (or all) on the next read"""
+        for name, cached in self.sections.items():
+            if section is None or name == section:
+                with cached._lock:
+                    cached.value = None
+                    cached.fetched_at = None
+
+    def snapshot(self):
+        """
+        Get cache statistics for monitoring
+
+        Returns:
+            dict: Per-section age and hit/miss counters
+        """
+        return {name: section.snapshot() for name, section in self.sections.items()}
+
+
+# Global stats cache instance
+_stats_cache = None
+_stats_cache_lock = threading.Lock()
+
+def start_blockchain_stats_cache(app, **kwargs):
+    """
+    Start the background dashboard stats refresher (once per process)
+
+    Args:
+        app: Flask application
+        **kwargs: Passed to BlockchainStatsCache
+
+    Returns:
+        BlockchainStatsCache: Running stats cache
+    """
+    global _stats_cache
+
+    with _stats_cache_lock:
+        if _stats_cache is None or _stats_cache.app is None:
+            _stats_cache = BlockchainStatsCache(app, **kwargs)
+        _stats_cache.start()
+        return _stats_cache
+
+
+def get_blockchain_stats_cache():
+    """
+    Get the shared stats cache
+    Without a started refresher it still caches, refreshing stale sections on read
+
+    Returns:
+        BlockchainStatsCache: Stats cache
+    """
+    global _stats_cache
+
+    with _stats_cache_lock:
+        if _stats_cache is None:
+            _stats_cache = BlockchainStatsCache()
+        return _stats_cache
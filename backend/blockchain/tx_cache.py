@@ -0,0 +1,153 @@
+"""
+Transaction Cache
+Persistent on-disk cache of Solana get_transaction responses
+
+A transaction signature is a hash of the signed transaction, so a
+confirmed transaction never changes and can be cached by signature.
+Responses at or below the latest finalized slot are stored permanently;
+newer (confirmed, not yet finalized) ones expire after a short TTL.
+Repeated audits and verifications then make no network calls.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from .config import TX_CACHE_PATH, TX_CACHE_TTL
+
+
+class TransactionCache:
+    """
+    SQLite-backed cache of raw get_transaction responses keyed by
+    (signature, encoding)
+    """
+
+    def __init__(self, path=TX_CACHE_PATH, ttl=TX_CACHE_TTL):
+        """
+        Initialize cache
+
+        Args:
+            path: SQLite file path
+            ttl: Seconds a non-finalized transaction stays cached
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connection()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS tx_cache (
+                signature TEXT NOT NULL,
+                encoding TEXT NOT NULL,
+                slot INTEGER,
+                finalized INTEGER NOT NULL DEFAULT 0,
+                response TEXT NOT NULL,
+                cached_at REAL NOT NULL,
+                PRIMARY KEY (signature, encoding)
+            )
+        ''')
+        conn.commit()
+
+    def _connection(self):
+        """One SQLite connection per thread"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, signature, encoding):
+        """
+        Look up a cached response
+
+        Args:
+            signature: Transaction signature string
+            encoding: RPC encoding the response was fetched with
+
+        Returns:
+            str: Raw response JSON, or None if missing/expired
+        """
+        row = self._connection().execute(
+            'SELECT response, finalized, cached_at FROM tx_cache WHERE signature = ? AND encoding = ?',
+            (signature, encoding)
+        ).fetchone()
+
+        if row is not None:
+            response, finalized, cached_at = row
+            if finalized or time.time() - cached_at < self.ttl:
+                with self._stats_lock:
+                    self.hits += 1
+                return response
+
+        with self._stats_lock:
+            self.misses += 1
+        return None
+
+    def put(self, signature, encoding, slot, response, finalized):
+        """
+        Store a response
+
+        Args:
+            signature: Transaction signature string
+            encoding: RPC encoding
+            slot: Slot the transaction landed in
+            response: Raw response JSON
+            finalized: True to keep permanently
+        """
+        conn = self._connection()
+        conn.execute(
+            'INSERT OR REPLACE INTO tx_cache (signature, encoding, slot, finalized, response, cached_at) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (signature, encoding, slot, 1 if finalized else 0, response, time.time())
+        )
+        conn.commit()
+
+        with self._stats_lock:
+            self.stores += 1
+
+    def purge_expired(self):
+        """
+        Delete expired non-finalized entries
+
+        Returns:
+            int: Number of entries removed
+        """
+        conn = self._connection()
+        cursor = conn.execute(
+            'DELETE FROM tx_cache WHERE finalized = 0 AND cached_at < ?',
+            (time.time() - self.ttl,)
+        )
+        conn.commit()
+        return cursor.rowcount
+
+    def snapshot(self):
+        """
+        Get cache statistics for monitoring
+
+        Returns:
+            dict: Entry counts and hit rate
+        """
+        total_entries, finalized_entries = self._connection().execute(
+            'SELECT COUNT(*), COALESCE(SUM(finalized), 0) FROM tx_cache'
+        ).fetchone()
+
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            return {
+                'path': str(self.path),
+                'entries': total_entries,
+                'finalized_entries': finalized_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups * 100, 2) if lookups else 0,
+                'stores': self.stores
+            }
@@ -3,19 +3,171 @@ Vote Recorder Module
 Records encrypted votes on Solana blockchain with memo transactions
 """
 
-import json
 import time
+from contextlib import contextmanager
 from datetime import datetime
 from solders.transaction import Transaction  # type: ignore
 from solders.message import Message  # type: ignore
 from solders.instruction import Instruction, AccountMeta  # type: ignore
 from solders.pubkey import Pubkey  # type: ignore
+from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price  # type: ignore
 from solana.rpc.types import TxOpts
 from solana.rpc.commitment import Confirmed
+from .merkle import MerkleTree, vote_leaf_data
+from .memo_codec import encode_ballot_memo, encode_merkle_root_memo, encode_chain_head_memo
+from .circuit_breaker import CircuitOpenError
+from .config import config, CONFIRMATION_TIMEOUT, LAMPORTS_PER_SIGNATURE
 
 # Memo program ID (Solana's built-in memo program)
 MEMO_PROGRAM_ID = Pubkey.from_string("MemoSq4gqABAXKb96qnH8TysNcWxMyWCqXgDLGmfcHr")
 
+# A transaction is limited to 1232 bytes; leave room for signature, accounts and blockhash
+MAX_BALLOT_MEMO_BYTES = 1000
+
+# AdvanceNonceAccount adds ~106 bytes; longer memos are sent with a recent blockhash
+MAX_NONCE_MEMO_BYTES = 900
+
+
+def build_memo_transaction(payer, memo_text, recent_blockhash, priority_fee=None, nonce_account=None):
+    """
+    Build and sign a memo transaction
+    
+    Args:
+        payer: FeePayer from the fee-payer pool (signs and pays)
+        memo_text: Text to store in memo
+        recent_blockhash: Recent blockhash, or the durable nonce of nonce_account
+        priority_fee: Optional PriorityFeeEstimator quote (adds compute-budget instructions)
+        nonce_account: Optional NonceAccount authorized by payer (durable nonce transaction)
+    
+    Returns:
+        Transaction: Signed transaction
+    """
+    instructions = []
+    if nonce_account is not None:
+        # AdvanceNonceAccount must be the first instruction of a durable nonce transaction
+        instructions.append(nonce_account.advance_instruction)
+    
+    if priority_fee is not None:
+        # Compute-budget instructions add ~50 bytes; a 1000-byte memo still fits in 1232
+        instructions.append(set_compute_unit_limit(priority_fee['compute_unit_limit']))
+        instructions.append(set_compute_unit_price(priority_fee['compute_unit_price']))
+    
+    memo_instruction = Instruction(
+        program_id=MEMO_PROGRAM_ID,
+        accounts=[
+            AccountMeta(
+                pubkey=payer.pubkey,
+                is_signer=True,
+                is_writable=False
+            )
+        ],
+        data=memo_text.encode('utf-8')
+    )
+    
+    instructions.append(memo_instruction)
+    
+    message = Message.new_with_blockhash(
+        instructions,
+        payer.pubkey,
+        recent_blockhash
+    )
+    
+    return Transaction([payer.keypair], message, recent_blockhash)
+
+
+@contextmanager
+def reserve_nonce(client, payer, memo_text):
+    """
+    Reserve a durable nonce for one memo transaction (USE_DURABLE_NONCES)
+    Call mark_sent() on the pool before sending; an unsent nonce is freed on exit.
+    
+    Args:
+        client: SolanaVotingClient or AsyncSolanaVotingClient
+        payer: FeePayer the transaction is built for (the nonce authority)
+        memo_text: Memo the transaction will carry
+    
+    Yields:
+        NonceAccount: Reserved account, or None to use a recent blockhash
+    """
+    nonce_pool = client.get_nonce_pool()
+    nonce_account = None
+    if nonce_pool is not None and payer is not None and len(memo_text.encode('utf-8')) <= MAX_NONCE_MEMO_BYTES:
+        nonce_account = nonce_pool.acquire(payer)
+    
+    try:
+        yield nonce_account
+    finally:
+        if nonce_account is not None:
+            nonce_pool.release(nonce_account)
+
+
+def transaction_fee(priority_fee=None):
+    """
+    Lamports a memo transaction costs its fee payer
+    
+    Args:
+        priority_fee: PriorityFeeEstimator quote it was built with, if any
+    
+    Returns:
+        int: Base signature fee plus the priority fee
+    """
+    return LAMPORTS_PER_SIGNATURE + (priority_fee['lamports'] if priority_fee else 0)
+
+
+def unproven_result(signature, last_valid_block_height, nonce_account, recent_blockhash, error):
+    """
+    Failure result of a memo transaction that was already sent
+    
+    The signature is kept so the outbox settles the ballot as unproven and the
+    reconciliation sweeper confirms or resubmits it, instead of sending the
+    memo a second time.
+    
+    Args:
+        signature: Signature of the sent transaction
+        last_valid_block_height: Expiry of its blockhash (None for durable nonces)
+        nonce_account: NonceAccount it was built with, or None
+        recent_blockhash: Blockhash or durable nonce it was built with
+        error: Error message
+    
+    Returns:
+        dict: Same structure as VoteRecorder._send_memo_transaction, 'success' False
+    """
+    return {
+        'success': False,
+        'error': error,
+        'proven': False,
+        'commitment': None,
+        'signature': signature,
+        'slot': None,
+        'timestamp': None,
+        'last_valid_block_height': last_valid_block_height,
+        'nonce_account': str(nonce_account.pubkey) if nonce_account is not None else None,
+        'durable_nonce': str(recent_blockhash) if nonce_account is not None else None,
+        'nonce_slot': nonce_account.nonce_slot if nonce_account is not None else None
+    }
+
+
+def ballot_receipts(encryption, signature, voter_hash, ballot):
+    """
+    Per-position receipts of a recorded ballot (all positions share the signature)
+    
+    Args:
+        encryption: VoteEncryption instance
+        signature: Transaction signature
+        voter_hash: SHA-256 hash of the voter ID
+        ballot: {position: encrypted_vote}
+    
+    Returns:
+        dict: {position: {'encrypted_data': str, 'receipt': str}}
+    """
+    return {
+        position: {
+            'encrypted_data': encrypted_vote,
+            'receipt': encryption.generate_vote_receipt(signature, voter_hash, position)
+        }
+        for position, encrypted_vote in ballot.items()
+    }
+
 
 class VoteRecorder:
     """
@@ -71,31 +223,57 @@ class VoteRecorder:
                 halka=halka
             )
             
-            voter_hash = payload['voter_hash']
-            encrypted_vote = payload['encrypted_vote']
-            metadata = payload['metadata']
-            
             print(f"   ✅ Vote encrypted")
-            print(f"   ✅ Voter hash: {voter_hash[:16]}...")
             
-            # Step 2: Create memo data (what goes on blockchain)
-            memo_data = {
-                "type": "VOTE",
-                "election_id": metadata['election_id'],
-                "voter_hash": voter_hash[:32],  # First 32 chars for space
-                "encrypted_vote": encrypted_vote[:200],  # Truncate for memo limit
-                "halka": halka,
-                "position": position,
-                "version": metadata['version'],
-                "timestamp": datetime.utcnow().isoformat()
+            return self.record_encrypted_vote_on_chain(
+                voter_hash=payload['voter_hash'],
+                encrypted_vote=payload['encrypted_vote'],
+                position=position,
+                halka=halka,
+                metadata=payload['metadata']
+            )
+        
+        except Exception as e:
+            print(f"   ❌ Vote recording failed: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return {
+                'success': False,
+                'error': str(e)
             }
+    
+    def record_encrypted_vote_on_chain(self, voter_hash, encrypted_vote, position, halka, metadata=None):
+        """
+        Record an already encrypted vote payload on Solana blockchain
+        Used by the vote outbox, which encrypts votes when they are cast
+        
+        Args:
+            voter_hash: SHA-256 hash of the voter ID
+            encrypted_vote: Encrypted vote data (from VoteEncryption)
+            position: Position being voted for
+            halka: Electoral constituency
+            metadata: Payload metadata (defaults to current election settings)
+        
+        Returns:
+            dict: Same structure as record_vote_on_chain
+        """
+        try:
+            if metadata is None:
+                from .config import ELECTION_ID, VOTE_PROGRAM_VERSION
+                metadata = {
+                    'election_id': ELECTION_ID,
+                    'version': VOTE_PROGRAM_VERSION
+                }
             
-            # Convert to compact JSON
-            memo_str = json.dumps(memo_data, separators=(',', ':'))
+            print(f"   ✅ Voter hash: {voter_hash[:16]}...")
             
-            # Memo program has 566 byte limit, truncate if needed
-            if len(memo_str) > 566:
-                memo_str = memo_str[:563] + "..."
+            # Step 2: Create memo (compact binary, full ciphertext, see memo_codec)
+            memo_str = encode_ballot_memo(
+                metadata['election_id'],
+                voter_hash,
+                halka,
+                {position: encrypted_vote}
+            )
             
             print(f"   📝 Memo size: {len(memo_str)} bytes")
             
@@ -118,6 +296,12 @@ class VoteRecorder:
                     'signature': result['signature'],
                     'slot': result['slot'],
                     'timestamp': result['timestamp'],
+                    'proven': result.get('proven', True),
+                    'commitment': result.get('commitment'),
+                    'last_valid_block_height': result.get('last_valid_block_height'),
+                    'nonce_account': result.get('nonce_account'),
+                    'durable_nonce': result.get('durable_nonce'),
+                    'nonce_slot': result.get('nonce_slot'),
                     'voter_hash': voter_hash,
                     'encrypted_data': encrypted_vote,
                     'receipt': receipt,
@@ -127,6 +311,7 @@ class VoteRecorder:
                 print(f"   ❌ Transaction failed: {result.get('error')}")
                 return {
                     'success': False,
+                    'deferred': result.get('deferred', False),
                     'error': result.get('error', 'Unknown error')
                 }
         
@@ -139,90 +324,385 @@ class VoteRecorder:
                 'error': str(e)
             }
     
-    def _send_memo_transaction(self, memo_text):
+    def record_ballot_on_chain(self, voter_hash, ballot, halka, metadata=None):
         """
-        Send memo transaction to Solana
+        Record all of a voter's encrypted votes in a single memo transaction
+        One signature, blockhash and confirmation per voter instead of per position
         
         Args:
-            memo_text: Text to store in memo
+            voter_hash: SHA-256 hash of the voter ID
+            ballot: dict mapping position -> encrypted vote data
+            halka: Electoral constituency
+            metadata: Payload metadata (defaults to current election settings)
         
         Returns:
-            dict: {'success': bool, 'signature': str, 'slot': int, 'timestamp': datetime}
+            dict: {
+                'success': bool,
+                'signature': str,
+                'slot': int,
+                'timestamp': datetime,
+                'voter_hash': str,
+                'votes': {position: {'encrypted_data': str, 'receipt': str}},
+                'error': str (if failed)
+            }
         """
         try:
-            # Ensure sufficient balance
-            if not self.client.ensure_sufficient_balance(0.01):
+            if metadata is None:
+                from .config import ELECTION_ID, VOTE_PROGRAM_VERSION
+                metadata = {
+                    'election_id': ELECTION_ID,
+                    'version': VOTE_PROGRAM_VERSION
+                }
+            
+            print(f"\n🔐 Recording ballot on blockchain...")
+            print(f"   Voter hash: {voter_hash[:16]}...")
+            print(f"   Positions: {', '.join(ballot.keys())}")
+            
+            # One compact memo with the shared fields written once and full ciphertexts
+            memo_str = encode_ballot_memo(
+                metadata['election_id'],
+                voter_hash,
+                halka,
+                ballot
+            )
+            
+            print(f"   📝 Memo size: {len(memo_str)} bytes")
+            
+            if len(memo_str.encode('utf-8')) > MAX_BALLOT_MEMO_BYTES:
                 return {
                     'success': False,
-                    'error': 'Insufficient SOL balance for transaction'
+                    'error': f'Ballot memo too large ({len(memo_str)} bytes)'
                 }
             
-            # Create memo instruction
-            memo_instruction = Instruction(
-                program_id=MEMO_PROGRAM_ID,
-                accounts=[
-                    AccountMeta(
-                        pubkey=self.client.admin_keypair.pubkey(),
-                        is_signer=True,
-                        is_writable=False
-                    )
-                ],
-                data=memo_text.encode('utf-8')
-            )
+            result = self._send_memo_transaction(memo_str)
             
-            # Get recent blockhash
-            recent_blockhash = self.client.get_latest_blockhash()
+            if not result['success'] and result.get('signature') is None:
+                print(f"   ❌ Transaction failed: {result.get('error')}")
+                return {
+                    'success': False,
+                    'deferred': result.get('deferred', False),
+                    'error': result.get('error', 'Unknown error')
+                }
             
-            # Create message
-            message = Message.new_with_blockhash(
-                [memo_instruction],
-                self.client.admin_keypair.pubkey(),
-                recent_blockhash
-            )
+            # Per-position receipts (all positions share the signature)
+            votes = ballot_receipts(self.encryption, result['signature'], voter_hash, ballot)
             
-            # Create signed transaction
-            transaction = Transaction([self.client.admin_keypair], message, recent_blockhash)
+            print(f"   ✅ Ballot confirmed!" if result['success'] else f"   🔌 Ballot sent, confirmation deferred")
+            print(f"   📜 Signature: {result['signature'][:16]}...")
             
-            # Send transaction (send raw transaction)
-            response = self.client.client.send_raw_transaction(
-                bytes(transaction),
-                opts=TxOpts(skip_preflight=False, preflight_commitment=Confirmed)
+            return {
+                'success': result['success'],
+                'deferred': result.get('deferred', False),
+                'signature': result['signature'],
+                'slot': result['slot'],
+                'timestamp': result['timestamp'],
+                'proven': result.get('proven', True),
+                'commitment': result.get('commitment'),
+                'last_valid_block_height': result.get('last_valid_block_height'),
+                'nonce_account': result.get('nonce_account'),
+                'durable_nonce': result.get('durable_nonce'),
+                'nonce_slot': result.get('nonce_slot'),
+                'voter_hash': voter_hash,
+                'votes': votes,
+                'error': result.get('error')
+            }
+        
+        except Exception as e:
+            print(f"   ❌ Ballot recording failed: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    def anchor_merkle_batch(self, votes, metadata=None):
+        """
+        Anchor a batch of encrypted votes on-chain as a single Merkle root
+        Only the 32-byte root is written, so one transaction covers any batch size
+        
+        Args:
+            votes: List of dicts with 'voter_hash', 'position' and 'encrypted_vote'
+            metadata: Payload metadata (defaults to current election settings)
+        
+        Returns:
+            dict: {
+                'success': bool,
+                'signature': str,
+                'slot': int,
+                'timestamp': datetime,
+                'merkle_root': str,
+                'leaves': [{'leaf_index': int, 'proof': list, 'receipt': str}],
+                'error': str (if failed)
+            }
+        """
+        try:
+            if metadata is None:
+                from .config import ELECTION_ID, VOTE_PROGRAM_VERSION
+                metadata = {
+                    'election_id': ELECTION_ID,
+                    'version': VOTE_PROGRAM_VERSION
+                }
+            
+            tree = MerkleTree([
+                vote_leaf_data(vote['voter_hash'], vote['position'], vote['encrypted_vote'])
+                for vote in votes
+            ])
+            
+            print(f"\n🌳 Anchoring Merkle batch on blockchain...")
+            print(f"   Votes: {tree.leaf_count}")
+            print(f"   Root: {tree.root[:16]}...")
+            
+            memo_str = encode_merkle_root_memo(
+                metadata['election_id'],
+                tree.root,
+                tree.leaf_count
             )
             
-            signature = str(response.value)
+            result = self._send_memo_transaction(memo_str)
             
-            # Check if fast mode is enabled
-            import os
-            fast_mode_file = os.path.join(os.path.dirname(__file__), '..', 'blockchain_fast_mode.txt')
-            fast_mode = os.path.exists(fast_mode_file)
+            if not result['success'] and result.get('signature') is None:
+                print(f"   ❌ Transaction failed: {result.get('error')}")
+                return {
+                    'success': False,
+                    'deferred': result.get('deferred', False),
+                    'error': result.get('error', 'Unknown error')
+                }
             
-            if fast_mode:
-                # Fast mode: skip full confirmation, just check signature exists
-                print(f"   ⚡ Fast mode: minimal confirmation")
-                confirmed = True
-                time.sleep(2)  # Brief wait for transaction to propagate
-            else:
-                # Normal mode: full confirmation
-                confirmed = self.client.confirm_transaction(signature, timeout=30)
+            leaves = []
+            for index, vote in enumerate(votes):
+                leaves.append({
+                    'leaf_index': index,
+                    'proof': tree.get_proof(index),
+                    'receipt': self.encryption.generate_vote_receipt(
+                        result['signature'],
+                        vote['voter_hash'],
+                        vote['position'],
+                        merkle_root=tree.root,
+                        leaf_index=index
+                    )
+                })
             
-            if confirmed:
-                # Get slot and timestamp
-                slot = self.client.get_slot()
-                timestamp = datetime.utcnow()
-                
+            print(f"   ✅ Merkle root anchored!" if result['success'] else f"   🔌 Merkle root sent, confirmation deferred")
+            print(f"   📜 Signature: {result['signature'][:16]}...")
+            
+            return {
+                'success': result['success'],
+                'deferred': result.get('deferred', False),
+                'signature': result['signature'],
+                'slot': result['slot'],
+                'timestamp': result['timestamp'],
+                'proven': result.get('proven', True),
+                'commitment': result.get('commitment'),
+                'last_valid_block_height': result.get('last_valid_block_height'),
+                'nonce_account': result.get('nonce_account'),
+                'durable_nonce': result.get('durable_nonce'),
+                'nonce_slot': result.get('nonce_slot'),
+                'merkle_root': tree.root,
+                'leaves': leaves,
+                'error': result.get('error')
+            }
+        
+        except Exception as e:
+            print(f"   ❌ Merkle anchoring failed: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    def anchor_chain_head(self, head_hash, length, last_vote_id):
+        """
+        Anchor a vote hash chain checkpoint on-chain
+        
+        Args:
+            head_hash: Hex chain head
+            length: Number of linked votes
+            last_vote_id: Vote id the head was computed at
+        
+        Returns:
+            dict: {'success': bool, 'signature': str, 'slot': int, 'timestamp': datetime, 'error': str}
+        """
+        try:
+            from .config import ELECTION_ID
+            
+            memo_str = encode_chain_head_memo(ELECTION_ID, head_hash, length, last_vote_id)
+            result = self._send_memo_transaction(memo_str)
+            
+            if not result['success']:
+                print(f"   ❌ Chain head anchoring failed: {result.get('error')}")
                 return {
-                    'success': True,
-                    'signature': signature,
-                    'slot': slot,
-                    'timestamp': timestamp
+                    'success': False,
+                    'error': result.get('error', 'Unknown error')
                 }
-            else:
+            
+            print(f"⛓️  Vote hash chain head anchored ({length} votes): {result['signature'][:16]}...")
+            
+            return {
+                'success': True,
+                'signature': result['signature'],
+                'slot': result['slot'],
+                'timestamp': result['timestamp'],
+                'proven': result.get('proven', True),
+                'commitment': result.get('commitment'),
+                'last_valid_block_height': result.get('last_valid_block_height'),
+                'nonce_account': result.get('nonce_account'),
+                'durable_nonce': result.get('durable_nonce'),
+                'nonce_slot': result.get('nonce_slot'),
+                'error': None
+            }
+        
+        except Exception as e:
+            print(f"   ❌ Chain head anchoring failed: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    def _send_memo_transaction(self, memo_text):
+        """
+        Send memo transaction to Solana
+        
+        Args:
+            memo_text: Text to store in memo
+        
+        Returns:
+            dict: {'success': bool, 'proven': bool, 'commitment': str, 'signature': str,
+                   'slot': int, 'timestamp': datetime, 'last_valid_block_height': int,
+                   'nonce_account': str, 'durable_nonce': str, 'nonce_slot': int}
+                  'commitment' is the tier the receipt was issued at. 'proven' is False
+                  when the transaction was sent but its confirmation could not be
+                  observed (commitment, slot and timestamp are None). Durable nonce
+                  transactions have no last valid block height; they stay valid
+                  until the nonce of nonce_account moves past durable_nonce
+        """
+        fee_estimator = None
+        priority_fee = None
+        sent = False
+        
+        try:
+            # Solana known to be unreachable: defer instead of waiting out RPC timeouts
+            if self.client.is_circuit_open():
                 return {
                     'success': False,
-                    'error': 'Transaction confirmation timeout'
+                    'deferred': True,
+                    'error': 'Solana RPC circuit open, vote deferred'
                 }
+            
+            # Optional priority fee (USE_PRIORITY_FEES), reserved from the election budget
+            fee_estimator = self.client.get_priority_fee_estimator()
+            priority_fee = fee_estimator.quote() if fee_estimator is not None else None
+            
+            # Least-loaded fee payer that can afford the fee (local balance estimates)
+            with self.client.get_fee_payer_pool().acquire(lamports=transaction_fee(priority_fee)) as payer, \
+                    reserve_nonce(self.client, payer, memo_text) as nonce_account:
+                if payer is None:
+                    if fee_estimator is not None:
+                        fee_estimator.refund(priority_fee)
+                    return {
+                        'success': False,
+                        'error': 'Insufficient SOL balance for transaction'
+                    }
+                
+                if nonce_account is not None:
+                    # Pre-fetched durable nonce: no blockhash lookup, no expiry
+                    recent_blockhash, last_valid_block_height = nonce_account.nonce, None
+                else:
+                    # Get recent blockhash (shared cache, refreshed in the background)
+                    recent_blockhash, last_valid_block_height = self.client.get_blockhash_provider().get()
+                
+                # Create signed memo transaction
+                transaction = build_memo_transaction(payer, memo_text, recent_blockhash, priority_fee, nonce_account)
+                
+                # Send transaction (send raw transaction)
+                sent_at = time.time()
+                if nonce_account is not None:
+                    self.client.get_nonce_pool().mark_sent(nonce_account)
+                response = self.client.client.send_raw_transaction(
+                    bytes(transaction),
+                    opts=TxOpts(skip_preflight=False, preflight_commitment=Confirmed)
+                )
+                signature = str(response.value)
+                sent = True
+                
+                payer.ledger.debit(lamports=transaction_fee(priority_fee))
+                
+                # Wait for the receipt tier (processed / confirmed / finalized); the
+                # tracker keeps following it to finalized in the background
+                commitment = config.get_commitment_tier()
+                confirmed = self.client.confirm_transaction(
+                    signature, timeout=CONFIRMATION_TIMEOUT, commitment=commitment
+                )
+                
+                if fee_estimator is not None:
+                    fee_estimator.record(priority_fee, time.time() - sent_at, bool(confirmed))
+                
+                if confirmed:
+                    # Get slot and timestamp
+                    slot = self.client.get_slot()
+                    timestamp = datetime.utcnow()
+                    
+                    return {
+                        'success': True,
+                        'proven': True,
+                        'commitment': commitment,
+                        'signature': signature,
+                        'slot': slot,
+                        'timestamp': timestamp,
+                        'last_valid_block_height': last_valid_block_height,
+                        'nonce_account': str(nonce_account.pubkey) if nonce_account is not None else None,
+                        'durable_nonce': str(recent_blockhash) if nonce_account is not None else None,
+                        'nonce_slot': nonce_account.nonce_slot if nonce_account is not None else None
+                    }
+                elif confirmed is None:
+                    # Sent but not proven on-chain: recorded as unproven, the reconciliation
+                    # sweeper confirms it or resubmits once its blockhash has expired
+                    return {
+                        'success': True,
+                        'proven': False,
+                        'commitment': None,
+                        'signature': signature,
+                        'slot': None,
+                        'timestamp': None,
+                        'last_valid_block_height': last_valid_block_height,
+                        'nonce_account': str(nonce_account.pubkey) if nonce_account is not None else None,
+                        'durable_nonce': str(recent_blockhash) if nonce_account is not None else None,
+                        'nonce_slot': nonce_account.nonce_slot if nonce_account is not None else None
+                    }
+                else:
+                    return {
+                        'success': False,
+                        'error': 'Transaction failed on-chain'
+                    }
         
+        except CircuitOpenError as e:
+            if sent:
+                # Circuit opened while confirming: the transaction is out, so the
+                # signature is kept (unproven) instead of sending the memo twice
+                result = unproven_result(signature, last_valid_block_height, nonce_account, recent_blockhash, str(e))
+                result['deferred'] = True
+                return result
+            if fee_estimator is not None:
+                fee_estimator.refund(priority_fee)
+            return {
+                'success': False,
+                'deferred': True,
+                'error': str(e)
+            }
         except Exception as e:
+            if sent:
+                # Failed after sending (confirmation, bookkeeping): the transaction may
+                # land, so the sweeper decides instead of the outbox sending it again
+                return unproven_result(
+                    signature, last_valid_block_height, nonce_account, recent_blockhash, f'Transaction failed: {str(e)}'
+                )
+            if fee_estimator is not None:
+                # Rejected before it was sent (preflight, expired blockhash, ...)
+                fee_estimator.refund(priority_fee)
+            if 'BlockhashNotFound' in str(e):
+                # Cached blockhash expired early, next attempt fetches a fresh one
+                self.client.get_blockhash_provider().invalidate()
             return {
                 'success': False,
                 'error': f'Transaction failed: {str(e)}'
@@ -263,18 +743,34 @@ class VoteRecorder:
             }
 
 
-# Helper function to get recorder instance
+# Shared recorder instance
+_vote_recorder = None
+
 def get_vote_recorder():
     """
-    Get VoteRecorder instance with initialized clients
+    Get shared VoteRecorder bound to the shared Solana client and encryption service
+    Rebuilt automatically if either service has been replaced
+    With USE_ASYNC_RECORDING the async pipeline facade is returned instead
     
     Returns:
-        VoteRecorder: Recorder instance
+        VoteRecorder: Recorder instance (or AsyncRecordingPipeline)
     """
     from .solana_client import get_solana_client
     from .encryption import get_encryption_service
+    from .config import USE_ASYNC_RECORDING
+    
+    if USE_ASYNC_RECORDING:
+        from .async_recorder import get_async_recording_pipeline
+        return get_async_recording_pipeline()
+    
+    global _vote_recorder
     
     solana_client = get_solana_client()
     encryption_service = get_encryption_service()
     
-    return VoteRecorder(solana_client, encryption_service)
+    recorder = _vote_recorder
+    if recorder is None or recorder.client is not solana_client or recorder.encryption is not encryption_service:
+        recorder = VoteRecorder(solana_client, encryption_service)
+        _vote_recorder = recorder
+    
+    return recorder
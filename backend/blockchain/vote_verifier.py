@@ -4,7 +4,12 @@ Verify votes on Solana blockchain and generate audit reports
 """
 
 from datetime import datetime
-from models import Vote, Voter, db
+from sqlalchemy import case, func
+from models import Vote, Voter, MerkleAnchor, ChainMemo, db
+from .merkle import verify_proof, vote_leaf_data
+from .chain_indexer import get_mirrored_memo
+from .memo_codec import decode_memo
+from .config import USE_CHAIN_MIRROR
 
 
 class VoteVerifier:
@@ -23,6 +28,7 @@ class VoteVerifier:
         """
         self.client = solana_client
         self.encryption = encryption_service
+        self._signer_set = None
     
     def verify_vote_by_receipt(self, receipt_code):
         """
@@ -56,6 +62,33 @@ class VoteVerifier:
                     'timestamp': vote.created_at
                 }
             
+            # Merkle-anchored votes: check inclusion proof against the anchored root
+            if vote.merkle_anchor_id:
+                inclusion = self.verify_merkle_inclusion(vote)
+                
+                if inclusion['valid']:
+                    return {
+                        'verified': True,
+                        'vote_exists': True,
+                        'blockchain_verified': True,
+                        'message': 'Vote included in Merkle root anchored on Solana blockchain',
+                        'position': vote.position,
+                        'blockchain_signature': vote.blockchain_tx_signature,
+                        'blockchain_slot': vote.blockchain_slot,
+                        'blockchain_timestamp': vote.blockchain_timestamp,
+                        'merkle_root': inclusion['merkle_root'],
+                        'leaf_index': inclusion['leaf_index'],
+                        'explorer_url': f"https://explorer.solana.com/tx/{vote.blockchain_tx_signature}?cluster=devnet"
+                    }
+                else:
+                    return {
+                        'verified': False,
+                        'vote_exists': True,
+                        'blockchain_verified': False,
+                        'message': 'Vote does not match the Merkle root anchored on blockchain',
+                        'error': inclusion.get('error', 'Merkle proof verification failed')
+                    }
+            
             # Verify on blockchain
             blockchain_verification = self.verify_on_blockchain(vote.blockchain_tx_signature)
             
@@ -98,6 +131,19 @@ class VoteVerifier:
             dict: {'exists': bool, 'confirmed': bool, 'details': {...}}
         """
         try:
+            # Local chain mirror (filled by the chain indexer) avoids an RPC round trip
+            mirrored = ChainMemo.query.filter_by(signature=transaction_signature).first() \
+                if USE_CHAIN_MIRROR else None
+            if mirrored is not None:
+                return {
+                    'exists': True,
+                    'confirmed': True,
+                    'signature': mirrored.signature,
+                    'slot': mirrored.slot,
+                    'blockTime': mirrored.block_time,
+                    'source': 'CHAIN_MIRROR'
+                }
+            
             tx_details = self.client.get_transaction_details(transaction_signature)
             
             if tx_details:
@@ -120,59 +166,91 @@ class VoteVerifier:
                 'error': str(e)
             }
     
+    def verify_merkle_inclusion(self, vote, anchored_roots=None):
+        """
+        Verify a Merkle-anchored vote against the root written on-chain
+        
+        Args:
+            vote: Vote with merkle_anchor_id set
+            anchored_roots: Optional dict cache {tx_signature: on-chain root}
+        
+        Returns:
+            dict: {'valid': bool, 'proof_valid': bool, 'root_anchored': bool,
+                   'merkle_root': str, 'leaf_index': int}
+        """
+        anchor = db.session.get(MerkleAnchor, vote.merkle_anchor_id)
+        
+        if anchor is None:
+            return {
+                'valid': False,
+                'proof_valid': False,
+                'root_anchored': False,
+                'error': 'Merkle anchor not found'
+            }
+        
+        # Step 1: Recompute root from the vote row and its inclusion proof (local)
+        leaf = vote_leaf_data(vote.voter_id_hash, vote.position, vote.encrypted_vote_data)
+        proof_valid = verify_proof(leaf, vote.merkle_proof or '[]', anchor.merkle_root)
+        
+        # Step 2: Check the root is the one anchored on-chain
+        if anchored_roots is not None and anchor.tx_signature in anchored_roots:
+            onchain_root = anchored_roots[anchor.tx_signature]
+        else:
+            onchain_root = self._fetch_anchored_root(anchor.tx_signature)
+            if anchored_roots is not None:
+                anchored_roots[anchor.tx_signature] = onchain_root
+        
+        root_anchored = onchain_root == anchor.merkle_root
+        
+        result = {
+            'valid': proof_valid and root_anchored,
+            'proof_valid': proof_valid,
+            'root_anchored': root_anchored,
+            'onchain_root': onchain_root,
+            'merkle_root': anchor.merkle_root,
+            'leaf_index': vote.merkle_leaf_index
+        }
+        
+        if not proof_valid:
+            result['error'] = 'Merkle inclusion proof mismatch'
+        elif onchain_root is None:
+            result['error'] = 'Merkle root not found on blockchain'
+        elif not root_anchored:
+            result['error'] = 'Anchored Merkle root mismatch'
+        
+        return result
+    
+    def _fetch_anchored_root(self, transaction_signature, use_mirror=True):
+        """
+        Read the Merkle root from an anchor transaction's memo
+        
+        Args:
+            transaction_signature: Anchor transaction signature
+            use_mirror: Check the chain mirror first (needs an app context)
+        
+        Returns:
+            str: Hex root or None
+        """
+        if not transaction_signature:
+            return None
+        
+        memo_data = self._get_memo(transaction_signature, use_mirror)
+        
+        if memo_data and memo_data.get('type') == 'MERKLE_ROOT':
+            return memo_data.get('root')
+        return None
+    
     def get_blockchain_stats(self):
         """
-        Get overall blockchain integration statistics
+        Get overall blockchain integration statistics (uncached, see stats_cache)
         
         Returns:
             dict: Blockchain statistics
         """
         try:
-            # Count total votes
-            total_votes = Vote.query.count()
-            
-            # Count blockchain-verified votes
-            verified_votes = Vote.query.filter_by(is_verified_on_chain=True).count()
-            
-            # Count pending verification
-            pending_votes = Vote.query.filter_by(is_verified_on_chain=False).count()
-            
-            # Get latest blockchain vote
-            latest_blockchain_vote = Vote.query.filter_by(
-                is_verified_on_chain=True
-            ).order_by(Vote.blockchain_timestamp.desc()).first()
-            
-            # Get unique voters with blockchain votes
-            unique_blockchain_voters = db.session.query(
-                Vote.voter_id
-            ).filter(
-                Vote.is_verified_on_chain == True
-            ).distinct().count()
-            
-            # Calculate verification rate
-            verification_rate = (verified_votes / total_votes * 100) if total_votes > 0 else 0
-            
-            # Get network stats
-            network_stats = self.client.get_network_stats()
-            
-            return {
-                'total_votes': total_votes,
-                'blockchain_verified': verified_votes,
-                'pending_verification': pending_votes,
-                'verification_rate': round(verification_rate, 2),
-                'unique_blockchain_voters': unique_blockchain_voters,
-                'latest_blockchain_vote': {
-                    'signature': latest_blockchain_vote.blockchain_tx_signature if latest_blockchain_vote else None,
-                    'timestamp': latest_blockchain_vote.blockchain_timestamp if latest_blockchain_vote else None,
-                    'position': latest_blockchain_vote.position if latest_blockchain_vote else None
-                },
-                'network': {
-                    'connected': network_stats.get('connected', False),
-                    'current_slot': network_stats.get('current_slot', 0),
-                    'admin_balance': network_stats.get('admin_balance', 0),
-                    'network_url': network_stats.get('network', '')
-                }
-            }
+            stats = self.get_blockchain_db_stats()
+            stats['network'] = self.get_blockchain_network_stats()
+            return stats
         except Exception as e:
             return {
                 'error': str(e),
@@ -180,45 +258,125 @@ class VoteVerifier:
                 'blockchain_verified': 0
             }
     
-    def generate_audit_report(self):
+    def get_blockchain_db_stats(self, recent_limit=10):
+        """
+        Vote table statistics in one aggregate query (no RPC)
+        
+        Args:
+            recent_limit: Number of latest blockchain votes to include
+        
+        Returns:
+            dict: Vote counts, verification rate, latest and recent blockchain votes
+        """
+        verified = Vote.is_verified_on_chain == True
+        
+        total_votes, verified_votes, pending_votes, unique_blockchain_voters = db.session.query(
+            func.count(Vote.id),
+            func.count(case((verified, 1))),
+            func.count(case((Vote.is_verified_on_chain == False, 1))),
+            func.count(func.distinct(case((verified, Vote.voter_id))))
+        ).one()
+        
+        # Calculate verification rate
+        verification_rate = (verified_votes / total_votes * 100) if total_votes > 0 else 0
+        
+        recent_votes = [
+            {
+                'position': row.position,
+                'blockchain_tx_signature': row.blockchain_tx_signature,
+                'blockchain_slot': row.blockchain_slot,
+                'blockchain_timestamp': row.blockchain_timestamp,
+                'verification_receipt': row.verification_receipt
+            }
+            for row in db.session.query(
+                Vote.position, Vote.blockchain_tx_signature, Vote.blockchain_slot,
+                Vote.blockchain_timestamp, Vote.verification_receipt
+            ).filter(verified).order_by(Vote.blockchain_timestamp.desc()).limit(recent_limit)
+        ]
+        latest_blockchain_vote = recent_votes[0] if recent_votes else None
+        
+        return {
+            'total_votes': total_votes,
+            'blockchain_verified': verified_votes,
+            'pending_verification': pending_votes,
+            'verification_rate': round(verification_rate, 2),
+            'unique_blockchain_voters': unique_blockchain_voters,
+            'latest_blockchain_vote': {
+                'signature': latest_blockchain_vote['blockchain_tx_signature'] if latest_blockchain_vote else None,
+                'timestamp': latest_blockchain_vote['blockchain_timestamp'] if latest_blockchain_vote else None,
+                'position': latest_blockchain_vote['position'] if latest_blockchain_vote else None
+            },
+            'recent_votes': recent_votes
+        }
+    
+    def get_blockchain_network_stats(self):
+        """
+        Live Solana network statistics (get_slot and get_balance RPC calls)
+        
+        Returns:
+            dict: Connection state, current slot, admin balance and RPC URL
+        """
+        network_stats = self.client.get_network_stats()
+        
+        return {
+            'connected': network_stats.get('connected', False),
+            'current_slot': network_stats.get('current_slot', 0),
+            'admin_balance': network_stats.get('admin_balance', 0),
+            'network_url': network_stats.get('network', '')
+        }
+    
+    def generate_audit_report(self, recent_limit=20):
         """
         Generate comprehensive audit report for election transparency
+        Computed with SQL aggregates, so memory and render time do not grow
+        with the number of votes (the full signature list is streamed by
+        iter_audit_signatures)
+        
+        Args:
+            recent_limit: Number of most recent signatures included for display
         
         Returns:
             dict: Detailed audit report
         """
         try:
-            # Get all blockchain-verified votes
-            verified_votes = Vote.query.filter_by(is_verified_on_chain=True).all()
+            verified = Vote.is_verified_on_chain == True
             
-            # Group by position
+            # Per-position counts and first/last on-chain timestamps
             positions_stats = {}
-            for vote in verified_votes:
-                if vote.position not in positions_stats:
-                    positions_stats[vote.position] = {
-                        'total': 0,
-                        'first_vote': None,
-                        'last_vote': None
-                    }
-                
-                positions_stats[vote.position]['total'] += 1
-                
-                if positions_stats[vote.position]['first_vote'] is None:
-                    positions_stats[vote.position]['first_vote'] = vote.blockchain_timestamp
-                
-                positions_stats[vote.position]['last_vote'] = vote.blockchain_timestamp
+            for position, total, first_vote, last_vote in db.session.query(
+                Vote.position,
+                func.count(Vote.id),
+                func.min(Vote.blockchain_timestamp),
+                func.max(Vote.blockchain_timestamp)
+            ).filter(verified).group_by(Vote.position).order_by(Vote.position):
+                positions_stats[position] = {
+                    'total': total,
+                    'first_vote': first_vote,
+                    'last_vote': last_vote
+                }
             
-            # Get all unique transaction signatures
-            all_signatures = [v.blockchain_tx_signature for v in verified_votes]
+            total_verified = sum(stats['total'] for stats in positions_stats.values())
+            unique_transactions = db.session.query(
+                func.count(func.distinct(Vote.blockchain_tx_signature))
+            ).filter(verified).scalar() or 0
+            
+            recent_signatures = [
+                row.signature for row in db.session.query(
+                    Vote.blockchain_tx_signature.label('signature')
+                ).filter(verified).group_by(
+                    Vote.blockchain_tx_signature
+                ).order_by(func.max(Vote.id).desc()).limit(recent_limit)
+            ]
             
             # Generate report timestamp
             report_time = datetime.utcnow()
             
             return {
                 'report_generated': report_time,
-                'total_verified_votes': len(verified_votes),
+                'total_verified_votes': total_verified,
                 'positions': positions_stats,
-                'blockchain_signatures': all_signatures,
+                'unique_transactions': unique_transactions,
+                'recent_signatures': recent_signatures,
                 'verification_status': 'All votes cryptographically secured on Solana blockchain',
                 'transparency_note': 'All blockchain transactions are publicly verifiable on Solana Explorer',
                 'audit_trail': 'Complete immutable record maintained on-chain'
@@ -231,6 +389,57 @@ class VoteVerifier:
                 'status': 'Report generation failed'
             }
     
+    def iter_audit_signatures(self, after_id=0, limit=None, batch_size=1000):
+        """
+        Stream blockchain-verified votes' transaction records in id order
+        (keyset pagination, one batch in memory at a time)
+        
+        Args:
+            after_id: Only votes with a larger id (cursor of the previous page)
+            limit: Maximum number of records, None for all
+            batch_size: Rows fetched per query
+        
+        Yields:
+            dict: {'vote_id', 'position', 'signature', 'slot', 'timestamp', 'merkle_root'}
+        """
+        cursor = after_id or 0
+        remaining = limit
+        
+        while remaining is None or remaining > 0:
+            size = batch_size if remaining is None else min(batch_size, remaining)
+            rows = db.session.query(
+                Vote.id,
+                Vote.position,
+                Vote.blockchain_tx_signature,
+                Vote.blockchain_slot,
+                Vote.blockchain_timestamp,
+                MerkleAnchor.merkle_root
+            ).outerjoin(
+                MerkleAnchor, MerkleAnchor.id == Vote.merkle_anchor_id
+            ).filter(
+                Vote.is_verified_on_chain == True,
+                Vote.id > cursor
+            ).order_by(Vote.id).limit(size).all()
+            
+            if not rows:
+                return
+            
+            for vote_id, position, signature, slot, timestamp, merkle_root in rows:
+                yield {
+                    'vote_id': vote_id,
+                    'position': position,
+                    'signature': signature,
+                    'slot': slot,
+                    'timestamp': timestamp.isoformat() if timestamp else None,
+                    'merkle_root': merkle_root
+                }
+            
+            cursor = rows[-1][0]
+            if remaining is not None:
+                remaining -= len(rows)
+            if len(rows) < size:
+                return
+    
     def verify_voter_votes(self, voter_id):
         """
         Verify all votes cast by a specific voter
@@ -283,111 +492,141 @@ class VoteVerifier:
                 'votes_found': False
             }
     
-    def check_vote_integrity(self, vote_id=None):
+    def check_vote_integrity(self, vote_id=None, resume=False, checkpoint_path=None,
+                             on_progress=None):
         """
         Check if local database votes match blockchain records
         Detects tampering/manipulation
         
+        Transactions are looked up concurrently through IntegrityCheckEngine
+        (bounded workers, shared requests-per-second limit, one lookup per
+        distinct signature or Merkle anchor).
+        
         Args:
             vote_id: Specific vote ID to check, or None for all votes
+            resume: Continue from checkpoint_path if a checkpoint exists
+            checkpoint_path: JSON checkpoint file for long audits
+            on_progress: Optional callback(progress_event) per page
         
         Returns:
             dict: Integrity report with tampering detection
         """
+        from .integrity_engine import IntegrityCheckEngine
+        
+        engine = IntegrityCheckEngine(self, checkpoint_path=checkpoint_path)
+        return engine.run(vote_id=vote_id, resume=resume, on_progress=on_progress)
+    
+    def reconcile_with_chain(self, confirm_on_chain=True):
+        """
+        Find the votes where the database and the chain mirror disagree
+        Both views are hashed into key-ordered Merkle trees and only the
+        differing subtrees are inspected, so the cost grows with the number
+        of discrepancies instead of the number of votes
+        
+        Args:
+            confirm_on_chain: Re-read each discrepancy's transaction over RPC
+                              (separates mirror lag from real tampering)
+        
+        Returns:
+            dict: Roots of both views, discrepancies and work counters
+        """
+        from .merkle_diff import KeyedMerkleTree, diff_trees
+        
         try:
-            # Get votes to check
-            if vote_id:
-                votes_to_check = [Vote.query.get(vote_id)]
-                if not votes_to_check[0]:
-                    return {'error': 'Vote not found'}
-            else:
-                votes_to_check = Vote.query.filter_by(is_verified_on_chain=True).all()
-            
-            results = {
-                'total_checked': len(votes_to_check),
-                'verified_intact': 0,
-                'tampering_detected': 0,
-                'unable_to_verify': 0,
-                'tampered_votes': [],
-                'integrity_status': 'CHECKING'
-            }
-            
-            for vote in votes_to_check:
-                if not vote.blockchain_tx_signature:
-                    results['unable_to_verify'] += 1
+            started = datetime.utcnow()
+            
+            local = KeyedMerkleTree('db')
+            remote = KeyedMerkleTree('chain')
+            diff = diff_trees(local, remote)
+            
+            rpc_calls = 0
+            for item in diff['discrepancies']:
+                record = item['db'] or item['chain']
+                item['vote_id'] = item['db']['vote_id'] if item['db'] else None
+                item['signature'] = record['signature']
+                item['position'] = record['position']
+                
+                if not confirm_on_chain or not record['signature']:
                     continue
                 
-                # Verify transaction exists on blockchain
-                try:
-                    # Check if transaction exists (simplified verification)
-                    tx_exists = self.client.get_transaction_details(vote.blockchain_tx_signature)
-                    
-                    if not tx_exists:
-                        # Transaction not found - possible tampering or network issue
-                        results['unable_to_verify'] += 1
-                        print(f"⚠️  Transaction not found for vote {vote.id}: {vote.blockchain_tx_signature[:20]}...")
-                        continue
-                    
-                    # Transaction exists on blockchain - vote is verified
-                    # Additional check: verify signature matches
-                    if tx_exists.get('signature') == vote.blockchain_tx_signature or str(tx_exists.get('signature')) == str(vote.blockchain_tx_signature):
-                        results['verified_intact'] += 1
-                    else:
-                        # Signature mismatch - definite tampering
-                        results['tampering_detected'] += 1
-                        results['tampered_votes'].append({
-                            'vote_id': vote.id,
-                            'voter_id': vote.voter_id,
-                            'position': vote.position,
-                            'candidate_id': vote.candidate_id,
-                            'blockchain_signature': vote.blockchain_tx_signature,
-                            'issue': 'Blockchain signature mismatch',
-                            'severity': 'CRITICAL'
-                        })
-                        
-                except Exception as e:
-                    print(f"⚠️  Error verifying vote {vote.id}: {str(e)}")
-                    results['unable_to_verify'] += 1
-            
-            # Determine overall integrity status
-            if results['tampering_detected'] > 0:
-                results['integrity_status'] = 'COMPROMISED'
-            elif results['verified_intact'] == results['total_checked']:
-                results['integrity_status'] = 'VERIFIED_SECURE'
-            else:
-                results['integrity_status'] = 'PARTIAL_VERIFICATION'
-            
-            return results
+                memo_data = self._get_memo(record['signature'], use_mirror=False)
+                rpc_calls += 1
+                item['confirmed_on_chain'] = self._classify_discrepancy(item, memo_data)
             
+            return {
+                'success': True,
+                'in_sync': not diff['discrepancies'],
+                'db_root': local.root,
+                'chain_root': remote.root,
+                'db_records': local.leaf_count,
+                'chain_records': remote.leaf_count,
+                'discrepancies': diff['discrepancies'],
+                'nodes_compared': diff['nodes_compared'],
+                'buckets_loaded': diff['buckets_loaded'],
+                'rpc_calls': rpc_calls,
+                'elapsed': (datetime.utcnow() - started).total_seconds()
+            }
+        
         except Exception as e:
             return {
-                'error': str(e),
-                'integrity_status': 'ERROR'
+                'success': False,
+                'error': str(e)
             }
     
-    def fetch_vote_from_blockchain(self, transaction_signature):
+    def _classify_discrepancy(self, item, memo_data):
+        """
+        Explain a discrepancy using the transaction read directly from chain
+        
+        Returns:
+            str: 'TAMPERED', 'MIRROR_LAG', 'MIRROR_STALE', 'NOT_ON_CHAIN' or 'ORPHAN_ON_CHAIN'
+        """
+        position = item['position']
+        
+        on_chain = None
+        if memo_data:
+            if memo_data.get('type') == 'BALLOT':
+                on_chain = memo_data.get('votes', {}).get(position)
+            elif memo_data.get('position') == position:
+                on_chain = memo_data.get('encrypted_vote')
+        
+        if item['db'] is None:
+            # On chain, but no vote row points at it
+            return 'ORPHAN_ON_CHAIN' if on_chain else 'MIRROR_STALE'
+        
+        if on_chain is None:
+            return 'NOT_ON_CHAIN'
+        if on_chain != item['db']['encrypted_vote'] or memo_data.get('voter_hash') != item['db']['voter_hash']:
+            return 'TAMPERED'
+        # Database agrees with the chain, the mirror is behind or wrong
+        return 'MIRROR_LAG' if item['chain'] is None else 'MIRROR_STALE'
+    
+    def fetch_vote_from_blockchain(self, transaction_signature, position=None):
         """
         Fetch and decrypt vote directly from blockchain
         Ultimate source of truth
         
         Args:
             transaction_signature: Blockchain transaction signature
+            position: Position to read from a ballot transaction (all positions
+                of a voter share one transaction)
         
         Returns:
             dict: Decrypted vote data from blockchain
         """
         try:
-            # Get transaction from blockchain
-            tx_data = self.client.get_transaction_data(transaction_signature)
-            
-            if not tx_data:
-                return {
-                    'success': False,
-                    'error': 'Transaction not found on blockchain'
-                }
+            # Local chain mirror first, then the transaction itself
+            memo_data = get_mirrored_memo(transaction_signature)
             
-            # Extract memo data
-            memo_data = self._extract_memo_from_transaction(tx_data)
+            if memo_data is None:
+                tx_data = self.client.get_transaction_data(transaction_signature)
+                
+                if not tx_data:
+                    return {
+                        'success': False,
+                        'error': 'Transaction not found on blockchain'
+                    }
+                
+                memo_data = self._extract_memo_from_transaction(tx_data)
             
             if not memo_data:
                 return {
@@ -395,17 +634,32 @@ class VoteVerifier:
                     'error': 'No memo data in transaction'
                 }
             
+            # Ballot memos hold one encrypted vote per position
+            if memo_data.get('type') == 'BALLOT':
+                ballot_votes = memo_data.get('votes', {})
+                if position is None and len(ballot_votes) == 1:
+                    position = next(iter(ballot_votes))
+                
+                if position not in ballot_votes:
+                    return {
+                        'success': False,
+                        'error': f'Position {position} not found in ballot transaction'
+                    }
+                
+                encrypted_vote = ballot_votes[position]
+            else:
+                encrypted_vote = memo_data.get('encrypted_vote', '')
+                position = memo_data.get('position')
+            
             # Decrypt vote
             try:
-                decrypted_vote = self.encryption.decrypt_vote_data(
-                    memo_data.get('encrypted_vote', '')
-                )
+                decrypted_vote = self.encryption.decrypt_vote_data(encrypted_vote)
                 
                 return {
                     'success': True,
                     'vote_data': decrypted_vote,
                     'voter_hash': memo_data.get('voter_hash'),
-                    'position': memo_data.get('position'),
+                    'position': position,
                     'halka': memo_data.get('halka'),
                     'timestamp': memo_data.get('timestamp'),
                     'election_id': memo_data.get('election_id'),
@@ -424,6 +678,66 @@ class VoteVerifier:
                 'error': str(e)
             }
     
+    def fetch_merkle_anchored_vote(self, vote, anchored_roots=None):
+        """
+        Decrypt a Merkle-anchored vote after proving it is under the anchored root
+        
+        Args:
+            vote: Vote with merkle_anchor_id set
+            anchored_roots: Optional dict cache {tx_signature: on-chain root}
+        
+        Returns:
+            dict: Same structure as fetch_vote_from_blockchain
+        """
+        inclusion = self.verify_merkle_inclusion(vote, anchored_roots)
+        
+        if not inclusion['valid']:
+            return {
+                'success': False,
+                'error': inclusion.get('error', 'Merkle verification failed')
+            }
+        
+        try:
+            decrypted_vote = self.encryption.decrypt_vote_data(vote.encrypted_vote_data)
+        except Exception as decrypt_error:
+            return {
+                'success': False,
+                'error': f'Decryption failed: {str(decrypt_error)}',
+                'encrypted_data_exists': True
+            }
+        
+        return {
+            'success': True,
+            'vote_data': decrypted_vote,
+            'voter_hash': vote.voter_id_hash,
+            'position': vote.position,
+            'halka': decrypted_vote.get('halka'),
+            'timestamp': decrypted_vote.get('timestamp'),
+            'merkle_root': inclusion['merkle_root'],
+            'source': 'MERKLE_ANCHOR'
+        }
+    
+    def _get_memo(self, transaction_signature, use_mirror=True):
+        """
+        Get memo data of a transaction from the chain mirror or RPC
+        
+        Returns:
+            dict: Parsed memo data or None
+        """
+        if use_mirror:
+            memo_data = get_mirrored_memo(transaction_signature)
+            if memo_data is not None:
+                return memo_data
+        
+        tx_data = self.client.get_transaction_data(transaction_signature)
+        return self._extract_memo_from_transaction(tx_data)
+    
+    def _get_signer_set(self):
+        """Pubkey strings of every fee payer that may author election memos"""
+        if self._signer_set is None:
+            self._signer_set = {str(pubkey) for pubkey in self.client.get_signer_pubkeys()}
+        return self._signer_set
+    
     def _extract_memo_from_transaction(self, tx_data):
         """
         Extract memo instruction data from transaction
@@ -435,12 +749,16 @@ class VoteVerifier:
             dict: Parsed memo data
         """
         try:
-            import json
-            
             # Get transaction details
             if not tx_data or 'transaction' not in tx_data:
                 return None
             
+            # Only memos paid for by our signers are election memos
+            fee_payer = tx_data.get('fee_payer')
+            if fee_payer and fee_payer not in self._get_signer_set():
+                print(f"⚠️  Memo from unknown signer {fee_payer[:8]}... ignored")
+                return None
+            
             transaction = tx_data['transaction']
             
             # Look for memo in transaction message
@@ -453,13 +771,19 @@ class VoteVerifier:
                         # Decode memo data
                         memo_text = instruction.get('data', '')
                         if memo_text:
+                            # Compact binary or legacy JSON memo
+                            memo_data = decode_memo(memo_text)
+                            if memo_data is not None:
+                                return memo_data
+                            
+                            # Try base64 decode if needed, else the next memo instruction
                             try:
-                                return json.loads(memo_text)
-                            except:
-                                # Try base64 decode if needed
                                 import base64
-                                decoded = base64.b64decode(memo_text).decode('utf-8')
-                                return json.loads(decoded)
+                                memo_data = decode_memo(base64.b64decode(memo_text).decode('utf-8'))
+                            except (ValueError, UnicodeDecodeError):
+                                memo_data = None
+                            if memo_data is not None:
+                                return memo_data
             
             return None
             
@@ -467,58 +791,49 @@ class VoteVerifier:
             print(f"⚠️  Error extracting memo: {str(e)}")
             return None
     
-    def get_blockchain_verified_results(self):
+    def get_blockchain_verified_results(self, rebuild=False):
         """
         Get election results by fetching votes directly from blockchain
         Ultimate tamper-proof results
         
+        Counting is incremental: only votes not tallied by a previous call
+        are fetched and decrypted, then added to the stored counters.
+        
+        Args:
+            rebuild: Discard the stored tally and recount every vote
+        
         Returns:
             dict: Election results from blockchain source
         """
+        from .tally import IncrementalTally
+        
         try:
-            # Get all blockchain-verified votes
-            blockchain_votes = Vote.query.filter_by(
-                is_verified_on_chain=True
-            ).all()
-            
-            results = {
-                'total_votes': len(blockchain_votes),
-                'positions': {},
-                'verification_status': 'BLOCKCHAIN_VERIFIED',
-                'source': 'SOLANA_BLOCKCHAIN'
-            }
+            tally = IncrementalTally(self)
             
-            for vote in blockchain_votes:
-                # Fetch vote from blockchain
-                blockchain_data = self.fetch_vote_from_blockchain(
-                    vote.blockchain_tx_signature
-                )
-                
-                if blockchain_data.get('success'):
-                    position = blockchain_data.get('position')
-                    candidate = blockchain_data.get('vote_data', {}).get('candidate_id')
-                    
-                    if position not in results['positions']:
-                        results['positions'][position] = {}
-                    
-                    if candidate not in results['positions'][position]:
-                        results['positions'][position][candidate] = 0
-                    
-                    results['positions'][position][candidate] += 1
+            if rebuild:
+                tally.rebuild()
+            
+            progress = tally.update()
+            results = tally.results()
+            results.update(progress)
             
             return results
             
         except Exception as e:
+            db.session.rollback()
             return {
                 'error': str(e),
                 'verification_status': 'ERROR'
             }
 
 
-# Helper function to get verifier instance
+# Shared verifier instance
+_vote_verifier = None
+
 def get_vote_verifier():
     """
-    Get VoteVerifier instance with initialized clients
+    Get shared VoteVerifier bound to the shared Solana client and encryption service
+    Rebuilt automatically if either service has been replaced
     
     Returns:
         VoteVerifier: Verifier instance
@@ -526,7 +841,14 @@ def get_vote_verifier():
     from .solana_client import get_solana_client
     from .encryption import get_encryption_service
     
+    global _vote_verifier
+    
     solana_client = get_solana_client()
     encryption_service = get_encryption_service()
     
-    return VoteVerifier(solana_client, encryption_service)
+    verifier = _vote_verifier
+    if verifier is None or verifier.client is not solana_client or verifier.encryption is not encryption_service:
+        verifier = VoteVerifier(solana_client, encryption_service)
+        _vote_verifier = verifier
+    
+    return verifier
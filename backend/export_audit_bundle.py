@@ -0,0 +1,47 @@
+"""
+Audit Bundle Export
+Writes a compressed, self-describing bundle of the election record
+(vote records, receipts, transaction bytes, Merkle anchors, hash chain
+checkpoints) that observers verify offline with verify_audit_bundle.py
+
+Usage:
+    python export_audit_bundle.py [output.tar.gz | -] [--include-candidates]
+"""
+
+import sys
+from datetime import datetime
+from app import app
+from blockchain.audit_bundle import AuditBundleExporter
+from blockchain.solana_client import get_solana_client
+
+
+def export_bundle(output, include_candidates=False):
+    """Export the bundle to a file path or stdout ('-')"""
+    log = sys.stderr if output == '-' else sys.stdout
+    
+    with app.app_context():
+        exporter = AuditBundleExporter(get_solana_client(), include_candidates=include_candidates)
+        
+        def progress(exported):
+            print(f"\r📦 Exported {exported} votes...", end='', file=log, flush=True)
+        
+        if output == '-':
+            manifest = exporter.export(sys.stdout.buffer, on_progress=progress)
+        else:
+            with open(output, 'wb') as f:
+                manifest = exporter.export(f, on_progress=progress)
+    
+    totals = manifest['totals']
+    print(f"\n✅ Audit bundle written: {output}", file=log)
+    print(f"   Votes: {totals['votes']} in {len(manifest['parts'])} parts", file=log)
+    print(f"   Transactions: {totals['transactions']}", file=log)
+    print(f"   Merkle anchors: {totals['merkle_anchors']}, chain checkpoints: {totals['chain_checkpoints']}", file=log)
+    print(f"   Signers: {', '.join(manifest['signers'])}", file=log)
+    if include_candidates:
+        print("⚠️  Bundle contains candidate ids - share only with trusted auditors", file=log)
+
+
+if __name__ == '__main__':
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    output = args[0] if args else f"audit_bundle_{datetime.utcnow():%Y%m%d_%H%M%S}.tar.gz"
+    export_bundle(output, include_candidates='--include-candidates' in sys.argv)
@@ -1,46 +1,68 @@
 """
-Fast Devnet Mode Configuration
-Creates a config file to toggle fast vs. secure blockchain voting
+Commitment Tier Configuration
+Sets the commitment tier at which vote receipts are issued (fast vs. secure)
+
+    processed   fastest receipt (fast mode), may still be dropped with a fork
+    confirmed   supermajority voted on the block (default)
+    finalized   slowest, cannot be rolled back
+
+Receipts below finalized are promoted to finalized in the background.
+The tier is read once when the app starts (BlockchainConfig), so restart
+the app and the outbox worker after changing it.
 """
 
 import os
-from pathlib import Path
 
-# Get backend directory
-BACKEND_DIR = Path(__file__).resolve().parent
+# Tier names and the configuration file (holds the tier name) shared with the runtime
+from blockchain.config import COMMITMENT_TIERS, FAST_MODE_CONFIG
+
+def set_commitment_tier(tier):
+    """
+    Set the receipt tier used from the next start
 
-# Configuration file path
-FAST_MODE_CONFIG = BACKEND_DIR / 'blockchain_fast_mode.txt'
+    Args:
+        tier: 'processed', 'confirmed' or 'finalized'
+    """
+    if tier not in COMMITMENT_TIERS:
+        print(f"❌ Unknown tier '{tier}' (choose from: {', '.join(COMMITMENT_TIERS)})")
+        return
+
+    with open(FAST_MODE_CONFIG, 'w') as f:
+        f.write(f'{tier}\n')
+        f.write('# Commitment tier at which vote receipts are issued\n')
+        f.write('# Receipts below finalized are promoted to finalized in the background\n')
+        f.write('# To restore the default, delete this file or run disable_fast_mode()\n')
+    print(f"✅ Receipt tier set to {tier.upper()}")
+    print(f"   📁 Config: {FAST_MODE_CONFIG}")
+    print("   🔄 Restart the app and outbox worker to apply")
 
 def enable_fast_mode():
     """
     Enable fast mode for devnet testing
-    - Reduces confirmation timeout
-    - Skips some verification steps
-    - NOT recommended for production
+    - Receipts are issued at the processed tier
+    - Finalization is still tracked in the background
     """
-    with open(FAST_MODE_CONFIG, 'w') as f:
-        f.write('ENABLED\n')
-        f.write('# Fast mode is enabled for faster devnet testing\n')
-        f.write('# Transactions still recorded, but confirmation is faster\n')
-        f.write('# To disable, delete this file or run disable_fast_mode()\n')
-    print("✅ Fast mode ENABLED")
+    set_commitment_tier('processed')
     print("   ⚡ Blockchain voting will be faster")
-    print("   ⚠️  Use only for devnet testing")
-    print(f"   📁 Config: {FAST_MODE_CONFIG}")
 
 def disable_fast_mode():
-    """Disable fast mode (full security)"""
+    """Disable fast mode (receipts at the default confirmed tier)"""
     if FAST_MODE_CONFIG.exists():
         os.remove(FAST_MODE_CONFIG)
         print("✅ Fast mode DISABLED")
-        print("   🔒 Full blockchain confirmation enabled")
+        print("   🔒 Receipts issued at the default tier")
+        print("   🔄 Restart the app and outbox worker to apply")
     else:
         print("ℹ️  Fast mode was not enabled")
 
+def get_commitment_tier():
+    """Tier the app will load on its next start"""
+    from blockchain.config import config
+    return config._load_commitment_tier()
+
 def is_fast_mode_enabled():
     """Check if fast mode is enabled"""
-    return FAST_MODE_CONFIG.exists()
+    return get_commitment_tier() == 'processed'
 
 if __name__ == '__main__':
     import sys
@@ -49,13 +71,17 @@ if __name__ == '__main__':
             enable_fast_mode()
         elif sys.argv[1] == 'disable':
             disable_fast_mode()
+        elif sys.argv[1] == 'tier' and len(sys.argv) > 2:
+            set_commitment_tier(sys.argv[2].lower())
         elif sys.argv[1] == 'status':
-            if is_fast_mode_enabled():
-                print("⚡ Fast mode is ENABLED")
+            tier = get_commitment_tier()
+            if tier == 'processed':
+                print("⚡ Fast mode is ENABLED (receipts at PROCESSED)")
             else:
-                print("🔒 Fast mode is DISABLED (full security)")
+                print(f"🔒 Receipts issued at {tier.upper()}")
     else:
         print("Usage:")
-        print("  python fast_mode.py enable   - Enable fast devnet mode")
-        print("  python fast_mode.py disable  - Disable fast mode")
-        print("  python fast_mode.py status   - Check current mode")
+        print("  python fast_mode.py enable             - Receipts at processed (fast devnet mode)")
+        print("  python fast_mode.py disable            - Receipts at the default tier")
+        print("  python fast_mode.py tier <tier>        - processed / confirmed / finalized")
+        print("  python fast_mode.py status             - Check current tier")
@@ -0,0 +1,62 @@
+"""
+Migration: Allow Ballot Transactions
+All positions of a voter are now recorded in one Solana transaction, so
+several Vote rows share the same blockchain_tx_signature. Rebuilds the
+vote table without the UNIQUE constraint on that column (SQLite cannot
+drop a constraint in place).
+"""
+
+from app import app, db
+from models import Vote
+
+def has_unique_signature_constraint():
+    """Check if vote.blockchain_tx_signature is still UNIQUE (inline constraints show up as autoindexes)"""
+    with db.engine.connect() as conn:
+        indexes = conn.execute(db.text("PRAGMA index_list(vote)")).fetchall()
+        for index in indexes:
+            index_name, is_unique = index[1], index[2]
+            if not is_unique:
+                continue
+            index_columns = conn.execute(db.text(f"PRAGMA index_info('{index_name}')")).fetchall()
+            if [col[2] for col in index_columns] == ['blockchain_tx_signature']:
+                return True
+    return False
+
+def migrate_ballot_transactions():
+    """Drop UNIQUE constraint on vote.blockchain_tx_signature"""
+    print("🔄 Migrating Vote model - Allowing shared ballot signatures...")
+    
+    with app.app_context():
+        if not has_unique_signature_constraint():
+            print("✅ Signature column already allows ballot transactions. No migration needed.")
+            return
+        
+        inspector = db.inspect(db.engine)
+        columns = [col['name'] for col in inspector.get_columns('vote')]
+        column_list = ', '.join(columns)
+        
+        try:
+            with db.engine.connect() as conn:
+                # Keep foreign keys (blockchain_outbox.vote_id) pointing at "vote"
+                conn.execute(db.text("PRAGMA legacy_alter_table = ON"))
+                conn.execute(db.text("ALTER TABLE vote RENAME TO vote_old"))
+                conn.commit()
+            
+            # Recreate vote table from the current model definition
+            Vote.__table__.create(db.engine)
+            
+            with db.engine.connect() as conn:
+                conn.execute(db.text(f"INSERT INTO vote ({column_list}) SELECT {column_list} FROM vote_old"))
+                conn.execute(db.text("DROP TABLE vote_old"))
+                conn.commit()
+            
+            print("✅ Rebuilt vote table")
+            print("   - blockchain_tx_signature is now indexed (not unique)")
+            
+        except Exception as e:
+            print(f"❌ Migration failed: {str(e)}")
+            print("   Restore from backup if vote_old table exists.")
+
+if __name__ == '__main__':
+    migrate_ballot_transactions()
+    print("\n🎯 Migration complete! Ballots can now be recorded in a single transaction.")
@@ -0,0 +1,46 @@
+"""
+Migration: Add Blockchain Outbox Table
+Creates the queue used to record votes on Solana in the background
+"""
+
+from app import app, db
+from models import Vote, Voter, BlockchainOutbox
+
+def migrate_blockchain_outbox():
+    """Create blockchain_outbox table and queue existing local-only votes"""
+    print("🔄 Migrating database - Adding blockchain outbox...")
+    
+    with app.app_context():
+        try:
+            # Create all tables (only creates missing ones)
+            db.create_all()
+            print("✅ blockchain_outbox table ready")
+            
+            # Queue votes that were never recorded on-chain
+            queued_vote_ids = {row.vote_id for row in db.session.query(BlockchainOutbox.vote_id).all()}
+            local_votes = Vote.query.filter_by(is_verified_on_chain=False).all()
+            voter_halkas = dict(db.session.query(Voter.voter_id, Voter.halka).all())
+            
+            queued = 0
+            for vote in local_votes:
+                if vote.id in queued_vote_ids:
+                    continue
+                db.session.add(BlockchainOutbox(
+                    vote_id=vote.id,
+                    voter_id=vote.voter_id,
+                    position=vote.position,
+                    halka=voter_halkas.get(vote.voter_id),
+                    status='pending'
+                ))
+                queued += 1
+            
+            db.session.commit()
+            print(f"✅ Queued {queued} local-only votes for blockchain recording")
+            
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Migration failed: {str(e)}")
+
+if __name__ == '__main__':
+    migrate_blockchain_outbox()
+    print("\n🎯 Migration complete! Votes will be recorded on blockchain by the outbox submitter.")
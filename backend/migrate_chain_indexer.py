@@ -0,0 +1,27 @@
+"""
+Migration: Add Chain Indexer Tables
+Creates chain_memo (local mirror of on-chain election memos) and
+chain_indexer_state (signature history checkpoint per address)
+"""
+
+from app import app, db
+from models import ChainMemo, ChainIndexerState  # Ensure models are imported
+
+def migrate_chain_indexer():
+    """Create chain indexer tables"""
+    print("🔄 Migrating database - Adding chain indexer tables...")
+    
+    with app.app_context():
+        try:
+            # Create all tables (only creates missing ones)
+            db.create_all()
+            print("✅ chain_memo and chain_indexer_state tables ready")
+            print("   Run: python run_chain_indexer.py --once  (initial catch-up)")
+            
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Migration failed: {str(e)}")
+
+if __name__ == '__main__':
+    migrate_chain_indexer()
+    print("\n🎯 Migration complete! Verification can now be answered from the chain mirror.")
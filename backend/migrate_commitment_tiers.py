@@ -0,0 +1,38 @@
+"""
+Migration: Add Commitment Tier
+Adds blockchain_commitment to Vote so receipts issued at the processed or
+confirmed tier can be promoted to finalized by the reconciliation sweeper
+"""
+
+from app import app, db
+from models import Vote  # Ensure models are imported
+
+def migrate_commitment_tiers():
+    """Add commitment tier field to Vote table"""
+    print("🔄 Migrating Vote model - Adding commitment tier field...")
+    
+    with app.app_context():
+        inspector = db.inspect(db.engine)
+        columns = [col['name'] for col in inspector.get_columns('vote')]
+        
+        if 'blockchain_commitment' in columns:
+            print("✅ Commitment tier field already exists. No migration needed.")
+            return
+        
+        try:
+            with db.engine.connect() as conn:
+                conn.execute(db.text("""
+                    ALTER TABLE vote ADD COLUMN blockchain_commitment VARCHAR(20);
+                """))
+                conn.commit()
+            
+            print("✅ Successfully added commitment tier field to Vote table")
+            print("   - blockchain_commitment (VARCHAR(20))")
+            print("   ℹ️  Votes recorded earlier keep an empty tier and are not promoted")
+            
+        except Exception as e:
+            print(f"❌ Migration failed: {str(e)}")
+
+if __name__ == '__main__':
+    migrate_commitment_tiers()
+    print("\n🎯 Migration complete! Set the receipt tier with: python fast_mode.py tier <processed|confirmed|finalized>")
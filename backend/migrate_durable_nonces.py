@@ -0,0 +1,52 @@
+"""
+Migration: Add Durable Nonce Fields
+Adds nonce_account, durable_nonce and nonce_slot to blockchain_outbox so the
+reconciliation sweeper can tell when a durable nonce transaction can no
+longer land
+"""
+
+from app import app, db
+from models import BlockchainOutbox  # Ensure models are imported
+
+def migrate_durable_nonces():
+    """Add durable nonce fields to BlockchainOutbox table"""
+    print("🔄 Migrating BlockchainOutbox model - Adding durable nonce fields...")
+    
+    with app.app_context():
+        # Create blockchain_outbox if the outbox migration has not run yet
+        db.create_all()
+        
+        inspector = db.inspect(db.engine)
+        columns = [col['name'] for col in inspector.get_columns('blockchain_outbox')]
+        
+        if all(column in columns for column in ('nonce_account', 'durable_nonce', 'nonce_slot')):
+            print("✅ Durable nonce fields already exist. No migration needed.")
+            return
+        
+        try:
+            with db.engine.connect() as conn:
+                if 'nonce_account' not in columns:
+                    conn.execute(db.text("""
+                        ALTER TABLE blockchain_outbox ADD COLUMN nonce_account VARCHAR(64);
+                    """))
+                if 'durable_nonce' not in columns:
+                    conn.execute(db.text("""
+                        ALTER TABLE blockchain_outbox ADD COLUMN durable_nonce VARCHAR(64);
+                    """))
+                if 'nonce_slot' not in columns:
+                    conn.execute(db.text("""
+                        ALTER TABLE blockchain_outbox ADD COLUMN nonce_slot BIGINT;
+                    """))
+                conn.commit()
+            
+            print("✅ Successfully added durable nonce fields to BlockchainOutbox table")
+            print("   - nonce_account (VARCHAR(64))")
+            print("   - durable_nonce (VARCHAR(64))")
+            print("   - nonce_slot (BIGINT)")
+            
+        except Exception as e:
+            print(f"❌ Migration failed: {str(e)}")
+
+if __name__ == '__main__':
+    migrate_durable_nonces()
+    print("\n🎯 Migration complete! Durable nonce votes are now reconciled by the sweeper.")
@@ -0,0 +1,27 @@
+"""
+Migration: Add Incremental Tally Tables
+Creates tally_checkpoint, tally_counter and tallied_vote used by
+get_blockchain_verified_results to count only new blockchain votes
+"""
+
+from app import app, db
+from models import TallyCheckpoint, TallyCounter, TalliedVote  # Ensure models are imported
+
+def migrate_incremental_tally():
+    """Create incremental tally tables"""
+    print("🔄 Migrating database - Adding incremental tally tables...")
+    
+    with app.app_context():
+        try:
+            # Create all tables (only creates missing ones)
+            db.create_all()
+            print("✅ tally_checkpoint, tally_counter and tallied_vote tables ready")
+            print("   The first results refresh counts all existing blockchain votes")
+            
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Migration failed: {str(e)}")
+
+if __name__ == '__main__':
+    migrate_incremental_tally()
+    print("\n🎯 Migration complete! Blockchain results are now tallied incrementally.")
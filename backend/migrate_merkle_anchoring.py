@@ -0,0 +1,50 @@
+"""
+Migration: Add Merkle Anchoring Support
+Creates merkle_anchor table and adds inclusion proof columns to Vote
+"""
+
+from app import app, db
+from models import Vote, MerkleAnchor  # Ensure models are imported
+
+def migrate_merkle_anchoring():
+    """Add Merkle anchoring fields to Vote table"""
+    print("🔄 Migrating Vote model - Adding Merkle anchoring fields...")
+    
+    with app.app_context():
+        # Create merkle_anchor table (only creates missing tables)
+        db.create_all()
+        
+        inspector = db.inspect(db.engine)
+        columns = [col['name'] for col in inspector.get_columns('vote')]
+        
+        if 'merkle_anchor_id' in columns:
+            print("✅ Merkle anchoring fields already exist. No migration needed.")
+            return
+        
+        try:
+            with db.engine.connect() as conn:
+                conn.execute(db.text("""
+                    ALTER TABLE vote ADD COLUMN merkle_anchor_id INTEGER REFERENCES merkle_anchor(id);
+                """))
+                conn.execute(db.text("""
+                    ALTER TABLE vote ADD COLUMN merkle_leaf_index INTEGER;
+                """))
+                conn.execute(db.text("""
+                    ALTER TABLE vote ADD COLUMN merkle_proof TEXT;
+                """))
+                conn.execute(db.text("""
+                    CREATE INDEX IF NOT EXISTS ix_vote_merkle_anchor_id ON vote (merkle_anchor_id);
+                """))
+                conn.commit()
+            
+            print("✅ Successfully added Merkle anchoring fields to Vote table")
+            print("   - merkle_anchor_id (INTEGER)")
+            print("   - merkle_leaf_index (INTEGER)")
+            print("   - merkle_proof (TEXT)")
+            
+        except Exception as e:
+            print(f"❌ Migration failed: {str(e)}")
+
+if __name__ == '__main__':
+    migrate_merkle_anchoring()
+    print("\n🎯 Migration complete! Set ANCHORING_MODE = \"merkle\" in blockchain/config.py to batch votes.")
@@ -0,0 +1,56 @@
+"""
+Migration: Add Outbox Reconciliation Fields
+Adds tx_signature, last_valid_block_height and revivals to blockchain_outbox
+so the reconciliation sweeper can prove or resubmit unproven transactions
+and cap how often failed entries are revived
+"""
+
+from app import app, db
+from models import BlockchainOutbox  # Ensure models are imported
+
+def migrate_outbox_reconciliation():
+    """Add reconciliation fields to BlockchainOutbox table"""
+    print("🔄 Migrating BlockchainOutbox model - Adding reconciliation fields...")
+    
+    with app.app_context():
+        # Create blockchain_outbox if the outbox migration has not run yet
+        db.create_all()
+        
+        inspector = db.inspect(db.engine)
+        columns = [col['name'] for col in inspector.get_columns('blockchain_outbox')]
+        
+        if all(column in columns for column in ('tx_signature', 'last_valid_block_height', 'revivals')):
+            print("✅ Reconciliation fields already exist. No migration needed.")
+            return
+        
+        try:
+            with db.engine.connect() as conn:
+                if 'tx_signature' not in columns:
+                    conn.execute(db.text("""
+                        ALTER TABLE blockchain_outbox ADD COLUMN tx_signature VARCHAR(200);
+                    """))
+                    conn.execute(db.text("""
+                        CREATE INDEX IF NOT EXISTS ix_blockchain_outbox_tx_signature
+                        ON blockchain_outbox (tx_signature);
+                    """))
+                if 'last_valid_block_height' not in columns:
+                    conn.execute(db.text("""
+                        ALTER TABLE blockchain_outbox ADD COLUMN last_valid_block_height BIGINT;
+                    """))
+                if 'revivals' not in columns:
+                    conn.execute(db.text("""
+                        ALTER TABLE blockchain_outbox ADD COLUMN revivals INTEGER DEFAULT 0;
+                    """))
+                conn.commit()
+            
+            print("✅ Successfully added reconciliation fields to BlockchainOutbox table")
+            print("   - tx_signature (VARCHAR(200))")
+            print("   - last_valid_block_height (BIGINT)")
+            print("   - revivals (INTEGER)")
+            
+        except Exception as e:
+            print(f"❌ Migration failed: {str(e)}")
+
+if __name__ == '__main__':
+    migrate_outbox_reconciliation()
+    print("\n🎯 Migration complete! Unproven votes are now reconciled by the sweeper.")
@@ -0,0 +1,54 @@
+"""
+Migration: Add Vote Hash Chain
+Adds chain_hash to Vote, creates vote_chain_checkpoint and links all
+existing votes into the chain
+"""
+
+from app import app, db
+from models import Vote, VoteChainCheckpoint  # Ensure models are imported
+from blockchain.hash_chain import VoteHashChain
+
+def migrate_vote_hash_chain():
+    """Add hash chain field to Vote table and link existing votes"""
+    print("🔄 Migrating Vote model - Adding hash chain field...")
+    
+    with app.app_context():
+        # Create vote_chain_checkpoint table (only creates missing tables)
+        db.create_all()
+        
+        inspector = db.inspect(db.engine)
+        columns = [col['name'] for col in inspector.get_columns('vote')]
+        
+        if 'chain_hash' in columns:
+            print("✅ Hash chain field already exists.")
+        else:
+            try:
+                with db.engine.connect() as conn:
+                    conn.execute(db.text("""
+                        ALTER TABLE vote ADD COLUMN chain_hash VARCHAR(64);
+                    """))
+                    conn.execute(db.text("""
+                        CREATE INDEX IF NOT EXISTS ix_vote_chain_hash ON vote (chain_hash);
+                    """))
+                    conn.commit()
+                
+                print("✅ Successfully added hash chain field to Vote table")
+                print("   - chain_hash (VARCHAR(64))")
+                
+            except Exception as e:
+                print(f"❌ Migration failed: {str(e)}")
+                return
+        
+        try:
+            chain = VoteHashChain()
+            linked = chain.link_pending()
+            chain.checkpoint(anchor=False)
+            print(f"✅ Linked {linked} existing votes into the hash chain")
+            
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Linking existing votes failed: {str(e)}")
+
+if __name__ == '__main__':
+    migrate_vote_hash_chain()
+    print("\n🎯 Migration complete! Scan the chain with: python verify_vote_integrity.py --local")
@@ -50,14 +50,171 @@ class Vote(db.Model):
     position = db.Column(db.String(100))
     
     # ✅ Blockchain Integration Fields
-    blockchain_tx_signature = db.Column(db.String(200), unique=True, nullable=True)  # Solana transaction signature
+    blockchain_tx_signature = db.Column(db.String(200), index=True, nullable=True)   # Solana transaction signature (shared by a ballot)
     blockchain_slot = db.Column(db.BigInteger, nullable=True)                        # Block slot number
     blockchain_timestamp = db.Column(db.DateTime, nullable=True)                     # On-chain timestamp
     voter_id_hash = db.Column(db.String(64), nullable=True)                         # SHA-256 hash for anonymity
     encrypted_vote_data = db.Column(db.Text, nullable=True)                         # AES-256 encrypted payload
     verification_receipt = db.Column(db.String(500), nullable=True)                 # Voter receipt code
     is_verified_on_chain = db.Column(db.Boolean, default=False)                     # Blockchain verification status
+    blockchain_commitment = db.Column(db.String(20), nullable=True)                 # 'processed', 'confirmed' or 'finalized'
     created_at = db.Column(db.DateTime, default=datetime.utcnow)                    # Local timestamp
+    
+    # ✅ Merkle Anchoring Fields (votes batched under one on-chain root)
+    merkle_anchor_id = db.Column(db.Integer, db.ForeignKey('merkle_anchor.id'), nullable=True, index=True)
+    merkle_leaf_index = db.Column(db.Integer, nullable=True)                        # Position of vote in the tree
+    merkle_proof = db.Column(db.Text, nullable=True)                                # JSON inclusion proof
+    
+    # ✅ Local Hash Chain (tamper detection without RPC)
+    chain_hash = db.Column(db.String(64), nullable=True, index=True)                # SHA-256 over previous hash + vote fields
+
+
+class MerkleAnchor(db.Model):
+    """Merkle root of a batch of votes, anchored on Solana in one memo transaction"""
+    __tablename__ = 'merkle_anchor'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    merkle_root = db.Column(db.String(64), unique=True, nullable=False)  # Hex SHA-256 root
+    leaf_count = db.Column(db.Integer, nullable=False)
+    
+    tx_signature = db.Column(db.String(200), nullable=True)
+    slot = db.Column(db.BigInteger, nullable=True)
+    anchored_at = db.Column(db.DateTime, nullable=True)
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    votes = db.relationship('Vote', backref='merkle_anchor', lazy='dynamic')
+    
+    def __repr__(self):
+        return f'<MerkleAnchor {self.merkle_root[:16]}: {self.leaf_count} votes>'
+
+
+class BlockchainOutbox(db.Model):
+    """Durable queue of votes waiting to be recorded on the Solana blockchain"""
+    __tablename__ = 'blockchain_outbox'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    vote_id = db.Column(db.Integer, db.ForeignKey('vote.id'), unique=True, nullable=False)
+    voter_id = db.Column(db.String(100), nullable=False)
+    position = db.Column(db.String(100))
+    halka = db.Column(db.String(20))
+    
+    # Delivery state
+    status = db.Column(db.String(20), default='pending', index=True)  # 'pending', 'deferred', 'processing', 'unproven', 'done', 'failed'
+    attempts = db.Column(db.Integer, default=0)
+    last_error = db.Column(db.Text)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    locked_at = db.Column(db.DateTime)  # When a submitter claimed the entry
+    revivals = db.Column(db.Integer, default=0)  # Times the sweeper gave a 'failed' entry new attempts
+    
+    # Sent transaction, kept until the reconciliation sweeper proves or resubmits it
+    tx_signature = db.Column(db.String(200), index=True)
+    last_valid_block_height = db.Column(db.BigInteger)  # Blockhash expiry of tx_signature
+    nonce_account = db.Column(db.String(64))  # Durable nonce account of tx_signature (no blockhash expiry)
+    durable_nonce = db.Column(db.String(64))  # Nonce tx_signature was signed against
+    nonce_slot = db.Column(db.BigInteger)  # Slot durable_nonce was read at (older RPC answers are ignored)
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    vote = db.relationship('Vote', backref=db.backref('outbox_entry', uselist=False))
+    
+    def __repr__(self):
+        return f'<BlockchainOutbox vote={self.vote_id}: {self.status} ({self.attempts} attempts)>'
+
+
+class ChainMemo(db.Model):
+    """Election memo mirrored from the fee payer's on-chain transaction history"""
+    __tablename__ = 'chain_memo'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    signature = db.Column(db.String(200), nullable=False, index=True)
+    slot = db.Column(db.BigInteger, index=True)
+    block_time = db.Column(db.BigInteger, nullable=True)
+    
+    memo_type = db.Column(db.String(20), index=True)                 # 'VOTE', 'BALLOT' or 'MERKLE_ROOT'
+    election_id = db.Column(db.String(100))
+    voter_hash = db.Column(db.String(64), index=True)
+    halka = db.Column(db.String(20), index=True)
+    position = db.Column(db.String(100), index=True)                 # One row per position for ballots
+    encrypted_vote = db.Column(db.Text)
+    merkle_root = db.Column(db.String(64), index=True)
+    leaf_count = db.Column(db.Integer)
+    memo_version = db.Column(db.String(20))
+    memo_timestamp = db.Column(db.String(40))                        # Timestamp written in the memo
+    
+    indexed_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (db.UniqueConstraint('signature', 'position', name='uq_chain_memo_signature_position'),)
+    
+    def __repr__(self):
+        return f'<ChainMemo {self.memo_type} {self.signature[:16]}... {self.position or ""}>'
+
+
+class ChainIndexerState(db.Model):
+    """How far the chain indexer has read an address's signature history"""
+    __tablename__ = 'chain_indexer_state'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    address = db.Column(db.String(64), unique=True, nullable=False)
+    last_signature = db.Column(db.String(200), nullable=True)    # Newest signature fully indexed
+    last_slot = db.Column(db.BigInteger, nullable=True)
+    signatures_indexed = db.Column(db.Integer, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class VoteChainCheckpoint(db.Model):
+    """Periodic snapshot of the vote hash chain head, optionally anchored on Solana"""
+    __tablename__ = 'vote_chain_checkpoint'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    last_vote_id = db.Column(db.Integer, nullable=False, index=True)   # Vote the head was computed at
+    head_hash = db.Column(db.String(64), nullable=False)
+    length = db.Column(db.Integer, nullable=False)                      # Linked votes up to last_vote_id
+    
+    anchor_signature = db.Column(db.String(200), nullable=True)
+    anchor_slot = db.Column(db.BigInteger, nullable=True)
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class TallyCheckpoint(db.Model):
+    """Progress of the incremental chain-sourced tally (single row)"""
+    __tablename__ = 'tally_checkpoint'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    last_slot = db.Column(db.BigInteger, nullable=True)          # Highest slot tallied so far
+    last_signature = db.Column(db.String(200), nullable=True)    # Signature of the last tallied vote
+    total_votes = db.Column(db.Integer, default=0)
+    input_digest = db.Column(db.String(64), nullable=True)       # Order-independent SHA-256 sum of tallied inputs
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<TallyCheckpoint {self.total_votes} votes @ slot {self.last_slot}>'
+
+
+class TallyCounter(db.Model):
+    """Per-position, per-candidate vote count from blockchain data"""
+    __tablename__ = 'tally_counter'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    position = db.Column(db.String(100), nullable=False)
+    candidate_id = db.Column(db.String(100), nullable=False)
+    count = db.Column(db.Integer, default=0)
+    
+    __table_args__ = (db.UniqueConstraint('position', 'candidate_id', name='uq_tally_position_candidate'),)
+
+
+class TalliedVote(db.Model):
+    """Vote already counted by the incremental tally (never counted twice)"""
+    __tablename__ = 'tallied_vote'
+    
+    vote_id = db.Column(db.Integer, db.ForeignKey('vote.id'), primary_key=True)
+    tx_signature = db.Column(db.String(200), nullable=True)
+    slot = db.Column(db.BigInteger, nullable=True)
+    position = db.Column(db.String(100))
+    candidate_id = db.Column(db.String(100))
+    tallied_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 class Admin(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -0,0 +1,38 @@
+"""
+Standalone Chain Indexer
+Mirrors election memos from Solana into the local chain_memo table
+Run once with --once to catch up and exit, add --rebuild to drop the
+mirror and re-read every history first
+"""
+
+import sys
+import time
+from app import app
+from blockchain.chain_indexer import ChainIndexer, start_chain_indexer
+
+
+if __name__ == '__main__':
+    if '--once' in sys.argv:
+        with app.app_context():
+            indexer = ChainIndexer(app)
+            if '--rebuild' in sys.argv:
+                indexer.rebuild()
+                print("🗑️  Chain mirror cleared, re-indexing from scratch")
+            added = indexer.catch_up()
+            stats = indexer.get_stats()
+        print(f"✅ Catch-up complete: {added} memo rows added, {stats['memo_rows']} in mirror")
+        sys.exit(0)
+    
+    indexer = start_chain_indexer(app)
+    
+    try:
+        while True:
+            time.sleep(60)
+            with app.app_context():
+                stats = indexer.get_stats()
+            for address in stats['addresses']:
+                print(f"📊 Indexer {address['address'][:8]}...: slot {address['last_slot']}, "
+                      f"{address['signatures_indexed']} signatures, {stats['memo_rows']} memo rows")
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping chain indexer...")
+        indexer.stop()
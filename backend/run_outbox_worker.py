@@ -0,0 +1,31 @@
+"""
+Standalone Vote Outbox Worker
+Records queued votes on Solana when the web app runs under a WSGI server
+"""
+
+import time
+from app import app
+from blockchain.outbox import start_outbox_submitter
+from blockchain.reconciler import start_reconciliation_sweeper
+
+
+if __name__ == '__main__':
+    submitter = start_outbox_submitter(app)
+    sweeper = start_reconciliation_sweeper(app)
+    
+    try:
+        while True:
+            time.sleep(30)
+            with app.app_context():
+                stats = submitter.get_stats()
+            print(f"📊 Outbox: {stats['pending']} pending, {stats['deferred']} deferred, {stats['processing']} processing, "
+                  f"{stats['unproven']} unproven, {stats['done']} done, {stats['failed']} failed")
+            
+            metrics = sweeper.snapshot()
+            if metrics['drain_rate_per_minute'] is not None:
+                print(f"🧹 Backlog: {metrics['backlog'].get('total', 0)} votes, "
+                      f"draining {metrics['drain_rate_per_minute']}/min")
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping outbox worker...")
+        sweeper.stop()
+        submitter.stop()
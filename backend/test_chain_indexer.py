@@ -0,0 +1,158 @@
+"""
+Test Chain Indexer
+Only memos paid for by the signer set may enter the chain mirror: a
+third-party transaction that references a signer with a forged vote memo
+must not become verified data (stubbed RPC)
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from flask import Flask
+from solders.keypair import Keypair
+from solders.signature import Signature
+from models import db, ChainMemo
+from blockchain.chain_indexer import ChainIndexer, get_mirrored_memo
+from blockchain.encryption import VoteEncryption
+from blockchain.memo_codec import encode_ballot_memo
+
+
+def create_test_app():
+    """Flask app on a throwaway SQLite database"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def make_signature(n):
+    return Signature(bytes([n]) + bytes(63))
+
+
+def ballot_memo(voter_id):
+    encryption = VoteEncryption()
+    payload = encryption.create_vote_payload(voter_id, 'NA122-PTI-PM', 'PM', 'NA-122')
+    return encode_ballot_memo('TEST-ELECTION', payload['voter_hash'], 'NA-122', {'PM': payload['encrypted_vote']})
+
+
+class StubClient:
+    """Signer history and per-transaction fee payers set by the test"""
+
+    def __init__(self, signer):
+        self.signer = signer
+        self.history = []  # signature entries, newest first
+        self.fee_payers = {}  # signature str -> fee payer str
+        self.client = SimpleNamespace(get_signatures_for_address=self.get_signatures_for_address)
+
+    def get_signer_pubkeys(self):
+        return [self.signer]
+
+    def get_signatures_for_address(self, address, before=None, until=None, limit=1000):
+        return SimpleNamespace(value=list(self.history))
+
+    def get_transaction_data(self, signature):
+        if signature not in self.fee_payers:
+            return None
+        return {
+            'signature': signature,
+            'fee_payer': self.fee_payers[signature],
+            'transaction': {'message': {'instructions': []}}
+        }
+
+    def add(self, signature, memo, fee_payer):
+        self.history.insert(0, SimpleNamespace(
+            signature=signature, err=None, memo=f"[{len(memo)}] {memo}", slot=10, block_time=1700000000
+        ))
+        self.fee_payers[str(signature)] = str(fee_payer)
+
+
+def test_only_signer_memos_mirrored():
+    """Memos of transactions paid by other keys are not mirrored"""
+    app = create_test_app()
+    signer = Keypair().pubkey()
+    client = StubClient(signer)
+    client.add(make_signature(1), ballot_memo('PKV1001'), signer)
+    client.add(make_signature(2), ballot_memo('PKV1002'), Keypair().pubkey())  # Forged, references the signer
+
+    with app.app_context():
+        indexer = ChainIndexer(app, solana_client=client)
+        assert indexer.catch_up() == 1
+        assert get_mirrored_memo(str(make_signature(1))) is not None
+        assert ChainMemo.query.filter_by(signature=str(make_signature(2))).count() == 0
+
+    print("   ✅ Forged memo not mirrored")
+
+
+def test_retired_signer_memos_mirrored():
+    """Memos paid by a retired fee payer (still in the signer set) are mirrored"""
+    app = create_test_app()
+    signer, retired = Keypair().pubkey(), Keypair().pubkey()
+    client = StubClient(signer)
+    client.get_signer_pubkeys = lambda: [signer, retired]
+    client.add(make_signature(4), ballot_memo('PKV1004'), retired)
+
+    with app.app_context():
+        indexer = ChainIndexer(app, solana_client=client)
+        assert indexer.catch_up() == 1
+        assert get_mirrored_memo(str(make_signature(4))) is not None
+
+    print("   ✅ Retired signer memo mirrored")
+
+
+def test_unreadable_transaction_retried():
+    """A transaction whose fee payer cannot be read stops the run without moving the checkpoint"""
+    app = create_test_app()
+    signer = Keypair().pubkey()
+    client = StubClient(signer)
+    client.add(make_signature(3), ballot_memo('PKV1003'), signer)
+    del client.fee_payers[str(make_signature(3))]
+
+    with app.app_context():
+        indexer = ChainIndexer(app, solana_client=client)
+        try:
+            indexer.catch_up()
+            assert False, 'catch_up should fail'
+        except RuntimeError:
+            db.session.rollback()
+
+        client.fee_payers[str(make_signature(3))] = str(signer)
+        assert indexer.catch_up() == 1
+
+    print("   ✅ Unreadable transaction retried on the next run")
+
+
+def main():
+    """Run chain indexer tests"""
+    print("\n" + "="*60)
+    print("🗂️  VOTONOMY CHAIN INDEXER TEST")
+    print("="*60)
+
+    tests = [test_only_signer_memos_mirrored, test_retired_signer_memos_mirrored, test_unreadable_transaction_retried]
+    failed = 0
+
+    for test in tests:
+        print(f"\n🧪 {test.__doc__}")
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ FAILED {e}")
+
+    print("\n" + "="*60)
+    if failed:
+        print(f"❌ {failed} of {len(tests)} tests failed")
+    else:
+        print(f"✅ All {len(tests)} tests passed")
+    print("="*60 + "\n")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,229 @@
+"""
+Test Durable Nonces
+Nonce reads from lagging RPC nodes must never make a sent ballot look
+expired (which would record it twice) or hand out an already used nonce
+(stubbed RPC)
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from flask import Flask
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.signature import Signature
+from models import db, Vote
+from blockchain.fee_payer_pool import FeePayer
+from blockchain.nonce_pool import DurableNoncePool, fetch_nonces
+from blockchain.outbox import enqueue_vote
+from blockchain.reconciler import VoteReconciliationSweeper
+
+
+def create_test_app():
+    """Flask app on a throwaway SQLite database"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def make_hash(n):
+    return Hash(bytes([n]) * 32)
+
+
+def nonce_account_data(nonce, authority):
+    """Initialized nonce account layout (version, state, authority, nonce, fee)"""
+    return (
+        (0).to_bytes(4, 'little') + (1).to_bytes(4, 'little') +
+        bytes(authority) + bytes(nonce) + (5000).to_bytes(8, 'little')
+    )
+
+
+class StubRPC:
+    """Nonce accounts and the slot each answer is read at, set by the test"""
+
+    def __init__(self):
+        self.accounts = {}  # pubkey str -> (nonce Hash, authority Pubkey)
+        self.slot = 100
+        self.status_slot = 100
+        self.account_reads = []
+
+    def get_multiple_accounts(self, pubkeys):
+        self.account_reads.append([str(pubkey) for pubkey in pubkeys])
+        return SimpleNamespace(
+            context=SimpleNamespace(slot=self.slot),
+            value=[
+                SimpleNamespace(data=nonce_account_data(*self.accounts[str(pubkey)]))
+                if str(pubkey) in self.accounts else None
+                for pubkey in pubkeys
+            ]
+        )
+
+    def get_signature_statuses(self, signatures, search_transaction_history=False):
+        return SimpleNamespace(context=SimpleNamespace(slot=self.status_slot), value=[None] * len(signatures))
+
+    def get_epoch_info(self):
+        return SimpleNamespace(value=SimpleNamespace(block_height=1000, absolute_slot=self.slot))
+
+
+def create_fee_payer():
+    ledger = SimpleNamespace(lamports=10**10, can_afford=lambda **kwargs: True, debit=lambda **kwargs: None)
+    return FeePayer(Keypair(), ledger)
+
+
+def create_nonce_pool(rpc, payers, count=2):
+    client = SimpleNamespace(client=rpc, get_fee_payer_pool=lambda: SimpleNamespace(payers=payers))
+    pool = DurableNoncePool(client, count=count, wallets_dir=Path(tempfile.mkdtemp()), recycle_after=3600)
+    for index, account in enumerate(pool.accounts):
+        rpc.accounts[str(account.pubkey)] = (make_hash(index + 1), payers[0].pubkey)
+    return pool
+
+
+def test_lagging_batch_ignored():
+    """fetch_nonces leaves accounts read behind min_context_slot out (unknown)"""
+    rpc = StubRPC()
+    pubkey = Keypair().pubkey()
+    rpc.accounts[str(pubkey)] = (make_hash(1), Keypair().pubkey())
+
+    rpc.slot = 90
+    nonces, context_slot = fetch_nonces(rpc, [pubkey], min_context_slot=100)
+    assert nonces == {} and context_slot is None
+
+    rpc.slot = 120
+    nonces, context_slot = fetch_nonces(rpc, [pubkey, Keypair().pubkey()], min_context_slot=100)
+    assert nonces[str(pubkey)][0] == make_hash(1)
+    assert len(nonces) == 2 and None in nonces.values()
+    assert context_slot == 120
+
+    print("   ✅ Lagging reads ignored")
+
+
+def test_used_nonce_not_reused_on_lagging_read():
+    """A used nonce becomes ready again only from a read at or past its slot"""
+    rpc = StubRPC()
+    payer = create_fee_payer()
+    pool = create_nonce_pool(rpc, [payer], count=1)
+
+    assert pool.refresh() == 1
+    account = pool.acquire(payer)
+    assert account is not None and account.nonce_slot == 100
+    pool.mark_sent(account)
+
+    # Nonce advanced on-chain, but the answer comes from a node behind the last read
+    rpc.accounts[str(account.pubkey)] = (make_hash(9), payer.pubkey)
+    rpc.slot = 90
+    assert pool.refresh() == 0
+    assert account.state == 'used'
+
+    rpc.slot = 130
+    assert pool.refresh() == 1
+    assert account.state == 'ready' and account.nonce == make_hash(9) and account.nonce_slot == 130
+
+    print("   ✅ Used nonce kept until a current read")
+
+
+def test_orphaned_accounts_not_polled():
+    """Accounts of a removed fee payer are not polled until the payers change"""
+    rpc = StubRPC()
+    payer, removed = create_fee_payer(), create_fee_payer()
+    payers = [payer]
+    pool = create_nonce_pool(rpc, payers, count=2)
+    orphan = pool.accounts[1]
+    rpc.accounts[str(orphan.pubkey)] = (make_hash(7), removed.pubkey)
+
+    pool.refresh()
+    assert orphan.state == 'orphaned'
+    pool.acquire(payer)
+    pool.mark_sent(pool.accounts[0])
+
+    rpc.account_reads.clear()
+    pool.refresh()
+    assert all(str(orphan.pubkey) not in read for read in rpc.account_reads)
+
+    payers.append(removed)
+    pool.refresh()
+    assert orphan.state == 'ready' and orphan.authority is removed
+
+    print("   ✅ Orphaned accounts re-bound when the payers change")
+
+
+def test_sweeper_nonce_expiry():
+    """Unproven nonce ballot: resubmitted only once a current read shows its nonce moved"""
+    app = create_test_app()
+    rpc = StubRPC()
+    client = SimpleNamespace(client=rpc, is_circuit_open=lambda: False)
+    sweeper = VoteReconciliationSweeper(app, solana_client=client, commitment='processed')
+    nonce_pubkey = Keypair().pubkey()
+
+    with app.app_context():
+        vote = Vote(voter_id='PKV1001', candidate_id='NA122-PTI-PM', position='PM')
+        db.session.add(vote)
+        db.session.flush()
+        entry = enqueue_vote(vote, 'NA-122')
+        entry.status = 'unproven'
+        entry.tx_signature = str(Signature(bytes([1]) + bytes(63)))
+        entry.nonce_account = str(nonce_pubkey)
+        entry.durable_nonce = str(make_hash(1))
+        entry.nonce_slot = 100
+        db.session.commit()
+
+        # Account not found: unknown, not expired
+        assert sweeper.sweep_once()['resubmitted'] == 0
+
+        # Nonce moved, but read from a node behind the slot it was reserved at
+        rpc.accounts[str(nonce_pubkey)] = (make_hash(2), Keypair().pubkey())
+        rpc.slot = 90
+        assert sweeper.sweep_once()['resubmitted'] == 0
+
+        # Current nonce read, but statuses from a node behind it
+        rpc.slot, rpc.status_slot = 120, 110
+        assert sweeper.sweep_once()['resubmitted'] == 0
+        assert entry.status == 'unproven'
+
+        rpc.status_slot = 120
+        assert sweeper.sweep_once()['resubmitted'] == 1
+        assert entry.status == 'pending' and entry.nonce_account is None and entry.nonce_slot is None
+
+    print("   ✅ Nonce ballot resubmitted only on a current read")
+
+
+def main():
+    """Run durable nonce tests"""
+    print("\n" + "="*60)
+    print("🔑 VOTONOMY DURABLE NONCE TEST")
+    print("="*60)
+
+    tests = [
+        test_lagging_batch_ignored,
+        test_used_nonce_not_reused_on_lagging_read,
+        test_orphaned_accounts_not_polled,
+        test_sweeper_nonce_expiry
+    ]
+    failed = 0
+
+    for test in tests:
+        print(f"\n🧪 {test.__doc__}")
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ FAILED {e}")
+
+    print("\n" + "="*60)
+    if failed:
+        print(f"❌ {failed} of {len(tests)} tests failed")
+    else:
+        print(f"✅ All {len(tests)} tests passed")
+    print("="*60 + "\n")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
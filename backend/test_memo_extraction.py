@@ -0,0 +1,136 @@
+"""
+Test Memo Extraction
+Memos must be read from jsonParsed transactions that carry other
+instructions before the memo (ComputeBudget instructions when priority
+fees are on) and only from transactions paid by our signers (stubbed RPC)
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from solders.keypair import Keypair
+from solders.rpc.responses import GetTransactionResp
+from blockchain.encryption import VoteEncryption
+from blockchain.memo_codec import encode_ballot_memo
+from blockchain.solana_client import SolanaVotingClient, MEMO_PROGRAM_ID
+from blockchain.vote_verifier import VoteVerifier
+
+COMPUTE_BUDGET_PROGRAM_ID = 'ComputeBudget111111111111111111111111111111'
+
+
+def transaction_response(fee_payer, memos):
+    """jsonParsed getTransaction response: two ComputeBudget instructions, then the memos"""
+    instructions = [
+        {'programId': COMPUTE_BUDGET_PROGRAM_ID, 'accounts': [], 'data': 'HnkkG7', 'stackHeight': None},
+        {'programId': COMPUTE_BUDGET_PROGRAM_ID, 'accounts': [], 'data': '3DdGGhkhJbjm', 'stackHeight': None}
+    ] + [
+        {'program': 'spl-memo', 'programId': MEMO_PROGRAM_ID, 'parsed': memo, 'stackHeight': None}
+        for memo in memos
+    ]
+
+    return GetTransactionResp.from_json(json.dumps({
+        'jsonrpc': '2.0',
+        'id': 1,
+        'result': {
+            'slot': 5,
+            'blockTime': 1700000000,
+            'meta': None,
+            'transaction': {
+                'signatures': ['5' * 88],
+                'message': {
+                    'accountKeys': [
+                        {'pubkey': fee_payer, 'signer': True, 'writable': True, 'source': 'transaction'}
+                    ],
+                    'recentBlockhash': '11111111111111111111111111111111',
+                    'instructions': instructions
+                }
+            }
+        }
+    }))
+
+
+def create_verifier(response, signers):
+    """VoteVerifier reading transactions through SolanaVotingClient's parsing"""
+    client = SolanaVotingClient.__new__(SolanaVotingClient)
+    client._get_transaction_cached = lambda *args, **kwargs: response
+    client.get_signer_pubkeys = lambda: signers
+    return VoteVerifier(client, VoteEncryption())
+
+
+def ballot_memo(encryption):
+    payload = encryption.create_vote_payload('PKV1001', 'NA122-PTI-PM', 'PM', 'NA-122')
+    memo = encode_ballot_memo('TEST-ELECTION', payload['voter_hash'], 'NA-122', {'PM': payload['encrypted_vote']})
+    return memo, payload
+
+
+def test_memo_after_compute_budget():
+    """Memo found behind ComputeBudget instructions"""
+    signer = Keypair().pubkey()
+    encryption = VoteEncryption()
+    memo, payload = ballot_memo(encryption)
+    verifier = create_verifier(transaction_response(str(signer), [memo]), [signer])
+
+    tx_data = verifier.client.get_transaction_data('5' * 88)
+    assert [i['programId'] for i in tx_data['transaction']['message']['instructions']] == [MEMO_PROGRAM_ID]
+
+    memo_data = verifier._extract_memo_from_transaction(tx_data)
+    assert memo_data is not None and memo_data['type'] == 'BALLOT'
+    assert memo_data['voter_hash'] == payload['voter_hash']
+
+    print("   ✅ Memo read behind ComputeBudget instructions")
+
+
+def test_undecodable_memo_skipped():
+    """An undecodable memo instruction is skipped, not fatal"""
+    signer = Keypair().pubkey()
+    memo, payload = ballot_memo(VoteEncryption())
+    verifier = create_verifier(transaction_response(str(signer), ['not a vote memo!', memo]), [signer])
+
+    memo_data = verifier._extract_memo_from_transaction(verifier.client.get_transaction_data('5' * 88))
+    assert memo_data is not None and memo_data['voter_hash'] == payload['voter_hash']
+
+    print("   ✅ Undecodable memo skipped")
+
+
+def test_unknown_fee_payer_ignored():
+    """Memos paid by a key outside the signer set are not election memos"""
+    memo, payload = ballot_memo(VoteEncryption())
+    verifier = create_verifier(transaction_response(str(Keypair().pubkey()), [memo]), [Keypair().pubkey()])
+
+    assert verifier._extract_memo_from_transaction(verifier.client.get_transaction_data('5' * 88)) is None
+
+    print("   ✅ Forged memo ignored")
+
+
+def main():
+    """Run memo extraction tests"""
+    print("\n" + "="*60)
+    print("📝 VOTONOMY MEMO EXTRACTION TEST")
+    print("="*60)
+
+    tests = [test_memo_after_compute_budget, test_undecodable_memo_skipped, test_unknown_fee_payer_ignored]
+    failed = 0
+
+    for test in tests:
+        print(f"\n🧪 {test.__doc__}")
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ FAILED {e}")
+
+    print("\n" + "="*60)
+    if failed:
+        print(f"❌ {failed} of {len(tests)} tests failed")
+    else:
+        print(f"✅ All {len(tests)} tests passed")
+    print("="*60 + "\n")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,253 @@
+"""
+Test Outbox Deferral
+A ballot deferred while the RPC circuit opens must never be sent twice:
+unsent ballots are parked, sent ones keep their signature (stubbed RPC)
+"""
+
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from flask import Flask
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.transaction import Transaction
+from models import db, Vote, BlockchainOutbox
+from blockchain.circuit_breaker import CircuitOpenError
+from blockchain.encryption import VoteEncryption
+from blockchain.outbox import enqueue_vote, VoteOutboxSubmitter
+from blockchain.vote_recorder import VoteRecorder
+
+
+def create_test_app():
+    """Flask app on a throwaway SQLite database"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+class StubRecorder:
+    """Recorder returning a fixed result and counting submissions"""
+
+    def __init__(self, result):
+        self.encryption = VoteEncryption()
+        self.client = SimpleNamespace(is_circuit_open=lambda: False, circuit_breaker=None)
+        self.result = result
+        self.calls = 0
+
+    def record_ballot_on_chain(self, voter_hash, ballot, halka):
+        self.calls += 1
+        result = dict(self.result)
+        if result.get('signature'):
+            result['voter_hash'] = voter_hash
+            result['votes'] = {
+                position: {'encrypted_data': encrypted, 'receipt': 'RECEIPT'}
+                for position, encrypted in ballot.items()
+            }
+        return result
+
+
+def queue_ballot(recorder):
+    """One voter's PM and MNA votes in the outbox"""
+    votes = []
+    for position in ('PM', 'MNA'):
+        payload = recorder.encryption.create_vote_payload('PKV1001', f'NA122-PTI-{position}', position, 'NA-122')
+        vote = Vote(
+            voter_id='PKV1001',
+            candidate_id=f'NA122-PTI-{position}',
+            position=position,
+            voter_id_hash=payload['voter_hash'],
+            encrypted_vote_data=payload['encrypted_vote']
+        )
+        db.session.add(vote)
+        db.session.flush()
+        enqueue_vote(vote, 'NA-122')
+        votes.append(vote)
+    db.session.commit()
+    return votes
+
+
+def test_deferred_before_send():
+    """Unsent ballot: parked as deferred without using up an attempt"""
+    app = create_test_app()
+    recorder = StubRecorder({'success': False, 'deferred': True, 'error': 'Solana RPC circuit open'})
+    submitter = VoteOutboxSubmitter(app, recorder_factory=lambda: recorder, workers=1)
+
+    with app.app_context():
+        votes = queue_ballot(recorder)
+        submitter.drain_once()
+
+        for vote in votes:
+            entry = vote.outbox_entry
+            assert entry.status == 'deferred'
+            assert entry.attempts == 0
+            assert entry.tx_signature is None
+            assert vote.blockchain_tx_signature is None
+
+    print("   ✅ Unsent ballot deferred")
+
+
+def test_deferred_after_send():
+    """Sent ballot: signature kept, left unproven and not submitted again"""
+    app = create_test_app()
+    recorder = StubRecorder({
+        'success': False,
+        'deferred': True,
+        'error': 'Solana RPC circuit open',
+        'proven': False,
+        'commitment': None,
+        'signature': 'SENT-SIGNATURE',
+        'slot': None,
+        'timestamp': None,
+        'last_valid_block_height': 1234,
+        'nonce_account': None,
+        'durable_nonce': None,
+        'nonce_slot': None
+    })
+    submitter = VoteOutboxSubmitter(app, recorder_factory=lambda: recorder, workers=1)
+
+    with app.app_context():
+        votes = queue_ballot(recorder)
+        submitter.drain_once()
+        submitter.drain_once()
+
+        assert recorder.calls == 1
+        for vote in votes:
+            entry = vote.outbox_entry
+            assert entry.status == 'unproven'
+            assert entry.tx_signature == 'SENT-SIGNATURE'
+            assert entry.last_valid_block_height == 1234
+            assert vote.blockchain_tx_signature == 'SENT-SIGNATURE'
+            assert vote.verification_receipt == 'RECEIPT'
+            assert vote.is_verified_on_chain is False
+
+    print("   ✅ Sent ballot kept as unproven")
+
+
+def test_failed_after_send():
+    """Sent ballot failing for another reason: signature kept, left unproven"""
+    app = create_test_app()
+    recorder = StubRecorder({
+        'success': False,
+        'error': 'Transaction failed: confirmation error',
+        'proven': False,
+        'commitment': None,
+        'signature': 'SENT-SIGNATURE',
+        'slot': None,
+        'timestamp': None,
+        'last_valid_block_height': 1234,
+        'nonce_account': None,
+        'durable_nonce': None,
+        'nonce_slot': None
+    })
+    submitter = VoteOutboxSubmitter(app, recorder_factory=lambda: recorder, workers=1)
+
+    with app.app_context():
+        votes = queue_ballot(recorder)
+        submitter.drain_once()
+        submitter.drain_once()
+
+        assert recorder.calls == 1
+        for vote in votes:
+            assert vote.outbox_entry.status == 'unproven'
+            assert vote.outbox_entry.tx_signature == 'SENT-SIGNATURE'
+
+    print("   ✅ Failed sent ballot kept as unproven")
+
+
+def create_sending_client(confirm_transaction):
+    """Client whose send succeeds and whose confirmation is confirm_transaction"""
+    payer = SimpleNamespace(keypair=Keypair(), ledger=SimpleNamespace(debit=lambda **kwargs: None))
+    payer.pubkey = payer.keypair.pubkey()
+
+    @contextmanager
+    def acquire(lamports=None):
+        yield payer
+
+    def send_raw_transaction(raw, opts=None):
+        return SimpleNamespace(value=Transaction.from_bytes(raw).signatures[0])
+
+    return SimpleNamespace(
+        client=SimpleNamespace(send_raw_transaction=send_raw_transaction),
+        is_circuit_open=lambda: False,
+        get_priority_fee_estimator=lambda: None,
+        get_fee_payer_pool=lambda: SimpleNamespace(acquire=acquire),
+        get_nonce_pool=lambda: None,
+        get_blockhash_provider=lambda: SimpleNamespace(get=lambda: (Hash.default(), 500)),
+        confirm_transaction=confirm_transaction
+    )
+
+
+def test_recorder_keeps_signature():
+    """VoteRecorder: circuit opening during confirmation still returns the signature"""
+    def confirm_transaction(signature, timeout=None, commitment=None):
+        raise CircuitOpenError(30)
+
+    result = VoteRecorder(create_sending_client(confirm_transaction), VoteEncryption())._send_memo_transaction('ballot')
+
+    assert result['success'] is False
+    assert result['deferred'] is True
+    assert result['signature']
+    assert result['last_valid_block_height'] == 500
+
+    print("   ✅ Recorder returns the signature of a deferred sent ballot")
+
+
+def test_recorder_keeps_signature_on_error():
+    """VoteRecorder: any error after sending still returns the signature"""
+    def confirm_transaction(signature, timeout=None, commitment=None):
+        raise ValueError('unexpected RPC response')
+
+    result = VoteRecorder(create_sending_client(confirm_transaction), VoteEncryption())._send_memo_transaction('ballot')
+
+    assert result['success'] is False
+    assert result['proven'] is False
+    assert result['signature']
+    assert result['last_valid_block_height'] == 500
+
+    print("   ✅ Recorder returns the signature of a failed sent ballot")
+
+
+def main():
+    """Run outbox deferral tests"""
+    print("\n" + "="*60)
+    print("🔌 VOTONOMY OUTBOX DEFERRAL TEST")
+    print("="*60)
+
+    tests = [
+        test_deferred_before_send,
+        test_deferred_after_send,
+        test_failed_after_send,
+        test_recorder_keeps_signature,
+        test_recorder_keeps_signature_on_error
+    ]
+    failed = 0
+
+    for test in tests:
+        print(f"\n🧪 {test.__doc__}")
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ FAILED {e}")
+
+    print("\n" + "="*60)
+    if failed:
+        print(f"❌ {failed} of {len(tests)} tests failed")
+    else:
+        print(f"✅ All {len(tests)} tests passed")
+    print("="*60 + "\n")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
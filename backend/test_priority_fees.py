@@ -0,0 +1,153 @@
+"""
+Test Priority Fees
+Concurrent submitters must never reserve more priority fees than the
+election budget, and fees of unsent transactions are refunded (stubbed RPC)
+"""
+
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from blockchain.encryption import VoteEncryption
+from blockchain.priority_fees import PriorityFeeEstimator
+from blockchain.vote_recorder import VoteRecorder
+
+QUOTE_LAMPORTS = 1000
+
+
+def create_estimator(budget_sol, spend_path=None):
+    """Estimator with a fixed price of QUOTE_LAMPORTS per quote and no sampling RPC"""
+    estimator = PriorityFeeEstimator(
+        SimpleNamespace(rpc_url='http://localhost', circuit_breaker=None),
+        election_id='TEST-ELECTION',
+        spend_path=spend_path or Path(tempfile.mkdtemp()) / 'priority_fee_spend.json',
+        budget_sol=budget_sol
+    )
+    estimator.current_price = lambda: 10000  # micro-lamports per CU -> QUOTE_LAMPORTS per quote
+    return estimator
+
+
+def test_budget_never_exceeded():
+    """Concurrent quotes stay within the budget"""
+    estimator = create_estimator(budget_sol=0.00005)
+    granted = []
+
+    def submitter():
+        for _ in range(50):
+            quote = estimator.quote()
+            if quote is not None:
+                granted.append(quote)
+
+    threads = [threading.Thread(target=submitter) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(quote['lamports'] == QUOTE_LAMPORTS for quote in granted)
+    assert len(granted) * QUOTE_LAMPORTS == estimator.spent_lamports
+    assert estimator.spent_lamports <= estimator.budget_lamports
+
+    print(f"   ✅ {len(granted)} quotes granted within the budget")
+
+
+def test_budget_shared_between_processes():
+    """Estimators sharing a spend file (web app and outbox worker) share one budget"""
+    spend_path = Path(tempfile.mkdtemp()) / 'priority_fee_spend.json'
+    estimators = [create_estimator(budget_sol=0.00005, spend_path=spend_path) for _ in range(2)]
+    granted = []
+
+    def submitter(estimator):
+        for _ in range(50):
+            quote = estimator.quote()
+            if quote is not None:
+                granted.append(quote)
+
+    threads = [threading.Thread(target=submitter, args=(estimators[i % 2],)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    budget = estimators[0].budget_lamports
+    assert len(granted) * QUOTE_LAMPORTS == budget
+
+    # A restart (crash) picks up the full spend
+    assert create_estimator(budget_sol=0.00005, spend_path=spend_path).spent_lamports == budget
+
+    print(f"   ✅ {len(granted)} quotes granted across two estimators within the budget")
+
+
+def test_refund():
+    """Refunded quotes give their lamports back"""
+    estimator = create_estimator(budget_sol=0.00005)
+    quote = estimator.quote()
+    assert estimator.spent_lamports == QUOTE_LAMPORTS
+
+    estimator.refund(quote)
+    estimator.refund(None)
+    assert estimator.spent_lamports == 0
+
+    print("   ✅ Quote refunded")
+
+
+def test_recorder_refunds_unsent():
+    """VoteRecorder refunds the quote when no fee payer can afford the transaction"""
+    estimator = create_estimator(budget_sol=0.00005)
+    requested = []
+
+    @contextmanager
+    def acquire(lamports=None):
+        requested.append(lamports)
+        yield None
+
+    client = SimpleNamespace(
+        is_circuit_open=lambda: False,
+        get_priority_fee_estimator=lambda: estimator,
+        get_fee_payer_pool=lambda: SimpleNamespace(acquire=acquire),
+        get_nonce_pool=lambda: None
+    )
+
+    result = VoteRecorder(client, VoteEncryption())._send_memo_transaction('ballot')
+
+    assert result['success'] is False
+    assert requested[0] > QUOTE_LAMPORTS  # Payer must afford the signature plus the priority fee
+    assert estimator.spent_lamports == 0
+
+    print("   ✅ Unsent transaction refunded")
+
+
+def main():
+    """Run priority fee tests"""
+    print("\n" + "="*60)
+    print("💸 VOTONOMY PRIORITY FEE TEST")
+    print("="*60)
+
+    tests = [test_budget_never_exceeded, test_budget_shared_between_processes, test_refund, test_recorder_refunds_unsent]
+    failed = 0
+
+    for test in tests:
+        print(f"\n🧪 {test.__doc__}")
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ FAILED {e}")
+
+    print("\n" + "="*60)
+    if failed:
+        print(f"❌ {failed} of {len(tests)} tests failed")
+    else:
+        print(f"✅ All {len(tests)} tests passed")
+    print("="*60 + "\n")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
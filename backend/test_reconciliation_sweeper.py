@@ -0,0 +1,276 @@
+"""
+Test Reconciliation Sweeper
+The sweeper resubmits a vote only once its transaction can no longer land,
+so no vote is recorded on-chain twice (stubbed RPC)
+"""
+
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from flask import Flask
+from solders.signature import Signature
+from solders.transaction_status import TransactionConfirmationStatus
+from models import db, Vote
+from blockchain.outbox import enqueue_vote
+from blockchain.reconciler import VoteReconciliationSweeper
+
+BLOCK_HEIGHT = 1000
+HEIGHT_SLOT = 5000
+
+
+def create_test_app():
+    """Flask app on a throwaway SQLite database"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def make_signature(n):
+    return str(Signature(bytes([n]) + bytes(63)))
+
+
+class StubRPC:
+    """Signature statuses and finalized transactions set by the test"""
+
+    def __init__(self):
+        self.statuses = {}
+        self.finalized = set()
+        self.transaction_error = None
+        self.status_slot = HEIGHT_SLOT
+
+    def get_epoch_info(self):
+        return SimpleNamespace(value=SimpleNamespace(block_height=BLOCK_HEIGHT, absolute_slot=HEIGHT_SLOT))
+
+    def get_block_time(self, slot):
+        return SimpleNamespace(value=1700000000)
+
+    def get_signature_statuses(self, signatures, search_transaction_history=False):
+        return SimpleNamespace(
+            context=SimpleNamespace(slot=self.status_slot),
+            value=[self.statuses.get(str(signature)) for signature in signatures]
+        )
+
+    def get_transaction(self, signature, encoding=None, commitment=None, max_supported_transaction_version=None):
+        if self.transaction_error is not None:
+            raise self.transaction_error
+        return SimpleNamespace(value=object() if str(signature) in self.finalized else None)
+
+
+def create_sweeper(app, rpc, **kwargs):
+    client = SimpleNamespace(client=rpc, is_circuit_open=lambda: False)
+    return VoteReconciliationSweeper(app, solana_client=client, commitment='processed', **kwargs)
+
+
+def add_sent_vote(signature, status, commitment=None, last_valid_block_height=BLOCK_HEIGHT - 100):
+    """Vote whose ballot was sent, with its outbox entry in status"""
+    vote = Vote(
+        voter_id=f'PKV-{signature[:8]}',
+        candidate_id='NA122-PTI-PM',
+        position='PM',
+        blockchain_tx_signature=signature,
+        blockchain_commitment=commitment,
+        is_verified_on_chain=status == 'done'
+    )
+    db.session.add(vote)
+    db.session.flush()
+
+    entry = enqueue_vote(vote, 'NA-122')
+    entry.status = status
+    entry.tx_signature = signature
+    entry.last_valid_block_height = last_valid_block_height
+    db.session.commit()
+    return vote
+
+
+def test_unproven_confirmed_or_resubmitted():
+    """Unproven: confirmed when found, resubmitted only once its blockhash expired"""
+    app = create_test_app()
+    rpc = StubRPC()
+    sweeper = create_sweeper(app, rpc)
+
+    with app.app_context():
+        found = add_sent_vote(make_signature(1), 'unproven')
+        pending = add_sent_vote(make_signature(2), 'unproven', last_valid_block_height=BLOCK_HEIGHT + 100)
+        expired = add_sent_vote(make_signature(3), 'unproven')
+        rpc.statuses[make_signature(1)] = SimpleNamespace(
+            err=None, slot=55, confirmation_status=TransactionConfirmationStatus.Confirmed
+        )
+
+        result = sweeper.sweep_once()
+
+        assert result['confirmed'] == 1
+        assert result['resubmitted'] == 1
+        assert found.outbox_entry.status == 'done' and found.is_verified_on_chain
+        assert pending.outbox_entry.status == 'unproven'
+        assert expired.outbox_entry.status == 'pending' and expired.outbox_entry.tx_signature is None
+
+    print("   ✅ Unproven votes settled")
+
+
+def test_lagging_status_node_not_expired():
+    """Statuses read behind the block height: a missing transaction is unknown, not expired"""
+    app = create_test_app()
+    rpc = StubRPC()
+    sweeper = create_sweeper(app, rpc)
+
+    with app.app_context():
+        unproven = add_sent_vote(make_signature(8), 'unproven')
+        receipt = add_sent_vote(make_signature(9), 'done', commitment='processed')
+
+        # Landed, but the status node has not seen it yet
+        rpc.status_slot = HEIGHT_SLOT - 10
+        assert sweeper.sweep_once()['resubmitted'] == 0
+        assert unproven.outbox_entry.status == 'unproven'
+        assert receipt.outbox_entry.status == 'done'
+
+        rpc.status_slot = HEIGHT_SLOT
+        rpc.statuses[make_signature(8)] = SimpleNamespace(
+            err=None, slot=HEIGHT_SLOT - 5, confirmation_status=TransactionConfirmationStatus.Confirmed
+        )
+        rpc.statuses[make_signature(9)] = rpc.statuses[make_signature(8)]
+        assert sweeper.sweep_once()['resubmitted'] == 0
+        assert unproven.outbox_entry.status == 'done'
+
+    print("   ✅ Lagging status node treated as unknown")
+
+
+def test_processed_receipt_resubmitted():
+    """Processed-tier receipt missing after expiry: resubmitted on the first sweep"""
+    app = create_test_app()
+    rpc = StubRPC()
+    sweeper = create_sweeper(app, rpc)
+
+    with app.app_context():
+        vote = add_sent_vote(make_signature(4), 'done', commitment='processed')
+
+        assert sweeper.sweep_once()['resubmitted'] == 1
+        assert vote.outbox_entry.status == 'pending'
+        assert vote.is_verified_on_chain is False
+
+    print("   ✅ Dropped processed receipt resubmitted")
+
+
+def test_confirmed_receipt_needs_repeated_misses():
+    """Confirmed receipt: kept until missing for several sweeps and unknown at finalized"""
+    app = create_test_app()
+    rpc = StubRPC()
+    sweeper = create_sweeper(app, rpc, receipt_missing_sweeps=3)
+
+    with app.app_context():
+        vote = add_sent_vote(make_signature(5), 'done', commitment='confirmed')
+
+        for sweep in range(2):
+            assert sweeper.sweep_once()['resubmitted'] == 0
+        assert vote.outbox_entry.status == 'done'
+
+        # Found at finalized: a lagging status lookup, never resubmitted
+        rpc.finalized.add(make_signature(5))
+        assert sweeper.sweep_once()['resubmitted'] == 0
+
+        # Lookup failing: doubt is not a reason to send the ballot again
+        rpc.finalized.clear()
+        rpc.transaction_error = ConnectionError('RPC down')
+        assert sweeper.sweep_once()['resubmitted'] == 0
+        assert vote.outbox_entry.status == 'done'
+
+        rpc.transaction_error = None
+        assert sweeper.sweep_once()['resubmitted'] == 1
+        assert vote.outbox_entry.status == 'pending'
+
+    print("   ✅ Confirmed receipt resubmitted only when dropped for good")
+
+
+def test_receipt_miss_count_resets():
+    """A receipt seen again starts its miss count over"""
+    app = create_test_app()
+    rpc = StubRPC()
+    sweeper = create_sweeper(app, rpc, receipt_missing_sweeps=2)
+
+    with app.app_context():
+        vote = add_sent_vote(make_signature(6), 'done', commitment='confirmed')
+
+        assert sweeper.sweep_once()['resubmitted'] == 0
+        rpc.statuses[make_signature(6)] = SimpleNamespace(
+            err=None, slot=60, confirmation_status=TransactionConfirmationStatus.Confirmed
+        )
+        assert sweeper.sweep_once()['resubmitted'] == 0
+        del rpc.statuses[make_signature(6)]
+        assert sweeper.sweep_once()['resubmitted'] == 0
+        assert vote.outbox_entry.status == 'done'
+
+    print("   ✅ Miss count reset by a visible status")
+
+
+def test_revivals_capped():
+    """Failed entries are revived at most max_revivals times, then stay failed"""
+    app = create_test_app()
+    rpc = StubRPC()
+    sweeper = create_sweeper(app, rpc, failed_retry_after=0, max_revivals=2)
+
+    with app.app_context():
+        vote = add_sent_vote(make_signature(7), 'failed')
+        entry = vote.outbox_entry
+
+        for revival in range(1, 3):
+            entry.updated_at = datetime.utcnow() - timedelta(seconds=1)
+            db.session.commit()
+            assert sweeper.sweep_once()['revived'] == 1
+            db.session.refresh(entry)
+            assert entry.status == 'pending' and entry.revivals == revival
+
+            entry.status = 'failed'
+            db.session.commit()
+
+        entry.updated_at = datetime.utcnow() - timedelta(seconds=1)
+        db.session.commit()
+        assert sweeper.sweep_once()['revived'] == 0
+        db.session.refresh(entry)
+        assert entry.status == 'failed'
+
+    print("   ✅ Revivals capped")
+
+
+def main():
+    """Run reconciliation sweeper tests"""
+    print("\n" + "="*60)
+    print("🧹 VOTONOMY RECONCILIATION SWEEPER TEST")
+    print("="*60)
+
+    tests = [
+        test_unproven_confirmed_or_resubmitted,
+        test_lagging_status_node_not_expired,
+        test_processed_receipt_resubmitted,
+        test_confirmed_receipt_needs_repeated_misses,
+        test_receipt_miss_count_resets,
+        test_revivals_capped
+    ]
+    failed = 0
+
+    for test in tests:
+        print(f"\n🧪 {test.__doc__}")
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ FAILED {e}")
+
+    print("\n" + "="*60)
+    if failed:
+        print(f"❌ {failed} of {len(tests)} tests failed")
+    else:
+        print(f"✅ All {len(tests)} tests passed")
+    print("="*60 + "\n")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,71 @@
+"""
+Offline Audit Bundle Verification
+Checks a bundle from export_audit_bundle.py on all CPU cores
+No database, admin access or RPC connection is needed
+
+Usage:
+    python verify_audit_bundle.py <bundle.tar.gz> [--workers N]
+"""
+
+import sys
+from blockchain.audit_bundle import verify_audit_bundle
+
+
+def print_report(report):
+    """Print verification report"""
+    print("\n" + "="*70)
+    print("🔐 VOTONOMY OFFLINE AUDIT")
+    print("="*70)
+    
+    if 'error' in report:
+        print(f"\n❌ {report['error']}\n")
+        return
+    
+    if report['status'] == 'VERIFIED':
+        print("\n✅ BUNDLE VERIFIED - all records match their on-chain transactions\n")
+    else:
+        print("\n🚨 VERIFICATION FAILED\n")
+    
+    print(f"Election:              {report['election_id']} (exported {report['created_at']})")
+    print(f"Signers:               {', '.join(report['signers'])}")
+    print(f"Votes:                 {report['votes']} ({report['on_chain_votes']} on chain)")
+    print(f"Verified Votes:        {report['verified_votes']}")
+    print(f"Transactions Checked:  {report['transactions_verified']}")
+    print(f"Merkle Anchors:        {report['merkle_anchors']}")
+    print(f"Chain Checkpoints:     {report['chain_checkpoints_verified']} verified"
+          f"{'' if report['chain_recomputed'] else ' (chain not recomputed, bundle has no candidate ids)'}")
+    print(f"Failures:              {report['failure_count']}")
+    print(f"Time:                  {report['elapsed']}s on {report['workers']} workers")
+    
+    for title, errors in (("Bundle integrity", report['integrity_errors']),
+                          ("Merkle anchors", report['anchor_errors']),
+                          ("Hash chain", report['chain_errors'])):
+        if errors:
+            print(f"\n❌ {title}:")
+            for error in errors:
+                print(f"   {error}")
+    
+    if report['failures']:
+        print(f"\n❌ Vote failures (first {len(report['failures'])}):")
+        for failure in report['failures']:
+            print(f"   Vote {failure['vote_id']}: {failure['issue']}")
+    
+    print("\n" + "="*70)
+    print("⚠️  Compare the signer list with the keys published by the election authority")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("Usage: python verify_audit_bundle.py <bundle.tar.gz> [--workers N]")
+        sys.exit(1)
+    
+    workers = None
+    if '--workers' in sys.argv:
+        workers = int(sys.argv[sys.argv.index('--workers') + 1])
+    
+    def progress(done, total):
+        print(f"\r   Parts verified: {done}/{total}", end='', flush=True)
+    
+    report = verify_audit_bundle(sys.argv[1], workers=workers, on_progress=progress)
+    print_report(report)
+    sys.exit(0 if report['status'] == 'VERIFIED' else 1)
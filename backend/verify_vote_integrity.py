@@ -6,6 +6,7 @@ Detects tampering and manipulation
 
 from app import app, db
 from blockchain.vote_verifier import get_vote_verifier
+from blockchain.integrity_engine import integrity_checkpoint_path
 from models import Vote
 from colorama import init, Fore, Style
 
@@ -20,7 +21,15 @@ def print_header():
     print("="*70 + "\n")
 
 
-def verify_all_votes():
+def print_progress(event):
+    """Print integrity check progress on one line"""
+    eta = f"{event['eta_seconds']}s" if event['eta_seconds'] is not None else "?"
+    print(f"\r   Progress: {event['checked']}/{event['total']} ({event['percent']}%) "
+          f"| {event['votes_per_second']} votes/s | ETA {eta} "
+          f"| {Fore.RED}tampered: {event['tampering_detected']}{Style.RESET_ALL}   ", end='', flush=True)
+
+
+def verify_all_votes(resume=False):
     """Verify all blockchain votes for integrity"""
     
     with app.app_context():
@@ -48,9 +57,15 @@ def verify_all_votes():
         
         # Run integrity check
         print(f"🔍 Verifying {blockchain_votes} blockchain votes...")
-        print(f"   This may take a moment...\n")
+        checkpoint_path = integrity_checkpoint_path('cli')
+        print(f"   Checkpoint: {checkpoint_path} (resume with --resume)\n")
         
-        results = verifier.check_vote_integrity()
+        results = verifier.check_vote_integrity(
+            resume=resume,
+            checkpoint_path=checkpoint_path,
+            on_progress=print_progress
+        )
+        print("\n")
         
         # Display results
         print("="*70)
@@ -100,6 +115,38 @@ def verify_all_votes():
         print("\n" + "="*70)
 
 
+def verify_hash_chain():
+    """Scan the local vote hash chain (no network access)"""
+    from blockchain.hash_chain import VoteHashChain
+    
+    with app.app_context():
+        print_header()
+        print("⛓️  Scanning local vote hash chain...\n")
+        
+        results = VoteHashChain().scan()
+        
+        if results['status'] == 'CONSISTENT':
+            print(f"{Fore.GREEN}✅ HASH CHAIN CONSISTENT{Style.RESET_ALL}\n")
+        else:
+            print(f"{Fore.RED}🚨 HASH CHAIN DIVERGED!{Style.RESET_ALL}\n")
+        
+        print(f"Rows Scanned:          {results['rows_scanned']} in {results['elapsed']}s")
+        print(f"Linked Votes:          {results['linked']}")
+        print(f"Pending (not linked):  {results['pending']}")
+        print(f"Checkpoints Verified:  {results['checkpoints_verified']}")
+        print(f"Head:                  vote {results['head_vote_id']} {results['head_hash'][:16]}...")
+        
+        divergence = results['first_divergence']
+        if divergence:
+            print(f"\n{Fore.RED}First divergent vote: {divergence['vote_id']}{Style.RESET_ALL}")
+            print(f"   Issue: {divergence['issue']}")
+            if 'stored_hash' in divergence:
+                print(f"   Expected: {divergence['expected_hash']}")
+                print(f"   Stored:   {divergence['stored_hash']}")
+        
+        print("\n" + "="*70)
+
+
 def verify_specific_vote(vote_id):
     """Verify a specific vote"""
     
@@ -140,7 +187,13 @@ def verify_specific_vote(vote_id):
 if __name__ == "__main__":
     import sys
     
-    if len(sys.argv) > 1:
+    if len(sys.argv) > 1 and sys.argv[1] == '--local':
+        # Fast RPC-free scan of the local hash chain
+        verify_hash_chain()
+    elif len(sys.argv) > 1 and sys.argv[1] == '--resume':
+        # Continue an interrupted full check
+        verify_all_votes(resume=True)
+    elif len(sys.argv) > 1:
         # Verify specific vote
         try:
             vote_id = int(sys.argv[1])